@@ -30,7 +30,7 @@ def dbr_run(frame_queue, finish_queue):
             # textResults is a list object, the following program will output each whole text result.
             # if you just want some individual results in textResult, you can get all keys in text result and get the value by the key.
             textResults = results["TextResults"]
-            intermediateResults = results["IntermediateResults"]
+            intermediateResults = dbr.GetIntermediateResults()
             for textResult in textResults:
                 # print(textResult["BarcodeFormat"])
                 print(textResult["BarcodeFormatString"])
@@ -12,9 +12,9 @@ def DecodeFileStream(imagePath):
     with open(imagePath, "rb") as fread:
         total = fread.read()
         try:
-            results = dbr.DecodeFileStream(bytearray(total), len(total))
+            results = dbr.DecodeFileStream(total, len(total))
             textResults = results["TextResults"]
-            # intermediateResults = results["IntermediateResults"]
+            # intermediateResults = dbr.GetIntermediateResults()
             print(len(textResults))
             for textResult in textResults:
                 print(textResult["BarcodeFormatString"])
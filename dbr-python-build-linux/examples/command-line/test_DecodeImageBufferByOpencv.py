@@ -12,7 +12,7 @@ def DecodeBuffer(imageByOpencv):
     try:
         results = dbr.DecodeBuffer(image, image.shape[0], image.shape[1], image.strides[0])
         textResults = results["TextResults"]
-        # intermediateResults = results["IntermediateResults"]
+        # intermediateResults = dbr.GetIntermediateResults()
         print(len(textResults))
         for textResult in textResults:
             print(textResult["BarcodeFormatString"])
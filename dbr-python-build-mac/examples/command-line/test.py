@@ -16,12 +16,12 @@ def InitLicense(license):
 def DecodeFile(fileName, templateName = ""):
     try:
         
-        # results is a dictionary object which includes TextResults and IntermediateResults. 
+        # results is a dictionary object which includes TextResults. Intermediate results are fetched on demand by GetIntermediateResults().
         results = dbr.DecodeFile(fileName, templateName)
         # textResults is a list object, the following program will output each whole text result.
         # if you just want some individual results in textResult, you can get all keys in text result and get the value by the key.
         textResults = results["TextResults"]
-        intermediateResults = results["IntermediateResults"]
+        intermediateResults = dbr.GetIntermediateResults()
         for textResult in textResults:
             # print(textResult["BarcodeFormat"])
             print(textResult["BarcodeFormatString"])
@@ -67,7 +67,7 @@ def DecodeBuffer(image, templateName = ""):
 def DecodeFileStream(imagePath, templateName = ""):
     with open(imagePath, "rb") as fread:
         total = fread.read()
-        results = dbr.DecodeFileStream(bytearray(total), len(total))
+        results = dbr.DecodeFileStream(total, len(total))
         textResults = results["TextResults"]
         for textResult in textResults:
             print("barcode format: " + textResult["BarcodeFormatString"])
@@ -0,0 +1,63 @@
+import os
+import sys
+import glob
+import time
+import threading
+
+from dbr import DynamsoftBarcodeReader
+
+
+LICENSE_KEY = "Input your own license"
+PATH_TO_IMAGEs = r"Please input your own images library path"
+# The largest number of threads to test. Every run from 1 to MAX_THREADS threads is timed.
+MAX_THREADS = 4
+# How many times each image is decoded in a run.
+REPEAT = 5
+
+def decodeWorker(dbr, images, counts, index):
+    # Every thread owns its reader. DecodeFile releases the GIL, so the threads run in parallel.
+    decoded = 0
+    for fileName in images:
+        try:
+            results = dbr.DecodeFile(fileName)
+            if results:
+                decoded += len(results["TextResults"])
+        except Exception:
+            # DecodeFile raises when no barcode is found
+            pass
+    counts[index] = decoded
+
+def run(threadCount, images):
+    readers = []
+    for i in range(threadCount):
+        dbr = DynamsoftBarcodeReader()
+        dbr.InitLicense(LICENSE_KEY)
+        readers.append(dbr)
+
+    # Split the work evenly between the threads.
+    chunks = [images[i::threadCount] for i in range(threadCount)]
+    counts = [0] * threadCount
+    threads = [threading.Thread(target=decodeWorker, args=(readers[i], chunks[i], counts, i)) for i in range(threadCount)]
+
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+    return elapsed, sum(counts)
+
+if __name__ == "__main__":
+    images = glob.glob(os.path.join(PATH_TO_IMAGEs, "*.*")) * REPEAT
+    if len(images) == 0:
+        print("No image found in " + PATH_TO_IMAGEs)
+        sys.exit(1)
+
+    # All runs must find the same barcodes, otherwise a handle was shared unsafely.
+    baselineTime, baselineCount = run(1, images)
+    print("threads: 1, time: %.3fs, images/s: %.2f, barcodes: %d" % (baselineTime, len(images) / baselineTime, baselineCount))
+    for threadCount in range(2, MAX_THREADS + 1):
+        elapsed, count = run(threadCount, images)
+        print("threads: %d, time: %.3fs, images/s: %.2f, speedup: %.2fx, barcodes: %d" % (threadCount, elapsed, len(images) / elapsed, baselineTime / elapsed, count))
+        if count != baselineCount:
+            print("Error: expected %d barcodes but got %d" % (baselineCount, count))
@@ -1,4 +1,5 @@
 #include <Python.h>
+#include <pythread.h>
 #include "DynamsoftBarcodeReader.h"
 #include <ndarraytypes.h>
 #include <structmember.h>
@@ -241,8 +242,245 @@ typedef struct
     void *hBarcode;
     // Callback function for video mode
     PyObject *py_callback;
+    // Serializes native calls on hBarcode so a handle is never used by two threads at once
+    PyThread_type_lock lock;
+    // Mirror of the runtime settings of hBarcode, valid while settingsCached is set. Updates are compared with it,
+    // so the SDK is only called when a value changes. Every other native call that changes the settings clears it.
+    PublicRuntimeSettings cachedSettings;
+    int settingsCached;
 } DynamsoftBarcodeReader;
 
+/**
+ * Take the handle lock. If another thread owns it, wait with the GIL released
+ * so that the owner can finish its native call and reacquire the GIL.
+ */
+static void LockHandle(DynamsoftBarcodeReader *self)
+{
+    if (!PyThread_acquire_lock(self->lock, NOWAIT_LOCK))
+    {
+        Py_BEGIN_ALLOW_THREADS
+        PyThread_acquire_lock(self->lock, WAIT_LOCK);
+        Py_END_ALLOW_THREADS
+    }
+}
+
+static void UnlockHandle(DynamsoftBarcodeReader *self)
+{
+    PyThread_release_lock(self->lock);
+}
+
+/**
+ * The runtime settings of the handle. They are read from the SDK only after the mirror was cleared.
+ * Call with the handle locked.
+ */
+static const PublicRuntimeSettings *GetCachedSettings(DynamsoftBarcodeReader *self)
+{
+    if (!self->settingsCached)
+    {
+        memset(&self->cachedSettings, 0, sizeof(PublicRuntimeSettings));
+        self->settingsCached = DBR_GetRuntimeSettings(self->hBarcode, &self->cachedSettings) == DBR_OK;
+    }
+    return &self->cachedSettings;
+}
+
+/**
+ * Update the runtime settings of the handle unless they are equal to the mirror. The settings must start
+ * as a copy of GetCachedSettings(), so that the bytes the caller did not set compare equal.
+ * Call with the handle locked.
+ */
+static int ApplySettings(DynamsoftBarcodeReader *self, PublicRuntimeSettings *settings, char *errorMsgBuffer, int errorMsgBufferLen)
+{
+    GetCachedSettings(self);
+    if (self->settingsCached && memcmp(settings, &self->cachedSettings, sizeof(PublicRuntimeSettings)) == 0)
+    {
+        snprintf(errorMsgBuffer, errorMsgBufferLen, "%s", DBR_GetErrorString(DBR_OK));
+        return DBR_OK;
+    }
+    int ret = DBR_UpdateRuntimeSettings(self->hBarcode, settings, errorMsgBuffer, errorMsgBufferLen);
+    // The SDK may adjust the values, the mirror is read again when it is needed
+    self->settingsCached = 0;
+    return ret;
+}
+
+#if defined(IS_PY3K)
+#define InternString PyUnicode_InternFromString
+#else
+#define InternString PyString_InternFromString
+#endif
+
+/**
+ * Dictionary keys used to marshal results and settings. They are interned once
+ * when the module is loaded, so building or reading a dict never allocates a key.
+ */
+#define DBR_KEYS(K) \
+    K(AccompanyingTextBytes) \
+    K(Angle) \
+    K(BCMIndex) \
+    K(BMIndex) \
+    K(BarcodeBytes) \
+    K(BarcodeColourModes) \
+    K(BarcodeComplementMode) \
+    K(BarcodeComplementModes) \
+    K(BarcodeFormat) \
+    K(BarcodeFormatIds) \
+    K(BarcodeFormatIds_2) \
+    K(BarcodeFormatString) \
+    K(BarcodeFormatString_2) \
+    K(BarcodeFormat_2) \
+    K(BarcodeText) \
+    K(BinarizationMode) \
+    K(BinarizationModes) \
+    K(Bytes) \
+    K(CCMIndex) \
+    K(CICMIndex) \
+    K(CheckDigitBytes) \
+    K(Clarity) \
+    K(ColourClusteringMode) \
+    K(ColourClusteringModes) \
+    K(ColourConversionMode) \
+    K(ColourConversionModes) \
+    K(Columns) \
+    K(Confidence) \
+    K(DPMCRMIndex) \
+    K(DPMCodeReadingMode) \
+    K(DPMCodeReadingModes) \
+    K(DataRegionColumns) \
+    K(DataRegionNumber) \
+    K(DataRegionRows) \
+    K(DataType) \
+    K(DeblurLevel) \
+    K(Deformation) \
+    K(DeformationResistingModes) \
+    K(DetailedResult) \
+    K(DocumentName) \
+    K(EndPoint) \
+    K(ErrorCorrectionLevel) \
+    K(ExpectedBarcodesCount) \
+    K(ExtendedResults) \
+    K(FPS) \
+    K(FrameId) \
+    K(GTMIndex) \
+    K(GrayscaleTransformationMode) \
+    K(GrayscaleTransformationModes) \
+    K(Height) \
+    K(IMResults) \
+    K(IPMIndex) \
+    K(ImagePixelFormat) \
+    K(ImagePreprocessingMode) \
+    K(ImagePreprocessingModes) \
+    K(IntermediateResultSavingMode) \
+    K(IntermediateResultTypes) \
+    K(LMIndex) \
+    K(LayerNumber) \
+    K(LinesConfidenceCoefficients) \
+    K(LocalizationMode) \
+    K(LocalizationModes) \
+    K(LocalizationResult) \
+    K(LocalizationRsult) \
+    K(MaxAlgorithmThreadCount) \
+    K(MaxQueueLength) \
+    K(MaxResultQueueLength) \
+    K(MinBarcodeTextLength) \
+    K(MinResultConfidence) \
+    K(ModuleSize) \
+    K(PDFRasterDPI) \
+    K(PageNumber) \
+    K(Point) \
+    K(Points) \
+    K(ROIId) \
+    K(RPMIndex) \
+    K(RegionBottom) \
+    K(RegionLeft) \
+    K(RegionMeasuredByPercentage) \
+    K(RegionName) \
+    K(RegionPredetectionMode) \
+    K(RegionPredetectionModes) \
+    K(RegionRight) \
+    K(RegionTop) \
+    K(ResultCoordinateType) \
+    K(ResultType) \
+    K(ReturnBarcodeZoneClarity) \
+    K(RotationMatrix) \
+    K(Rows) \
+    K(SamplingImage) \
+    K(ScaleDownRatio) \
+    K(ScaleDownThreshold) \
+    K(StartCharsBytes) \
+    K(StartPoint) \
+    K(StopCharsBytes) \
+    K(Stride) \
+    K(TFMIndex) \
+    K(TerminatePhase) \
+    K(TextAssistedCorrectionMode) \
+    K(TextFilterMode) \
+    K(TextFilterModes) \
+    K(TextResultOrderModes) \
+    K(TextResults) \
+    K(TextureDetectionModes) \
+    K(Threshold) \
+    K(Timeout) \
+    K(Width) \
+    K(X) \
+    K(X1) \
+    K(X2) \
+    K(X3) \
+    K(X4) \
+    K(Y) \
+    K(Y1) \
+    K(Y2) \
+    K(Y3) \
+    K(Y4) \
+    K(model) \
+    K(version)
+
+#define DECLARE_KEY(name) static PyObject *key_##name = NULL;
+DBR_KEYS(DECLARE_KEY)
+#undef DECLARE_KEY
+
+static int InitKeys(void)
+{
+#define INIT_KEY(name) if ((key_##name = InternString(#name)) == NULL) return -1;
+    DBR_KEYS(INIT_KEY)
+#undef INIT_KEY
+    return 0;
+}
+
+// Barcode format names repeat across results, so their string objects are shared
+#define MAX_FORMAT_STRINGS 64
+static char *formatNames[MAX_FORMAT_STRINGS];
+static PyObject *formatStrings[MAX_FORMAT_STRINGS];
+static int formatStringCount = 0;
+
+/**
+ * Return a new reference to the string object of a barcode format name.
+ */
+static PyObject * GetFormatString(const char *name)
+{
+    for (int i = 0; i < formatStringCount; ++i)
+    {
+        if (strcmp(formatNames[i], name) == 0)
+        {
+            Py_INCREF(formatStrings[i]);
+            return formatStrings[i];
+        }
+    }
+
+    PyObject *pyName = InternString(name);
+    if (pyName != NULL && formatStringCount < MAX_FORMAT_STRINGS)
+    {
+        char *copy = (char *)PyMem_Malloc(strlen(name) + 1);
+        if (copy != NULL)
+        {
+            strcpy(copy, name);
+            formatNames[formatStringCount] = copy;
+            formatStrings[formatStringCount] = pyName;
+            ++formatStringCount;
+            Py_INCREF(pyName);
+        }
+    }
+    return pyName;
+}
+
 void ToHexString(unsigned char* pSrc, int iLen, char* pDest)
 {
 	const char HEXCHARS[16] = { '0', '1', '2', '3', '4', '5', '6', '7', '8', '9', 'A', 'B', 'C', 'D', 'E', 'F' };
@@ -267,52 +505,36 @@ static PyObject * CreatePyRuntimeSettings(PublicRuntimeSettings pSettings)
     }
 
     PyObject * terminatePhase               = Py_BuildValue("i", pSettings.terminatePhase);
-    PyObject * terminatePhaseKey            = Py_BuildValue("s", "TerminatePhase");
-    PyDict_SetItem(pySettings, terminatePhaseKey,           terminatePhase);
+    PyDict_SetItem(pySettings, key_TerminatePhase,           terminatePhase);
     Py_DECREF(terminatePhase);
-    Py_DECREF(terminatePhaseKey);
 
     PyObject * timeout                      = Py_BuildValue("i", pSettings.timeout);
-    PyObject * timeoutKey                   = Py_BuildValue("s", "Timeout");
-    PyDict_SetItem(pySettings, timeoutKey, timeout);
+    PyDict_SetItem(pySettings, key_Timeout, timeout);
     Py_DECREF(timeout);
-    Py_DECREF(timeoutKey);
 
     PyObject * maxAlgorithmThreadCount      = Py_BuildValue("i", pSettings.maxAlgorithmThreadCount );
-    PyObject * maxAlgorithmThreadCountKey   = Py_BuildValue("s", "MaxAlgorithmThreadCount");
-    PyDict_SetItem(pySettings, maxAlgorithmThreadCountKey,  maxAlgorithmThreadCount);
+    PyDict_SetItem(pySettings, key_MaxAlgorithmThreadCount,  maxAlgorithmThreadCount);
     Py_DECREF(maxAlgorithmThreadCount);
-    Py_DECREF(maxAlgorithmThreadCountKey);
 
     PyObject * expectedBarcodesCount        = Py_BuildValue("i", pSettings.expectedBarcodesCount);
-    PyObject * expectedBarcodesCountKey     = Py_BuildValue("s", "ExpectedBarcodesCount");
-    PyDict_SetItem(pySettings, expectedBarcodesCountKey,    expectedBarcodesCount);
+    PyDict_SetItem(pySettings, key_ExpectedBarcodesCount,    expectedBarcodesCount);
     Py_DECREF(expectedBarcodesCount);
-    Py_DECREF(expectedBarcodesCountKey);
 
     PyObject * barcodeFormatIds             = Py_BuildValue("i", pSettings.barcodeFormatIds);
-    PyObject * BarcodeFormatIdsKey          = Py_BuildValue("s", "BarcodeFormatIds");
-    PyDict_SetItem(pySettings, BarcodeFormatIdsKey,         barcodeFormatIds);
+    PyDict_SetItem(pySettings, key_BarcodeFormatIds,         barcodeFormatIds);
     Py_DECREF(barcodeFormatIds);
-    Py_DECREF(BarcodeFormatIdsKey);
 
     PyObject * barcodeFormatIds_2           = Py_BuildValue("i", pSettings.barcodeFormatIds_2);
-    PyObject * barcodeFormatIds_2Key        = Py_BuildValue("s", "BarcodeFormatIds_2");
-    PyDict_SetItem(pySettings, barcodeFormatIds_2Key,       barcodeFormatIds_2);
+    PyDict_SetItem(pySettings, key_BarcodeFormatIds_2,       barcodeFormatIds_2);
     Py_DECREF(barcodeFormatIds_2);
-    Py_DECREF(barcodeFormatIds_2Key);
 
     PyObject * pdfRasterDPI                 = Py_BuildValue("i", pSettings.pdfRasterDPI);
-    PyObject * pdfRasterDPIKey              = Py_BuildValue("s", "PDFRasterDPI");
-    PyDict_SetItem(pySettings, pdfRasterDPIKey,             pdfRasterDPI);
+    PyDict_SetItem(pySettings, key_PDFRasterDPI,             pdfRasterDPI);
     Py_DECREF(pdfRasterDPI);
-    Py_DECREF(pdfRasterDPIKey);
 
     PyObject * scaleDownThreshold           = Py_BuildValue("i", pSettings.scaleDownThreshold);
-    PyObject * scaleDownThresholdKey        = Py_BuildValue("s", "ScaleDownThreshold");
-    PyDict_SetItem(pySettings, scaleDownThresholdKey,       scaleDownThreshold);
+    PyDict_SetItem(pySettings, key_ScaleDownThreshold,       scaleDownThreshold);
     Py_DECREF(scaleDownThreshold);
-    Py_DECREF(scaleDownThresholdKey);
 
     PyObject * binarizationModes            = PyList_New(8);
     PyObject * localizationModes            = PyList_New(8);
@@ -361,218 +583,187 @@ static PyObject * CreatePyRuntimeSettings(PublicRuntimeSettings pSettings)
         PyList_SetItem(textResultOrderModes,     i, tempTROM);
     }
 
-    PyObject * binarizationModesKey         = Py_BuildValue("s", "BinarizationModes");
-    PyDict_SetItem(pySettings, binarizationModesKey,        binarizationModes);
+    PyDict_SetItem(pySettings, key_BinarizationModes,        binarizationModes);
     Py_DECREF(binarizationModes);
-    Py_DECREF(binarizationModesKey);
 
-    PyObject * localizationModesKey         = Py_BuildValue("s", "LocalizationModes");
-    PyDict_SetItem(pySettings, localizationModesKey,        localizationModes);
+    PyDict_SetItem(pySettings, key_LocalizationModes,        localizationModes);
     Py_DECREF(localizationModes);
-    Py_DECREF(localizationModesKey);
 
-    PyObject * colourClusteringModesKey     = Py_BuildValue("s", "ColourClusteringModes");
-    PyDict_SetItem(pySettings, colourClusteringModesKey,    colourClusteringModes);
+    PyDict_SetItem(pySettings, key_ColourClusteringModes,    colourClusteringModes);
     Py_DECREF(colourClusteringModes);
-    Py_DECREF(colourClusteringModesKey);
 
-    PyObject * colourConversionModesKey     = Py_BuildValue("s", "ColourConversionModes");
-    PyDict_SetItem(pySettings, colourConversionModesKey,    colourConversionModes);
+    PyDict_SetItem(pySettings, key_ColourConversionModes,    colourConversionModes);
     Py_DECREF(colourConversionModes);
-    Py_DECREF(colourConversionModesKey);
 
-    PyObject * grayscaleTransformationModesKey = Py_BuildValue("s", "GrayscaleTransformationModes");
-    PyDict_SetItem(pySettings, grayscaleTransformationModesKey, grayscaleTransformationModes);
+    PyDict_SetItem(pySettings, key_GrayscaleTransformationModes, grayscaleTransformationModes);
     Py_DECREF(grayscaleTransformationModes);
-    Py_DECREF(grayscaleTransformationModesKey);
     
-    PyObject * regionPredetectionModesKey   = Py_BuildValue("s", "RegionPredetectionModes");
-    PyDict_SetItem(pySettings, regionPredetectionModesKey,  regionPredetectionModes);
+    PyDict_SetItem(pySettings, key_RegionPredetectionModes,  regionPredetectionModes);
     Py_DECREF(regionPredetectionModes);
-    Py_DECREF(regionPredetectionModesKey);
 
-    PyObject * imagePreprocessingModesKey   = Py_BuildValue("s", "ImagePreprocessingModes");
-    PyDict_SetItem(pySettings, imagePreprocessingModesKey,  imagePreprocessingModes);
+    PyDict_SetItem(pySettings, key_ImagePreprocessingModes,  imagePreprocessingModes);
     Py_DECREF(imagePreprocessingModes);
-    Py_DECREF(imagePreprocessingModesKey);
 
-    PyObject * textureDetectionModesKey     = Py_BuildValue("s", "TextureDetectionModes");
-    PyDict_SetItem(pySettings, textureDetectionModesKey,    textureDetectionModes);
+    PyDict_SetItem(pySettings, key_TextureDetectionModes,    textureDetectionModes);
     Py_DECREF(textureDetectionModes);
-    Py_DECREF(textureDetectionModesKey);
 
-    PyObject * textFilterModesKey           = Py_BuildValue("s", "TextFilterModes");
-    PyDict_SetItem(pySettings, textFilterModesKey,          textFilterModes);
+    PyDict_SetItem(pySettings, key_TextFilterModes,          textFilterModes);
     Py_DECREF(textFilterModes);
-    Py_DECREF(textFilterModesKey);
 
-    PyObject * dpmCodeReadingModesKey       = Py_BuildValue("s", "DPMCodeReadingModes");
-    PyDict_SetItem(pySettings, dpmCodeReadingModesKey,      dpmCodeReadingModes);
+    PyDict_SetItem(pySettings, key_DPMCodeReadingModes,      dpmCodeReadingModes);
     Py_DECREF(dpmCodeReadingModes);
-    Py_DECREF(dpmCodeReadingModesKey);
 
-    PyObject * deformationResistingModesKey = Py_BuildValue("s", "DeformationResistingModes");
-    PyDict_SetItem(pySettings, deformationResistingModesKey, deformationResistingModes);
+    PyDict_SetItem(pySettings, key_DeformationResistingModes, deformationResistingModes);
     Py_DECREF(deformationResistingModes);
-    Py_DECREF(deformationResistingModesKey);
 
-    PyObject * barcodeComplementModesKey    = Py_BuildValue("s", "BarcodeComplementModes");
-    PyDict_SetItem(pySettings, barcodeComplementModesKey,   barcodeComplementModes);
+    PyDict_SetItem(pySettings, key_BarcodeComplementModes,   barcodeComplementModes);
     Py_DECREF(barcodeComplementModes);
-    Py_DECREF(barcodeComplementModesKey);
 
-    PyObject * barcodeColourModesKey        = Py_BuildValue("s", "BarcodeColourModes");
-    PyDict_SetItem(pySettings, barcodeColourModesKey,       barcodeColourModes);
+    PyDict_SetItem(pySettings, key_BarcodeColourModes,       barcodeColourModes);
     Py_DECREF(barcodeColourModes);
-    Py_DECREF(barcodeColourModesKey);
 
-    PyObject * textResultOrderModesKey      = Py_BuildValue("s", "TextResultOrderModes");
-    PyDict_SetItem(pySettings, textResultOrderModesKey,     textResultOrderModes);
+    PyDict_SetItem(pySettings, key_TextResultOrderModes,     textResultOrderModes);
     Py_DECREF(textResultOrderModes);
-    Py_DECREF(textResultOrderModesKey);
 
     PyObject * textAssistedCorrectionMode   = Py_BuildValue("i", pSettings.furtherModes.textAssistedCorrectionMode);
-    PyObject * textAssistedCorrectionModeKey =Py_BuildValue("s", "TextAssistedCorrectionMode");
-    PyDict_SetItem(pySettings, textAssistedCorrectionModeKey, textAssistedCorrectionMode);
+    PyDict_SetItem(pySettings, key_TextAssistedCorrectionMode, textAssistedCorrectionMode);
     Py_DECREF(textAssistedCorrectionMode);
-    Py_DECREF(textAssistedCorrectionModeKey);
 
     PyObject * deblurLevel                  = Py_BuildValue("i", pSettings.deblurLevel);
-    PyObject * deblurLevelKey               = Py_BuildValue("s", "DeblurLevel");
-    PyDict_SetItem(pySettings, deblurLevelKey,              deblurLevel);
+    PyDict_SetItem(pySettings, key_DeblurLevel,              deblurLevel);
     Py_DECREF(deblurLevel);
-    Py_DECREF(deblurLevelKey);
 
     PyObject * intermediateResultTypes      = Py_BuildValue("i", pSettings.intermediateResultTypes);
-    PyObject * intermediateResultTypesKey   = Py_BuildValue("s", "IntermediateResultTypes");
-    PyDict_SetItem(pySettings, intermediateResultTypesKey,  intermediateResultTypes);
+    PyDict_SetItem(pySettings, key_IntermediateResultTypes,  intermediateResultTypes);
     Py_DECREF(intermediateResultTypes);
-    Py_DECREF(intermediateResultTypesKey);
 
     PyObject * intermediateResultSavingMode = Py_BuildValue("i", pSettings.intermediateResultSavingMode);
-    PyObject * intermediateResultSavingModeKey = Py_BuildValue("s", "IntermediateResultSavingMode");
-    PyDict_SetItem(pySettings, intermediateResultSavingModeKey, intermediateResultSavingMode);
+    PyDict_SetItem(pySettings, key_IntermediateResultSavingMode, intermediateResultSavingMode);
     Py_DECREF(intermediateResultSavingMode);
-    Py_DECREF(intermediateResultSavingModeKey);
 
     PyObject * resultCoordinateType         = Py_BuildValue("i", pSettings.resultCoordinateType);
-    PyObject * resultCoordinateTypeKey      = Py_BuildValue("s", "ResultCoordinateType");
-    PyDict_SetItem(pySettings, resultCoordinateTypeKey,     resultCoordinateType);
+    PyDict_SetItem(pySettings, key_ResultCoordinateType,     resultCoordinateType);
     Py_DECREF(resultCoordinateType);
-    Py_DECREF(resultCoordinateTypeKey);
 
     PyObject * returnBarcodeZoneClarity     = Py_BuildValue("i", pSettings.returnBarcodeZoneClarity);
-    PyObject * returnBarcodeZoneClarityKey  = Py_BuildValue("s", "ReturnBarcodeZoneClarity");
-    PyDict_SetItem(pySettings, returnBarcodeZoneClarityKey, returnBarcodeZoneClarity);
+    PyDict_SetItem(pySettings, key_ReturnBarcodeZoneClarity, returnBarcodeZoneClarity);
     Py_DECREF(returnBarcodeZoneClarity);
-    Py_DECREF(returnBarcodeZoneClarityKey);
 
     PyObject * regionTop                    = Py_BuildValue("i", pSettings.region.regionTop);
-    PyObject * regionTopKey                 = Py_BuildValue("s", "RegionTop");
-    PyDict_SetItem(pySettings, regionTopKey,                regionTop);
+    PyDict_SetItem(pySettings, key_RegionTop,                regionTop);
     Py_DECREF(regionTop);
-    Py_DECREF(regionTopKey);
 
     PyObject * regionBottom                 = Py_BuildValue("i", pSettings.region.regionBottom);
-    PyObject * regionBottomKey              = Py_BuildValue("s", "RegionBottom");
-    PyDict_SetItem(pySettings, regionBottomKey,             regionBottom);
+    PyDict_SetItem(pySettings, key_RegionBottom,             regionBottom);
     Py_DECREF(regionBottom);
-    Py_DECREF(regionBottomKey);
 
     PyObject * regionLeft                   = Py_BuildValue("i", pSettings.region.regionLeft);
-    PyObject * regionLeftKey                = Py_BuildValue("s", "RegionLeft");
-    PyDict_SetItem(pySettings, regionLeftKey,               regionLeft);
+    PyDict_SetItem(pySettings, key_RegionLeft,               regionLeft);
     Py_DECREF(regionLeft);
-    Py_DECREF(regionLeftKey);
 
     PyObject * regionRight                  = Py_BuildValue("i", pSettings.region.regionRight);
-    PyObject * regionRightKey               = Py_BuildValue("s", "RegionRight");
-    PyDict_SetItem(pySettings, regionRightKey,              regionRight);
+    PyDict_SetItem(pySettings, key_RegionRight,              regionRight);
     Py_DECREF(regionRight);
-    Py_DECREF(regionRightKey);
 
     PyObject * regionMeasuredByPercentage   = Py_BuildValue("i", pSettings.region.regionMeasuredByPercentage);
-    PyObject * regionMeasuredByPercentageKey =Py_BuildValue("s", "RegionMeasuredByPercentage");
-    PyDict_SetItem(pySettings, regionMeasuredByPercentageKey, regionMeasuredByPercentage);
+    PyDict_SetItem(pySettings, key_RegionMeasuredByPercentage, regionMeasuredByPercentage);
     Py_DECREF(regionMeasuredByPercentage);
-    Py_DECREF(regionMeasuredByPercentageKey);
 
     PyObject * minBarcodeTextLength         = Py_BuildValue("i", pSettings.minBarcodeTextLength);
-    PyObject * minBarcodeTextLengthKey      = Py_BuildValue("s", "MinBarcodeTextLength");
-    PyDict_SetItem(pySettings, minBarcodeTextLengthKey,     minBarcodeTextLength);
+    PyDict_SetItem(pySettings, key_MinBarcodeTextLength,     minBarcodeTextLength);
     Py_DECREF(minBarcodeTextLength);
-    Py_DECREF(minBarcodeTextLengthKey);
 
     PyObject * minResultConfidence          = Py_BuildValue("i", pSettings.minResultConfidence);
-    PyObject * minResultConfidenceKey       = Py_BuildValue("s", "MinResultConfidence");
-    PyDict_SetItem(pySettings, minResultConfidenceKey,      minResultConfidence);
+    PyDict_SetItem(pySettings, key_MinResultConfidence,      minResultConfidence);
     Py_DECREF(minResultConfidence);
-    Py_DECREF(minResultConfidenceKey);
 
     return pySettings;
 }
 
-PublicRuntimeSettings CreateCRuntimeSettings(PyObject *o)
+/**
+ * Replace the error of a setting that could not be converted with a TypeError naming it.
+ */
+static int OverlayTypeError(PyObject *key, const char *expected)
 {
-    PublicRuntimeSettings pSettings;
-    pSettings.terminatePhase            = (TerminatePhase)(PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "TerminatePhase"))));
-    pSettings.timeout                   = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "Timeout")));
-    pSettings.maxAlgorithmThreadCount   = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "MaxAlgorithmThreadCount")));
-    pSettings.expectedBarcodesCount     = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "ExpectedBarcodesCount")));
-    pSettings.barcodeFormatIds          = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "BarcodeFormatIds")));
-    pSettings.barcodeFormatIds_2        = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "BarcodeFormatIds_2")));
-    pSettings.pdfRasterDPI              = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "PDFRasterDPI")));
-    pSettings.scaleDownThreshold        = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "ScaleDownThreshold")));
-
-    PyObject * binarizationModes            = PyDict_GetItem(o, Py_BuildValue("s", "BinarizationModes"));
-    PyObject * localizationModes            = PyDict_GetItem(o, Py_BuildValue("s", "LocalizationModes"));
-    PyObject * colourClusteringModes        = PyDict_GetItem(o, Py_BuildValue("s", "ColourClusteringModes"));
-    PyObject * colourConversionModes        = PyDict_GetItem(o, Py_BuildValue("s", "ColourConversionModes"));
-    PyObject * grayscaleTransformationModes = PyDict_GetItem(o, Py_BuildValue("s", "GrayscaleTransformationModes"));
-    PyObject * regionPredetectionModes      = PyDict_GetItem(o, Py_BuildValue("s", "RegionPredetectionModes"));
-    PyObject * imagePreprocessingModes      = PyDict_GetItem(o, Py_BuildValue("s", "ImagePreprocessingModes"));
-    PyObject * textureDetectionModes        = PyDict_GetItem(o, Py_BuildValue("s", "TextureDetectionModes"));
-    PyObject * textFilterModes              = PyDict_GetItem(o, Py_BuildValue("s", "TextFilterModes"));
-    PyObject * dpmCodeReadingModes          = PyDict_GetItem(o, Py_BuildValue("s", "DPMCodeReadingModes"));
-    PyObject * deformationResistingModes    = PyDict_GetItem(o, Py_BuildValue("s", "DeformationResistingModes"));
-    PyObject * barcodeComplementModes       = PyDict_GetItem(o, Py_BuildValue("s", "BarcodeComplementModes"));
-    PyObject * barcodeColourModes           = PyDict_GetItem(o, Py_BuildValue("s", "BarcodeColourModes"));
-    PyObject * textResultOrderModes         = PyDict_GetItem(o, Py_BuildValue("s", "TextResultOrderModes"));
+    PyErr_Clear();
+#if defined(IS_PY3K)
+    PyErr_Format(PyExc_TypeError, "the runtime setting %U must be %s", key, expected);
+#else
+    PyErr_Format(PyExc_TypeError, "the runtime setting %s must be %s", PyString_AsString(key), expected);
+#endif
+    return -1;
+}
 
+/**
+ * Copy the values of the settings dict o into pSettings. A key missing from o keeps the value in pSettings,
+ * so a dict holding only the changed settings updates only those fields.
+ * Returns -1 with a TypeError set if a value is not an integer or a list of integers, pSettings must not be applied then.
+ */
+#define OVERLAY_SETTING(key, field) \
+    if ((item = PyDict_GetItem(o, key)) != NULL) \
+    { \
+        value = PyLong_AsLong(item); \
+        if (value == -1 && PyErr_Occurred()) \
+            return OverlayTypeError(key, "an integer"); \
+        field = value; \
+    }
+#define OVERLAY_MODES(key, modes) \
+    if ((item = PyDict_GetItem(o, key)) != NULL) \
+    { \
+        if (!PyList_Check(item)) \
+            return OverlayTypeError(key, "a list of integers"); \
+        for (i = 0; i < 8 && i < PyList_GET_SIZE(item); ++i) \
+        { \
+            value = PyLong_AsLong(PyList_GET_ITEM(item, i)); \
+            if (value == -1 && PyErr_Occurred()) \
+                return OverlayTypeError(key, "a list of integers"); \
+            modes[i] = value; \
+        } \
+    }
 
-    for(int i = 0; i < 8; ++i)
-    {
-        pSettings.binarizationModes[i]                          = (BinarizationMode)(PyLong_AsLong(PyList_GetItem(binarizationModes, i)));
-        pSettings.localizationModes[i]                          = (LocalizationMode)(PyLong_AsLong(PyList_GetItem(localizationModes, i)));
-        pSettings.furtherModes.colourClusteringModes[i]         = (ColourClusteringMode)(PyLong_AsLong(PyList_GetItem(colourClusteringModes, i)));
-        pSettings.furtherModes.colourConversionModes[i]         = (ColourConversionMode)(PyLong_AsLong(PyList_GetItem(colourConversionModes, i)));
-        pSettings.furtherModes.grayscaleTransformationModes[i]  = (GrayscaleTransformationMode)(PyLong_AsLong(PyList_GetItem(grayscaleTransformationModes, i)));
-        pSettings.furtherModes.regionPredetectionModes[i]       = (RegionPredetectionMode)(PyLong_AsLong(PyList_GetItem(regionPredetectionModes, i)));
-        pSettings.furtherModes.imagePreprocessingModes[i]       = (ImagePreprocessingMode)(PyLong_AsLong(PyList_GetItem(imagePreprocessingModes, i)));
-        pSettings.furtherModes.textureDetectionModes[i]         = (TextureDetectionMode)(PyLong_AsLong(PyList_GetItem(textureDetectionModes, i)));
-        pSettings.furtherModes.textFilterModes[i]               = (TextFilterMode)(PyLong_AsLong(PyList_GetItem(textFilterModes, i)));
-        pSettings.furtherModes.dpmCodeReadingModes[i]           = (DPMCodeReadingMode)(PyLong_AsLong(PyList_GetItem(dpmCodeReadingModes, i)));
-        pSettings.furtherModes.deformationResistingModes[i]     = (DeformationResistingMode)(PyLong_AsLong(PyList_GetItem(deformationResistingModes, i)));
-        pSettings.furtherModes.barcodeComplementModes[i]        = (BarcodeComplementMode)(PyLong_AsLong(PyList_GetItem(barcodeComplementModes, i)));
-        pSettings.furtherModes.barcodeColourModes[i]            = (BarcodeColourMode)(PyLong_AsLong(PyList_GetItem(barcodeColourModes, i)));
-        pSettings.textResultOrderModes[i]                       = (TextResultOrderMode)(PyLong_AsLong(PyList_GetItem(textResultOrderModes, i)));
-    }
-
-    pSettings.furtherModes.textAssistedCorrectionMode               = (TextAssistedCorrectionMode)(PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "TextAssistedCorrectionMode"))));
-    pSettings.deblurLevel                                           = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "DeblurLevel")));
-    pSettings.intermediateResultTypes                               = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "IntermediateResultTypes")));
-    pSettings.intermediateResultSavingMode                          = (IntermediateResultSavingMode)(PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "IntermediateResultSavingMode"))));
-    pSettings.resultCoordinateType                                  = (ResultCoordinateType)(PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "ResultCoordinateType"))));
-    pSettings.returnBarcodeZoneClarity                              = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "ReturnBarcodeZoneClarity")));
-    pSettings.region.regionTop                                      = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "RegionTop")));
-    pSettings.region.regionBottom                                   = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "RegionBottom")));
-    pSettings.region.regionLeft                                     = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "RegionLeft")));
-    pSettings.region.regionRight                                    = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "RegionRight")));
-    pSettings.region.regionMeasuredByPercentage                     = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "RegionMeasuredByPercentage")));
-    pSettings.minBarcodeTextLength                                  = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "MinBarcodeTextLength")));
-    pSettings.minResultConfidence                                   = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "MinResultConfidence")));
-
-    return pSettings;
+static int OverlayCRuntimeSettings(PyObject *o, PublicRuntimeSettings *pSettings)
+{
+    PyObject *item;
+    Py_ssize_t i;
+    long value;
+    OVERLAY_SETTING(key_TerminatePhase,             pSettings->terminatePhase);
+    OVERLAY_SETTING(key_Timeout,                    pSettings->timeout);
+    OVERLAY_SETTING(key_MaxAlgorithmThreadCount,    pSettings->maxAlgorithmThreadCount);
+    OVERLAY_SETTING(key_ExpectedBarcodesCount,      pSettings->expectedBarcodesCount);
+    OVERLAY_SETTING(key_BarcodeFormatIds,           pSettings->barcodeFormatIds);
+    OVERLAY_SETTING(key_BarcodeFormatIds_2,         pSettings->barcodeFormatIds_2);
+    OVERLAY_SETTING(key_PDFRasterDPI,               pSettings->pdfRasterDPI);
+    OVERLAY_SETTING(key_ScaleDownThreshold,         pSettings->scaleDownThreshold);
+
+    OVERLAY_MODES(key_BinarizationModes,                pSettings->binarizationModes);
+    OVERLAY_MODES(key_LocalizationModes,                pSettings->localizationModes);
+    OVERLAY_MODES(key_ColourClusteringModes,            pSettings->furtherModes.colourClusteringModes);
+    OVERLAY_MODES(key_ColourConversionModes,            pSettings->furtherModes.colourConversionModes);
+    OVERLAY_MODES(key_GrayscaleTransformationModes,     pSettings->furtherModes.grayscaleTransformationModes);
+    OVERLAY_MODES(key_RegionPredetectionModes,          pSettings->furtherModes.regionPredetectionModes);
+    OVERLAY_MODES(key_ImagePreprocessingModes,          pSettings->furtherModes.imagePreprocessingModes);
+    OVERLAY_MODES(key_TextureDetectionModes,            pSettings->furtherModes.textureDetectionModes);
+    OVERLAY_MODES(key_TextFilterModes,                  pSettings->furtherModes.textFilterModes);
+    OVERLAY_MODES(key_DPMCodeReadingModes,              pSettings->furtherModes.dpmCodeReadingModes);
+    OVERLAY_MODES(key_DeformationResistingModes,        pSettings->furtherModes.deformationResistingModes);
+    OVERLAY_MODES(key_BarcodeComplementModes,           pSettings->furtherModes.barcodeComplementModes);
+    OVERLAY_MODES(key_BarcodeColourModes,               pSettings->furtherModes.barcodeColourModes);
+    OVERLAY_MODES(key_TextResultOrderModes,             pSettings->textResultOrderModes);
+
+    OVERLAY_SETTING(key_TextAssistedCorrectionMode,     pSettings->furtherModes.textAssistedCorrectionMode);
+    OVERLAY_SETTING(key_DeblurLevel,                    pSettings->deblurLevel);
+    OVERLAY_SETTING(key_IntermediateResultTypes,        pSettings->intermediateResultTypes);
+    OVERLAY_SETTING(key_IntermediateResultSavingMode,   pSettings->intermediateResultSavingMode);
+    OVERLAY_SETTING(key_ResultCoordinateType,           pSettings->resultCoordinateType);
+    OVERLAY_SETTING(key_ReturnBarcodeZoneClarity,       pSettings->returnBarcodeZoneClarity);
+    OVERLAY_SETTING(key_RegionTop,                      pSettings->region.regionTop);
+    OVERLAY_SETTING(key_RegionBottom,                   pSettings->region.regionBottom);
+    OVERLAY_SETTING(key_RegionLeft,                     pSettings->region.regionLeft);
+    OVERLAY_SETTING(key_RegionRight,                    pSettings->region.regionRight);
+    OVERLAY_SETTING(key_RegionMeasuredByPercentage,     pSettings->region.regionMeasuredByPercentage);
+    OVERLAY_SETTING(key_MinBarcodeTextLength,           pSettings->minBarcodeTextLength);
+    OVERLAY_SETTING(key_MinResultConfidence,            pSettings->minResultConfidence);
+    return 0;
 }
 
 static PyObject * CreatePySamplingImageData(SamplingImageData samplingImage)
@@ -588,32 +779,24 @@ static PyObject * CreatePySamplingImageData(SamplingImageData samplingImage)
     if(samplingImage.bytes != NULL)
     {
         PyObject * pySamplingImageBytes     = PyByteArray_FromStringAndSize(samplingImage.bytes, samplingImage.width * samplingImage.height);
-        PyObject * pySamplingImageBytesKey  = Py_BuildValue("s", "Bytes");
-        PyDict_SetItem(pySamplingImage, pySamplingImageBytesKey, pySamplingImageBytes);
+        PyDict_SetItem(pySamplingImage, key_Bytes, pySamplingImageBytes);
         Py_DECREF(pySamplingImageBytes);
-        Py_DECREF(pySamplingImageBytesKey);
     }
     else
     {
         PyObject * pySamplingImageBytes     = Py_BuildValue("s", "NULL");
-        PyObject * pySamplingImageBytesKey  = Py_BuildValue("s", "Bytes");
-        PyDict_SetItem(pySamplingImage, pySamplingImageBytesKey, pySamplingImageBytes);
+        PyDict_SetItem(pySamplingImage, key_Bytes, pySamplingImageBytes);
         Py_DECREF(pySamplingImageBytes);
-        Py_DECREF(pySamplingImageBytesKey);
     }
 
 
     PyObject * pySamplingImageWidth     = Py_BuildValue("i", samplingImage.width);
-    PyObject * pySamplingImageWidthKey  = Py_BuildValue("s", "Width");
-    PyDict_SetItem(pySamplingImage, pySamplingImageWidthKey, pySamplingImageWidth);
+    PyDict_SetItem(pySamplingImage, key_Width, pySamplingImageWidth);
     Py_DECREF(pySamplingImageWidth);
-    Py_DECREF(pySamplingImageWidthKey);
 
     PyObject * pySamplingImageHeight    = Py_BuildValue("i", samplingImage.height);
-    PyObject * pySamplingImageHeightKey = Py_BuildValue("s", "Height");
-    PyDict_SetItem(pySamplingImage, pySamplingImageHeightKey, pySamplingImageHeight);
+    PyDict_SetItem(pySamplingImage, key_Height, pySamplingImageHeight);
     Py_DECREF(pySamplingImageHeight);
-    Py_DECREF(pySamplingImageHeightKey);
 
     return pySamplingImage;
 }
@@ -636,191 +819,137 @@ static PyObject * CreatePyDetailedResult(void * pResult, int format)
     if((format & BF_ONED) != 0)
     {
         PyObject * pyModuleSize         = Py_BuildValue("i", ((OneDCodeDetails *)pResult)->moduleSize);
-        PyObject * pyModuleSizeKey      = Py_BuildValue("s", "ModuleSize");
-        PyDict_SetItem(pyResult, pyModuleSizeKey, pyModuleSize);
+        PyDict_SetItem(pyResult, key_ModuleSize, pyModuleSize);
         Py_DECREF(pyModuleSize);
-        Py_DECREF(pyModuleSizeKey);
 
         if(((OneDCodeDetails *)pResult)->startCharsBytes != NULL)
         {
             PyObject * pyStartCharsBytes    = PyByteArray_FromStringAndSize(((OneDCodeDetails *)pResult)->startCharsBytes, ((OneDCodeDetails *)pResult)->startCharsBytesLength);
-            PyObject * pyStartCharsBytesKey = Py_BuildValue("s", "StartCharsBytes");
-            PyDict_SetItem(pyResult, pyStartCharsBytesKey, pyStartCharsBytes);
+            PyDict_SetItem(pyResult, key_StartCharsBytes, pyStartCharsBytes);
             Py_DECREF(pyStartCharsBytes);
-            Py_DECREF(pyStartCharsBytesKey);
 
         }
         else
         {
             PyObject * pyStartCharsBytes    = Py_BuildValue("s", "NULL");
-            PyObject * pyStartCharsBytesKey = Py_BuildValue("s", "StartCharsBytes");
-            PyDict_SetItem(pyResult, pyStartCharsBytesKey, pyStartCharsBytes);
+            PyDict_SetItem(pyResult, key_StartCharsBytes, pyStartCharsBytes);
             Py_DECREF(pyStartCharsBytes);
-            Py_DECREF(pyStartCharsBytesKey);
         }
 
         if(((OneDCodeDetails *)pResult)->stopCharsBytes != NULL)
         {
             PyObject * pyStopCharsBytes     = PyByteArray_FromStringAndSize(((OneDCodeDetails *)pResult)->stopCharsBytes, ((OneDCodeDetails *)pResult)->stopCharsBytesLength);
-            PyObject * pyStopCharsBytesKey  = Py_BuildValue("s", "StopCharsBytes");
-            PyDict_SetItem(pyResult, pyStopCharsBytesKey, pyStopCharsBytes);
+            PyDict_SetItem(pyResult, key_StopCharsBytes, pyStopCharsBytes);
             Py_DECREF(pyStopCharsBytes);
-            Py_DECREF(pyStopCharsBytesKey);
         }
         else
         {
             PyObject * pyStopCharsBytes     = Py_BuildValue("s", "NULL");
-            PyObject * pyStopCharsBytesKey  = Py_BuildValue("s", "StopCharsBytes");
-            PyDict_SetItem(pyResult, pyStopCharsBytesKey, pyStopCharsBytes);
+            PyDict_SetItem(pyResult, key_StopCharsBytes, pyStopCharsBytes);
             Py_DECREF(pyStopCharsBytes);
-            Py_DECREF(pyStopCharsBytesKey);
         }
         
 
         if(((OneDCodeDetails *)pResult)->checkDigitBytes != NULL)
         {
             PyObject * pyCheckDigitBytes    = PyByteArray_FromStringAndSize(((OneDCodeDetails *)pResult)->checkDigitBytes, ((OneDCodeDetails *)pResult)->checkDigitBytesLength);
-            PyObject * pyCheckDigitBytesKey = Py_BuildValue("s", "CheckDigitBytes");
-            PyDict_SetItem(pyResult, pyCheckDigitBytesKey, pyCheckDigitBytes);
+            PyDict_SetItem(pyResult, key_CheckDigitBytes, pyCheckDigitBytes);
             Py_DECREF(pyCheckDigitBytes);
-            Py_DECREF(pyCheckDigitBytesKey);
         }
         else
         {
             PyObject * pyCheckDigitBytes    = Py_BuildValue("s", "NULL");
-            PyObject * pyCheckDigitBytesKey = Py_BuildValue("s", "CheckDigitBytes");
-            PyDict_SetItem(pyResult, pyCheckDigitBytesKey, pyCheckDigitBytes);
+            PyDict_SetItem(pyResult, key_CheckDigitBytes, pyCheckDigitBytes);
             Py_DECREF(pyCheckDigitBytes);
-            Py_DECREF(pyCheckDigitBytesKey);
         }
     }
     else if(format == BF_QR_CODE)
     {
         PyObject * pyModuleSize         = Py_BuildValue("i", ((QRCodeDetails *)pResult)->moduleSize);
-        PyObject * pyModuleSizeKey      = Py_BuildValue("s", "ModuleSize");
-        PyDict_SetItem(pyResult, pyModuleSizeKey, pyModuleSize);
+        PyDict_SetItem(pyResult, key_ModuleSize, pyModuleSize);
         Py_DECREF(pyModuleSize);
-        Py_DECREF(pyModuleSizeKey);
 
         PyObject * pyRows               = Py_BuildValue("i", ((QRCodeDetails *)pResult)->rows);
-        PyObject * pyRowsKey            = Py_BuildValue("s", "Rows");
-        PyDict_SetItem(pyResult, pyRowsKey, pyRows);
+        PyDict_SetItem(pyResult, key_Rows, pyRows);
         Py_DECREF(pyRows);
-        Py_DECREF(pyRowsKey);
 
         PyObject * pyColumns            = Py_BuildValue("i", ((QRCodeDetails *)pResult)->columns);
-        PyObject * pyColumnsKey         = Py_BuildValue("s", "Columns");
-        PyDict_SetItem(pyResult, pyColumnsKey, pyColumns);
+        PyDict_SetItem(pyResult, key_Columns, pyColumns);
         Py_DECREF(pyColumns);
-        Py_DECREF(pyColumnsKey);
         
         PyObject * pyErrorCorrectionLevel    = Py_BuildValue("i", ((QRCodeDetails *)pResult)->errorCorrectionLevel);
-        PyObject * pyErrorCorrectionLevelKey = Py_BuildValue("s", "ErrorCorrectionLevel");
-        PyDict_SetItem(pyResult, pyErrorCorrectionLevelKey, pyErrorCorrectionLevel);
+        PyDict_SetItem(pyResult, key_ErrorCorrectionLevel, pyErrorCorrectionLevel);
         Py_DECREF(pyErrorCorrectionLevel);
-        Py_DECREF(pyErrorCorrectionLevelKey);
         
         PyObject * pyVersion            = Py_BuildValue("i", ((QRCodeDetails *)pResult)->version);
-        PyObject * pyVersionKey         = Py_BuildValue("s", "version");
-        PyDict_SetItem(pyResult, pyVersionKey, pyVersion);
+        PyDict_SetItem(pyResult, key_version, pyVersion);
         Py_DECREF(pyVersion);
-        Py_DECREF(pyVersionKey);
 
         PyObject * pyModel              = Py_BuildValue("i", ((QRCodeDetails *)pResult)->model);
-        PyObject * pyModelKey           = Py_BuildValue("s", "model");
-        PyDict_SetItem(pyResult, pyModelKey, pyModel);
+        PyDict_SetItem(pyResult, key_model, pyModel);
         Py_DECREF(pyModel);
-        Py_DECREF(pyModelKey);
     }
     else if(format == BF_DATAMATRIX)
     {
         PyObject * pyModuleSize         = Py_BuildValue("i", ((DataMatrixDetails *)pResult)->moduleSize);
-        PyObject * pyModuleSizeKey      = Py_BuildValue("s", "ModuleSize");
-        PyDict_SetItem(pyResult, pyModuleSizeKey, pyModuleSize);
+        PyDict_SetItem(pyResult, key_ModuleSize, pyModuleSize);
         Py_DECREF(pyModuleSize);
-        Py_DECREF(pyModuleSizeKey);
 
         PyObject * pyRows               = Py_BuildValue("i", ((DataMatrixDetails *)pResult)->rows);
-        PyObject * pyRowsKey            = Py_BuildValue("s", "Rows");
-        PyDict_SetItem(pyResult, pyRowsKey, pyRows);
+        PyDict_SetItem(pyResult, key_Rows, pyRows);
         Py_DECREF(pyRows);
-        Py_DECREF(pyRowsKey);
 
         PyObject * pyColumns            = Py_BuildValue("i", ((DataMatrixDetails *)pResult)->columns);
-        PyObject * pyColumnsKey         = Py_BuildValue("s", "Columns");
-        PyDict_SetItem(pyResult, pyColumnsKey, pyColumns); 
+        PyDict_SetItem(pyResult, key_Columns, pyColumns); 
         Py_DECREF(pyColumns);
-        Py_DECREF(pyColumnsKey);
 
         PyObject * pyDataRegionRows     = Py_BuildValue("i", ((DataMatrixDetails *)pResult)->dataRegionRows);
-        PyObject * pyDataRegionRowsKey  = Py_BuildValue("s", "DataRegionRows");
-        PyDict_SetItem(pyResult, pyDataRegionRowsKey, pyDataRegionRows);
+        PyDict_SetItem(pyResult, key_DataRegionRows, pyDataRegionRows);
         Py_DECREF(pyDataRegionRows);
-        Py_DECREF(pyDataRegionRowsKey);
 
         PyObject * pyDataRegionColumns  = Py_BuildValue("i", ((DataMatrixDetails *)pResult)->dataRegionColumns);
-        PyObject * pyDataRegionColumnsKey = Py_BuildValue("s", "DataRegionColumns");
-        PyDict_SetItem(pyResult, pyDataRegionColumnsKey, pyDataRegionColumns);
+        PyDict_SetItem(pyResult, key_DataRegionColumns, pyDataRegionColumns);
         Py_DECREF(pyDataRegionColumns);
-        Py_DECREF(pyDataRegionColumnsKey);
 
         PyObject * pyDataRegionNumber   = Py_BuildValue("i", ((DataMatrixDetails *)pResult)->dataRegionNumber);
-        PyObject * pyDataRegionNumberKey= Py_BuildValue("s", "DataRegionNumber");
-        PyDict_SetItem(pyResult, pyDataRegionNumberKey, pyDataRegionNumber); 
+        PyDict_SetItem(pyResult, key_DataRegionNumber, pyDataRegionNumber); 
         Py_DECREF(pyDataRegionNumber);
-        Py_DECREF(pyDataRegionNumberKey);
     }
     else if(format == BF_PDF417)
     {
         PyObject * pyModuleSize         = Py_BuildValue("i", ((PDF417Details *)pResult)->moduleSize);
-        PyObject * pyModuleSizeKey      = Py_BuildValue("s", "ModuleSize");
-        PyDict_SetItem(pyResult, pyModuleSizeKey, pyModuleSize);
+        PyDict_SetItem(pyResult, key_ModuleSize, pyModuleSize);
         Py_DECREF(pyModuleSize);
-        Py_DECREF(pyModuleSizeKey);
 
         PyObject * pyRows               = Py_BuildValue("i", ((PDF417Details *)pResult)->rows);
-        PyObject * pyRowsKey            = Py_BuildValue("s", "Rows");
-        PyDict_SetItem(pyResult, pyRowsKey, pyRows);
+        PyDict_SetItem(pyResult, key_Rows, pyRows);
         Py_DECREF(pyRows);
-        Py_DECREF(pyRowsKey);
 
         PyObject * pyColumns            = Py_BuildValue("i", ((PDF417Details *)pResult)->columns);
-        PyObject * pyColumnsKey         = Py_BuildValue("s", "Columns");
-        PyDict_SetItem(pyResult, pyColumnsKey, pyColumns);
+        PyDict_SetItem(pyResult, key_Columns, pyColumns);
         Py_DECREF(pyColumns);
-        Py_DECREF(pyColumnsKey);
         
         PyObject * pyErrorCorrectionLevel    = Py_BuildValue("i", ((PDF417Details *)pResult)->errorCorrectionLevel);
-        PyObject * pyErrorCorrectionLevelKey = Py_BuildValue("s", "ErrorCorrectionLevel");
-        PyDict_SetItem(pyResult, pyErrorCorrectionLevelKey, pyErrorCorrectionLevel);
+        PyDict_SetItem(pyResult, key_ErrorCorrectionLevel, pyErrorCorrectionLevel);
         Py_DECREF(pyErrorCorrectionLevel);
-        Py_DECREF(pyErrorCorrectionLevelKey);
     }
     else if(format == BF_AZTEC)
     {
         PyObject * pyModuleSize         = Py_BuildValue("i", ((AztecDetails *)pResult)->moduleSize);
-        PyObject * pyModuleSizeKey      = Py_BuildValue("s", "ModuleSize");
-        PyDict_SetItem(pyResult, pyModuleSizeKey, pyModuleSize);
+        PyDict_SetItem(pyResult, key_ModuleSize, pyModuleSize);
         Py_DECREF(pyModuleSize);
-        Py_DECREF(pyModuleSizeKey);
 
         PyObject * pyRows               = Py_BuildValue("i", ((AztecDetails *)pResult)->rows);
-        PyObject * pyRowsKey            = Py_BuildValue("s", "Rows");
-        PyDict_SetItem(pyResult, pyRowsKey, pyRows);
+        PyDict_SetItem(pyResult, key_Rows, pyRows);
         Py_DECREF(pyRows);
-        Py_DECREF(pyRowsKey);
 
         PyObject * pyColumns            = Py_BuildValue("i", ((AztecDetails *)pResult)->columns);
-        PyObject * pyColumnsKey         = Py_BuildValue("s", "Columns");
-        PyDict_SetItem(pyResult, pyColumnsKey, pyColumns); 
+        PyDict_SetItem(pyResult, key_Columns, pyColumns); 
         Py_DECREF(pyColumns);
-        Py_DECREF(pyColumnsKey);
 
         PyObject * pyLayerNumber        = Py_BuildValue("i", ((AztecDetails *)pResult)->layerNumber);
-        PyObject * pyLayerNumberKey     = Py_BuildValue("s", "LayerNumber");
-        PyDict_SetItem(pyResult, pyLayerNumberKey, pyLayerNumber);
+        PyDict_SetItem(pyResult, key_LayerNumber, pyLayerNumber);
         Py_DECREF(pyLayerNumber);
-        Py_DECREF(pyLayerNumberKey);
     }
     return pyResult;
 }
@@ -841,190 +970,138 @@ static PyObject * CreatePyLocalizationResult(LocalizationResult * pResult)
     }
 
     PyObject * pyTerminatePhase         = Py_BuildValue("i", pResult->terminatePhase);
-    PyObject * pyTerminatePhaseKey      = Py_BuildValue("s", "TerminatePhase");
-    PyDict_SetItem(pyResult, pyTerminatePhaseKey, pyTerminatePhase);
+    PyDict_SetItem(pyResult, key_TerminatePhase, pyTerminatePhase);
     Py_DECREF(pyTerminatePhase);
-    Py_DECREF(pyTerminatePhaseKey);
 
     PyObject * pyBarcodeFormat          = Py_BuildValue("i", pResult->barcodeFormat);
-    PyObject * pyBarcodeFormatKey       = Py_BuildValue("s", "BarcodeFormat");
-    PyDict_SetItem(pyResult, pyBarcodeFormatKey, pyBarcodeFormat);
+    PyDict_SetItem(pyResult, key_BarcodeFormat, pyBarcodeFormat);
     Py_DECREF(pyBarcodeFormat);
-    Py_DECREF(pyBarcodeFormatKey);
 
     if(pResult->barcodeFormatString != NULL)
     {
-        PyObject *pyBarcodeFormatString     = Py_BuildValue("s", pResult->barcodeFormatString);
-        PyObject * pyBarcodeFormatStringKey = Py_BuildValue("s", "BarcodeFormatString");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey, pyBarcodeFormatString);
+        PyObject *pyBarcodeFormatString     = GetFormatString(pResult->barcodeFormatString);
+        PyDict_SetItem(pyResult, key_BarcodeFormatString, pyBarcodeFormatString);
         Py_DECREF(pyBarcodeFormatString);
-        Py_DECREF(pyBarcodeFormatStringKey);
     }
     else
     {
         PyObject *pyBarcodeFormatString     = Py_BuildValue("s", "NULL");
-        PyObject * pyBarcodeFormatStringKey = Py_BuildValue("s", "BarcodeFormatString");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey, pyBarcodeFormatString);
+        PyDict_SetItem(pyResult, key_BarcodeFormatString, pyBarcodeFormatString);
         Py_DECREF(pyBarcodeFormatString);
-        Py_DECREF(pyBarcodeFormatStringKey);
     }
     
 
     PyObject * pyBarcodeFormat_2        = Py_BuildValue("i", pResult->barcodeFormat_2);
-    PyObject * pyBarcodeFormatKey_2     = Py_BuildValue("s", "BarcodeFormat_2");
-    PyDict_SetItem(pyResult, pyBarcodeFormatKey_2, pyBarcodeFormat_2);
+    PyDict_SetItem(pyResult, key_BarcodeFormat_2, pyBarcodeFormat_2);
     Py_DECREF(pyBarcodeFormat_2);
-    Py_DECREF(pyBarcodeFormatKey_2);
 
     if(pResult->barcodeFormatString_2 != NULL)
     {
-        PyObject * pyBarcodeFormatString_2    = Py_BuildValue("s", pResult->barcodeFormatString_2);
-        PyObject * pyBarcodeFormatStringKey_2 = Py_BuildValue("s", "BarcodeFormatString_2");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey_2, pyBarcodeFormatString_2);
+        PyObject * pyBarcodeFormatString_2    = GetFormatString(pResult->barcodeFormatString_2);
+        PyDict_SetItem(pyResult, key_BarcodeFormatString_2, pyBarcodeFormatString_2);
         Py_DECREF(pyBarcodeFormatString_2);
-        Py_DECREF(pyBarcodeFormatStringKey_2);
     }
     else
     {
         PyObject * pyBarcodeFormatString_2    = Py_BuildValue("s", "NULL");
-        PyObject * pyBarcodeFormatStringKey_2 = Py_BuildValue("s", "BarcodeFormatString_2");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey_2, pyBarcodeFormatString_2);
+        PyDict_SetItem(pyResult, key_BarcodeFormatString_2, pyBarcodeFormatString_2);
         Py_DECREF(pyBarcodeFormatString_2);
-        Py_DECREF(pyBarcodeFormatStringKey_2);
     }
     
 
     PyObject * pyX1                     = Py_BuildValue("i", pResult->x1);
-    PyObject * pyX1Key                  = Py_BuildValue("s", "X1");
-    PyDict_SetItem(pyResult, pyX1Key, pyX1);
+    PyDict_SetItem(pyResult, key_X1, pyX1);
     Py_DECREF(pyX1);
-    Py_DECREF(pyX1Key);
 
     PyObject * pyY1                     = Py_BuildValue("i", pResult->y1);
-    PyObject * pyY1Key                  = Py_BuildValue("s", "Y1");
-    PyDict_SetItem(pyResult, pyY1Key, pyY1);
+    PyDict_SetItem(pyResult, key_Y1, pyY1);
     Py_DECREF(pyY1);
-    Py_DECREF(pyY1Key);
 
     PyObject * pyX2                     = Py_BuildValue("i", pResult->x2);
-    PyObject * pyX2Key                  = Py_BuildValue("s", "X2");
-    PyDict_SetItem(pyResult, pyX2Key, pyX2);
+    PyDict_SetItem(pyResult, key_X2, pyX2);
     Py_DECREF(pyX2);
-    Py_DECREF(pyX2Key);
 
     PyObject * pyY2                     = Py_BuildValue("i", pResult->y2);
-    PyObject * pyY2Key                  = Py_BuildValue("s", "Y2");
-    PyDict_SetItem(pyResult, pyY2Key, pyY2);
+    PyDict_SetItem(pyResult, key_Y2, pyY2);
     Py_DECREF(pyY2);
-    Py_DECREF(pyY2Key);
 
     PyObject * pyX3                     = Py_BuildValue("i", pResult->x3);
-    PyObject * pyX3Key                  = Py_BuildValue("s", "X3");
-    PyDict_SetItem(pyResult, pyX3Key, pyX3);
+    PyDict_SetItem(pyResult, key_X3, pyX3);
     Py_DECREF(pyX3);
-    Py_DECREF(pyX3Key);
 
     PyObject * pyY3                     = Py_BuildValue("i", pResult->y3);
-    PyObject * pyY3Key                  = Py_BuildValue("s", "Y3");
-    PyDict_SetItem(pyResult, pyY3Key, pyY3);
+    PyDict_SetItem(pyResult, key_Y3, pyY3);
     Py_DECREF(pyY3);
-    Py_DECREF(pyY3Key);
 
     PyObject * pyX4                     = Py_BuildValue("i", pResult->x4);
-    PyObject * pyX4Key                  = Py_BuildValue("s", "X4");
-    PyDict_SetItem(pyResult, pyX4Key, pyX4);
+    PyDict_SetItem(pyResult, key_X4, pyX4);
     Py_DECREF(pyX4);
-    Py_DECREF(pyX4Key);
 
     PyObject * pyY4                     = Py_BuildValue("i", pResult->y4);
-    PyObject * pyY4Key                  = Py_BuildValue("s", "Y4");
-    PyDict_SetItem(pyResult, pyY4Key, pyY4);
+    PyDict_SetItem(pyResult, key_Y4, pyY4);
     Py_DECREF(pyY4);
-    Py_DECREF(pyY4Key);
 
     PyObject * pyAngle                  = Py_BuildValue("i", pResult->angle);
-    PyObject * pyAngleKey               = Py_BuildValue("s", "Angle");
-    PyDict_SetItem(pyResult, pyAngleKey, pyAngle);
+    PyDict_SetItem(pyResult, key_Angle, pyAngle);
     Py_DECREF(pyAngle);
-    Py_DECREF(pyAngleKey);
 
     PyObject * pyModuleSize             = Py_BuildValue("i", pResult->moduleSize);
-    PyObject * pyModuleSizeKey          = Py_BuildValue("s", "ModuleSize");
-    PyDict_SetItem(pyResult, pyModuleSizeKey, pyModuleSize);
+    PyDict_SetItem(pyResult, key_ModuleSize, pyModuleSize);
     Py_DECREF(pyModuleSize);
-    Py_DECREF(pyModuleSizeKey);
 
     PyObject * pyPageNumber             = Py_BuildValue("i", pResult->pageNumber);
-    PyObject * pyPageNumberKey          = Py_BuildValue("s", "PageNumber");
-    PyDict_SetItem(pyResult, pyPageNumberKey, pyPageNumber);
+    PyDict_SetItem(pyResult, key_PageNumber, pyPageNumber);
     Py_DECREF(pyPageNumber);
-    Py_DECREF(pyPageNumberKey);
 
     if(pResult->regionName != NULL)
     {
         PyObject * pyRegionName             = Py_BuildValue("s", pResult->regionName);
-        PyObject * pyRegionNameKey          = Py_BuildValue("s", "RegionName");
-        PyDict_SetItem(pyResult, pyRegionNameKey, pyRegionName);
+        PyDict_SetItem(pyResult, key_RegionName, pyRegionName);
         Py_DECREF(pyRegionName);
-        Py_DECREF(pyRegionNameKey);
     }
     else
     {
         PyObject * pyRegionName             = Py_BuildValue("s", "NULL");
-        PyObject * pyRegionNameKey          = Py_BuildValue("s", "RegionName");
-        PyDict_SetItem(pyResult, pyRegionNameKey, pyRegionName);
+        PyDict_SetItem(pyResult, key_RegionName, pyRegionName);
         Py_DECREF(pyRegionName);
-        Py_DECREF(pyRegionNameKey);
     }
     
 
     if(pResult->documentName != NULL)
     {
         PyObject * pyDocumentName           = Py_BuildValue("s", pResult->documentName);
-        PyObject * pyDocumentNameKey        = Py_BuildValue("s", "DocumentName");
-        PyDict_SetItem(pyResult, pyDocumentNameKey, pyDocumentName);
+        PyDict_SetItem(pyResult, key_DocumentName, pyDocumentName);
         Py_DECREF(pyDocumentName);
-        Py_DECREF(pyDocumentNameKey);
     }
     else
     {
         PyObject * pyDocumentName           = Py_BuildValue("s", "NULL");
-        PyObject * pyDocumentNameKey        = Py_BuildValue("s", "DocumentName");
-        PyDict_SetItem(pyResult, pyDocumentNameKey, pyDocumentName);
+        PyDict_SetItem(pyResult, key_DocumentName, pyDocumentName);
         Py_DECREF(pyDocumentName);
-        Py_DECREF(pyDocumentNameKey);
     }
     
 
     PyObject * pyResultCoordinateType   = Py_BuildValue("i", pResult->resultCoordinateType);
-    PyObject * pyResultCoordinateTypeKey= Py_BuildValue("s", "ResultCoordinateType");
-    PyDict_SetItem(pyResult, pyResultCoordinateTypeKey, pyResultCoordinateType);
+    PyDict_SetItem(pyResult, key_ResultCoordinateType, pyResultCoordinateType);
     Py_DECREF(pyResultCoordinateType);
-    Py_DECREF(pyResultCoordinateTypeKey);
 
     if(!(pResult->accompanyingTextBytes == NULL || pResult->accompanyingTextBytesLength == 0))
     {
         PyObject * pyAccompanyingTextBytes    = PyByteArray_FromStringAndSize(pResult->accompanyingTextBytes, pResult->accompanyingTextBytesLength);
-        PyObject * pyAccompanyingTextBytesKey = Py_BuildValue("s", "AccompanyingTextBytes");
-        PyDict_SetItem(pyResult, pyAccompanyingTextBytesKey, pyAccompanyingTextBytes);
+        PyDict_SetItem(pyResult, key_AccompanyingTextBytes, pyAccompanyingTextBytes);
         Py_DECREF(pyAccompanyingTextBytes);
-        Py_DECREF(pyAccompanyingTextBytesKey);
     }
     else
     {
         PyObject * pyAccompanyingTextBytes    = Py_BuildValue("s", "NULL");
-        PyObject * pyAccompanyingTextBytesKey = Py_BuildValue("s", "AccompanyingTextBytes");
-        PyDict_SetItem(pyResult, pyAccompanyingTextBytesKey, pyAccompanyingTextBytes);
+        PyDict_SetItem(pyResult, key_AccompanyingTextBytes, pyAccompanyingTextBytes);
         Py_DECREF(pyAccompanyingTextBytes);
-        Py_DECREF(pyAccompanyingTextBytesKey);
     }
     
 
     PyObject * pyConfidence             = Py_BuildValue("i", pResult->confidence);
-    PyObject * pyConfidenceKey          = Py_BuildValue("s", "Confidence");
-    PyDict_SetItem(pyResult, pyConfidenceKey, pyConfidence);
+    PyDict_SetItem(pyResult, key_Confidence, pyConfidence);
     Py_DECREF(pyConfidence);
-    Py_DECREF(pyConfidenceKey);
 
     return pyResult;
 }
@@ -1045,133 +1122,99 @@ static PyObject * CreatePyExtendedResult(ExtendedResult * pResult)
     }
 
     PyObject * pyResultType             = Py_BuildValue("i", pResult->resultType);
-    PyObject * pyResultTypeKey          = Py_BuildValue("s", "ResultType");
-    PyDict_SetItem(pyResult, pyResultTypeKey, pyResultType);
+    PyDict_SetItem(pyResult, key_ResultType, pyResultType);
     Py_DECREF(pyResultType);
-    Py_DECREF(pyResultTypeKey);
 
     PyObject * pyBarcodeFormat          = Py_BuildValue("i", pResult->barcodeFormat);
-    PyObject * pyBarcodeFormatKey       = Py_BuildValue("s", "BarcodeFormat");
-    PyDict_SetItem(pyResult, pyBarcodeFormatKey, pyBarcodeFormat);
+    PyDict_SetItem(pyResult, key_BarcodeFormat, pyBarcodeFormat);
     Py_DECREF(pyBarcodeFormat);
-    Py_DECREF(pyBarcodeFormatKey);
 
     if(pResult->barcodeFormatString != NULL)
     {
-        PyObject * pyBarcodeFormatString    = Py_BuildValue("s", pResult->barcodeFormatString);
-        PyObject * pyBarcodeFormatStringKey = Py_BuildValue("s", "BarcodeFormatString");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey, pyBarcodeFormatString);
+        PyObject * pyBarcodeFormatString    = GetFormatString(pResult->barcodeFormatString);
+        PyDict_SetItem(pyResult, key_BarcodeFormatString, pyBarcodeFormatString);
         Py_DECREF(pyBarcodeFormatString);
-        Py_DECREF(pyBarcodeFormatStringKey);
     }
     else
     {
         PyObject * pyBarcodeFormatString    = Py_BuildValue("s", "NULL");
-        PyObject * pyBarcodeFormatStringKey = Py_BuildValue("s", "BarcodeFormatString");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey, pyBarcodeFormatString);
+        PyDict_SetItem(pyResult, key_BarcodeFormatString, pyBarcodeFormatString);
         Py_DECREF(pyBarcodeFormatString);
-        Py_DECREF(pyBarcodeFormatStringKey);
     }
     
 
     PyObject * pyBarcodeFormat_2        = Py_BuildValue("i", pResult->barcodeFormat_2);
-    PyObject * pyBarcodeFormatKey_2     = Py_BuildValue("s", "BarcodeFormat_2");
-    PyDict_SetItem(pyResult, pyBarcodeFormatKey_2, pyBarcodeFormat_2);
+    PyDict_SetItem(pyResult, key_BarcodeFormat_2, pyBarcodeFormat_2);
     Py_DECREF(pyBarcodeFormat_2);
-    Py_DECREF(pyBarcodeFormatKey_2);
 
     if(pResult->barcodeFormatString_2 != NULL)
     {
-        PyObject * pyBarcodeFormatString_2    = Py_BuildValue("s", pResult->barcodeFormatString_2);
-        PyObject * pyBarcodeFormatStringKey_2 = Py_BuildValue("s", "BarcodeFormatString_2");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey_2, pyBarcodeFormatString_2);
+        PyObject * pyBarcodeFormatString_2    = GetFormatString(pResult->barcodeFormatString_2);
+        PyDict_SetItem(pyResult, key_BarcodeFormatString_2, pyBarcodeFormatString_2);
         Py_DECREF(pyBarcodeFormatString_2);
-        Py_DECREF(pyBarcodeFormatStringKey_2);
     }
     else
     {
         PyObject * pyBarcodeFormatString_2    = Py_BuildValue("s", "NULL");
-        PyObject * pyBarcodeFormatStringKey_2 = Py_BuildValue("s", "BarcodeFormatString_2");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey_2, pyBarcodeFormatString_2);
+        PyDict_SetItem(pyResult, key_BarcodeFormatString_2, pyBarcodeFormatString_2);
         Py_DECREF(pyBarcodeFormatString_2);
-        Py_DECREF(pyBarcodeFormatStringKey_2);
     }
 
     PyObject * pyConfidence             = Py_BuildValue("i",pResult->confidence);
-    PyObject * pyConfidenceKey          = Py_BuildValue("s", "Confidence");
-    PyDict_SetItem(pyResult, pyConfidenceKey, pyConfidence);
+    PyDict_SetItem(pyResult, key_Confidence, pyConfidence);
     Py_DECREF(pyConfidence);
-    Py_DECREF(pyConfidenceKey);
 
     if(pResult->bytes != NULL)
     {
         PyObject * pyBytes                  = PyByteArray_FromStringAndSize(pResult->bytes, pResult->bytesLength);
-        PyObject * pyBytesKey               = Py_BuildValue("s", "Bytes");
-        PyDict_SetItem(pyResult, pyBytesKey, pyBytes);
+        PyDict_SetItem(pyResult, key_Bytes, pyBytes);
         Py_DECREF(pyBytes);
-        Py_DECREF(pyBytesKey);
     }
     else
     {
         PyObject * pyBytes                  = Py_BuildValue("s", "NULL");
-        PyObject * pyBytesKey               = Py_BuildValue("s", "Bytes");
-        PyDict_SetItem(pyResult, pyBytesKey, pyBytes);
+        PyDict_SetItem(pyResult, key_Bytes, pyBytes);
         Py_DECREF(pyBytes);
-        Py_DECREF(pyBytesKey);
     }
 
     if(pResult->accompanyingTextBytes != NULL)
     {
         PyObject * pyAccompanyingTextBytes    = PyByteArray_FromStringAndSize(pResult->accompanyingTextBytes, pResult->accompanyingTextBytesLength);
-        PyObject * pyAccompanyingTextBytesKey = Py_BuildValue("s", "AccompanyingTextBytes");
-        PyDict_SetItem(pyResult, pyAccompanyingTextBytesKey, pyAccompanyingTextBytes);
+        PyDict_SetItem(pyResult, key_AccompanyingTextBytes, pyAccompanyingTextBytes);
     Py_DECREF(pyAccompanyingTextBytes);
-    Py_DECREF(pyAccompanyingTextBytesKey);
     }
     else
     {
         PyObject * pyAccompanyingTextBytes    = Py_BuildValue("s", "NULL");
-        PyObject * pyAccompanyingTextBytesKey = Py_BuildValue("s", "AccompanyingTextBytes");
-        PyDict_SetItem(pyResult, pyAccompanyingTextBytesKey, pyAccompanyingTextBytes);
+        PyDict_SetItem(pyResult, key_AccompanyingTextBytes, pyAccompanyingTextBytes);
         Py_DECREF(pyAccompanyingTextBytes);
-        Py_DECREF(pyAccompanyingTextBytesKey);
     }
     
     PyObject * pyDeformation            = Py_BuildValue("i", pResult->deformation);
-    PyObject * pyDeformationKey         = Py_BuildValue("s", "Deformation");
-    PyDict_SetItem(pyResult, pyDeformationKey, pyDeformation);
+    PyDict_SetItem(pyResult, key_Deformation, pyDeformation);
     Py_DECREF(pyDeformation);
-    Py_DECREF(pyDeformationKey);
 
     if(pResult->detailedResult != NULL)
     {
         PyObject * pyDetailedResult         = CreatePyDetailedResult(pResult->detailedResult, pResult->barcodeFormat);
-        PyObject * pyDetailedResultKey      = Py_BuildValue("s", "DetailedResult");
-        PyDict_SetItem(pyResult, pyDetailedResultKey, pyDetailedResult);
+        PyDict_SetItem(pyResult, key_DetailedResult, pyDetailedResult);
         Py_DECREF(pyDetailedResult);
-        Py_DECREF(pyDetailedResultKey);
     }
     else
     {
         PyObject * pyDetailedResult         = Py_BuildValue("s", "NULL");
-        PyObject * pyDetailedResultKey      = Py_BuildValue("s", "DetailedResult");
-        PyDict_SetItem(pyResult, pyDetailedResultKey, pyDetailedResult);
+        PyDict_SetItem(pyResult, key_DetailedResult, pyDetailedResult);
         Py_DECREF(pyDetailedResult);
-        Py_DECREF(pyDetailedResultKey);
     }
     
     
     PyObject * pySamplingImage          = CreatePySamplingImageData(pResult->samplingImage);
-    PyObject * pySamplingImageKey       = Py_BuildValue("s", "SamplingImage");
-    PyDict_SetItem(pyResult, pySamplingImageKey, pySamplingImage);
+    PyDict_SetItem(pyResult, key_SamplingImage, pySamplingImage);
     Py_DECREF(pySamplingImage);
-    Py_DECREF(pySamplingImageKey);
 
     PyObject * pyClarity                = Py_BuildValue("i",pResult->clarity);
-    PyObject * pyClarityKey             = Py_BuildValue("s", "Clarity");
-    PyDict_SetItem(pyResult, pyClarityKey, pyClarity);
+    PyDict_SetItem(pyResult, key_Clarity, pyClarity);
     Py_DECREF(pyClarity);
-    Py_DECREF(pyClarityKey);
 
     return pyResult;
 }
@@ -1199,49 +1242,37 @@ static PyObject * CreatePyTextResults(TextResultArray *pResults, const char * en
         }
 
         PyObject * pyBarcodeFormat      = Py_BuildValue("i", pResults->results[i]->barcodeFormat);
-        PyObject * pyBarcodeFormatKey   = Py_BuildValue("s", "BarcodeFormat");
-        PyDict_SetItem(pyTextResult, pyBarcodeFormatKey, pyBarcodeFormat);
+        PyDict_SetItem(pyTextResult, key_BarcodeFormat, pyBarcodeFormat);
         Py_DECREF(pyBarcodeFormat);
-        Py_DECREF(pyBarcodeFormatKey);
 
         if(pResults->results[i]->barcodeFormatString != NULL)
         {
-            PyObject * pyBarcodeFormatString    = Py_BuildValue("s", pResults->results[i]->barcodeFormatString);
-            PyObject * pyBarcodeFormatStringKey = Py_BuildValue("s", "BarcodeFormatString");
-            PyDict_SetItem(pyTextResult, pyBarcodeFormatStringKey, pyBarcodeFormatString);
+            PyObject * pyBarcodeFormatString    = GetFormatString(pResults->results[i]->barcodeFormatString);
+            PyDict_SetItem(pyTextResult, key_BarcodeFormatString, pyBarcodeFormatString);
             Py_DECREF(pyBarcodeFormatString);
-            Py_DECREF(pyBarcodeFormatStringKey);
         }
         else
         {
             PyObject * pyBarcodeFormatString    = Py_BuildValue("s", "NULL");
-            PyObject * pyBarcodeFormatStringKey = Py_BuildValue("s", "BarcodeFormatString");
-            PyDict_SetItem(pyTextResult, pyBarcodeFormatStringKey, pyBarcodeFormatString);
+            PyDict_SetItem(pyTextResult, key_BarcodeFormatString, pyBarcodeFormatString);
             Py_DECREF(pyBarcodeFormatString);
-            Py_DECREF(pyBarcodeFormatStringKey);
         }    
 
         PyObject * pyBarcodeFormat_2    = Py_BuildValue("i", pResults->results[i]->barcodeFormat_2);
-        PyObject * pyBarcodeFormatKey_2 = Py_BuildValue("s", "BarcodeFormat_2");
-        PyDict_SetItem(pyTextResult, pyBarcodeFormatKey_2, pyBarcodeFormat_2);
+        PyDict_SetItem(pyTextResult, key_BarcodeFormat_2, pyBarcodeFormat_2);
         Py_DECREF(pyBarcodeFormat_2);
-        Py_DECREF(pyBarcodeFormatKey_2);
 
         if(pResults->results[i]->barcodeFormatString_2 != NULL)
         {
-            PyObject * pyBarcodeFormatString_2    = Py_BuildValue("s", pResults->results[i]->barcodeFormatString_2);
-            PyObject * pyBarcodeFormatStringKey_2 = Py_BuildValue("s", "BarcodeFormatString_2");
-            PyDict_SetItem(pyTextResult, pyBarcodeFormatStringKey_2, pyBarcodeFormatString_2);
+            PyObject * pyBarcodeFormatString_2    = GetFormatString(pResults->results[i]->barcodeFormatString_2);
+            PyDict_SetItem(pyTextResult, key_BarcodeFormatString_2, pyBarcodeFormatString_2);
             Py_DECREF(pyBarcodeFormatString_2);
-            Py_DECREF(pyBarcodeFormatStringKey_2);
         }
         else
         {
             PyObject * pyBarcodeFormatString_2    = Py_BuildValue("s", "NULL");
-            PyObject * pyBarcodeFormatStringKey_2 = Py_BuildValue("s", "BarcodeFormatString_2");
-            PyDict_SetItem(pyTextResult, pyBarcodeFormatStringKey_2, pyBarcodeFormatString_2);
+            PyDict_SetItem(pyTextResult, key_BarcodeFormatString_2, pyBarcodeFormatString_2);
             Py_DECREF(pyBarcodeFormatString_2);
-            Py_DECREF(pyBarcodeFormatStringKey_2);
         }
 
         if(pResults->results[i]->barcodeText != NULL)
@@ -1252,69 +1283,53 @@ static PyObject * CreatePyTextResults(TextResultArray *pResults, const char * en
                 PyErr_SetString(PyExc_TypeError, "Incorrect character set! Failed to decode barcode results!");
                 return NULL;
             }
-            PyObject * pyBarcodeTextKey     = Py_BuildValue("s", "BarcodeText");
-            PyDict_SetItem(pyTextResult, pyBarcodeTextKey, pyBarcodeText);
+            PyDict_SetItem(pyTextResult, key_BarcodeText, pyBarcodeText);
             Py_DECREF(pyBarcodeText);
-            Py_DECREF(pyBarcodeTextKey);
         }
         else
         {
             PyObject * pyBarcodeText        = Py_BuildValue("s", "NULL");
-            PyObject * pyBarcodeTextKey     = Py_BuildValue("s", "BarcodeText");
-            PyDict_SetItem(pyTextResult, pyBarcodeTextKey, pyBarcodeText);
+            PyDict_SetItem(pyTextResult, key_BarcodeText, pyBarcodeText);
             Py_DECREF(pyBarcodeText);
-            Py_DECREF(pyBarcodeTextKey);
         }
 
         if(!(pResults->results[i]->barcodeBytes == NULL || pResults->results[i]->barcodeBytesLength == 0))
         {
             PyObject * pyBarcodeBytes       = PyByteArray_FromStringAndSize(pResults->results[i]->barcodeBytes, pResults->results[i]->barcodeBytesLength);
-            PyObject * pyBarcodeBytesKey    = Py_BuildValue("s", "BarcodeBytes");
-            PyDict_SetItem(pyTextResult, pyBarcodeBytesKey, pyBarcodeBytes);
+            PyDict_SetItem(pyTextResult, key_BarcodeBytes, pyBarcodeBytes);
             Py_DECREF(pyBarcodeBytes);
-            Py_DECREF(pyBarcodeBytesKey);
         }
         else
         {
             PyObject * pyBarcodeBytes       = Py_BuildValue("s", "NULL");
-            PyObject * pyBarcodeBytesKey    = Py_BuildValue("s", "BarcodeBytes");
-            PyDict_SetItem(pyTextResult, pyBarcodeBytesKey, pyBarcodeBytes);
+            PyDict_SetItem(pyTextResult, key_BarcodeBytes, pyBarcodeBytes);
             Py_DECREF(pyBarcodeBytes);
-            Py_DECREF(pyBarcodeBytesKey);
         }
         
         if(pResults->results[i]->localizationResult != NULL)
         {
             PyObject * pyLocalizationResult     = CreatePyLocalizationResult(pResults->results[i]->localizationResult);
-            PyObject * pyLocalizationResultKey  = Py_BuildValue("s", "LocalizationResult");
-            PyDict_SetItem(pyTextResult, pyLocalizationResultKey, pyLocalizationResult);
+            PyDict_SetItem(pyTextResult, key_LocalizationResult, pyLocalizationResult);
             Py_DECREF(pyLocalizationResult);
-            Py_DECREF(pyLocalizationResultKey);
         }
         else
         {
             PyObject * pyLocalizationResult     = Py_BuildValue("s", "NULL");
-            PyObject * pyLocalizationResultKey  = Py_BuildValue("s", "LocalizationResult");
-            PyDict_SetItem(pyTextResult, pyLocalizationResultKey, pyLocalizationResult);
+            PyDict_SetItem(pyTextResult, key_LocalizationResult, pyLocalizationResult);
             Py_DECREF(pyLocalizationResult);
-            Py_DECREF(pyLocalizationResultKey);
         }
 
         if(pResults->results[i]->detailedResult != NULL)
         {
             PyObject * pyDetailedResult     = CreatePyDetailedResult(pResults->results[i]->detailedResult, pResults->results[i]->barcodeFormat);
-            PyObject * pyDetailedResultKey  = Py_BuildValue("s", "DetailedResult");
-            PyDict_SetItem(pyTextResult, pyDetailedResultKey, pyDetailedResult);
+            PyDict_SetItem(pyTextResult, key_DetailedResult, pyDetailedResult);
             Py_DECREF(pyDetailedResult);
-            Py_DECREF(pyDetailedResultKey);
         }
         else
         {
             PyObject * pyDetailedResult     = Py_BuildValue("s", "NULL");
-            PyObject * pyDetailedResultKey  = Py_BuildValue("s", "DetailedResult");
-            PyDict_SetItem(pyTextResult, pyDetailedResultKey, pyDetailedResult);
+            PyDict_SetItem(pyTextResult, key_DetailedResult, pyDetailedResult);
             Py_DECREF(pyDetailedResult);
-            Py_DECREF(pyDetailedResultKey);
         }
 
         if(pResults->results[i]->resultsCount != 0)
@@ -1325,18 +1340,14 @@ static PyObject * CreatePyTextResults(TextResultArray *pResults, const char * en
                 PyObject * pyExtendedResult = CreatePyExtendedResult(pResults->results[i]->results[j]);
                 PyList_SetItem(pyExtendedResults, j, pyExtendedResult);
             }
-            PyObject * pyExtendedResultsKey = Py_BuildValue("s", "ExtendedResults");
-            PyDict_SetItem(pyTextResult, pyExtendedResultsKey, pyExtendedResults);
+            PyDict_SetItem(pyTextResult, key_ExtendedResults, pyExtendedResults);
             Py_DECREF(pyExtendedResults);
-            Py_DECREF(pyExtendedResultsKey);
         }
         else
         {
             PyObject * pyExtendedResults = Py_BuildValue("s", "NULL");
-            PyObject * pyExtendedResultsKey = Py_BuildValue("s", "ExtendedResults");
-            PyDict_SetItem(pyTextResult, pyExtendedResultsKey, pyExtendedResults);
+            PyDict_SetItem(pyTextResult, key_ExtendedResults, pyExtendedResults);
             Py_DECREF(pyExtendedResults);
-            Py_DECREF(pyExtendedResultsKey);
         }
 
         PyList_SetItem(pyTextResults, i, pyTextResult);
@@ -1348,7 +1359,187 @@ static PyObject * CreatePyTextResults(TextResultArray *pResults, const char * en
     return pyTextResults;
 }
 
-static PyObject * CreateIntermediateResultDatas(const void** ppResults, int count, IMResultDataType dataType)
+/**
+ * Image buffers
+ *
+ * An image buffer exports native image memory with its shape, strides and item format, so numpy.asarray
+ * wraps it without a copy. It keeps the owner of the memory alive: the capsule of the native intermediate
+ * result array, or a bytes object holding a copy.
+ */
+typedef struct
+{
+    PyObject_HEAD
+    PyObject *owner;
+    char *buf;
+    Py_ssize_t length;
+    int ndim;
+    Py_ssize_t itemsize;
+    const char *format;
+    Py_ssize_t shape[3];
+    Py_ssize_t strides[3];
+} ImageBufferObject;
+
+static int ImageBuffer_getbuffer(ImageBufferObject *self, Py_buffer *view, int flags)
+{
+    if ((flags & PyBUF_WRITABLE) == PyBUF_WRITABLE)
+    {
+        PyErr_SetString(PyExc_BufferError, "The image data is read-only");
+        view->obj = NULL;
+        return -1;
+    }
+
+    view->buf = self->buf;
+    view->readonly = 1;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+    if ((flags & PyBUF_STRIDES) == PyBUF_STRIDES && ((flags & PyBUF_FORMAT) == PyBUF_FORMAT || self->itemsize == 1))
+    {
+        view->ndim = self->ndim;
+        view->itemsize = self->itemsize;
+        view->format = (flags & PyBUF_FORMAT) == PyBUF_FORMAT ? (char *)self->format : NULL;
+        view->shape = self->shape;
+        view->strides = self->strides;
+        view->len = self->itemsize;
+        for (int i = 0; i < self->ndim; ++i)
+            view->len *= self->shape[i];
+    }
+    else
+    {
+        // Consumers that can not follow strides get the raw bytes
+        view->ndim = 1;
+        view->itemsize = 1;
+        view->format = (flags & PyBUF_FORMAT) == PyBUF_FORMAT ? "B" : NULL;
+        view->shape = (flags & PyBUF_ND) == PyBUF_ND ? &self->length : NULL;
+        view->strides = NULL;
+        view->len = self->length;
+    }
+    Py_INCREF(self);
+    view->obj = (PyObject *)self;
+    return 0;
+}
+
+static void ImageBuffer_dealloc(ImageBufferObject *self)
+{
+    Py_XDECREF(self->owner);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyBufferProcs ImageBuffer_as_buffer;
+
+static PyTypeObject ImageBufferType = {PyVarObject_HEAD_INIT(NULL, 0)};
+
+static int InitImageBufferType(void)
+{
+    ImageBuffer_as_buffer.bf_getbuffer = (getbufferproc)ImageBuffer_getbuffer;
+    ImageBufferType.tp_name = "dbr.ImageBuffer";
+    ImageBufferType.tp_basicsize = sizeof(ImageBufferObject);
+    ImageBufferType.tp_dealloc = (destructor)ImageBuffer_dealloc;
+    ImageBufferType.tp_as_buffer = &ImageBuffer_as_buffer;
+#if defined(IS_PY3K)
+    ImageBufferType.tp_flags = Py_TPFLAGS_DEFAULT;
+#else
+    ImageBufferType.tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_NEWBUFFER;
+#endif
+    ImageBufferType.tp_doc = "Exports native image memory to numpy.";
+    return PyType_Ready(&ImageBufferType);
+}
+
+/**
+ * Describe the pixels as (rows, width) or (rows, width, channels). Binary images stay packed
+ * with 8 pixels per byte, NV21 has the interleaved VU rows below the Y rows.
+ * An unknown format or a buffer too short for the layout is exported as raw bytes.
+ */
+static void SetImageLayout(ImageBufferObject *self, int width, int height, int stride, int format)
+{
+    int rows = height, channels = 1;
+    Py_ssize_t itemsize = 1;
+    const char *itemFormat = "B";
+    switch (format)
+    {
+    case IPF_BINARY:
+    case IPF_BINARYINVERTED:    width = (width + 7) / 8; break;
+    case IPF_GRAYSCALED:        break;
+    case IPF_NV21:              rows = height + height / 2; break;
+    case IPF_RGB_565:
+    case IPF_RGB_555:           itemsize = 2; itemFormat = "H"; break;
+    case IPF_RGB_888:           channels = 3; break;
+    case IPF_ARGB_8888:         channels = 4; break;
+    case IPF_RGB_161616:        channels = 3; itemsize = 2; itemFormat = "H"; break;
+    case IPF_ARGB_16161616:     channels = 4; itemsize = 2; itemFormat = "H"; break;
+    default:                    rows = 0; break;
+    }
+
+    Py_ssize_t rowBytes = (Py_ssize_t)width * channels * itemsize;
+    if (rows <= 0 || width <= 0 || stride < rowBytes || (Py_ssize_t)(rows - 1) * stride + rowBytes > self->length)
+    {
+        self->ndim = 1;
+        self->itemsize = 1;
+        self->format = "B";
+        self->shape[0] = self->length;
+        self->strides[0] = 1;
+        return;
+    }
+
+    self->ndim = channels == 1 ? 2 : 3;
+    self->itemsize = itemsize;
+    self->format = itemFormat;
+    self->shape[0] = rows;
+    self->shape[1] = width;
+    self->shape[2] = channels;
+    self->strides[0] = stride;
+    self->strides[1] = channels * itemsize;
+    self->strides[2] = itemsize;
+}
+
+static PyObject *numpyAsArray = NULL;
+
+/**
+ * Create a read-only numpy array over native image memory. Without an owner the memory is copied once,
+ * because the native result is freed as soon as the conversion is done. The bytes must not be NULL.
+ */
+static PyObject * CreatePyImageArray(const unsigned char *bytes, Py_ssize_t length, int width, int height, int stride, int format, PyObject *owner)
+{
+    if (numpyAsArray == NULL)
+    {
+        PyObject *numpy = PyImport_ImportModule("numpy");
+        if (numpy == NULL)
+            return NULL;
+        numpyAsArray = PyObject_GetAttrString(numpy, "asarray");
+        Py_DECREF(numpy);
+        if (numpyAsArray == NULL)
+            return NULL;
+    }
+
+    ImageBufferObject *buffer = PyObject_New(ImageBufferObject, &ImageBufferType);
+    if (buffer == NULL)
+    {
+        return NULL;
+    }
+    if (owner != NULL)
+    {
+        Py_INCREF(owner);
+        buffer->owner = owner;
+        buffer->buf = (char *)bytes;
+    }
+    else
+    {
+        buffer->owner = PyBytes_FromStringAndSize((const char *)bytes, length);
+        if (buffer->owner == NULL)
+        {
+            Py_DECREF(buffer);
+            return NULL;
+        }
+        buffer->buf = PyBytes_AS_STRING(buffer->owner);
+    }
+    buffer->length = length;
+    SetImageLayout(buffer, width, height, stride, format);
+
+    PyObject *array = PyObject_CallFunctionObjArgs(numpyAsArray, (PyObject *)buffer, NULL);
+    Py_DECREF(buffer);
+    return array;
+}
+
+static PyObject * CreateIntermediateResultDatas(const void** ppResults, int count, IMResultDataType dataType, PyObject *owner)
 {
     PyObject * pyResults = PyList_New(count);
 
@@ -1357,42 +1548,40 @@ static PyObject * CreateIntermediateResultDatas(const void** ppResults, int coun
         if(dataType == IMRDT_IMAGE)
         {
             PyObject * pyImageData = PyDict_New();
+            const ImageData * pImageData = (const ImageData *)(ppResults[i]);
 
-            if(((ImageData *)(ppResults[i]))->bytes == NULL)
+            if(pImageData->bytes != NULL)
             {
-                PyObject * pyBytes       = PyByteArray_FromStringAndSize(((ImageData *)(ppResults[i]))->bytes, ((ImageData *)(ppResults[i]))->bytesLength);
-                PyObject * pyBytesKey    = Py_BuildValue("s", "Bytes");
-                PyDict_SetItem(pyImageData, pyBytesKey, pyBytes);
+                // The array shares the memory of the native results, which stay alive as long as the array
+                PyObject * pyBytes       = CreatePyImageArray(pImageData->bytes, pImageData->bytesLength, pImageData->width, pImageData->height, pImageData->stride, pImageData->format, owner);
+                if(pyBytes == NULL)
+                {
+                    Py_DECREF(pyImageData);
+                    Py_DECREF(pyResults);
+                    return NULL;
+                }
+                PyDict_SetItem(pyImageData, key_Bytes, pyBytes);
                 Py_DECREF(pyBytes);
-                Py_DECREF(pyBytesKey);
             }
             else
             {
                 PyObject * pyBytes       = Py_BuildValue("s", "NULL");
-                PyObject * pyBytesKey    = Py_BuildValue("s", "Bytes");
-                PyDict_SetItem(pyImageData, pyBytesKey, pyBytes);
+                PyDict_SetItem(pyImageData, key_Bytes, pyBytes);
                 Py_DECREF(pyBytes);
-                Py_DECREF(pyBytesKey);
             }
             
 
             PyObject * pyWidth      = Py_BuildValue("i", ((ImageData *)(ppResults[i]))->width);
-            PyObject * pyWidthKey   = Py_BuildValue("s", "Width");
-            PyDict_SetItem(pyImageData, pyWidthKey, pyWidth);
+            PyDict_SetItem(pyImageData, key_Width, pyWidth);
             Py_DECREF(pyWidth);
-            Py_DECREF(pyWidthKey);
 
             PyObject * pyHeight      = Py_BuildValue("i", ((ImageData *)(ppResults[i]))->height);
-            PyObject * pyHeightKey   = Py_BuildValue("s", "Height");
-            PyDict_SetItem(pyImageData, pyHeightKey, pyHeight);
+            PyDict_SetItem(pyImageData, key_Height, pyHeight);
             Py_DECREF(pyHeight);
-            Py_DECREF(pyHeightKey);
 
             PyObject * pyStride      = Py_BuildValue("i", ((ImageData *)(ppResults[i]))->stride);
-            PyObject * pyStrideKey   = Py_BuildValue("s", "Stride");
-            PyDict_SetItem(pyImageData, pyStrideKey, pyStride);
+            PyDict_SetItem(pyImageData, key_Stride, pyStride);
             Py_DECREF(pyStride);
-            Py_DECREF(pyStrideKey);
 
             PyList_SetItem(pyResults, i, pyImageData);
         }
@@ -1408,32 +1597,24 @@ static PyObject * CreateIntermediateResultDatas(const void** ppResults, int coun
                     PyObject * pyPoint = PyDict_New();
 
                     PyObject * pyPointX = Py_BuildValue("i",((Contour *)(ppResults[i]))->points[j].x);
-                    PyObject * pyPointXKey   = Py_BuildValue("s", "X");
-                    PyDict_SetItem(pyPoint, pyPointXKey, pyPointX);
+                    PyDict_SetItem(pyPoint, key_X, pyPointX);
                     Py_DECREF(pyPointX);
-                    Py_DECREF(pyPointXKey);
 
                     PyObject * pyPointY = Py_BuildValue("i",((Contour *)(ppResults[i]))->points[j].y);
-                    PyObject * pyPointYKey   = Py_BuildValue("s", "Y");
-                    PyDict_SetItem(pyPoint, pyPointYKey, pyPointY);
+                    PyDict_SetItem(pyPoint, key_Y, pyPointY);
                     Py_DECREF(pyPointY);
-                    Py_DECREF(pyPointYKey);
 
                     PyList_SetItem(pyPoints, j, pyPoint);
                 }
-                PyObject * pyPointsKey   = Py_BuildValue("s", "Points");
-                PyDict_SetItem(pyContour, pyPointsKey, pyPoints);
+                PyDict_SetItem(pyContour, key_Points, pyPoints);
                 Py_DECREF(pyPoints);
-                Py_DECREF(pyPointsKey);
                 PyList_SetItem(pyResults, i, pyContour);
             }
             else
             {
                 PyObject * pyPoints   = Py_BuildValue("s", "NULL");
-                PyObject * pyPointsKey   = Py_BuildValue("s", "Points");
-                PyDict_SetItem(pyContour, pyPointsKey, pyPoints);
+                PyDict_SetItem(pyContour, key_Points, pyPoints);
                 Py_DECREF(pyPoints);
-                Py_DECREF(pyPointsKey);
                 PyList_SetItem(pyResults, i, pyContour);
             }
             
@@ -1444,37 +1625,25 @@ static PyObject * CreateIntermediateResultDatas(const void** ppResults, int coun
 
             PyObject * pyStartPoint = PyDict_New();
             PyObject * pyStartPointX = Py_BuildValue("i",((LineSegment *)(ppResults[i]))->startPoint.x);
-            PyObject * pyStartPointXKey   = Py_BuildValue("s", "X");
-            PyDict_SetItem(pyStartPoint, pyStartPointXKey, pyStartPointX);
+            PyDict_SetItem(pyStartPoint, key_X, pyStartPointX);
             Py_DECREF(pyStartPointX);
-            Py_DECREF(pyStartPointXKey);
 
             PyObject * pyStartPointY = Py_BuildValue("i",((LineSegment *)(ppResults[i]))->startPoint.y);
-            PyObject * pyStartPointYKey   = Py_BuildValue("s", "Y");
-            PyDict_SetItem(pyStartPoint, pyStartPointYKey, pyStartPointY);
+            PyDict_SetItem(pyStartPoint, key_Y, pyStartPointY);
             Py_DECREF(pyStartPointY);
-            Py_DECREF(pyStartPointYKey);
-            PyObject * pyStartPointKey   = Py_BuildValue("s", "StartPoint");
-            PyDict_SetItem(pyLineSegment, pyStartPointKey, pyStartPoint);
+            PyDict_SetItem(pyLineSegment, key_StartPoint, pyStartPoint);
             Py_DECREF(pyStartPoint);
-            Py_DECREF(pyStartPointKey);
 
             PyObject * pyEndPoint = PyDict_New();
             PyObject * pyEndPointX = Py_BuildValue("i",((LineSegment *)(ppResults[i]))->endPoint.x);
-            PyObject * pyEndPointXKey   = Py_BuildValue("s", "X");
-            PyDict_SetItem(pyEndPoint, pyEndPointXKey, pyEndPointX);
+            PyDict_SetItem(pyEndPoint, key_X, pyEndPointX);
             Py_DECREF(pyEndPointX);
-            Py_DECREF(pyEndPointXKey);
 
             PyObject * pyEndPointY = Py_BuildValue("i",((LineSegment *)(ppResults[i]))->endPoint.y);
-            PyObject * pyEndPointYKey   = Py_BuildValue("s", "Y");
-            PyDict_SetItem(pyEndPoint, pyEndPointYKey, pyEndPointY);
+            PyDict_SetItem(pyEndPoint, key_Y, pyEndPointY);
             Py_DECREF(pyEndPointY);
-            Py_DECREF(pyEndPointYKey);
-            PyObject * pyEndPointKey   = Py_BuildValue("s", "EndPoint");
-            PyDict_SetItem(pyLineSegment, pyEndPointKey, pyEndPoint);
+            PyDict_SetItem(pyLineSegment, key_EndPoint, pyEndPoint);
             Py_DECREF(pyEndPoint);
-            Py_DECREF(pyEndPointKey);
 
             if(((LineSegment *)(ppResults[i]))->linesConfidenceCoefficients != NULL)
             {
@@ -1484,18 +1653,14 @@ static PyObject * CreateIntermediateResultDatas(const void** ppResults, int coun
                     PyObject * pyLinesConfidenceCoefficient = Py_BuildValue("i",((LineSegment *)(ppResults[i]))->linesConfidenceCoefficients[j]);
                     PyList_SetItem(pyLinesConfidenceCoefficients, j, pyLinesConfidenceCoefficient);
                 }
-                PyObject * pyLinesConfidenceCoefficientsKey   = Py_BuildValue("s", "LinesConfidenceCoefficients");
-                PyDict_SetItem(pyLineSegment, pyLinesConfidenceCoefficientsKey, pyLinesConfidenceCoefficients);
+                PyDict_SetItem(pyLineSegment, key_LinesConfidenceCoefficients, pyLinesConfidenceCoefficients);
                 Py_DECREF(pyLinesConfidenceCoefficients);
-                Py_DECREF(pyLinesConfidenceCoefficientsKey);
             }
             else
             {
                 PyObject * pyLinesConfidenceCoefficients   = Py_BuildValue("s", "NULL");
-                PyObject * pyLinesConfidenceCoefficientsKey   = Py_BuildValue("s", "LinesConfidenceCoefficients");
-                PyDict_SetItem(pyLineSegment, pyLinesConfidenceCoefficientsKey, pyLinesConfidenceCoefficients);
+                PyDict_SetItem(pyLineSegment, key_LinesConfidenceCoefficients, pyLinesConfidenceCoefficients);
                 Py_DECREF(pyLinesConfidenceCoefficients);
-                Py_DECREF(pyLinesConfidenceCoefficientsKey);
             }
             
 
@@ -1507,19 +1672,15 @@ static PyObject * CreateIntermediateResultDatas(const void** ppResults, int coun
             PyObject * pyLocalizationResult = CreatePyLocalizationResult((LocalizationResult *)(ppResults[i]));
             if(pyLocalizationResult != NULL)
             {
-                PyObject * pyLRKey   = Py_BuildValue("s", "LocalizationRsult");
-                PyDict_SetItem(pyLR, pyLRKey, pyLocalizationResult);
+                PyDict_SetItem(pyLR, key_LocalizationRsult, pyLocalizationResult);
                 Py_DECREF(pyLocalizationResult);
-                Py_DECREF(pyLRKey);
                 PyList_SetItem(pyResults, i, pyLR);
             }
             else
             {
                 PyObject * pyLocalizationResult   = Py_BuildValue("s", "NULL");
-                PyObject * pyLRKey   = Py_BuildValue("s", "LocalizationRsult");
-                PyDict_SetItem(pyLR, pyLRKey, pyLocalizationResult);
+                PyDict_SetItem(pyLR, key_LocalizationRsult, pyLocalizationResult);
                 Py_DECREF(pyLocalizationResult);
-                Py_DECREF(pyLRKey);
                 PyList_SetItem(pyResults, i, pyLR);
             }
             
@@ -1529,40 +1690,28 @@ static PyObject * CreateIntermediateResultDatas(const void** ppResults, int coun
             PyObject * pyRegionOfInterest = PyDict_New();
 
             PyObject * pyROIId      = Py_BuildValue("i", ((RegionOfInterest *)(ppResults[i]))->roiId);
-            PyObject * pyROIIdKey   = Py_BuildValue("s", "ROIId");
-            PyDict_SetItem(pyRegionOfInterest, pyROIIdKey, pyROIId);
+            PyDict_SetItem(pyRegionOfInterest, key_ROIId, pyROIId);
             Py_DECREF(pyROIId);
-            Py_DECREF(pyROIIdKey);
 
             PyObject * pyPoint = PyDict_New();
 
             PyObject * pyPointX = Py_BuildValue("i", ((RegionOfInterest *)(ppResults[i]))->point.x);
-            PyObject * pyPointXKey   = Py_BuildValue("s", "X");
-            PyDict_SetItem(pyPoint, pyPointXKey, pyPointX);
+            PyDict_SetItem(pyPoint, key_X, pyPointX);
             Py_DECREF(pyPointX);
-            Py_DECREF(pyPointXKey);
 
             PyObject * pyPointY = Py_BuildValue("i", ((RegionOfInterest *)(ppResults[i]))->point.y);
-            PyObject * pyPointYKey   = Py_BuildValue("s", "Y");
-            PyDict_SetItem(pyPoint, pyPointYKey, pyPointY);
+            PyDict_SetItem(pyPoint, key_Y, pyPointY);
             Py_DECREF(pyPointY);
-            Py_DECREF(pyPointYKey);
-            PyObject * pyPointKey   = Py_BuildValue("s", "Point");
-            PyDict_SetItem(pyRegionOfInterest, pyPointKey, pyPoint);
+            PyDict_SetItem(pyRegionOfInterest, key_Point, pyPoint);
             Py_DECREF(pyPoint);
-            Py_DECREF(pyPointKey);
 
             PyObject * pyWidth      = Py_BuildValue("i", ((RegionOfInterest *)(ppResults[i]))->width);
-            PyObject * pyWidthKey   = Py_BuildValue("s", "Width");
-            PyDict_SetItem(pyRegionOfInterest, pyWidthKey, pyWidth);
+            PyDict_SetItem(pyRegionOfInterest, key_Width, pyWidth);
             Py_DECREF(pyWidth);
-            Py_DECREF(pyWidthKey);
 
             PyObject * pyHeight      = Py_BuildValue("i", ((RegionOfInterest *)(ppResults[i]))->height);
-            PyObject * pyHeightKey   = Py_BuildValue("s", "Height");
-            PyDict_SetItem(pyRegionOfInterest, pyHeightKey, pyHeight);
+            PyDict_SetItem(pyRegionOfInterest, key_Height, pyHeight);
             Py_DECREF(pyHeight);
-            Py_DECREF(pyHeightKey);
 
             PyList_SetItem(pyResults, i, pyRegionOfInterest);
         }
@@ -1571,12 +1720,19 @@ static PyObject * CreateIntermediateResultDatas(const void** ppResults, int coun
     return pyResults;
 }
 
-static PyObject * CreatePyIntermediateResults(IntermediateResultArray * pResults)
+#define INTERMEDIATE_RESULT_ARRAY_CAPSULE "dbr.IntermediateResultArray"
+
+static void FreeIntermediateResultArray(PyObject *capsule)
 {
-    if (pResults->results == NULL || pResults->resultsCount == 0)
+    IntermediateResultArray *pResults = (IntermediateResultArray *)PyCapsule_GetPointer(capsule, INTERMEDIATE_RESULT_ARRAY_CAPSULE);
+    DBR_FreeIntermediateResults(&pResults);
+}
+
+static PyObject * CreatePyIntermediateResults(IntermediateResultArray * pResults, PyObject *owner)
+{
+    if (pResults == NULL || pResults->results == NULL || pResults->resultsCount == 0)
     {
-        printf("No Intermediate result detected\n");
-        return Py_BuildValue("s", "NULL");
+        Py_RETURN_NONE;
     }
     // Get barcode results
     int count = pResults->resultsCount;
@@ -1594,58 +1750,48 @@ static PyObject * CreatePyIntermediateResults(IntermediateResultArray * pResults
         }
 
         PyObject * pyDataType      = Py_BuildValue("i", pResults->results[i]->dataType);
-        PyObject * pyDataTypeKey   = Py_BuildValue("s", "DataType");
-        PyDict_SetItem(pyIntermediateResult, pyDataTypeKey, pyDataType);
+        PyDict_SetItem(pyIntermediateResult, key_DataType, pyDataType);
         Py_DECREF(pyDataType);
-        Py_DECREF(pyDataTypeKey);
 
         if(pResults->results[i]->results != NULL)
         {
-            PyObject * pyResults      = CreateIntermediateResultDatas(pResults->results[i]->results, pResults->results[i]->resultsCount, pResults->results[i]->dataType);
-            PyObject * pyResultsKey   = Py_BuildValue("s", "IMResults");
-            PyDict_SetItem(pyIntermediateResult, pyResultsKey, pyResults);
+            PyObject * pyResults      = CreateIntermediateResultDatas(pResults->results[i]->results, pResults->results[i]->resultsCount, pResults->results[i]->dataType, owner);
+            if(pyResults == NULL)
+            {
+                Py_DECREF(pyIntermediateResult);
+                Py_DECREF(pyIntermediateResults);
+                return NULL;
+            }
+            PyDict_SetItem(pyIntermediateResult, key_IMResults, pyResults);
             Py_DECREF(pyResults);
-            Py_DECREF(pyResultsKey);
         }
         else
         {
             PyObject * pyResults   = Py_BuildValue("s", "NULL");
-            PyObject * pyResultsKey   = Py_BuildValue("s", "IMResults");
-            PyDict_SetItem(pyIntermediateResult, pyResultsKey, pyResults);
+            PyDict_SetItem(pyIntermediateResult, key_IMResults, pyResults);
             Py_DECREF(pyResults);
-            Py_DECREF(pyResultsKey);
         }
         
 
         PyObject * pyResultType      = Py_BuildValue("i", pResults->results[i]->resultType);
-        PyObject * pyResultTypeKey   = Py_BuildValue("s", "ResultType");
-        PyDict_SetItem(pyIntermediateResult, pyResultTypeKey, pyResultType);
+        PyDict_SetItem(pyIntermediateResult, key_ResultType, pyResultType);
         Py_DECREF(pyResultType);
-        Py_DECREF(pyResultTypeKey);
 
         PyObject * pyBarcodeComplementMode      = Py_BuildValue("i", pResults->results[i]->barcodeComplementMode);
-        PyObject * pyBarcodeComplementModeKey   = Py_BuildValue("s", "BarcodeComplementMode");
-        PyDict_SetItem(pyIntermediateResult, pyBarcodeComplementModeKey, pyBarcodeComplementMode);
+        PyDict_SetItem(pyIntermediateResult, key_BarcodeComplementMode, pyBarcodeComplementMode);
         Py_DECREF(pyBarcodeComplementMode);
-        Py_DECREF(pyBarcodeComplementModeKey);
 
         PyObject * pyBCMIndex      = Py_BuildValue("i", pResults->results[i]->bcmIndex);
-        PyObject * pyBCMIndexKey   = Py_BuildValue("s", "BCMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyBCMIndexKey, pyBCMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_BCMIndex, pyBCMIndex);
         Py_DECREF(pyBCMIndex);
-        Py_DECREF(pyBCMIndexKey);
 
         PyObject * pyDPMCodeReadingMode      = Py_BuildValue("i", pResults->results[i]->dpmCodeReadingMode);
-        PyObject * pyDPMCodeReadingModeKey   = Py_BuildValue("s", "DPMCodeReadingMode");
-        PyDict_SetItem(pyIntermediateResult, pyDPMCodeReadingModeKey, pyDPMCodeReadingMode);
+        PyDict_SetItem(pyIntermediateResult, key_DPMCodeReadingMode, pyDPMCodeReadingMode);
         Py_DECREF(pyDPMCodeReadingMode);
-        Py_DECREF(pyDPMCodeReadingModeKey);
 
         PyObject * pyDPMCRMIndex      = Py_BuildValue("i", pResults->results[i]->dpmcrmIndex);
-        PyObject * pyDPMCRMIndexKey   = Py_BuildValue("s", "DPMCRMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyDPMCRMIndexKey, pyDPMCRMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_DPMCRMIndex, pyDPMCRMIndex);
         Py_DECREF(pyDPMCRMIndex);
-        Py_DECREF(pyDPMCRMIndexKey);
 
         PyObject * pyRotationMatrix = PyList_New(9);
         for(int j = 0; j < 9; ++j)
@@ -1653,124 +1799,84 @@ static PyObject * CreatePyIntermediateResults(IntermediateResultArray * pResults
             PyObject * temp = Py_BuildValue("d",pResults->results[i]->rotationMatrix[j]);
             PyList_SetItem(pyRotationMatrix, j, temp);
         }
-        PyObject * pyRotationMatrixKey   = Py_BuildValue("s", "RotationMatrix");
-        PyDict_SetItem(pyIntermediateResult, pyRotationMatrixKey, pyRotationMatrix);
+        PyDict_SetItem(pyIntermediateResult, key_RotationMatrix, pyRotationMatrix);
         Py_DECREF(pyRotationMatrix);
-        Py_DECREF(pyRotationMatrixKey);
 
         PyObject * pyTextFilterMode      = Py_BuildValue("i", pResults->results[i]->textFilterMode);
-        PyObject * pyTextFilterModeKey   = Py_BuildValue("s", "TextFilterMode");
-        PyDict_SetItem(pyIntermediateResult, pyTextFilterModeKey, pyTextFilterMode);
+        PyDict_SetItem(pyIntermediateResult, key_TextFilterMode, pyTextFilterMode);
         Py_DECREF(pyTextFilterMode);
-        Py_DECREF(pyTextFilterModeKey);
 
         PyObject * pyTFMIndex      = Py_BuildValue("i", pResults->results[i]->tfmIndex);
-        PyObject * pyTFMIndexKey   = Py_BuildValue("s", "TFMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyTFMIndexKey, pyTFMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_TFMIndex, pyTFMIndex);
         Py_DECREF(pyTFMIndex);
-        Py_DECREF(pyTFMIndexKey);
 
         PyObject * pyLocalizationMode      = Py_BuildValue("i", pResults->results[i]->localizationMode);
-        PyObject * pyLocalizationModeKey   = Py_BuildValue("s", "LocalizationMode");
-        PyDict_SetItem(pyIntermediateResult, pyLocalizationModeKey, pyLocalizationMode);
+        PyDict_SetItem(pyIntermediateResult, key_LocalizationMode, pyLocalizationMode);
         Py_DECREF(pyLocalizationMode);
-        Py_DECREF(pyLocalizationModeKey);
 
         PyObject * pyLMIndex      = Py_BuildValue("i", pResults->results[i]->lmIndex);
-        PyObject * pyLMIndexKey   = Py_BuildValue("s", "LMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyLMIndexKey, pyLMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_LMIndex, pyLMIndex);
         Py_DECREF(pyLMIndex);
-        Py_DECREF(pyLMIndexKey);
 
         PyObject * pyBinarizationMode      = Py_BuildValue("i", pResults->results[i]->binarizationMode);
-        PyObject * pyBinarizationModeKey   = Py_BuildValue("s", "BinarizationMode");
-        PyDict_SetItem(pyIntermediateResult, pyBinarizationModeKey, pyBinarizationMode);
+        PyDict_SetItem(pyIntermediateResult, key_BinarizationMode, pyBinarizationMode);
         Py_DECREF(pyBinarizationMode);
-        Py_DECREF(pyBinarizationModeKey);
 
         PyObject * pyBMIndex      = Py_BuildValue("i", pResults->results[i]->bmIndex);
-        PyObject * pyBMIndexKey   = Py_BuildValue("s", "BMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyBMIndexKey, pyBMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_BMIndex, pyBMIndex);
         Py_DECREF(pyBMIndex);
-        Py_DECREF(pyBMIndexKey);
 
         PyObject * pyImagePreprocessingMode      = Py_BuildValue("i", pResults->results[i]->imagePreprocessingMode);
-        PyObject * pyImagePreprocessingModeKey   = Py_BuildValue("s", "ImagePreprocessingMode");
-        PyDict_SetItem(pyIntermediateResult, pyImagePreprocessingModeKey, pyImagePreprocessingMode);
+        PyDict_SetItem(pyIntermediateResult, key_ImagePreprocessingMode, pyImagePreprocessingMode);
         Py_DECREF(pyImagePreprocessingMode);
-        Py_DECREF(pyImagePreprocessingModeKey);
 
         PyObject * pyIPMIndex      = Py_BuildValue("i", pResults->results[i]->ipmIndex);
-        PyObject * pyIPMIndexKey   = Py_BuildValue("s", "IPMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyIPMIndexKey, pyIPMIndex);
-        Py_DECREF(pyIPMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_IPMIndex, pyIPMIndex);
         Py_DECREF(pyIPMIndex);
 
         PyObject * pyROIId      = Py_BuildValue("i", pResults->results[i]->roiId);
-        PyObject * pyROIIdKey   = Py_BuildValue("s", "ROIId");
-        PyDict_SetItem(pyIntermediateResult, pyROIIdKey, pyROIId);
+        PyDict_SetItem(pyIntermediateResult, key_ROIId, pyROIId);
         Py_DECREF(pyROIId);
-        Py_DECREF(pyROIIdKey);
 
         PyObject * pyRegionPredetectionMode      = Py_BuildValue("i", pResults->results[i]->regionPredetectionMode);
-        PyObject * pyRegionPredetectionModeKey   = Py_BuildValue("s", "RegionPredetectionMode");
-        PyDict_SetItem(pyIntermediateResult, pyRegionPredetectionModeKey, pyRegionPredetectionMode);
+        PyDict_SetItem(pyIntermediateResult, key_RegionPredetectionMode, pyRegionPredetectionMode);
         Py_DECREF(pyRegionPredetectionMode);
-        Py_DECREF(pyRegionPredetectionModeKey);
 
         PyObject * pyRPMIndex      = Py_BuildValue("i", pResults->results[i]->rpmIndex);
-        PyObject * pyRPMIndexKey   = Py_BuildValue("s", "RPMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyRPMIndexKey, pyRPMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_RPMIndex, pyRPMIndex);
         Py_DECREF(pyRPMIndex);
-        Py_DECREF(pyRPMIndexKey);
 
         PyObject * pyGrayscaleTransformationMode      = Py_BuildValue("i", pResults->results[i]->grayscaleTransformationMode);
-        PyObject * pyGrayscaleTransformationModeKey   = Py_BuildValue("s", "GrayscaleTransformationMode");
-        PyDict_SetItem(pyIntermediateResult, pyRegionPredetectionModeKey, pyRegionPredetectionMode);
-        Py_DECREF(pyRegionPredetectionMode);
-        Py_DECREF(pyRegionPredetectionModeKey);
+        PyDict_SetItem(pyIntermediateResult, key_GrayscaleTransformationMode, pyGrayscaleTransformationMode);
+        Py_DECREF(pyGrayscaleTransformationMode);
 
         PyObject * pyGTMIndex      = Py_BuildValue("i", pResults->results[i]->gtmIndex);
-        PyObject * pyGTMIndexKey   = Py_BuildValue("s", "GTMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyGTMIndexKey, pyGTMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_GTMIndex, pyGTMIndex);
         Py_DECREF(pyGTMIndex);
-        Py_DECREF(pyGTMIndexKey);
 
         PyObject * pyColourConversionMode      = Py_BuildValue("i", pResults->results[i]->colourConversionMode);
-        PyObject * pyColourConversionModeKey   = Py_BuildValue("s", "ColourConversionMode");
-        PyDict_SetItem(pyIntermediateResult, pyColourConversionModeKey, pyColourConversionMode);
+        PyDict_SetItem(pyIntermediateResult, key_ColourConversionMode, pyColourConversionMode);
         Py_DECREF(pyColourConversionMode);
-        Py_DECREF(pyColourConversionModeKey);
 
         PyObject * pyCICMIndex      = Py_BuildValue("i", pResults->results[i]->cicmIndex);
-        PyObject * pyCICMIndexKey   = Py_BuildValue("s", "CICMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyCICMIndexKey, pyCICMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_CICMIndex, pyCICMIndex);
         Py_DECREF(pyCICMIndex);
-        Py_DECREF(pyCICMIndexKey);
 
         PyObject * pyColourClusteringMode      = Py_BuildValue("i", pResults->results[i]->colourClusteringMode);
-        PyObject * pyColourClusteringModeKey   = Py_BuildValue("s", "ColourClusteringMode");
-        PyDict_SetItem(pyIntermediateResult, pyColourClusteringModeKey, pyColourClusteringMode);
+        PyDict_SetItem(pyIntermediateResult, key_ColourClusteringMode, pyColourClusteringMode);
         Py_DECREF(pyColourClusteringMode);
-        Py_DECREF(pyColourClusteringModeKey);
 
         PyObject * pyCCMIndex      = Py_BuildValue("i", pResults->results[i]->ccmIndex);
-        PyObject * pyCCMIndexKey   = Py_BuildValue("s", "CCMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyCCMIndexKey, pyCCMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_CCMIndex, pyCCMIndex);
         Py_DECREF(pyCCMIndex);
-        Py_DECREF(pyCCMIndexKey);
 
         PyObject * pyScaleDownRatio      = Py_BuildValue("i", pResults->results[i]->scaleDownRatio);
-        PyObject * pyScaleDownRatioKey   = Py_BuildValue("s", "ScaleDownRatio");
-        PyDict_SetItem(pyIntermediateResult, pyScaleDownRatioKey, pyScaleDownRatio);
+        PyDict_SetItem(pyIntermediateResult, key_ScaleDownRatio, pyScaleDownRatio);
         Py_DECREF(pyScaleDownRatio);
-        Py_DECREF(pyScaleDownRatioKey);
 
         PyObject * pyFrameId      = Py_BuildValue("i", pResults->results[i]->frameId);
-        PyObject * pyFrameIdKey   = Py_BuildValue("s", "FrameId");
-        PyDict_SetItem(pyIntermediateResult, pyFrameIdKey, pyFrameId);
+        PyDict_SetItem(pyIntermediateResult, key_FrameId, pyFrameId);
         Py_DECREF(pyFrameId);
-        Py_DECREF(pyFrameIdKey);
 
         PyList_SetItem(pyIntermediateResults, i, pyIntermediateResult);
     }
@@ -1790,82 +1896,56 @@ static PyObject * CreatePyFrameDecodingParameters(FrameDecodingParameters * pPar
     }
 
     PyObject * pyMaxQueueLength             = Py_BuildValue("i", pParameters->maxQueueLength);
-    PyObject * pyMaxQueueLengthKey          = Py_BuildValue("s", "MaxQueueLength");
-    PyDict_SetItem(pyParameters, pyMaxQueueLengthKey, pyMaxQueueLength);
+    PyDict_SetItem(pyParameters, key_MaxQueueLength, pyMaxQueueLength);
     Py_DECREF(pyMaxQueueLength);
-    Py_DECREF(pyMaxQueueLengthKey);
 
     PyObject * pyMaxResultQueueLength             = Py_BuildValue("i", pParameters->maxResultQueueLength);
-    PyObject * pyMaxResultQueueLengthKey          = Py_BuildValue("s", "MaxResultQueueLength");
-    PyDict_SetItem(pyParameters, pyMaxResultQueueLengthKey, pyMaxResultQueueLength);
+    PyDict_SetItem(pyParameters, key_MaxResultQueueLength, pyMaxResultQueueLength);
     Py_DECREF(pyMaxResultQueueLength);
-    Py_DECREF(pyMaxResultQueueLengthKey);
 
     PyObject * pyWidth             = Py_BuildValue("i", pParameters->width);
-    PyObject * pyWidthKey          = Py_BuildValue("s", "Width");
-    PyDict_SetItem(pyParameters, pyWidthKey, pyWidth);
+    PyDict_SetItem(pyParameters, key_Width, pyWidth);
     Py_DECREF(pyWidth);
-    Py_DECREF(pyWidthKey);
 
     PyObject * pyHeight             = Py_BuildValue("i", pParameters->height);
-    PyObject * pyHeightKey          = Py_BuildValue("s", "Height");
-    PyDict_SetItem(pyParameters, pyHeightKey, pyHeight);
+    PyDict_SetItem(pyParameters, key_Height, pyHeight);
     Py_DECREF(pyHeight);
-    Py_DECREF(pyHeightKey);
 
     PyObject * pyStride             = Py_BuildValue("i", pParameters->stride);
-    PyObject * pyStrideKey          = Py_BuildValue("s", "Stride");
-    PyDict_SetItem(pyParameters, pyStrideKey, pyStride);
+    PyDict_SetItem(pyParameters, key_Stride, pyStride);
     Py_DECREF(pyStride);
-    Py_DECREF(pyStrideKey);
 
     PyObject * pyImagePixelFormat             = Py_BuildValue("i", pParameters->imagePixelFormat);
-    PyObject * pyImagePixelFormatKey          = Py_BuildValue("s", "ImagePixelFormat");
-    PyDict_SetItem(pyParameters, pyImagePixelFormatKey, pyImagePixelFormat);
+    PyDict_SetItem(pyParameters, key_ImagePixelFormat, pyImagePixelFormat);
     Py_DECREF(pyImagePixelFormat);
-    Py_DECREF(pyImagePixelFormatKey);
 
     PyObject * pyRegionTop             = Py_BuildValue("i", pParameters->region.regionTop);
-    PyObject * pyRegionTopKey          = Py_BuildValue("s", "RegionTop");
-    PyDict_SetItem(pyParameters, pyRegionTopKey, pyRegionTop);
+    PyDict_SetItem(pyParameters, key_RegionTop, pyRegionTop);
     Py_DECREF(pyRegionTop);
-    Py_DECREF(pyRegionTopKey);
 
     PyObject * pyRegionLeft             = Py_BuildValue("i", pParameters->region.regionLeft);
-    PyObject * pyRegionLeftKey          = Py_BuildValue("s", "RegionLeft");
-    PyDict_SetItem(pyParameters, pyRegionLeftKey, pyRegionLeft);
+    PyDict_SetItem(pyParameters, key_RegionLeft, pyRegionLeft);
     Py_DECREF(pyRegionLeft);
-    Py_DECREF(pyRegionLeftKey);
 
     PyObject * pyRegionRight             = Py_BuildValue("i", pParameters->region.regionRight);
-    PyObject * pyRegionRightKey          = Py_BuildValue("s", "RegionRight");
-    PyDict_SetItem(pyParameters, pyRegionRightKey, pyRegionRight);
+    PyDict_SetItem(pyParameters, key_RegionRight, pyRegionRight);
     Py_DECREF(pyRegionRight);
-    Py_DECREF(pyRegionRightKey);
 
     PyObject * pyRegionBottom             = Py_BuildValue("i", pParameters->region.regionBottom);
-    PyObject * pyRegionBottomKey          = Py_BuildValue("s", "RegionBottom");
-    PyDict_SetItem(pyParameters, pyRegionBottomKey, pyRegionBottom);
+    PyDict_SetItem(pyParameters, key_RegionBottom, pyRegionBottom);
     Py_DECREF(pyRegionBottom);
-    Py_DECREF(pyRegionBottomKey);
 
     PyObject * pyRegionMeasuredByPercentage             = Py_BuildValue("i", pParameters->region.regionMeasuredByPercentage);
-    PyObject * pyRegionMeasuredByPercentageKey          = Py_BuildValue("s", "RegionMeasuredByPercentage");
-    PyDict_SetItem(pyParameters, pyRegionMeasuredByPercentageKey, pyRegionMeasuredByPercentage);
+    PyDict_SetItem(pyParameters, key_RegionMeasuredByPercentage, pyRegionMeasuredByPercentage);
     Py_DECREF(pyRegionMeasuredByPercentage);
-    Py_DECREF(pyRegionMeasuredByPercentageKey);
 
     PyObject * pyThreshold             = Py_BuildValue("f", pParameters->threshold);
-    PyObject * pyThresholdKey          = Py_BuildValue("s", "Threshold");
-    PyDict_SetItem(pyParameters, pyThresholdKey, pyThreshold);
+    PyDict_SetItem(pyParameters, key_Threshold, pyThreshold);
     Py_DECREF(pyThreshold);
-    Py_DECREF(pyThresholdKey);
 
     PyObject * pyFPS             = Py_BuildValue("i", pParameters->fps);
-    PyObject * pyFPSKey          = Py_BuildValue("s", "FPS");
-    PyDict_SetItem(pyParameters, pyFPSKey, pyFPS);
+    PyDict_SetItem(pyParameters, key_FPS, pyFPS);
     Py_DECREF(pyFPS);
-    Py_DECREF(pyFPSKey);
 
     return pyParameters;
 }
@@ -1873,19 +1953,19 @@ static PyObject * CreatePyFrameDecodingParameters(FrameDecodingParameters * pPar
 FrameDecodingParameters CreateCFrameDecodingParameters(PyObject * pyParameters)
 {
     FrameDecodingParameters parameters;
-    parameters.maxQueueLength                       = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "MaxQueueLength")));
-    parameters.maxResultQueueLength                 = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "MaxResultQueueLength")));
-    parameters.width                                = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "Width")));
-    parameters.height                               = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "Height")));
-    parameters.stride                               = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "Stride")));
-    parameters.imagePixelFormat                     = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "ImagePixelFormat")));
-    parameters.region.regionBottom                  = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "RegionBottom")));
-    parameters.region.regionLeft                    = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "RegionLeft")));
-    parameters.region.regionRight                   = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "RegionRight")));
-    parameters.region.regionTop                     = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "RegionTop")));
-    parameters.region.regionMeasuredByPercentage    = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "RegionMeasuredByPercentage")));
-    parameters.threshold                            = (float)PyFloat_AsDouble(PyDict_GetItem(pyParameters, Py_BuildValue("s", "Threshold")));
-    parameters.fps                                  = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "FPS")));
+    parameters.maxQueueLength                       = PyLong_AsLong(PyDict_GetItem(pyParameters, key_MaxQueueLength));
+    parameters.maxResultQueueLength                 = PyLong_AsLong(PyDict_GetItem(pyParameters, key_MaxResultQueueLength));
+    parameters.width                                = PyLong_AsLong(PyDict_GetItem(pyParameters, key_Width));
+    parameters.height                               = PyLong_AsLong(PyDict_GetItem(pyParameters, key_Height));
+    parameters.stride                               = PyLong_AsLong(PyDict_GetItem(pyParameters, key_Stride));
+    parameters.imagePixelFormat                     = PyLong_AsLong(PyDict_GetItem(pyParameters, key_ImagePixelFormat));
+    parameters.region.regionBottom                  = PyLong_AsLong(PyDict_GetItem(pyParameters, key_RegionBottom));
+    parameters.region.regionLeft                    = PyLong_AsLong(PyDict_GetItem(pyParameters, key_RegionLeft));
+    parameters.region.regionRight                   = PyLong_AsLong(PyDict_GetItem(pyParameters, key_RegionRight));
+    parameters.region.regionTop                     = PyLong_AsLong(PyDict_GetItem(pyParameters, key_RegionTop));
+    parameters.region.regionMeasuredByPercentage    = PyLong_AsLong(PyDict_GetItem(pyParameters, key_RegionMeasuredByPercentage));
+    parameters.threshold                            = (float)PyFloat_AsDouble(PyDict_GetItem(pyParameters, key_Threshold));
+    parameters.fps                                  = PyLong_AsLong(PyDict_GetItem(pyParameters, key_FPS));
 
     return parameters;
 }
@@ -1907,7 +1987,9 @@ initLicense(PyObject *obj, PyObject *args)
         return NULL;
     }
 
+    LockHandle(self);
     int ret = DBR_InitLicense(self->hBarcode, pszLicense);
+    UnlockHandle(self);
     return Py_BuildValue("i", ret);
 }
 
@@ -1943,11 +2025,7 @@ static PyObject *createPyResults(TextResultArray *pResults, const char* encoding
         PyObject *pyObject = NULL;
         if (encoding) {
             pyObject = PyList_New(10);
-        #ifdef IS_PY3K
-            PyObject *format = PyUnicode_FromString(pResults->results[i]->barcodeFormatString);
-        #else
-            PyObject *format = PyString_FromString(pResults->results[i]->barcodeFormatString);
-        #endif
+            PyObject *format = GetFormatString(pResults->results[i]->barcodeFormatString);
             PyList_SetItem(pyObject, 0, format);
             
             PyObject *result = PyUnicode_Decode(pResults->results[i]->barcodeBytes, pResults->results[i]->barcodeBytesLength, encoding, "strict");
@@ -2016,16 +2094,17 @@ static PyObject *createPyResults(TextResultArray *pResults, const char* encoding
 }
 
 /**
+ * Call with the handle locked, it reads and updates the settings mirror.
  * This function will deprecate in a future version.
 */
 void updateFormat(DynamsoftBarcodeReader *self, int format)
 {
-    // Update DBR params
-    PublicRuntimeSettings pSettings = {0};
-    DBR_GetRuntimeSettings(self->hBarcode, &pSettings);
+    // Update DBR params, nothing reaches the SDK while the format stays the same
+    PublicRuntimeSettings pSettings;
+    memcpy(&pSettings, GetCachedSettings(self), sizeof(PublicRuntimeSettings));
     pSettings.barcodeFormatIds = format;
     char szErrorMsgBuffer[256];
-    DBR_UpdateRuntimeSettings(self->hBarcode, &pSettings, szErrorMsgBuffer, 256);
+    ApplySettings(self, &pSettings, szErrorMsgBuffer, 256);
 }
 
 /**
@@ -2054,17 +2133,21 @@ decodeFile(PyObject *obj, PyObject *args)
         return NULL;
     }
 
-    updateFormat(self, iFormat);
-
     TextResultArray *pResults = NULL;
 
     // Barcode detection
-    int ret = DBR_DecodeFile(self->hBarcode, pFileName, templateName ? templateName : "");
+    int ret;
+    LockHandle(self);
+    updateFormat(self, iFormat);
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_DecodeFile(self->hBarcode, pFileName, templateName ? templateName : "");
+    DBR_GetAllTextResults(self->hBarcode, &pResults);
+    Py_END_ALLOW_THREADS
+    UnlockHandle(self);
     if (ret)
     {
         printf("Detection error: %s\n", DBR_GetErrorString(ret));
     }
-    DBR_GetAllTextResults(self->hBarcode, &pResults);
 
     // Wrap results
     PyObject *list = createPyResults(pResults, encoding);
@@ -2087,8 +2170,6 @@ decodeBuffer(PyObject *obj, PyObject *args)
     if (!PyArg_ParseTuple(args, "Oi|iss", &o, &iFormat, &imagePixelFormat, &templateName, &encoding))
         return NULL;
 
-    updateFormat(self, iFormat);
-
 #if defined(IS_PY3K)
     //Refer to numpy/core/src/multiarray/ctors.c
     Py_buffer *view;
@@ -2139,13 +2220,19 @@ decodeBuffer(PyObject *obj, PyObject *args)
     TextResultArray *pResults = NULL;
 
     PyObject *list = NULL;
-    int ret = DBR_DecodeBuffer(self->hBarcode, buffer, width, height, stride, imagePixelFormat, templateName ? templateName : "");
+    int ret;
+    LockHandle(self);
+    updateFormat(self, iFormat);
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_DecodeBuffer(self->hBarcode, buffer, width, height, stride, imagePixelFormat, templateName ? templateName : "");
+    DBR_GetAllTextResults(self->hBarcode, &pResults);
+    Py_END_ALLOW_THREADS
+    UnlockHandle(self);
     if (ret)
     {
         printf("Detection error: %s\n", DBR_GetErrorString(ret));
     }
     // Wrap results
-    DBR_GetAllTextResults(self->hBarcode, &pResults);
     list = createPyResults(pResults, encoding);
 
 #if defined(IS_PY3K)
@@ -2157,6 +2244,32 @@ decodeBuffer(PyObject *obj, PyObject *args)
     return list;
 }
 
+/**
+ * Gets a read-only view of the bytes of a file stream: bytes, bytearray, memoryview, mmap or a uint8 array.
+ * On Python 2, mmap and the other objects that only have the old buffer interface are read through it.
+ * Their view keeps the object alive but does not lock its memory, so it must not be closed or resized during the decoding.
+ *
+ * On success the caller must release the view with PyBuffer_Release.
+ * On failure an exception is set and -1 is returned.
+ */
+static int GetFileStreamBuffer(PyObject *op, Py_buffer *view)
+{
+    if (PyObject_GetBuffer(op, view, PyBUF_SIMPLE) == 0)
+        return 0;
+#if !defined(IS_PY3K)
+    const void *buffer;
+    Py_ssize_t length;
+    if (PyObject_CheckReadBuffer(op))
+    {
+        PyErr_Clear();
+        if (PyObject_AsReadBuffer(op, &buffer, &length) < 0)
+            return -1;
+        return PyBuffer_FillInfo(view, op, (void *)buffer, length, 1, PyBUF_SIMPLE);
+    }
+#endif
+    return -1;
+}
+
 /**
  * Decode file stream. This API will be deprecated in a future version.
  */
@@ -2184,18 +2297,33 @@ decodeFileStream(PyObject *obj, PyObject *args)
         return NULL;
     }
 
-    updateFormat(self, iFormat);
-
     TextResultArray *pResults = NULL;
-    // https://docs.python.org/2/c-api/bytearray.html
-    char *filestream = PyByteArray_AsString(op);
+    // Any contiguous buffer is read in place: bytes, bytearray, memoryview, mmap or a uint8 array
+    Py_buffer view;
+    if (GetFileStreamBuffer(op, &view) < 0)
+    {
+        return NULL;
+    }
+    // A negative size decodes the whole buffer
+    if (fileSize < 0 || fileSize > view.len)
+    {
+        fileSize = (int)view.len;
+    }
+    char *filestream = (char *)view.buf;
     // Barcode detection
-    int ret = DBR_DecodeFileInMemory(self->hBarcode, filestream, fileSize, templateName ? templateName : "");
+    int ret;
+    LockHandle(self);
+    updateFormat(self, iFormat);
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_DecodeFileInMemory(self->hBarcode, filestream, fileSize, templateName ? templateName : "");
+    DBR_GetAllTextResults(self->hBarcode, &pResults);
+    Py_END_ALLOW_THREADS
+    UnlockHandle(self);
+    PyBuffer_Release(&view);
     if (ret)
     {
         printf("Detection error: %s\n", DBR_GetErrorString(ret));
     }
-    DBR_GetAllTextResults(self->hBarcode, &pResults);
 
     // Wrap results
     PyObject *list = createPyResults(pResults, encoding);
@@ -2223,7 +2351,9 @@ initLicenseFromLicenseContent(PyObject *obj, PyObject *args)
         return NULL;
     }
 
+    LockHandle(self);
     int ret = DBR_InitLicenseFromLicenseContent(self->hBarcode, pszLicenseKey, pszLicenseContent);
+    UnlockHandle(self);
     return Py_BuildValue("i", ret);
 }
 
@@ -2268,7 +2398,9 @@ initLicenseFromServer(PyObject *obj, PyObject *args)
         return NULL;
     }
 
+    LockHandle(self);
     int ret = DBR_InitLicenseFromServer(self->hBarcode, pLicenseServer, pszLicenseKey);
+    UnlockHandle(self);
     return Py_BuildValue("i", ret);
 }
 
@@ -2277,21 +2409,29 @@ initLicenseFromServer(PyObject *obj, PyObject *args)
 */
 static void setModeValue(DynamsoftBarcodeReader *self, PyObject *iter, char *mode)
 {
-    PublicRuntimeSettings pSettings = {0};
-    DBR_GetRuntimeSettings(self->hBarcode, &pSettings);
-    int index = 0;
-    pSettings.furtherModes.grayscaleTransformationModes[0] = GTM_INVERTED;
-
-    while (1)
+    // The modes are read before the handle is locked, because iterating may run Python code that uses the reader
+    int attributes[8];
+    int count = 0;
+    while (count < 8)
     {
         PyObject *next = PyIter_Next(iter);
         if (!next)
         {
             break;
         }
+        attributes[count++] = PyLong_AsLong(next);
+        Py_DECREF(next);
+    }
 
+    LockHandle(self);
+    PublicRuntimeSettings pSettings;
+    memcpy(&pSettings, GetCachedSettings(self), sizeof(PublicRuntimeSettings));
+    pSettings.furtherModes.grayscaleTransformationModes[0] = GTM_INVERTED;
+
+    for (int index = 0; index < count; ++index)
+    {
         // Set attributes for different modes
-        int attribute = PyLong_AsLong(next);
+        int attribute = attributes[index];
         if (!strcmp("grayscaleTransformationModes", mode))
         {
             // printf("Set grayscaleTransformationModes %d\n", attribute);
@@ -2341,12 +2481,11 @@ static void setModeValue(DynamsoftBarcodeReader *self, PyObject *iter, char *mod
         {
             pSettings.furtherModes.textAssistedCorrectionMode = attribute;
         }
-
-        ++index;
     }
 
     char szErrorMsgBuffer[256];
-    DBR_UpdateRuntimeSettings(self->hBarcode, &pSettings, szErrorMsgBuffer, 256);
+    ApplySettings(self, &pSettings, szErrorMsgBuffer, 256);
+    UnlockHandle(self);
 }
 
 /**
@@ -2399,7 +2538,10 @@ setParameters(PyObject *obj, PyObject *args)
     }
 
     char errorMessage[DEFAULT_MEMORY_SIZE];
+    LockHandle(self);
     int ret = DBR_InitRuntimeSettingsWithString(self->hBarcode, json, CM_OVERWRITE, errorMessage, 256);
+    self->settingsCached = 0;
+    UnlockHandle(self);
     if (ret) 
     {
         printf("Returned value: %d, error message: %s\n", ret, errorMessage);
@@ -2493,8 +2635,6 @@ startVideoMode(PyObject *obj, PyObject *args)
         return NULL;
     }
 
-    updateFormat(self, iFormat);
-
     if (!PyCallable_Check(callback))
     {
         PyErr_SetString(PyExc_TypeError, "parameter must be callable");
@@ -2508,9 +2648,11 @@ startVideoMode(PyObject *obj, PyObject *args)
     }
 
 
+    LockHandle(self);
+    updateFormat(self, iFormat);
     DBR_SetTextResultCallback(self->hBarcode, onResultCallback, self);
-
     int ret = DBR_StartFrameDecoding(self->hBarcode, maxListLength, maxResultListLength, width, height, stride, imagePixelFormat, "");
+    UnlockHandle(self);
     return Py_BuildValue("i", ret);
 }
 
@@ -2524,7 +2666,12 @@ stopVideoMode(PyObject *obj, PyObject *args)
     printf("Stop the video mode\n");
     if (self->hBarcode)
     {
-        int ret = DBR_StopFrameDecoding(self->hBarcode);
+        // Stopping joins the decoding thread, whose result callback needs the GIL and may call into the reader,
+        // so neither the GIL nor the handle lock is held while waiting. The SDK stops video mode from any thread.
+        int ret;
+        Py_BEGIN_ALLOW_THREADS
+        ret = DBR_StopFrameDecoding(self->hBarcode);
+        Py_END_ALLOW_THREADS
         return Py_BuildValue("i", ret);
     }
 
@@ -2580,7 +2727,13 @@ appendVideoFrame(PyObject *obj, PyObject *args)
     Py_DECREF(ao);
 #endif
 
-    int frameId = DBR_AppendFrame(self->hBarcode, buffer);
+    int frameId;
+
+    LockHandle(self);
+
+    frameId = DBR_AppendFrame(self->hBarcode, buffer);
+
+    UnlockHandle(self);
     return 0;
 }
 
@@ -2603,7 +2756,9 @@ static PyObject * InitLicense(PyObject *obj, PyObject *args)
         return NULL;
     }
 
+    LockHandle(self);
     int ret = DBR_InitLicense(self->hBarcode, pszLicense);
+    UnlockHandle(self);
     const char* errorString = DBR_GetErrorString(ret);
     printf("%s\n", errorString);
     return Py_BuildValue("i", ret);
@@ -2619,7 +2774,9 @@ static PyObject * GetRuntimeSettings(PyObject *obj, PyObject *args)
     DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
 
     PublicRuntimeSettings settings;
-    int errorCode = DBR_GetRuntimeSettings(self->hBarcode, &settings);
+    LockHandle(self);
+    memcpy(&settings, GetCachedSettings(self), sizeof(PublicRuntimeSettings));
+    UnlockHandle(self);
 
     PyObject * pySettings = CreatePyRuntimeSettings(settings);
 
@@ -2646,9 +2803,18 @@ static PyObject * UpdataRuntimeSettings(PyObject *obj, PyObject *args)
         printf("the parameter should be a dictionary.");
         return NULL;
     }
-    PublicRuntimeSettings settings = CreateCRuntimeSettings(pyParameters);
+    // pyParameters may hold only the changed settings, the others keep their current values
+    PublicRuntimeSettings settings;
     char szErrorMsgBuffer[256];
-    int errorCode = DBR_UpdateRuntimeSettings(self->hBarcode, &settings, szErrorMsgBuffer, 256);
+    LockHandle(self);
+    memcpy(&settings, GetCachedSettings(self), sizeof(PublicRuntimeSettings));
+    if (OverlayCRuntimeSettings(pyParameters, &settings) < 0)
+    {
+        UnlockHandle(self);
+        return NULL;
+    }
+    int errorCode = ApplySettings(self, &settings, szErrorMsgBuffer, 256);
+    UnlockHandle(self);
     if(errorCode != 0)
     {
         printf("Error:%s\n", szErrorMsgBuffer);
@@ -2668,7 +2834,10 @@ static PyObject * ResetRuntimeSettings(PyObject *obj, PyObject *args)
 {
     DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
 
+    LockHandle(self);
     DBR_ResetRuntimeSettings(self->hBarcode);
+    self->settingsCached = 0;
+    UnlockHandle(self);
 
     return NULL;
 }
@@ -2695,7 +2864,10 @@ static PyObject * SetModeArgument(PyObject *obj, PyObject *args)
         return NULL;
     }
     char szErrorMsgBuffer[256];
+    LockHandle(self);
     int errorCode = DBR_SetModeArgument(self->hBarcode, pModesName, index, pArgumentName, pArgumentValue, szErrorMsgBuffer, 256);
+    self->settingsCached = 0;
+    UnlockHandle(self);
     if(errorCode != 0)
     {
         printf("Error:%s\n", szErrorMsgBuffer);
@@ -2728,7 +2900,9 @@ static PyObject * GetModeArgument(PyObject *obj, PyObject *args)
     }
     char szErrorMsgBuffer[256];
     char pArgumentValue[512];
+    LockHandle(self);
     int errorCode = DBR_GetModeArgument(self->hBarcode, pModesName, index, pArgumentName, pArgumentValue, 512, szErrorMsgBuffer, 256);
+    UnlockHandle(self);
     if(errorCode != 0)
     {
         printf("Error:%s\n", szErrorMsgBuffer);
@@ -2741,13 +2915,47 @@ static PyObject * GetModeArgument(PyObject *obj, PyObject *args)
     return Py_BuildValue("s", pArgumentValue);
 }
 
+/**
+ * Get the intermediate results of the last decoding.
+ * They are only fetched and converted when asked for, so decoding does not pay for them.
+ *
+ * @return Returns a list of intermediate results, or None if there is none.
+ */
+static PyObject * GetIntermediateResults(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+
+    IntermediateResultArray * pIResults = NULL;
+    LockHandle(self);
+    Py_BEGIN_ALLOW_THREADS
+    DBR_GetIntermediateResults(self->hBarcode, &pIResults);
+    Py_END_ALLOW_THREADS
+    UnlockHandle(self);
+
+    if (pIResults == NULL)
+    {
+        Py_RETURN_NONE;
+    }
+
+    // The images are numpy arrays over the native results, so the capsule frees them when the last array is gone
+    PyObject * owner = PyCapsule_New(pIResults, INTERMEDIATE_RESULT_ARRAY_CAPSULE, FreeIntermediateResultArray);
+    if (owner == NULL)
+    {
+        DBR_FreeIntermediateResults(&pIResults);
+        return NULL;
+    }
+    PyObject * pyIntermediateResults = CreatePyIntermediateResults(pIResults, owner);
+    Py_DECREF(owner);
+    return pyIntermediateResults;
+}
+
 /**
  * Decode barcode from a file 
  * 
  * @param [in] filename String The file name.
  * @param [in] templateName String The template name.
  * 
- * @return Returns a dictionary which includes text results and intermediate results.
+ * @return Returns a dictionary which includes text results. Call GetIntermediateResults() for intermediate results.
  */
 static PyObject * DecodeFile(PyObject *obj, PyObject *args)
 {
@@ -2771,15 +2979,17 @@ static PyObject * DecodeFile(PyObject *obj, PyObject *args)
         encoding = "utf8";
     }
 
-    // Barcode detection
-
-    int ret = DBR_DecodeFile(self->hBarcode, pFileName, templateName);
-
+    // Barcode detection. Results are fetched under the same lock so that
+    // another thread cannot overwrite them in between.
+    int ret;
     TextResultArray *pResults = NULL;
-    DBR_GetAllTextResults(self->hBarcode, &pResults);
 
-    IntermediateResultArray * pIResults = NULL;
-    DBR_GetIntermediateResults(self->hBarcode, &pIResults);
+    LockHandle(self);
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_DecodeFile(self->hBarcode, pFileName, templateName);
+    DBR_GetAllTextResults(self->hBarcode, &pResults);
+    Py_END_ALLOW_THREADS
+    UnlockHandle(self);
 
     // Wrap results
     PyObject * results = PyDict_New();
@@ -2789,24 +2999,12 @@ static PyObject * DecodeFile(PyObject *obj, PyObject *args)
     {
         return NULL;
     }
-    PyObject * pyTextResultsKey = Py_BuildValue("s","TextResults");
-    PyDict_SetItem(results, pyTextResultsKey, pyTextResults);
+    PyDict_SetItem(results, key_TextResults, pyTextResults);
 
     Py_DECREF(pyTextResults);
-    Py_DECREF(pyTextResultsKey);
 
     DBR_FreeTextResults(&pResults);
 
-    PyObject * pyIntermediateResults = CreatePyIntermediateResults(pIResults);
-    PyObject * pyIntermediateResultsKey = Py_BuildValue("s","IntermediateResults");
-    PyDict_SetItem(results, pyIntermediateResultsKey, pyIntermediateResults);
-
-    Py_DECREF(pyIntermediateResults);
-    Py_DECREF(pyIntermediateResultsKey);
-
-    DBR_FreeIntermediateResults(&pIResults);
-
-
     return results;
 }
 
@@ -2814,7 +3012,7 @@ static PyObject * DecodeFile(PyObject *obj, PyObject *args)
  * Decode barcode from an image buffer. 
  * @param [in] frame-by-opencv-capture.
  * 
- * @return Returns a dictionary which includes text results and intermediate results.
+ * @return Returns a dictionary which includes text results. Call GetIntermediateResults() for intermediate results.
  */
 static PyObject * DecodeBuffer(PyObject *obj, PyObject *args)
 {
@@ -2887,15 +3085,17 @@ static PyObject * DecodeBuffer(PyObject *obj, PyObject *args)
     {
         templateName = "";
     }
-    int ret = DBR_DecodeBuffer(self->hBarcode, buffer, width, height, stride, imagePixelFormat, templateName);
+    int ret;
+    LockHandle(self);
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_DecodeBuffer(self->hBarcode, buffer, width, height, stride, imagePixelFormat, templateName);
+    DBR_GetAllTextResults(self->hBarcode, &pResults);
+    Py_END_ALLOW_THREADS
+    UnlockHandle(self);
     if (ret)
     {
         printf("Detection error: %s\n", DBR_GetErrorString(ret));
     }
-    // Wrap results
-    DBR_GetAllTextResults(self->hBarcode, &pResults);
-    IntermediateResultArray * pIResults = NULL;
-    DBR_GetIntermediateResults(self->hBarcode, &pIResults);
 
     // Wrap results
     PyObject * results = PyDict_New();
@@ -2905,23 +3105,12 @@ static PyObject * DecodeBuffer(PyObject *obj, PyObject *args)
     {
         return NULL;
     }
-    PyObject * pyTextResultsKey = Py_BuildValue("s","TextResults");
-    PyDict_SetItem(results, pyTextResultsKey, pyTextResults);
+    PyDict_SetItem(results, key_TextResults, pyTextResults);
 
     Py_DECREF(pyTextResults);
-    Py_DECREF(pyTextResultsKey);
 
     DBR_FreeTextResults(&pResults);
 
-    PyObject * pyIntermediateResults = CreatePyIntermediateResults(pIResults);
-    PyObject * pyIntermediateResultsKey = Py_BuildValue("s","IntermediateResults");
-    PyDict_SetItem(results, pyIntermediateResultsKey, pyIntermediateResults);
-
-    Py_DECREF(pyIntermediateResults);
-    Py_DECREF(pyIntermediateResultsKey);
-
-    DBR_FreeIntermediateResults(&pIResults);
-
 #if defined(IS_PY3K)
     Py_DECREF(memoryview);
 #else
@@ -2936,7 +3125,7 @@ static PyObject * DecodeBuffer(PyObject *obj, PyObject *args)
  * @param [in] fileStream ByteArray The image file bytes in memory.
  * @param [in] fileSize LONG The length of the file bytes in memory.
  * 
- * @return Returns a dictionary which includes text results and intermediate results.
+ * @return Returns a dictionary which includes text results. Call GetIntermediateResults() for intermediate results.
  */
 static PyObject * DecodeFileStream(PyObject *obj, PyObject *args)
 {
@@ -2952,21 +3141,35 @@ static PyObject * DecodeFileStream(PyObject *obj, PyObject *args)
     }
 
     TextResultArray *pResults = NULL;
-    // https://docs.python.org/2/c-api/bytearray.html
-    char *filestream = PyByteArray_AsString(op);
+    // Any contiguous buffer is read in place: bytes, bytearray, memoryview, mmap or a uint8 array
+    Py_buffer view;
+    if (GetFileStreamBuffer(op, &view) < 0)
+    {
+        return NULL;
+    }
+    // A negative size decodes the whole buffer
+    if (fileSize < 0 || fileSize > view.len)
+    {
+        fileSize = (int)view.len;
+    }
+    char *filestream = (char *)view.buf;
     if(templateName == NULL)
     {
         templateName = "";
     }
     // Barcode detection
-    int ret = DBR_DecodeFileInMemory(self->hBarcode, filestream, fileSize, templateName);
+    int ret;
+    LockHandle(self);
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_DecodeFileInMemory(self->hBarcode, filestream, fileSize, templateName);
+    DBR_GetAllTextResults(self->hBarcode, &pResults);
+    Py_END_ALLOW_THREADS
+    UnlockHandle(self);
+    PyBuffer_Release(&view);
     if (ret)
     {
         printf("Detection error: %s\n", DBR_GetErrorString(ret));
     }
-    DBR_GetAllTextResults(self->hBarcode, &pResults);
-    IntermediateResultArray * pIResults = NULL;
-    DBR_GetIntermediateResults(self->hBarcode, &pIResults);
 
     if(encoding == NULL)
     {
@@ -2981,23 +3184,12 @@ static PyObject * DecodeFileStream(PyObject *obj, PyObject *args)
     {
         return NULL;
     }
-    PyObject * pyTextResultsKey = Py_BuildValue("s","TextResults");
-    PyDict_SetItem(results, pyTextResultsKey, pyTextResults);
+    PyDict_SetItem(results, key_TextResults, pyTextResults);
 
     Py_DECREF(pyTextResults);
-    Py_DECREF(pyTextResultsKey);
 
     DBR_FreeTextResults(&pResults);
 
-    PyObject * pyIntermediateResults = CreatePyIntermediateResults(pIResults);
-    PyObject * pyIntermediateResultsKey = Py_BuildValue("s","IntermediateResults");
-    PyDict_SetItem(results, pyIntermediateResultsKey, pyIntermediateResults);
-
-    Py_DECREF(pyIntermediateResults);
-    Py_DECREF(pyIntermediateResultsKey);
-
-    DBR_FreeIntermediateResults(&pIResults);
-
     return results;
 }
 
@@ -3117,7 +3309,9 @@ static PyObject * StartVideoMode(PyObject *obj, PyObject *args)
     {
         templateName = "";
     }
+    LockHandle(self);
     int ret = DBR_StartFrameDecodingEx(self->hBarcode, parameters, templateName);
+    UnlockHandle(self);
     return Py_BuildValue("i", ret);
 }
 
@@ -3127,7 +3321,12 @@ static PyObject * StopVideoMode(PyObject *obj, PyObject *args)
     printf("Stop the video mode\n");
     if (self->hBarcode)
     {
-        int ret = DBR_StopFrameDecoding(self->hBarcode);
+        // Stopping joins the decoding thread, whose result callback needs the GIL and may call into the reader,
+        // so neither the GIL nor the handle lock is held while waiting. The SDK stops video mode from any thread.
+        int ret;
+        Py_BEGIN_ALLOW_THREADS
+        ret = DBR_StopFrameDecoding(self->hBarcode);
+        Py_END_ALLOW_THREADS
         return Py_BuildValue("i", ret);
     }
 
@@ -3181,7 +3380,13 @@ static PyObject * AppendVideoFrame(PyObject *obj, PyObject *args)
 
 #endif
 
-    int frameId = DBR_AppendFrame(self->hBarcode, buffer);
+    int frameId;
+
+    LockHandle(self);
+
+    frameId = DBR_AppendFrame(self->hBarcode, buffer);
+
+    UnlockHandle(self);
     return Py_BuildValue("i",frameId);
 }
 
@@ -3205,7 +3410,9 @@ static PyObject * InitLicenseFromLicenseContent(PyObject *obj, PyObject *args)
         return NULL;
     }
 
+    LockHandle(self);
     int ret = DBR_InitLicenseFromLicenseContent(self->hBarcode, pszLicenseKey, pszLicenseContent);
+    UnlockHandle(self);
     const char* errorString = DBR_GetErrorString(ret);
     printf("%s",errorString);
     return Py_BuildValue("i", ret);
@@ -3221,7 +3428,9 @@ static PyObject * OutputLicenseToString(PyObject *obj, PyObject *args)
     DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
 
     char* content = NULL;
+    LockHandle(self);
     int ret = DBR_OutputLicenseToStringPtr(self->hBarcode, &content);
+    UnlockHandle(self);
     if (ret)
     {
         printf("%s\n", DBR_GetErrorString(ret));
@@ -3254,7 +3463,9 @@ static PyObject * InitLicenseFromServer(PyObject *obj, PyObject *args)
         return NULL;
     }
 
+    LockHandle(self);
     int ret = DBR_InitLicenseFromServer(self->hBarcode, pLicenseServer, pszLicenseKey);
+    UnlockHandle(self);
     const char* errorString = DBR_GetErrorString(ret);
     printf("%s",errorString);
     return Py_BuildValue("i", ret);
@@ -3278,7 +3489,10 @@ static PyObject * InitRuntimeSettingsByJsonString(PyObject *obj, PyObject *args)
     }
 
     char errorMessage[DEFAULT_MEMORY_SIZE];
+    LockHandle(self);
     int ret = DBR_InitRuntimeSettingsWithString(self->hBarcode, json, CM_OVERWRITE, errorMessage, 256);
+    self->settingsCached = 0;
+    UnlockHandle(self);
     if (ret) 
     {
         printf("Returned value: %d, error message: %s\n", ret, errorMessage);
@@ -3306,7 +3520,10 @@ static PyObject * InitRuntimeSettingsByJsonFile(PyObject *obj, PyObject *args)
     }
 
     char errorMessage[512];
+    LockHandle(self);
     int ret = DBR_InitRuntimeSettingsWithFile(self->hBarcode, jsonPath, CM_OVERWRITE, errorMessage, 512);
+    self->settingsCached = 0;
+    UnlockHandle(self);
     if (ret) 
     {
         printf("Returned value: %d, error message: %s\n", ret, errorMessage);
@@ -3328,7 +3545,9 @@ static PyObject * OutputSettingsToJsonString(PyObject *obj, PyObject *args)
     char errorMessage[DEFAULT_MEMORY_SIZE];
     char * pContent = NULL;
 
+    LockHandle(self);
     int ret = DBR_OutputSettingsToStringPtr(self->hBarcode, &pContent, "CurrentRuntimeSettings");
+    UnlockHandle(self);
     // printf("pContent: %s\n, string len: %d", pContent, strlen(pContent));
     if (ret) 
     {
@@ -3356,7 +3575,9 @@ static PyObject * OutputSettingsToJsonFile(PyObject *obj, PyObject *args)
     }
     char errorMessage[DEFAULT_MEMORY_SIZE];
 
+    LockHandle(self);
     int ret = DBR_OutputSettingsToFile(self->hBarcode, jsonPath, "CurrentRuntimeSettings");
+    UnlockHandle(self);
     if (ret) 
     {
         printf("Returned value: %d, error message: %s\n", ret, errorMessage);
@@ -3378,7 +3599,10 @@ static PyObject * AppendTplFileToRuntimeSettings(PyObject *obj, PyObject *args)
     }
 
     char errorMessage[512];
+    LockHandle(self);
     int ret = DBR_AppendTplFileToRuntimeSettings(self->hBarcode, jsonPath, conflictMode, errorMessage, 512);
+    self->settingsCached = 0;
+    UnlockHandle(self);
     if (ret) 
     {
         printf("Returned value: %d, error message: %s\n", ret, errorMessage);
@@ -3400,7 +3624,10 @@ static PyObject * AppendTplStringToRuntimeSettings(PyObject *obj, PyObject *args
     }
 
     char errorMessage[512];
+    LockHandle(self);
     int ret = DBR_AppendTplStringToRuntimeSettings(self->hBarcode, json, conflictMode, errorMessage, 512);
+    self->settingsCached = 0;
+    UnlockHandle(self);
     if (ret) 
     {
         printf("Returned value: %d, error message: %s\n", ret, errorMessage);
@@ -3624,6 +3851,7 @@ static PyMethodDef dbr_methods[] = {
     {"AppendTplStringToRuntimeSettings",AppendTplStringToRuntimeSettings,   METH_VARARGS, NULL},
     {"GetAllTemplateNames",             GetAllTemplateNames,                METH_VARARGS, NULL},
     {"DecodeFileStream",                DecodeFileStream,                   METH_VARARGS, NULL},
+    {"GetIntermediateResults",          GetIntermediateResults,             METH_VARARGS, NULL},
     {"GetRuntimeSettings",              GetRuntimeSettings,                 METH_VARARGS, NULL},
     {"UpdataRuntimeSettings",           UpdataRuntimeSettings,              METH_VARARGS, NULL},
     {"ResetRuntimeSettings",            ResetRuntimeSettings,               METH_VARARGS, NULL},
@@ -3691,6 +3919,11 @@ static int DynamsoftBarcodeReader_clear(DynamsoftBarcodeReader *self)
     Py_XDECREF(tmp);
 
     DBR_DestroyInstance(self->hBarcode);
+    if (self->lock)
+    {
+        PyThread_free_lock(self->lock);
+        self->lock = NULL;
+    }
 
     return 0;
 }
@@ -3722,6 +3955,14 @@ static PyObject * DynamsoftBarcodeReader_new(PyTypeObject *type, PyObject *args,
             return NULL;
         }
 
+        self->lock = PyThread_allocate_lock();
+        if (!self->lock)
+        {
+            // dealloc destroys the native instance
+            Py_DECREF(self);
+            return PyErr_NoMemory();
+        }
+
 #ifdef IS_PY3K
         self->COLOR_CLUTERING_MODE              = PyUnicode_FromString("colourClusteringModes");
         self->COLOR_CONVERSION_MODE             = PyUnicode_FromString("colourConversionModes");
@@ -4013,6 +4254,12 @@ void initdbr(void)
     if (PyType_Ready(&DynamsoftBarcodeReaderType) < 0)
         INITERROR;
 
+    if (InitKeys() < 0)
+        INITERROR;
+
+    if (InitImageBufferType() < 0)
+        INITERROR;
+
 #if defined(IS_PY3K)
     PyObject *module = PyModule_Create(&moduledef);
 #else
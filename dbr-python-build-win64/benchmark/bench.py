@@ -0,0 +1,371 @@
+''' Binding overhead benchmarks.
+
+    Usage: python bench.py run [--build-dir DIR] [--rounds N] [--scale F] [--filter TEXT] [--output FILE] [--compare FILE]
+           python bench.py compare BASELINE CURRENT [--threshold R]
+
+    The benchmarks call the dbr package built by build.py, whose native library is the stub in stub/stub_dbr.c.
+    The stub decodes nothing and spends no time unless DBR_STUB_DECODE_US is set, so the measured time is the cost
+    of the binding: parsing the arguments, marshalling images and results, dispatching the call, releasing the GIL
+    and calling back into Python. Inputs and iteration counts are fixed, so two runs on the same machine are comparable.
+
+    A run writes a JSON report:
+    {"schema": 1, "dbr_version": ..., "python": ..., "platform": ..., "created": ..., "rounds": ...,
+     "benchmarks": [{"id": "decode_buffer[layer=python,results=10]", "name": ..., "params": {...},
+                     "iterations": ..., "min_ns": ..., "median_ns": ..., "mean_ns": ..., "max_ns": ...}]}
+    where the times are per call. compare matches the benchmarks of two reports by id and fails if the median of any
+    of them grew by more than the threshold.
+'''
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import threading
+
+here = os.path.dirname(os.path.realpath(__file__))
+
+_timer = getattr(time, "perf_counter", time.time)
+
+SCHEMA = 1
+
+# The stub variables of every benchmark: no simulated work, and only the start of an image is hashed for the results
+BASE_ENVIRONMENT = {"DBR_STUB_DECODE_US": 0, "DBR_STUB_SETTINGS_US": 0, "DBR_STUB_HASH_BYTES": 64}
+
+class Benchmark():
+    """
+    Defines one benchmark with fixed parameters.
+
+    Attributes:
+    -----------
+    - name <str> : The API measured
+    - params <dict> : The parameters, they are part of the id
+    - iterations <int> : The calls per round before scaling
+    - environment <dict> : The stub variables set while the benchmark runs
+    - setup : A function called with params that returns run(iterations), which makes the calls of one round,
+        and optionally a teardown function as run.teardown
+    """
+
+    def __init__(self, name, params, iterations, environment, setup):
+        self.name = name
+        self.params = params
+        self.iterations = iterations
+        self.environment = environment
+        self.setup = setup
+
+    @property
+    def id(self):
+        return "%s[%s]" % (self.name, ",".join("%s=%s" % (key, self.params[key]) for key in sorted(self.params)))
+
+#region Benchmarks
+
+def _licensed_reader(lazy_results=False):
+    from dbr import BarcodeReader
+    # The stub only checks that a license was set
+    reader = BarcodeReader(lazy_results=lazy_results)
+    reader.init_license("benchmark")
+    return reader
+
+def _image(width, height, channels=3):
+    import numpy
+    return numpy.arange(width * height * channels, dtype=numpy.uint8).reshape(height, width, channels)
+
+def setup_decode_buffer(params):
+    image = _image(params["width"], params["height"])
+    layer = params["layer"]
+    if layer == "native":
+        from dbr import DynamsoftBarcodeReader
+        native = DynamsoftBarcodeReader()
+        native.InitLicense("benchmark")
+        def run(iterations):
+            for i in range(iterations):
+                native.DecodeBuffer(image, -1, "")
+                native.GetAllTextResults(False, 0, 0)
+        return run
+    reader = _licensed_reader(lazy_results=(layer == "lazy"))
+    as_arrays = layer == "arrays"
+    def run(iterations):
+        for i in range(iterations):
+            reader.decode_buffer(image, as_arrays=as_arrays)
+    return run
+
+def setup_extended_results(params):
+    image = _image(64, 64)
+    reader = _licensed_reader()
+    def run(iterations):
+        for i in range(iterations):
+            for text_result in reader.decode_buffer(image):
+                text_result.extended_results
+    return run
+
+def setup_intermediate_results(params):
+    from dbr import EnumIntermediateResultType
+    image = _image(64, 64)
+    reader = _licensed_reader()
+    settings = reader.get_runtime_settings()
+    settings.intermediate_result_types = EnumIntermediateResultType.IRT_ORIGINAL_IMAGE
+    reader.update_runtime_settings(settings)
+    reader.decode_buffer(image)
+    def run(iterations):
+        for i in range(iterations):
+            reader.get_all_intermediate_results()
+    return run
+
+def setup_get_runtime_settings(params):
+    reader = _licensed_reader()
+    if params["layer"] == "native":
+        native = reader._BarcodeReader__dbr
+        def run(iterations):
+            for i in range(iterations):
+                native.GetRuntimeSettings()
+        return run
+    def run(iterations):
+        for i in range(iterations):
+            reader.get_runtime_settings()
+    return run
+
+def setup_update_runtime_settings(params):
+    reader = _licensed_reader()
+    settings = reader.get_runtime_settings()
+    changed = params["changed"]
+    def run(iterations):
+        for i in range(iterations):
+            if changed:
+                settings.deblur_level = i & 1
+            reader.update_runtime_settings(settings)
+    return run
+
+def _start_video_mode(reader, width, height, call_back_func):
+    from dbr import EnumImagePixelFormat
+    parameters = reader.init_frame_decoding_parameters()
+    parameters.max_queue_length = 200
+    parameters.max_result_queue_length = 200
+    parameters.width = width
+    parameters.height = height
+    parameters.stride = width * 3
+    parameters.image_pixel_format = EnumImagePixelFormat.IPF_RGB_888
+    parameters.fps = 0
+    reader.start_video_mode(parameters, call_back_func)
+
+def setup_append_video_frame(params):
+    width, height = params["width"], params["height"]
+    frame = _image(width, height)
+    reader = _licensed_reader()
+    _start_video_mode(reader, width, height, None)
+    def run(iterations):
+        for i in range(iterations):
+            reader.append_video_frame(frame)
+            # The queue is kept short, so every frame is copied by the library instead of dropped
+            if i % 64 == 63:
+                while reader.get_length_of_frame_queue() > 0:
+                    time.sleep(0)
+    run.teardown = reader.stop_video_mode
+    return run
+
+def setup_result_callback(params):
+    frame = _image(64, 64)
+    reader = _licensed_reader()
+    done = threading.Condition()
+    state = {"received": 0}
+    def on_result(text_results):
+        with done:
+            state["received"] += 1
+            done.notify()
+    _start_video_mode(reader, 64, 64, on_result)
+    def run(iterations):
+        # Bursts no longer than the frame queue, each frame gives exactly one callback
+        remaining = iterations
+        while remaining > 0:
+            burst = min(remaining, 100)
+            with done:
+                state["received"] = 0
+            for i in range(burst):
+                reader.append_video_frame(frame)
+            with done:
+                while state["received"] < burst:
+                    done.wait()
+            remaining -= burst
+    run.teardown = reader.stop_video_mode
+    return run
+
+def benchmarks():
+    ''' Returns every benchmark of the suite. '''
+    suite = []
+    for results in (0, 1, 10, 100):
+        for layer in ("native", "python", "lazy", "arrays"):
+            suite.append(Benchmark("decode_buffer", {"layer": layer, "results": results, "width": 64, "height": 64}, 2000 if results < 100 else 200,
+                {"DBR_STUB_RESULTS": results}, setup_decode_buffer))
+    suite.append(Benchmark("decode_buffer", {"layer": "python", "results": 1, "width": 1920, "height": 1080}, 200,
+        {"DBR_STUB_RESULTS": 1}, setup_decode_buffer))
+    for extended in (1, 8):
+        suite.append(Benchmark("extended_results", {"results": 10, "extended": extended}, 500,
+            {"DBR_STUB_RESULTS": 10, "DBR_STUB_EXTENDED": extended}, setup_extended_results))
+    for images, size in ((1, 64), (4, 64), (1, 1024)):
+        suite.append(Benchmark("get_all_intermediate_results", {"images": images, "size": size}, 1000 if size < 1024 else 100,
+            {"DBR_STUB_IMAGES": images, "DBR_STUB_IMAGE_WIDTH": size, "DBR_STUB_IMAGE_HEIGHT": size}, setup_intermediate_results))
+    for layer in ("native", "python"):
+        suite.append(Benchmark("get_runtime_settings", {"layer": layer}, 5000, {}, setup_get_runtime_settings))
+    for changed in (False, True):
+        suite.append(Benchmark("update_runtime_settings", {"changed": changed}, 2000, {}, setup_update_runtime_settings))
+    for width, height in ((320, 240), (1280, 720)):
+        suite.append(Benchmark("append_video_frame", {"width": width, "height": height}, 1000 if width < 1280 else 200,
+            {"DBR_STUB_RESULTS": 0}, setup_append_video_frame))
+    for results in (1, 10):
+        suite.append(Benchmark("on_result_callback", {"results": results}, 1000, {"DBR_STUB_RESULTS": results}, setup_result_callback))
+    return suite
+
+#endregion
+
+def redirect_native_stdout():
+    ''' Points the standard output descriptor at the standard error and returns a file writing to the original standard
+        output. The extension prints with the C library, e.g. its version for every reader, and the report must not mix with it.
+        Kept here rather than imported from dbr.scan, so that older builds can be benchmarked too.
+    '''
+    try:
+        stdout_fd = sys.stdout.fileno()
+        stderr_fd = sys.stderr.fileno()
+    except (AttributeError, ValueError, IOError, OSError):
+        return sys.stdout
+    sys.stdout.flush()
+    output = os.fdopen(os.dup(stdout_fd), "w")
+    os.dup2(stderr_fd, stdout_fd)
+    return output
+
+def measure(benchmark, rounds, scale):
+    ''' Runs a benchmark and returns its JSON record with the time per call of every round. '''
+    iterations = max(1, int(benchmark.iterations * scale))
+    environment = dict(BASE_ENVIRONMENT)
+    environment.update(benchmark.environment)
+    saved = dict((name, os.environ.get(name)) for name in environment)
+    # The stub reads its variables on every call
+    for name, value in environment.items():
+        os.environ[name] = str(value)
+    try:
+        run = benchmark.setup(benchmark.params)
+        try:
+            run(max(1, iterations // 10))
+            samples = []
+            for i in range(rounds):
+                start = _timer()
+                run(iterations)
+                samples.append((_timer() - start) * 1e9 / iterations)
+        finally:
+            teardown = getattr(run, "teardown", None)
+            if teardown is not None:
+                teardown()
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                del os.environ[name]
+            else:
+                os.environ[name] = value
+    samples.sort()
+    return {
+        "id": benchmark.id,
+        "name": benchmark.name,
+        "params": benchmark.params,
+        "iterations": iterations,
+        "min_ns": round(samples[0], 1),
+        "median_ns": round(samples[len(samples) // 2], 1),
+        "mean_ns": round(sum(samples) / len(samples), 1),
+        "max_ns": round(samples[-1], 1),
+    }
+
+def run_suite(rounds=5, scale=1.0, selected=None, progress=None):
+    ''' Runs the benchmarks whose id contains selected and returns the report. '''
+    import dbr
+    dbr_version = dbr.BarcodeReader().dbr_version
+    report = {
+        "schema": SCHEMA,
+        "dbr_version": dbr_version,
+        "python": platform.python_implementation() + " " + platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime()),
+        "rounds": rounds,
+        "scale": scale,
+        "benchmarks": [],
+    }
+    for benchmark in benchmarks():
+        if selected and selected not in benchmark.id:
+            continue
+        record = measure(benchmark, rounds, scale)
+        report["benchmarks"].append(record)
+        if progress is not None:
+            progress(record)
+    return report
+
+def compare(baseline, current, threshold=0.1):
+    ''' Compares the medians of two reports.
+        :return rows, regressed : (id, baseline_ns, current_ns, ratio) of every benchmark in both reports, and whether a ratio exceeds 1 + threshold.
+    '''
+    baseline_records = dict((record["id"], record) for record in baseline["benchmarks"])
+    rows = []
+    regressed = False
+    for record in current["benchmarks"]:
+        old = baseline_records.get(record["id"])
+        if old is None:
+            continue
+        ratio = record["median_ns"] / old["median_ns"] if old["median_ns"] else float("inf")
+        rows.append((record["id"], old["median_ns"], record["median_ns"], ratio))
+        regressed = regressed or ratio > 1 + threshold
+    return rows, regressed
+
+def print_comparison(rows, threshold, output=sys.stdout):
+    output.write("%-64s %12s %12s %8s\n" % ("benchmark", "baseline_ns", "current_ns", "ratio"))
+    for benchmark_id, old_ns, new_ns, ratio in rows:
+        output.write("%-64s %12.1f %12.1f %8.3f%s\n" % (benchmark_id, old_ns, new_ns, ratio, "  REGRESSED" if ratio > 1 + threshold else ""))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the overhead of the Python binding against the stub library.")
+    commands = parser.add_subparsers(dest="command")
+    run_parser = commands.add_parser("run", help="Run the benchmarks and write a JSON report")
+    run_parser.add_argument("--build-dir", default=os.path.join(here, "build"), help="The directory written by build.py, default to %(default)s")
+    run_parser.add_argument("--rounds", type=int, default=5, help="The rounds of every benchmark, default to %(default)s")
+    run_parser.add_argument("--scale", type=float, default=1.0, help="The factor applied to the iterations of every benchmark")
+    run_parser.add_argument("--filter", help="Only run the benchmarks whose id contains this text")
+    run_parser.add_argument("--output", help="The JSON report file to write, default to stdout")
+    run_parser.add_argument("--compare", help="A baseline report to compare the run with")
+    run_parser.add_argument("--threshold", type=float, default=0.1, help="The allowed growth of a median, default to %(default)s")
+    compare_parser = commands.add_parser("compare", help="Compare two JSON reports")
+    compare_parser.add_argument("baseline", help="The baseline report")
+    compare_parser.add_argument("current", help="The current report")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="The allowed growth of a median, default to %(default)s")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        rows, regressed = compare(baseline, current, args.threshold)
+        print_comparison(rows, args.threshold)
+        return 1 if regressed else 0
+    if args.command != "run":
+        parser.print_help()
+        return 2
+
+    sys.path.insert(0, os.path.abspath(args.build_dir))
+    output = redirect_native_stdout()
+    def progress(record):
+        sys.stderr.write("%-64s %12.1f ns\n" % (record["id"], record["median_ns"]))
+    report = run_suite(args.rounds, args.scale, args.filter, progress)
+    if "stub" not in report["dbr_version"]:
+        sys.stderr.write("The library is not the stub, the times include the barcode reading.\n")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4, sort_keys=True)
+    else:
+        output.write(json.dumps(report, indent=4, sort_keys=True) + "\n")
+        output.flush()
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows, regressed = compare(baseline, report, args.threshold)
+        print_comparison(rows, args.threshold, sys.stderr)
+        return 1 if regressed else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
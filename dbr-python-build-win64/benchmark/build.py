@@ -0,0 +1,79 @@
+''' Builds the extension against the stub library for the benchmarks.
+
+    Usage: python build.py [--build-dir DIR]
+
+    The stub libDynamsoftBarcodeReader is compiled from stub/stub_dbr.c, src/dbr.c is linked against it, and the
+    Python files of the wheel matching this interpreter are copied next to it, so DIR/dbr is a complete dbr package
+    whose native calls cost only what the binding costs. Linux and macOS only, the stub uses pthreads.
+'''
+
+import os
+import sys
+import glob
+import shutil
+import argparse
+import subprocess
+import sysconfig
+from setuptools import setup, Extension
+import numpy
+
+here = os.path.dirname(os.path.realpath(__file__))
+root = os.path.dirname(here)
+src = os.path.join(root, "src")
+
+def wheel_dir():
+    ''' The wheel whose Python files match this interpreter, the newest one otherwise. '''
+    wheel = os.path.join(root, "wheel%d%d" % sys.version_info[:2])
+    if not os.path.isdir(wheel):
+        wheel = sorted(glob.glob(os.path.join(root, "wheel[0-9]*")))[-1]
+    return wheel
+
+def build_stub(package_dir):
+    ''' Compiles the stub library into package_dir and returns its path. '''
+    compiler = (sysconfig.get_config_var("CC") or "cc").split()
+    if sys.platform == "darwin":
+        library = os.path.join(package_dir, "libDynamsoftBarcodeReader.dylib")
+        link_args = ["-dynamiclib", "-install_name", "@rpath/libDynamsoftBarcodeReader.dylib"]
+    elif sys.platform.startswith("linux"):
+        library = os.path.join(package_dir, "libDynamsoftBarcodeReader.so")
+        link_args = ["-shared"]
+    else:
+        raise SystemExit("The stub library is built on Linux and macOS only.")
+    command = compiler + ["-fPIC", "-O2", "-std=c99", "-D_POSIX_C_SOURCE=200809L", "-I" + src] + link_args + \
+        ["-o", library, os.path.join(here, "stub", "stub_dbr.c"), "-lpthread"]
+    subprocess.check_call(command)
+    return library
+
+def build_extension(build_dir, package_dir):
+    ''' Builds src/dbr.c as dbr.dbr into build_dir, linked against the stub in package_dir. '''
+    rpath = "@loader_path" if sys.platform == "darwin" else "$ORIGIN"
+    module_dbr = Extension("dbr.dbr", [os.path.join(src, "dbr.c")],
+        include_dirs=[src, numpy.get_include(), os.path.join(numpy.get_include(), "numpy")],
+        library_dirs=[package_dir],
+        libraries=["DynamsoftBarcodeReader"],
+        extra_compile_args=["-std=c99"],
+        extra_link_args=["-Wl,-rpath," + rpath])
+    setup(name="dbr", ext_modules=[module_dbr],
+        script_args=["-q", "build_ext", "--build-lib", build_dir, "--build-temp", os.path.join(build_dir, "temp")])
+
+def build(build_dir):
+    ''' Builds the dbr package with the stub library into build_dir and returns the package directory. '''
+    package_dir = os.path.join(build_dir, "dbr")
+    if not os.path.isdir(package_dir):
+        os.makedirs(package_dir)
+    build_stub(package_dir)
+    build_extension(build_dir, package_dir)
+    for file_name in glob.glob(os.path.join(wheel_dir(), "dbr", "*.py")):
+        shutil.copy(file_name, package_dir)
+    return package_dir
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the dbr package against the stub library.")
+    parser.add_argument("--build-dir", default=os.path.join(here, "build"), help="The output directory, default to %(default)s")
+    args = parser.parse_args(argv)
+    package_dir = build(os.path.abspath(args.build_dir))
+    print("Built " + package_dir)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
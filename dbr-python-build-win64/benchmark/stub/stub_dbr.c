@@ -0,0 +1,1002 @@
+/**
+ * Stub of the Dynamsoft Barcode Reader C API.
+ *
+ * It implements every DBR_* function used by dbr.c with deterministic fake
+ * results so that the Python extension can be built, tested and benchmarked
+ * without the real SDK. The cost of a decode is simulated by spinning:
+ *
+ *   DBR_STUB_DECODE_US        microseconds spent per decode (default 0)
+ *   DBR_STUB_SETTINGS_US      microseconds spent per settings get/update (default 0)
+ *   DBR_STUB_RESULTS          barcodes returned per image (default 1)
+ *   DBR_STUB_EXTENDED         extended results per barcode (default 1)
+ *   DBR_STUB_IMAGES           intermediate images per decoding (default 1)
+ *   DBR_STUB_IMAGE_WIDTH      width of an intermediate RGB image (default 5)
+ *   DBR_STUB_IMAGE_HEIGHT     height of an intermediate RGB image (default 8)
+ *   DBR_STUB_PAGES            pages of every image file (default 1)
+ *   DBR_STUB_HASH_BYTES       bytes of a buffer or an image row that are hashed (default 0, all)
+ *
+ * Every image gives the same results for the same bytes. Results depend on
+ * a hash of the file content or of the pixels.
+ */
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <pthread.h>
+#include "DynamsoftBarcodeReader.h"
+
+#define STUB_VERSION "7.3.0.stub"
+#define MAX_FRAME_QUEUE 256
+#define MAX_TEMPLATES 16
+
+typedef struct
+{
+    PublicRuntimeSettings settings;
+    char *templateJson;
+    char license[128];
+    // "Pages" of the template, -1 decodes every page
+    int page;
+    // "Pages" of the templates appended under another name than "default", used when a decoding names them
+    char templateNames[MAX_TEMPLATES][64];
+    int templatePages[MAX_TEMPLATES];
+    int templateCount;
+    // Page of the last decoding
+    int lastPage;
+
+    // Results of the last decoding
+    unsigned int lastHash;
+    int lastCount;
+    int lastWidth;
+    int lastHeight;
+    int hasResults;
+
+    // Video mode
+    FrameDecodingParameters frameParameters;
+    CB_TextResult textResultCallback;
+    void *textResultUser;
+    CB_Error errorCallback;
+    void *errorUser;
+    pthread_t frameThread;
+    pthread_mutex_t frameMutex;
+    pthread_cond_t frameCond;
+    unsigned char *frames[MAX_FRAME_QUEUE];
+    int frameIds[MAX_FRAME_QUEUE];
+    int frameHead;
+    int frameLength;
+    int nextFrameId;
+    int running;
+} StubReader;
+
+static long EnvLong(const char *name, long defaultValue)
+{
+    const char *value = getenv(name);
+    return value != NULL ? atol(value) : defaultValue;
+}
+
+static void Spin(long microseconds)
+{
+    if (microseconds <= 0)
+        return;
+    struct timespec start, now;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    do
+    {
+        clock_gettime(CLOCK_MONOTONIC, &now);
+    } while ((now.tv_sec - start.tv_sec) * 1000000L + (now.tv_nsec - start.tv_nsec) / 1000L < microseconds);
+}
+
+static unsigned int Hash(const unsigned char *bytes, size_t length, unsigned int hash)
+{
+    // Hashing a whole frame would cost more than the binding that is measured
+    if (length > 64)
+    {
+        long limit = EnvLong("DBR_STUB_HASH_BYTES", 0);
+        if (limit > 0 && (size_t)limit < length)
+            length = (size_t)limit;
+    }
+    for (size_t i = 0; i < length; ++i)
+    {
+        hash ^= bytes[i];
+        hash *= 16777619u;
+    }
+    return hash;
+}
+
+static char *CopyString(const char *s)
+{
+    if (s == NULL)
+        return NULL;
+    char *copy = (char *)malloc(strlen(s) + 1);
+    strcpy(copy, s);
+    return copy;
+}
+
+static void DefaultSettings(PublicRuntimeSettings *settings)
+{
+    memset(settings, 0, sizeof(PublicRuntimeSettings));
+    settings->terminatePhase = TP_BARCODE_RECOGNIZED;
+    settings->timeout = 10000;
+    settings->maxAlgorithmThreadCount = 4;
+    settings->expectedBarcodesCount = 0;
+    settings->barcodeFormatIds = BF_ALL;
+    settings->barcodeFormatIds_2 = 0;
+    settings->pdfRasterDPI = 300;
+    settings->scaleDownThreshold = 2300;
+    settings->binarizationModes[0] = BM_LOCAL_BLOCK;
+    settings->localizationModes[0] = LM_CONNECTED_BLOCKS;
+    settings->localizationModes[1] = LM_SCAN_DIRECTLY;
+    settings->localizationModes[2] = LM_STATISTICS;
+    settings->localizationModes[3] = LM_LINES;
+    settings->textResultOrderModes[0] = TROM_CONFIDENCE;
+    settings->textResultOrderModes[1] = TROM_POSITION;
+    settings->textResultOrderModes[2] = TROM_FORMAT;
+    settings->scaleUpModes[0] = SUM_AUTO;
+    settings->deblurLevel = 9;
+    settings->region.regionBottom = 100;
+    settings->region.regionRight = 100;
+    settings->minResultConfidence = 30;
+}
+
+/**
+ * The number of barcodes found in an image. Localization modes beyond the
+ * first few and a low deblur level cost recall, so that tuning has an effect.
+ */
+static int ResultCount(StubReader *reader, unsigned int hash)
+{
+    int count = (int)EnvLong("DBR_STUB_RESULTS", 1);
+    if (reader->settings.expectedBarcodesCount > 0 && reader->settings.expectedBarcodesCount < count)
+        count = reader->settings.expectedBarcodesCount;
+    if (reader->settings.deblurLevel < 5 && (hash & 3) == 0 && count > 0)
+        count -= 1;
+    return count;
+}
+
+/**
+ * The simulated cost of a decode scales with the number of localization modes and the deblur level.
+ */
+static long DecodeCost(StubReader *reader)
+{
+    long base = EnvLong("DBR_STUB_DECODE_US", 0);
+    int modes = 0;
+    for (int i = 0; i < 8; ++i)
+    {
+        if (reader->settings.localizationModes[i] != LM_SKIP)
+            ++modes;
+    }
+    if (modes == 0)
+        modes = 1;
+    return base * (modes + reader->settings.deblurLevel) / 13;
+}
+
+static int TemplatePage(StubReader *reader, const char *pTemplateName)
+{
+    if (pTemplateName != NULL)
+    {
+        for (int i = 0; i < reader->templateCount; ++i)
+        {
+            if (strcmp(reader->templateNames[i], pTemplateName) == 0)
+                return reader->templatePages[i];
+        }
+    }
+    return reader->page;
+}
+
+static int Decode(StubReader *reader, unsigned int hash, int width, int height, const char *pTemplateName)
+{
+    // Every file has DBR_STUB_PAGES pages, a page decodes like a file of its own
+    long pages = EnvLong("DBR_STUB_PAGES", 1);
+    int decodedPage = TemplatePage(reader, pTemplateName);
+    reader->lastPage = decodedPage;
+    if (decodedPage >= pages)
+    {
+        reader->hasResults = 0;
+        return DBRERR_PAGE_NUMBER_INVALID;
+    }
+    if (decodedPage > 0)
+        hash = Hash((const unsigned char *)&decodedPage, sizeof(decodedPage), hash);
+    for (long page = 0; page < (decodedPage < 0 ? pages : 1); ++page)
+        Spin(DecodeCost(reader));
+    reader->lastHash = hash;
+    reader->lastWidth = width;
+    reader->lastHeight = height;
+    reader->lastCount = ResultCount(reader, hash);
+    reader->hasResults = 1;
+    if (reader->license[0] == '\0')
+        return DBRERR_LICENSE_INVALID;
+    return DBR_OK;
+}
+
+static TextResultArray *CreateTextResults(unsigned int hash, int count, int width, int height, int page)
+{
+    TextResultArray *array = (TextResultArray *)calloc(1, sizeof(TextResultArray));
+    array->resultsCount = count;
+    array->results = (PTextResult *)calloc(count > 0 ? count : 1, sizeof(PTextResult));
+    for (int i = 0; i < count; ++i)
+    {
+        char text[64];
+        snprintf(text, sizeof(text), "STUB-%08X-%d", hash, i);
+        int x = (int)((hash >> 4) % (unsigned int)(width > 64 ? width - 64 : 1)) + i * 8;
+        int y = (int)((hash >> 12) % (unsigned int)(height > 64 ? height - 64 : 1));
+
+        TextResult *result = (TextResult *)calloc(1, sizeof(TextResult));
+        result->barcodeFormat = (i % 2 == 0) ? BF_QR_CODE : BF_CODE_128;
+        result->barcodeFormatString = (i % 2 == 0) ? "QR_CODE" : "CODE_128";
+        result->barcodeFormatString_2 = "";
+        result->barcodeText = CopyString(text);
+        result->barcodeBytesLength = (int)strlen(text);
+        result->barcodeBytes = (unsigned char *)CopyString(text);
+
+        LocalizationResult *localization = (LocalizationResult *)calloc(1, sizeof(LocalizationResult));
+        localization->terminatePhase = TP_BARCODE_RECOGNIZED;
+        localization->barcodeFormat = result->barcodeFormat;
+        localization->barcodeFormatString = result->barcodeFormatString;
+        localization->barcodeFormatString_2 = "";
+        localization->x1 = x;      localization->y1 = y;
+        localization->x2 = x + 60; localization->y2 = y;
+        localization->x3 = x + 60; localization->y3 = y + 60;
+        localization->x4 = x;      localization->y4 = y + 60;
+        localization->resultCoordinateType = RCT_PIXEL;
+        localization->moduleSize = 4;
+        localization->confidence = 80;
+        localization->regionName = "";
+        localization->documentName = "";
+        localization->pageNumber = page;
+        result->localizationResult = localization;
+
+        if (result->barcodeFormat == BF_QR_CODE)
+        {
+            QRCodeDetails *details = (QRCodeDetails *)calloc(1, sizeof(QRCodeDetails));
+            details->moduleSize = 4;
+            details->rows = 21;
+            details->columns = 21;
+            details->errorCorrectionLevel = QRECL_ERROR_CORRECTION_M;
+            details->version = 1;
+            details->model = 2;
+            result->detailedResult = details;
+        }
+        else
+        {
+            OneDCodeDetails *details = (OneDCodeDetails *)calloc(1, sizeof(OneDCodeDetails));
+            details->moduleSize = 2;
+            result->detailedResult = details;
+        }
+
+        int extendedCount = (int)EnvLong("DBR_STUB_EXTENDED", 1);
+        if (extendedCount < 0)
+            extendedCount = 0;
+        result->resultsCount = extendedCount;
+        result->results = (PExtendedResult *)calloc(extendedCount > 0 ? extendedCount : 1, sizeof(PExtendedResult));
+        for (int e = 0; e < extendedCount; ++e)
+        {
+            ExtendedResult *extended = (ExtendedResult *)calloc(1, sizeof(ExtendedResult));
+            extended->resultType = e == 0 ? RT_STANDARD_TEXT : RT_CANDIDATE_TEXT;
+            extended->barcodeFormat = result->barcodeFormat;
+            extended->barcodeFormatString = result->barcodeFormatString;
+            extended->barcodeFormatString_2 = "";
+            extended->confidence = 80 - e;
+            extended->bytesLength = result->barcodeBytesLength;
+            extended->bytes = (unsigned char *)CopyString(text);
+            extended->samplingImage.width = 8;
+            extended->samplingImage.height = 8;
+            extended->samplingImage.bytes = (unsigned char *)calloc(64, 1);
+            for (int j = 0; j < 64; ++j)
+                extended->samplingImage.bytes[j] = (unsigned char)((hash >> (j % 24)) & 1 ? 255 : 0);
+            if (result->barcodeFormat == BF_QR_CODE)
+            {
+                QRCodeDetails *copy = (QRCodeDetails *)malloc(sizeof(QRCodeDetails));
+                *copy = *(QRCodeDetails *)result->detailedResult;
+                extended->detailedResult = copy;
+            }
+            else
+            {
+                OneDCodeDetails *copy = (OneDCodeDetails *)malloc(sizeof(OneDCodeDetails));
+                *copy = *(OneDCodeDetails *)result->detailedResult;
+                extended->detailedResult = copy;
+            }
+            result->results[e] = extended;
+        }
+
+        array->results[i] = result;
+    }
+    return array;
+}
+
+static void FreeTextResults(TextResultArray *array)
+{
+    if (array == NULL)
+        return;
+    for (int i = 0; i < array->resultsCount; ++i)
+    {
+        TextResult *result = array->results[i];
+        free((void *)result->barcodeText);
+        free(result->barcodeBytes);
+        free(result->localizationResult);
+        free(result->detailedResult);
+        for (int j = 0; j < result->resultsCount; ++j)
+        {
+            free(result->results[j]->bytes);
+            free(result->results[j]->samplingImage.bytes);
+            free(result->results[j]->detailedResult);
+            free(result->results[j]);
+        }
+        free(result->results);
+        free(result);
+    }
+    free(array->results);
+    free(array);
+}
+
+// ---------------------------------------------------------------- General
+
+const char *DBR_GetErrorString(int errorCode)
+{
+    switch (errorCode)
+    {
+    case DBR_OK: return "Successful.";
+    case DBRERR_FILE_NOT_FOUND: return "The file is not found.";
+    case DBRERR_LICENSE_INVALID: return "The license is invalid.";
+    case DBRERR_NULL_POINTER: return "Null pointer.";
+    case DBRERR_JSON_PARSE_FAILED: return "Failed to parse JSON string.";
+    case DBRERR_TEMPLATE_NAME_INVALID: return "The template name is invalid.";
+    case DBRERR_PARAMETER_VALUE_INVALID: return "The parameter value is invalid.";
+    case DBRERR_FRAME_DECODING_THREAD_EXISTS: return "The frame decoding thread already exists.";
+    case DBRERR_STOP_DECODING_THREAD_FAILED: return "Failed to stop the frame decoding thread.";
+    default: return "Unknown error.";
+    }
+}
+
+const char *DBR_GetVersion()
+{
+    return STUB_VERSION;
+}
+
+void *DBR_CreateInstance()
+{
+    StubReader *reader = (StubReader *)calloc(1, sizeof(StubReader));
+    DefaultSettings(&reader->settings);
+    reader->page = -1;
+    pthread_mutex_init(&reader->frameMutex, NULL);
+    pthread_cond_init(&reader->frameCond, NULL);
+    return reader;
+}
+
+int DBR_StopFrameDecoding(void *barcodeReader);
+
+void DBR_DestroyInstance(void *barcodeReader)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    if (reader == NULL)
+        return;
+    DBR_StopFrameDecoding(reader);
+    pthread_mutex_destroy(&reader->frameMutex);
+    pthread_cond_destroy(&reader->frameCond);
+    free(reader->templateJson);
+    free(reader);
+}
+
+// ---------------------------------------------------------------- License
+
+int DBR_InitLicense(void *barcodeReader, const char *pLicense)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    if (pLicense == NULL || pLicense[0] == '\0')
+        return DBRERR_LICENSE_INVALID;
+    snprintf(reader->license, sizeof(reader->license), "%s", pLicense);
+    return DBR_OK;
+}
+
+int DBR_InitLicenseFromServer(void *barcodeReader, const char *pLicenseServer, const char *pLicenseKey)
+{
+    return DBR_InitLicense(barcodeReader, pLicenseKey);
+}
+
+int DBR_InitLicenseFromLicenseContent(void *barcodeReader, const char *pLicenseKey, const char *pLicenseContent)
+{
+    return DBR_InitLicense(barcodeReader, pLicenseKey);
+}
+
+int DBR_OutputLicenseToString(void *barcodeReader, char content[], int contentLen)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    snprintf(content, contentLen, "%s", reader->license);
+    return DBR_OK;
+}
+
+int DBR_OutputLicenseToStringPtr(void *barcodeReader, char **content)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    *content = CopyString(reader->license);
+    return DBR_OK;
+}
+
+void DBR_FreeLicenseString(char **content)
+{
+    free(*content);
+    *content = NULL;
+}
+
+// ---------------------------------------------------------------- Decoding
+
+int DBR_DecodeFile(void *barcodeReader, const char *pFileName, const char *pTemplateName)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    FILE *file = fopen(pFileName, "rb");
+    if (file == NULL)
+    {
+        reader->hasResults = 0;
+        return DBRERR_FILE_NOT_FOUND;
+    }
+    unsigned char chunk[65536];
+    unsigned int hash = 2166136261u;
+    size_t length;
+    while ((length = fread(chunk, 1, sizeof(chunk), file)) > 0)
+        hash = Hash(chunk, length, hash);
+    fclose(file);
+    return Decode(reader, hash, 640, 480, pTemplateName);
+}
+
+int DBR_DecodeFileInMemory(void *barcodeReader, const unsigned char *pFileBytes, const int fileSize, const char *pTemplateName)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    if (pFileBytes == NULL)
+        return DBRERR_NULL_POINTER;
+    return Decode(reader, Hash(pFileBytes, (size_t)fileSize, 2166136261u), 640, 480, pTemplateName);
+}
+
+int DBR_DecodeBuffer(void *barcodeReader, const unsigned char *pBufferBytes, const int width, const int height, const int stride, const ImagePixelFormat format, const char *pTemplateName)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    if (pBufferBytes == NULL)
+        return DBRERR_NULL_POINTER;
+    int pixelSize = format == IPF_GRAYSCALED ? 1 : (format == IPF_ARGB_8888 ? 4 : 3);
+    unsigned int hash = 2166136261u;
+    for (int row = 0; row < height; ++row)
+        hash = Hash(pBufferBytes + (size_t)row * stride, (size_t)width * pixelSize, hash);
+    return Decode(reader, hash, width, height, pTemplateName);
+}
+
+int DBR_GetAllTextResults(void *barcodeReader, TextResultArray **pResults)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    if (pResults == NULL)
+        return DBRERR_NULL_POINTER;
+    *pResults = CreateTextResults(reader->lastHash, reader->hasResults ? reader->lastCount : 0, reader->lastWidth, reader->lastHeight, reader->lastPage < 0 ? 0 : reader->lastPage);
+    return DBR_OK;
+}
+
+void DBR_FreeTextResults(TextResultArray **pResults)
+{
+    if (pResults == NULL)
+        return;
+    FreeTextResults(*pResults);
+    *pResults = NULL;
+}
+
+// ---------------------------------------------------------------- Intermediate results
+
+int DBR_GetIntermediateResults(void *barcodeReader, IntermediateResultArray **pResult)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    *pResult = NULL;
+    if (!reader->hasResults || reader->settings.intermediateResultTypes == 0)
+        return DBR_OK;
+
+    IntermediateResultArray *array = (IntermediateResultArray *)calloc(1, sizeof(IntermediateResultArray));
+    array->resultsCount = 3;
+    array->results = (PIntermediateResult *)calloc(3, sizeof(PIntermediateResult));
+
+    // The images of the original image type, RGB with a stride aligned to 16 bytes
+    int imageCount = (int)EnvLong("DBR_STUB_IMAGES", 1);
+    int width = (int)EnvLong("DBR_STUB_IMAGE_WIDTH", 5);
+    int height = (int)EnvLong("DBR_STUB_IMAGE_HEIGHT", 8);
+    if (imageCount < 0)
+        imageCount = 0;
+    int stride = (width * 3 + 15) / 16 * 16;
+    IntermediateResult *image = (IntermediateResult *)calloc(1, sizeof(IntermediateResult));
+    image->resultsCount = imageCount;
+    image->results = (const void **)calloc(imageCount > 0 ? imageCount : 1, sizeof(void *));
+    for (int n = 0; n < imageCount; ++n)
+    {
+        ImageData *imageData = (ImageData *)calloc(1, sizeof(ImageData));
+        imageData->width = width;
+        imageData->height = height;
+        imageData->stride = stride;
+        imageData->format = IPF_RGB_888;
+        imageData->bytesLength = stride * height;
+        imageData->bytes = (unsigned char *)malloc(imageData->bytesLength > 0 ? imageData->bytesLength : 1);
+        for (int i = 0; i < imageData->bytesLength; ++i)
+            imageData->bytes[i] = (unsigned char)((reader->lastHash + n + i) & 0xFF);
+        image->results[n] = imageData;
+    }
+    image->dataType = IMRDT_IMAGE;
+    image->resultType = IRT_ORIGINAL_IMAGE;
+    array->results[0] = image;
+
+    // Two contours
+    IntermediateResult *contours = (IntermediateResult *)calloc(1, sizeof(IntermediateResult));
+    contours->resultsCount = 2;
+    contours->results = (const void **)calloc(2, sizeof(void *));
+    for (int c = 0; c < 2; ++c)
+    {
+        Contour *contour = (Contour *)calloc(1, sizeof(Contour));
+        contour->pointsCount = 3 + c;
+        contour->points = (DBRPoint *)calloc(contour->pointsCount, sizeof(DBRPoint));
+        for (int i = 0; i < contour->pointsCount; ++i)
+        {
+            contour->points[i].x = c * 100 + i;
+            contour->points[i].y = c * 100 + i * 2;
+        }
+        contours->results[c] = contour;
+    }
+    contours->dataType = IMRDT_CONTOUR;
+    contours->resultType = IRT_CONTOUR;
+    array->results[1] = contours;
+
+    // Two line segments
+    IntermediateResult *lines = (IntermediateResult *)calloc(1, sizeof(IntermediateResult));
+    lines->resultsCount = 2;
+    lines->results = (const void **)calloc(2, sizeof(void *));
+    for (int l = 0; l < 2; ++l)
+    {
+        LineSegment *line = (LineSegment *)calloc(1, sizeof(LineSegment));
+        line->startPoint.x = l;
+        line->startPoint.y = l + 1;
+        line->endPoint.x = l + 10;
+        line->endPoint.y = l + 11;
+        lines->results[l] = line;
+    }
+    lines->dataType = IMRDT_LINESEGMENT;
+    lines->resultType = IRT_LINE_SEGMENT;
+    array->results[2] = lines;
+
+    *pResult = array;
+    return DBR_OK;
+}
+
+void DBR_FreeIntermediateResults(IntermediateResultArray **pResults)
+{
+    if (pResults == NULL || *pResults == NULL)
+        return;
+    IntermediateResultArray *array = *pResults;
+    for (int i = 0; i < array->resultsCount; ++i)
+    {
+        IntermediateResult *result = array->results[i];
+        for (int j = 0; j < result->resultsCount; ++j)
+        {
+            if (result->dataType == IMRDT_IMAGE)
+                free(((ImageData *)result->results[j])->bytes);
+            else if (result->dataType == IMRDT_CONTOUR)
+                free(((Contour *)result->results[j])->points);
+            free((void *)result->results[j]);
+        }
+        free((void *)result->results);
+        free(result);
+    }
+    free(array->results);
+    free(array);
+    *pResults = NULL;
+}
+
+// ---------------------------------------------------------------- Runtime settings
+
+int DBR_GetRuntimeSettings(void *barcodeReader, PublicRuntimeSettings *pSettings)
+{
+    Spin(EnvLong("DBR_STUB_SETTINGS_US", 0));
+    StubReader *reader = (StubReader *)barcodeReader;
+    *pSettings = reader->settings;
+    return DBR_OK;
+}
+
+int DBR_UpdateRuntimeSettings(void *barcodeReader, PublicRuntimeSettings *pSettings, char errorMsgBuffer[], const int errorMsgBufferLen)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    Spin(EnvLong("DBR_STUB_SETTINGS_US", 0));
+    reader->settings = *pSettings;
+    if (errorMsgBuffer != NULL && errorMsgBufferLen > 0)
+        snprintf(errorMsgBuffer, errorMsgBufferLen, "%s", DBR_GetErrorString(DBR_OK));
+    return DBR_OK;
+}
+
+int DBR_ResetRuntimeSettings(void *barcodeReader)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    DefaultSettings(&reader->settings);
+    reader->page = -1;
+    reader->templateCount = 0;
+    free(reader->templateJson);
+    reader->templateJson = NULL;
+    return DBR_OK;
+}
+
+int DBR_SetModeArgument(void *barcodeReader, const char *pModesName, const int index, const char *pArgumentName, const char *pArgumentValue, char errorMsgBuffer[], const int errorMsgBufferLen)
+{
+    if (errorMsgBuffer != NULL && errorMsgBufferLen > 0)
+        snprintf(errorMsgBuffer, errorMsgBufferLen, "%s", DBR_GetErrorString(DBR_OK));
+    return DBR_OK;
+}
+
+int DBR_GetModeArgument(void *barcodeReader, const char *pModesName, const int index, const char *pArgumentName, char valueBuffer[], const int valueBufferLen, char errorMsgBuffer[], const int errorMsgBufferLen)
+{
+    snprintf(valueBuffer, valueBufferLen, "0");
+    if (errorMsgBuffer != NULL && errorMsgBufferLen > 0)
+        snprintf(errorMsgBuffer, errorMsgBufferLen, "%s", DBR_GetErrorString(DBR_OK));
+    return DBR_OK;
+}
+
+// ---------------------------------------------------------------- Templates
+
+/**
+ * Read an integer such as "DeblurLevel": 3 from a JSON template. This is not a
+ * JSON parser, it only needs to understand the templates written by the tests.
+ */
+static int FindJsonInt(const char *json, const char *name, int *value)
+{
+    char pattern[128];
+    snprintf(pattern, sizeof(pattern), "\"%s\"", name);
+    const char *found = strstr(json, pattern);
+    if (found == NULL)
+        return 0;
+    found = strchr(found + strlen(pattern), ':');
+    if (found == NULL)
+        return 0;
+    *value = atoi(found + 1);
+    return 1;
+}
+
+/**
+ * Read a string such as "Name": "default" from a JSON template.
+ */
+static int FindJsonString(const char *json, const char *name, char value[], int valueLen)
+{
+    char pattern[128];
+    snprintf(pattern, sizeof(pattern), "\"%s\"", name);
+    const char *found = strstr(json, pattern);
+    if (found == NULL || (found = strchr(found + strlen(pattern), '"')) == NULL)
+        return 0;
+    const char *end = strchr(++found, '"');
+    if (end == NULL)
+        return 0;
+    snprintf(value, valueLen, "%.*s", (int)(end - found), found);
+    return 1;
+}
+
+/**
+ * Read "LocalizationModes": [{"Mode": "LM_..."}, ...] into the settings.
+ */
+static void FindLocalizationModes(const char *json, PublicRuntimeSettings *settings)
+{
+    const char *found = strstr(json, "\"LocalizationModes\"");
+    if (found == NULL)
+        return;
+    const char *end = strchr(found, ']');
+    static const struct { const char *name; LocalizationMode mode; } names[] = {
+        {"LM_CONNECTED_BLOCKS", LM_CONNECTED_BLOCKS}, {"LM_STATISTICS", LM_STATISTICS},
+        {"LM_LINES", LM_LINES}, {"LM_SCAN_DIRECTLY", LM_SCAN_DIRECTLY},
+        {"LM_STATISTICS_MARKS", LM_STATISTICS_MARKS}, {"LM_STATISTICS_POSTAL_CODE", LM_STATISTICS_POSTAL_CODE},
+    };
+    int count = 0;
+    for (int i = 0; i < 8; ++i)
+        settings->localizationModes[i] = LM_SKIP;
+    const char *cursor = found;
+    while (count < 8 && (cursor = strstr(cursor, "LM_")) != NULL && (end == NULL || cursor < end))
+    {
+        for (size_t n = 0; n < sizeof(names) / sizeof(names[0]); ++n)
+        {
+            size_t length = strlen(names[n].name);
+            if (strncmp(cursor, names[n].name, length) == 0 && cursor[length] == '"')
+            {
+                settings->localizationModes[count++] = names[n].mode;
+                break;
+            }
+        }
+        cursor += 3;
+    }
+}
+
+static int ApplyTemplate(StubReader *reader, const char *content, char errorMsgBuffer[], const int errorMsgBufferLen)
+{
+    if (content == NULL || strchr(content, '{') == NULL)
+    {
+        if (errorMsgBuffer != NULL && errorMsgBufferLen > 0)
+            snprintf(errorMsgBuffer, errorMsgBufferLen, "%s", DBR_GetErrorString(DBRERR_JSON_PARSE_FAILED));
+        return DBRERR_JSON_PARSE_FAILED;
+    }
+    int value;
+    if (FindJsonInt(content, "DeblurLevel", &value))
+        reader->settings.deblurLevel = value;
+    if (FindJsonInt(content, "ExpectedBarcodesCount", &value))
+        reader->settings.expectedBarcodesCount = value;
+    if (FindJsonInt(content, "Timeout", &value))
+        reader->settings.timeout = value;
+    if (FindJsonInt(content, "ScaleDownThreshold", &value))
+        reader->settings.scaleDownThreshold = value;
+    FindLocalizationModes(content, &reader->settings);
+    const char *pages = strstr(content, "\"Pages\"");
+    if (pages != NULL && (pages = strchr(pages + 7, '"')) != NULL && pages[1] != '"')
+        reader->page = atoi(pages + 1);
+    else
+        reader->page = -1;
+    free(reader->templateJson);
+    reader->templateJson = CopyString(content);
+    if (errorMsgBuffer != NULL && errorMsgBufferLen > 0)
+        snprintf(errorMsgBuffer, errorMsgBufferLen, "%s", DBR_GetErrorString(DBR_OK));
+    return DBR_OK;
+}
+
+static char *ReadFile(const char *pFilePath)
+{
+    FILE *file = fopen(pFilePath, "rb");
+    if (file == NULL)
+        return NULL;
+    fseek(file, 0, SEEK_END);
+    long size = ftell(file);
+    fseek(file, 0, SEEK_SET);
+    char *content = (char *)malloc(size + 1);
+    size_t length = fread(content, 1, size, file);
+    content[length] = '\0';
+    fclose(file);
+    return content;
+}
+
+int DBR_InitRuntimeSettingsWithString(void *barcodeReader, const char *content, const ConflictMode conflictMode, char errorMsgBuffer[], const int errorMsgBufferLen)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    DefaultSettings(&reader->settings);
+    reader->templateCount = 0;
+    return ApplyTemplate(reader, content, errorMsgBuffer, errorMsgBufferLen);
+}
+
+int DBR_InitRuntimeSettingsWithFile(void *barcodeReader, const char *pFilePath, const ConflictMode conflictMode, char errorMsgBuffer[], const int errorMsgBufferLen)
+{
+    char *content = ReadFile(pFilePath);
+    if (content == NULL)
+        return DBRERR_FILE_NOT_FOUND;
+    int ret = DBR_InitRuntimeSettingsWithString(barcodeReader, content, conflictMode, errorMsgBuffer, errorMsgBufferLen);
+    free(content);
+    return ret;
+}
+
+int DBR_AppendTplStringToRuntimeSettings(void *barcodeReader, const char *content, const ConflictMode conflictMode, char errorMsgBuffer[], const int errorMsgBufferLen)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    char name[64];
+    if (content == NULL || !FindJsonString(content, "Name", name, sizeof(name)) || strcmp(name, "default") == 0)
+        return ApplyTemplate(reader, content, errorMsgBuffer, errorMsgBufferLen);
+    // A named template only keeps its page, the current settings are not changed
+    int i = 0;
+    while (i < reader->templateCount && strcmp(reader->templateNames[i], name) != 0)
+        ++i;
+    if (i == MAX_TEMPLATES)
+        return DBRERR_JSON_VALUE_INVALID;
+    if (i == reader->templateCount)
+        ++reader->templateCount;
+    snprintf(reader->templateNames[i], sizeof(reader->templateNames[i]), "%s", name);
+    char pages[16];
+    reader->templatePages[i] = FindJsonString(content, "Pages", pages, sizeof(pages)) && pages[0] != '\0' ? atoi(pages) : -1;
+    if (errorMsgBuffer != NULL && errorMsgBufferLen > 0)
+        snprintf(errorMsgBuffer, errorMsgBufferLen, "%s", DBR_GetErrorString(DBR_OK));
+    return DBR_OK;
+}
+
+int DBR_AppendTplFileToRuntimeSettings(void *barcodeReader, const char *pFilePath, const ConflictMode conflictMode, char errorMsgBuffer[], const int errorMsgBufferLen)
+{
+    char *content = ReadFile(pFilePath);
+    if (content == NULL)
+        return DBRERR_FILE_NOT_FOUND;
+    int ret = DBR_AppendTplStringToRuntimeSettings(barcodeReader, content, conflictMode, errorMsgBuffer, errorMsgBufferLen);
+    free(content);
+    return ret;
+}
+
+int DBR_GetParameterTemplateCount(void *barcodeReader)
+{
+    return 1 + ((StubReader *)barcodeReader)->templateCount;
+}
+
+int DBR_GetParameterTemplateName(void *barcodeReader, const int index, char nameBuffer[], const int nameBufferLen)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    if (index < 0 || index > reader->templateCount)
+        return DBRERR_INDEX_INVALID;
+    snprintf(nameBuffer, nameBufferLen, "%s", index == 0 ? "default" : reader->templateNames[index - 1]);
+    return DBR_OK;
+}
+
+static char *SettingsToJson(StubReader *reader)
+{
+    char *json = (char *)malloc(1024);
+    char page[16] = "";
+    if (reader->page >= 0)
+        snprintf(page, sizeof(page), "%d", reader->page);
+    snprintf(json, 1024,
+             "{\"ImageParameter\":{\"Name\":\"default\",\"DeblurLevel\":%d,\"ExpectedBarcodesCount\":%d,"
+             "\"Timeout\":%d,\"ScaleDownThreshold\":%d,\"BarcodeFormatIds\":[\"BF_ALL\"],\"Pages\":\"%s\"},\"Version\":\"3.0\"}",
+             reader->settings.deblurLevel, reader->settings.expectedBarcodesCount,
+             reader->settings.timeout, reader->settings.scaleDownThreshold, page);
+    return json;
+}
+
+int DBR_OutputSettingsToString(void *barcodeReader, char content[], const int contentLen, const char *pSettingsName)
+{
+    char *json = SettingsToJson((StubReader *)barcodeReader);
+    snprintf(content, contentLen, "%s", json);
+    free(json);
+    return DBR_OK;
+}
+
+int DBR_OutputSettingsToStringPtr(void *barcodeReader, char **content, const char *pSettingsName)
+{
+    *content = SettingsToJson((StubReader *)barcodeReader);
+    return DBR_OK;
+}
+
+void DBR_FreeSettingsString(char **content)
+{
+    free(*content);
+    *content = NULL;
+}
+
+int DBR_OutputSettingsToFile(void *barcodeReader, const char *pFilePath, const char *pSettingsName)
+{
+    FILE *file = fopen(pFilePath, "w");
+    if (file == NULL)
+        return DBRERR_FILE_NOT_FOUND;
+    char *json = SettingsToJson((StubReader *)barcodeReader);
+    fputs(json, file);
+    free(json);
+    fclose(file);
+    return DBR_OK;
+}
+
+// ---------------------------------------------------------------- Frame decoding
+
+int DBR_InitFrameDecodingParameters(void *barcodeReader, FrameDecodingParameters *pParameters)
+{
+    memset(pParameters, 0, sizeof(FrameDecodingParameters));
+    pParameters->maxQueueLength = 3;
+    pParameters->maxResultQueueLength = 10;
+    pParameters->imagePixelFormat = IPF_RGB_888;
+    pParameters->region.regionBottom = 100;
+    pParameters->region.regionRight = 100;
+    pParameters->threshold = 0.01f;
+    pParameters->fps = 0;
+    return DBR_OK;
+}
+
+int DBR_SetTextResultCallback(void *barcodeReader, CB_TextResult cbFunction, void *pUser)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    reader->textResultCallback = cbFunction;
+    reader->textResultUser = pUser;
+    return DBR_OK;
+}
+
+int DBR_SetErrorCallback(void *barcodeReader, CB_Error cbFunction, void *pUser)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    reader->errorCallback = cbFunction;
+    reader->errorUser = pUser;
+    return DBR_OK;
+}
+
+static void *FrameDecodingThread(void *arg)
+{
+    StubReader *reader = (StubReader *)arg;
+    FrameDecodingParameters *parameters = &reader->frameParameters;
+    int pixelSize = parameters->imagePixelFormat == IPF_GRAYSCALED ? 1 : (parameters->imagePixelFormat == IPF_ARGB_8888 ? 4 : 3);
+    pthread_mutex_lock(&reader->frameMutex);
+    while (1)
+    {
+        while (reader->running && reader->frameLength == 0)
+            pthread_cond_wait(&reader->frameCond, &reader->frameMutex);
+        if (!reader->running)
+            break;
+        unsigned char *frame = reader->frames[reader->frameHead];
+        int frameId = reader->frameIds[reader->frameHead];
+        reader->frameHead = (reader->frameHead + 1) % MAX_FRAME_QUEUE;
+        --reader->frameLength;
+        pthread_mutex_unlock(&reader->frameMutex);
+
+        unsigned int hash = 2166136261u;
+        for (int row = 0; row < parameters->height; ++row)
+            hash = Hash(frame + (size_t)row * parameters->stride, (size_t)parameters->width * pixelSize, hash);
+        free(frame);
+        Spin(DecodeCost(reader));
+        int count = ResultCount(reader, hash);
+        if (count > 0 && reader->textResultCallback != NULL)
+            reader->textResultCallback(frameId, CreateTextResults(hash, count, parameters->width, parameters->height, 0), reader->textResultUser);
+        else if (count == 0 && reader->errorCallback != NULL)
+            reader->errorCallback(frameId, DBR_OK, reader->errorUser);
+
+        pthread_mutex_lock(&reader->frameMutex);
+    }
+    pthread_mutex_unlock(&reader->frameMutex);
+    return NULL;
+}
+
+int DBR_StartFrameDecodingEx(void *barcodeReader, FrameDecodingParameters parameters, const char *pTemplateName)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    if (reader->running)
+        return DBRERR_FRAME_DECODING_THREAD_EXISTS;
+    if (parameters.width <= 0 || parameters.height <= 0 || parameters.stride <= 0 ||
+        parameters.maxQueueLength <= 0 || parameters.maxQueueLength > MAX_FRAME_QUEUE)
+        return DBRERR_PARAMETER_VALUE_INVALID;
+    reader->frameParameters = parameters;
+    reader->frameHead = 0;
+    reader->frameLength = 0;
+    reader->running = 1;
+    if (pthread_create(&reader->frameThread, NULL, FrameDecodingThread, reader) != 0)
+    {
+        reader->running = 0;
+        return DBRERR_UNKNOWN;
+    }
+    return DBR_OK;
+}
+
+int DBR_StartFrameDecoding(void *barcodeReader, const int maxQueueLength, const int maxResultQueueLength, const int width, const int height, const int stride, const ImagePixelFormat format, const char *pTemplateName)
+{
+    FrameDecodingParameters parameters;
+    DBR_InitFrameDecodingParameters(barcodeReader, &parameters);
+    parameters.maxQueueLength = maxQueueLength;
+    parameters.maxResultQueueLength = maxResultQueueLength;
+    parameters.width = width;
+    parameters.height = height;
+    parameters.stride = stride;
+    parameters.imagePixelFormat = format;
+    return DBR_StartFrameDecodingEx(barcodeReader, parameters, pTemplateName);
+}
+
+int DBR_AppendFrame(void *barcodeReader, unsigned char *pBufferBytes)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    int frameId;
+    pthread_mutex_lock(&reader->frameMutex);
+    frameId = reader->nextFrameId++;
+    if (reader->running && reader->frameLength < reader->frameParameters.maxQueueLength)
+    {
+        // The SDK copies the frame, the caller may reuse its buffer at once
+        size_t size = (size_t)reader->frameParameters.stride * reader->frameParameters.height;
+        unsigned char *frame = (unsigned char *)malloc(size);
+        memcpy(frame, pBufferBytes, size);
+        int tail = (reader->frameHead + reader->frameLength) % MAX_FRAME_QUEUE;
+        reader->frames[tail] = frame;
+        reader->frameIds[tail] = frameId;
+        ++reader->frameLength;
+        pthread_cond_signal(&reader->frameCond);
+    }
+    pthread_mutex_unlock(&reader->frameMutex);
+    return frameId;
+}
+
+int DBR_GetLengthOfFrameQueue(void *barcodeReader)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    pthread_mutex_lock(&reader->frameMutex);
+    int length = reader->frameLength;
+    pthread_mutex_unlock(&reader->frameMutex);
+    return length;
+}
+
+int DBR_StopFrameDecoding(void *barcodeReader)
+{
+    StubReader *reader = (StubReader *)barcodeReader;
+    pthread_mutex_lock(&reader->frameMutex);
+    if (!reader->running)
+    {
+        pthread_mutex_unlock(&reader->frameMutex);
+        return DBRERR_STOP_DECODING_THREAD_FAILED;
+    }
+    reader->running = 0;
+    pthread_cond_broadcast(&reader->frameCond);
+    pthread_mutex_unlock(&reader->frameMutex);
+    pthread_join(reader->frameThread, NULL);
+
+    while (reader->frameLength > 0)
+    {
+        free(reader->frames[reader->frameHead]);
+        reader->frameHead = (reader->frameHead + 1) % MAX_FRAME_QUEUE;
+        --reader->frameLength;
+    }
+    return DBR_OK;
+}
@@ -21,12 +21,13 @@ error = reader.init_runtime_settings_with_file(json_file)
 if error[0] != EnumErrorCode.DBR_OK:
     print(error[1])
 
+# Any buffer is decoded in place. A large file can be decoded without reading it with reader.decode_file_mmap(image)
 with open(image, "rb") as fread:
     total = fread.read()
 
 if sys.version_info.major == 3 and sys.version_info.minor >= 6:
     try:
-        text_results:List[TextResult] = reader.decode_file_stream(bytearray(total), len(total))
+        text_results:List[TextResult] = reader.decode_file_stream(total)
 
         if text_results != None:
             for text_result in text_results:
@@ -42,7 +43,7 @@ if sys.version_info.major == 3 and sys.version_info.minor >= 6:
 
 else:
     try:
-        text_results = reader.decode_file_stream(bytearray(total), len(total))
+        text_results = reader.decode_file_stream(total)
 
         if text_results != None:
             for text_result in text_results:
@@ -0,0 +1,31 @@
+import os
+import glob
+import asyncio
+from dbr import *
+
+# you can change the following variables' value to your own value.
+license_key = "Input your own license"
+image_folder = r"Please input your own image folder path"
+# The number of readers decoding at the same time.
+reader_count = 4
+
+async def decode_one(reader, img):
+    try:
+        text_results = await reader.decode_file(img)
+        print(img)
+        if text_results != None:
+            for text_result in text_results:
+                print("Barcode Format : " + text_result.barcode_format_string)
+                print("Barcode Text : " + text_result.barcode_text)
+    except BarcodeReaderError as bre:
+        print(img)
+        print(bre)
+
+async def main():
+    # The event loop stays responsive while the images are decoded in the background.
+    async with AsyncBarcodeReader(reader_count, license_key) as reader:
+        images = glob.glob(os.path.join(image_folder, "*.*"))
+        await asyncio.gather(*[decode_one(reader, img) for img in images])
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(main())
@@ -0,0 +1,43 @@
+import os
+import time
+from dbr import *
+
+# you can change the following variables' value to your own value.
+license_key = "Input your own license"
+#license_server = "Input the name/IP of the license server"
+json_file = r"Please input your own template path"
+image_folder = r"Please input your own image folder path"
+cache_folder = r"Please input your own cache folder path"
+
+# The results stored in cache_folder are reused the next time this script runs
+cache = ResultCache(max_bytes=16 * 1024 * 1024, directory=cache_folder)
+reader = BarcodeReader(result_cache=cache)
+
+reader.init_license(license_key)
+#reader.init_license_from_server(license_server, license_key)
+#license_content = reader.output_license_to_string()
+#reader.init_license_from_license_content(license_key, license_content)
+
+error = reader.init_runtime_settings_with_file(json_file)
+if error[0] != EnumErrorCode.DBR_OK:
+    print(error[1])
+
+print("-------------------start------------------------")
+for round_index in range(2):
+    start = time.time()
+    for file_name in os.listdir(image_folder):
+        try:
+            text_results = reader.decode_file(os.path.join(image_folder, file_name))
+            if round_index == 0 and text_results != None:
+                for text_result in text_results:
+                    print("File : " + file_name)
+                    print("Barcode Text :")
+                    print(text_result.barcode_text)
+                    print("-------------")
+        except BarcodeReaderError as bre:
+            print(bre)
+    print("Round " + str(round_index + 1) + " : " + str(time.time() - start) + " seconds")
+
+print("Cache hits : " + str(cache.hits))
+print("Cache misses : " + str(cache.misses))
+print("-------------------over------------------------")
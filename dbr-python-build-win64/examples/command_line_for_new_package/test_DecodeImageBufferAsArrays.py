@@ -0,0 +1,48 @@
+import os
+import cv2
+from dbr import *
+
+
+# you can change the following variables' value to your own value.
+license_key = "Input your own license"
+#license_server = "Input the name/IP of the license server"
+json_file = r"Please input your own template path"
+original_image = r"Please input your own image path"
+
+image = cv2.imread(original_image)
+
+reader = BarcodeReader()
+
+reader.init_license(license_key)
+#reader.init_license_from_server(license_server, license_key)
+#license_content = reader.output_license_to_string()
+#reader.init_license_from_license_content(license_key, license_content)
+
+error = reader.init_runtime_settings_with_file(json_file)
+if error[0] != EnumErrorCode.DBR_OK:
+    print(error[1])
+
+try:
+    results = reader.decode_buffer(image, as_arrays=True)
+
+    # Every row of the arrays belongs to one barcode, so the geometry of all barcodes is computed at once
+    quads = results.localization_points
+    centers = quads.mean(axis=1)
+    top_left = quads.min(axis=1)
+    bottom_right = quads.max(axis=1)
+
+    for i in range(len(results)):
+        print("Barcode Text :")
+        print(results.barcode_texts[i])
+        print("Center : ")
+        print(centers[i])
+        print("Bounding Box : ")
+        print(top_left[i], bottom_right[i])
+        print("-------------")
+
+    # Draw all quadrilaterals in one call
+    cv2.polylines(image, list(quads), True, (0, 255, 0), 2)
+    cv2.imshow("Barcodes", image)
+    cv2.waitKey(0)
+except BarcodeReaderError as bre:
+    print(bre)
@@ -27,7 +27,7 @@ if error[0] != EnumErrorCode.DBR_OK:
 if sys.version_info.major == 3 and sys.version_info.minor >= 6:
 
     try:
-        text_results:List[TextResult] = reader.decode_buffer(image, image.shape[0], image.shape[1], image.strides[0])
+        text_results:List[TextResult] = reader.decode_buffer(image)
 
         if text_results != None:
             for text_result in text_results:
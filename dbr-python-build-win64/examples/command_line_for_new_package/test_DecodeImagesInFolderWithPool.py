@@ -0,0 +1,37 @@
+import os
+import glob
+from dbr import *
+
+# you can change the following variables' value to your own value.
+license_key = "Input your own license"
+json_file = r"Please input your own template path"
+image_folder = r"Please input your own image folder path"
+# The number of readers decoding at the same time.
+pool_size = 4
+
+with open(json_file) as f:
+    json_string = f.read()
+
+# The license and the template are applied once per reader, not once per image.
+with BarcodeReaderPool(pool_size, license_key, json_string) as pool:
+    images = glob.glob(os.path.join(image_folder, "*.*"))
+    futures = [pool.submit(img) for img in images]
+    for idx, (img, future) in enumerate(zip(images, futures)):
+        print(img)
+        print('Test', idx+1)
+        print(40*'#')
+        try:
+            text_results = future.result()
+
+            if text_results != None:
+                for text_result in text_results:
+                    print("Barcode Format :")
+                    print(text_result.barcode_format_string)
+                    print("Barcode Text :")
+                    print(text_result.barcode_text)
+                    print("Localization Points : ")
+                    print(text_result.localization_result.localization_points)
+                    print("-------------")
+        except BarcodeReaderError as bre:
+            print(bre)
+        print(40*'#')
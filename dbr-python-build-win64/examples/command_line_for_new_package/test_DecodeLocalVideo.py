@@ -12,15 +12,7 @@ video_file = r"Please input your own video file path"
 
 reader = BarcodeReader()
 
-results = None
-
-# The callback function for receiving barcode results
-def on_barcode_result(data):
-    global results
-    results = data
-
 def read_barcode():
-    global results
     video_width = 0
     video_height = 0
     
@@ -56,14 +48,16 @@ def read_barcode():
     parameters.fps = 0
     parameters.auto_filter = 1
 
-    reader.start_video_mode(parameters, on_barcode_result)
+    # Without a callback the results are queued and fetched below, so drawing never slows down the decoding
+    reader.start_video_mode(parameters)
 
     while True:
-        if results != None:
+        video_result = reader.get_video_results()
+        if video_result != None:
+            frame_id, results = video_result
             thickness = 2
             color = (0,255,0)
-            for result in results:
-                text_result = TextResult(result)
+            for text_result in results:
                 print("Barcode Format :")
                 print(text_result.barcode_format_string)
                 print("Barcode Text :")
@@ -79,7 +73,6 @@ def read_barcode():
                 cv2.line(frame, points[2], points[3], color, thickness)
                 cv2.line(frame, points[3], points[0], color, thickness)
                 cv2.putText(frame, text_result.barcode_text, points[0], cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0,0,255))
-            results = None
 
         cv2.imshow(windowName, frame)
         rval, frame = vc.read()
@@ -0,0 +1,72 @@
+import os
+import sys
+import asyncio
+import cv2
+from dbr import *
+
+# you can change the following variables' value to your own value.
+license_key = "Input your own license"
+#license_server = "Input the name/IP of the license server"
+json_file = r"Please input your own template path"
+video_file = r"Please input your own video file path"
+
+reader = BarcodeReader()
+
+async def append_frames(vc):
+    while True:
+        rval, frame = vc.read()
+        if rval == False:
+            break
+        try:
+            reader.append_video_frame(frame)
+        except:
+            pass
+        # Let the result consumer run between frames
+        await asyncio.sleep(0)
+    # Ends the async for below once the queued results are consumed
+    reader.stop_video_mode()
+
+async def print_results():
+    async for frame_id, text_results in AsyncVideoResults(reader):
+        for text_result in text_results:
+            print("Frame Id :")
+            print(frame_id)
+            print("Barcode Format :")
+            print(text_result.barcode_format_string)
+            print("Barcode Text :")
+            print(text_result.barcode_text)
+            print("-------------")
+
+async def read_barcode():
+    vc = cv2.VideoCapture(video_file)
+    if not vc.isOpened():
+        return
+    rval, frame = vc.read()
+    if rval == False:
+        return
+
+    parameters = reader.init_frame_decoding_parameters()
+    # you can modify these following parameters.
+    parameters.max_queue_length = 30
+    parameters.max_result_queue_length = 30
+    parameters.width = frame.shape[1]
+    parameters.height = frame.shape[0]
+    parameters.stride = frame.strides[0]
+    parameters.image_pixel_format = EnumImagePixelFormat.IPF_RGB_888
+
+    reader.start_video_mode(parameters)
+    await asyncio.gather(append_frames(vc), print_results())
+
+
+print("-------------------start------------------------")
+reader.init_license(license_key)
+#reader.init_license_from_server(license_server, license_key)
+#license_content = reader.output_license_to_string()
+#reader.init_license_from_license_content(license_key, license_content)
+
+error = reader.init_runtime_settings_with_file(json_file)
+if error[0] != EnumErrorCode.DBR_OK:
+    print(error[1])
+
+asyncio.get_event_loop().run_until_complete(read_barcode())
+print("-------------------over------------------------")
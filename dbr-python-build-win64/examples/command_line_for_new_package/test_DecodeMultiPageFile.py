@@ -0,0 +1,43 @@
+import os
+from dbr import *
+
+# you can change the following variables' value to your own value.
+license_key = "Input your own license"
+#license_server = "Input the name/IP of the license server"
+json_file = r"Please input your own template path"
+document = r"Please input your own multi-page TIFF or PDF path"
+
+reader = BarcodeReader()
+
+reader.init_license(license_key)
+#reader.init_license_from_server(license_server, license_key)
+#license_content = reader.output_license_to_string()
+#reader.init_license_from_license_content(license_key, license_content)
+
+error = reader.init_runtime_settings_with_file(json_file)
+if error[0] != EnumErrorCode.DBR_OK:
+    print(error[1])
+
+print("-------------------start------------------------")
+try:
+    # Only the first page is decoded if it has a barcode
+    with reader.iter_pages(document, max_barcodes=1) as pages:
+        for page_number, text_results in pages:
+            print("Page : " + str(page_number) + ", barcodes : " + str(len(text_results) if text_results != None else 0))
+
+    # The pages are decoded by 4 readers at the same time
+    with BarcodeReaderPool(4, license_key) as pool:
+        with reader.iter_pages(document, pool=pool) as pages:
+            for page_number, text_results in pages:
+                if text_results != None:
+                    for text_result in text_results:
+                        print("Page : " + str(page_number))
+                        print("Barcode Format :")
+                        print(text_result.barcode_format_string)
+                        print("Barcode Text :")
+                        print(text_result.barcode_text)
+                        print("-------------")
+        print("Pages decoded : " + str(pages.pages_decoded))
+except BarcodeReaderError as bre:
+    print(bre)
+print("-------------------over------------------------")
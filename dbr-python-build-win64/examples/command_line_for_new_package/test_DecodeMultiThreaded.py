@@ -0,0 +1,61 @@
+import os
+import sys
+import glob
+import time
+import threading
+from dbr import *
+
+# you can change the following variables' value to your own value.
+license_key = "Input your own license"
+image_folder = r"Please input your own image folder path"
+# The largest number of threads to test. Every run from 1 to max_threads threads is timed.
+max_threads = 4
+# How many times each image is decoded in a run.
+repeat = 5
+
+def decode_worker(reader, images, counts, index):
+    # Every thread owns its reader. Decoding releases the GIL, so the threads run in parallel.
+    decoded = 0
+    for img in images:
+        try:
+            text_results = reader.decode_file(img)
+            if text_results != None:
+                decoded += len(text_results)
+        except BarcodeReaderError as bre:
+            print(bre)
+    counts[index] = decoded
+
+def run(thread_count, images):
+    readers = []
+    for i in range(thread_count):
+        reader = BarcodeReader()
+        reader.init_license(license_key)
+        readers.append(reader)
+
+    # Split the work evenly between the threads.
+    chunks = [images[i::thread_count] for i in range(thread_count)]
+    counts = [0] * thread_count
+    threads = [threading.Thread(target=decode_worker, args=(readers[i], chunks[i], counts, i)) for i in range(thread_count)]
+
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+    return elapsed, sum(counts)
+
+if __name__ == "__main__":
+    images = glob.glob(os.path.join(image_folder, "*.*")) * repeat
+    if len(images) == 0:
+        print("No image found in " + image_folder)
+        sys.exit(1)
+
+    # All runs must find the same barcodes, otherwise a handle was shared unsafely.
+    baseline_time, baseline_count = run(1, images)
+    print("threads: 1, time: %.3fs, images/s: %.2f, barcodes: %d" % (baseline_time, len(images) / baseline_time, baseline_count))
+    for thread_count in range(2, max_threads + 1):
+        elapsed, count = run(thread_count, images)
+        print("threads: %d, time: %.3fs, images/s: %.2f, speedup: %.2fx, barcodes: %d" % (thread_count, elapsed, len(images) / elapsed, baseline_time / elapsed, count))
+        if count != baseline_count:
+            print("Error: expected %d barcodes but got %d" % (baseline_count, count))
@@ -66,8 +66,7 @@ def read_barcode():
         if results != None:
             thickness = 2
             color = (0,255,0)
-            for result in results:
-                text_result = TextResult(result)
+            for text_result in results:
                 print("Barcode Format :")
                 print(text_result.barcode_format_string)
                 print("Barcode Text :")
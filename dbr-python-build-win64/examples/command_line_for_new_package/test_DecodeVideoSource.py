@@ -0,0 +1,47 @@
+import os
+import cv2
+from dbr import *
+
+# you can change the following variables' value to your own value.
+license_key = "Input your own license"
+#license_server = "Input the name/IP of the license server"
+json_file = r"Please input your own template path"
+video_file = r"Please input your own video file path"
+
+reader = BarcodeReader()
+
+reader.init_license(license_key)
+#reader.init_license_from_server(license_server, license_key)
+#license_content = reader.output_license_to_string()
+#reader.init_license_from_license_content(license_key, license_content)
+
+error = reader.init_runtime_settings_with_file(json_file)
+if error[0] != EnumErrorCode.DBR_OK:
+    print(error[1])
+
+parameters = reader.init_frame_decoding_parameters()
+# you can modify these following parameters, the frame layout is taken from the video.
+parameters.max_queue_length = 30
+parameters.max_result_queue_length = 30
+parameters.threshold = 0.01
+parameters.auto_filter = 1
+
+print("-------------------start------------------------")
+try:
+    # A file is read only as fast as it is decoded, pass a camera index and keep drop_frames=True for a live source
+    with reader.iter_video(video_file, parameters, drop_frames=False) as video:
+        for frame_id, text_results in video:
+            for text_result in text_results:
+                print("Frame Id : " + str(frame_id))
+                print("Barcode Format :")
+                print(text_result.barcode_format_string)
+                print("Barcode Text :")
+                print(text_result.barcode_text)
+                print("-------------")
+
+    print("Frames read : " + str(video.frames_read))
+    print("Frames dropped : " + str(video.dropped_frames))
+    print("Results dropped : " + str(video.dropped_results))
+except BarcodeReaderError as bre:
+    print(bre)
+print("-------------------over------------------------")
@@ -0,0 +1,48 @@
+import os
+import cv2
+from dbr import *
+
+# you can change the following variables' value to your own value.
+license_key = "Input your own license"
+#license_server = "Input the name/IP of the license server"
+json_file = r"Please input your own template path"
+video_file = r"Please input your own video file path"
+
+reader = BarcodeReader()
+
+reader.init_license(license_key)
+#reader.init_license_from_server(license_server, license_key)
+#license_content = reader.output_license_to_string()
+#reader.init_license_from_license_content(license_key, license_content)
+
+error = reader.init_runtime_settings_with_file(json_file)
+if error[0] != EnumErrorCode.DBR_OK:
+    print(error[1])
+
+# Barcodes are searched around where they were in the last frames, and the whole frame every 15 frames
+tracker = RegionTracker(reader, padding=0.5, history=2, full_frame_interval=15)
+
+print("-------------------start------------------------")
+vc = cv2.VideoCapture(video_file)
+try:
+    while True:
+        rval, frame = vc.read()
+        if rval == False:
+            break
+
+        text_results = tracker.decode(frame)
+        if text_results != None:
+            for text_result in text_results:
+                print("Barcode Text :")
+                print(text_result.barcode_text)
+                print("Localization Points : ")
+                print(text_result.localization_result.localization_points)
+                print("-------------")
+except BarcodeReaderError as bre:
+    print(bre)
+vc.release()
+
+print("Frames searched in full : " + str(tracker.full_frame_decodes))
+print("Regions decoded : " + str(tracker.region_decodes))
+print("Share of pixels decoded : " + str(tracker.decoded_pixel_ratio))
+print("-------------------over------------------------")
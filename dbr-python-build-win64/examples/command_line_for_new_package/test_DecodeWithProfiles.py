@@ -0,0 +1,42 @@
+import os
+import cv2
+from dbr import *
+
+# you can change the following variables' value to your own value.
+license_key = "Input your own license"
+#license_server = "Input the name/IP of the license server"
+image_file = r"Please input your own image path"
+dpm_image_file = r"Please input your own DPM image path"
+
+reader = BarcodeReader()
+
+reader.init_license(license_key)
+#reader.init_license_from_server(license_server, license_key)
+#license_content = reader.output_license_to_string()
+#reader.init_license_from_license_content(license_key, license_content)
+
+def print_results(text_results):
+    if text_results != None:
+        for text_result in text_results:
+            print("Barcode Format :")
+            print(text_result.barcode_format_string)
+            print("Barcode Text :")
+            print(text_result.barcode_text)
+            print("-------------")
+
+print("-------------------start------------------------")
+try:
+    # The profiles are registered once, switching between them later costs nothing
+    reader.register_profile("fast_1d", {"BarcodeFormatIds": ["BF_ONED"], "ExpectedBarcodesCount": 1, "DeblurLevel": 0})
+    reader.register_profile("dpm", {"BarcodeFormatIds": ["BF_DATAMATRIX", "BF_QR_CODE"], "DeblurLevel": 9,
+        "DPMCodeReadingModes": [{"Mode": "DPMCRM_GENERAL"}]})
+
+    image = cv2.imread(image_file)
+    with reader.profile("fast_1d"):
+        print_results(reader.decode_buffer(image))
+        print_results(reader.decode_file(image_file))
+
+    print_results(reader.decode_file(dpm_image_file, profile="dpm"))
+except BarcodeReaderError as bre:
+    print(bre)
+print("-------------------over------------------------")
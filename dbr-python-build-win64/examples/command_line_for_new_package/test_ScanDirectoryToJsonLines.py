@@ -0,0 +1,29 @@
+import sys
+import json
+import subprocess
+
+# you can change the following variables' value to your own value.
+license_key = "Input your own license"
+image_folder = r"Please input your own image folder path"
+
+print("-------------------start------------------------")
+# The standard output of the scanner is JSON Lines only, the messages of the library go to the standard error
+output = subprocess.check_output([sys.executable, "-m", "dbr", "scan", image_folder, "--license", license_key])
+records = []
+for line in output.decode("utf-8").splitlines():
+    try:
+        records.append(json.loads(line))
+    except ValueError:
+        print("Not a JSON record : " + line)
+        sys.exit(1)
+
+for record in records:
+    print(record["file"] + " : " + str(len(record["results"])) + " barcodes in " + str(record["elapsed_ms"]) + " ms")
+    for result in record["results"]:
+        print("Barcode Format :")
+        print(result["format"])
+        print("Barcode Text :")
+        print(result["text"])
+        print("-------------")
+print("Records : " + str(len(records)))
+print("-------------------over------------------------")
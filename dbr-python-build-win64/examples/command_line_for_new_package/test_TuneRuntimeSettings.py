@@ -0,0 +1,35 @@
+import sys
+import json
+import subprocess
+from dbr import *
+
+# you can change the following variables' value to your own value.
+license_key = "Input your own license"
+# Every image needs a .txt file next to it with the expected barcode texts, one per line.
+image_folder = r"Please input your own labeled image folder path"
+report_file = r"Please input your own report file path"
+
+print("-------------------start------------------------")
+# The standard output of the tuner is the template only, the messages of the library go to the standard error
+process = subprocess.Popen([sys.executable, "-m", "dbr", "tune", image_folder, "--license", license_key, "--target-recall", "0.95",
+    "--report", report_file], stdout=subprocess.PIPE)
+template, _ = process.communicate()
+if process.returncode == 1:
+    print("No configuration reaches the target recall.")
+elif process.returncode != 0:
+    sys.exit(process.returncode)
+json_string = template.decode("utf-8")
+print(json.loads(json_string))
+
+with open(report_file) as f:
+    report = json.load(f)
+for trial in report["pareto"]:
+    print(str(trial["mean_ms"]) + " ms, recall " + str(trial["recall"]) + " : " + json.dumps(trial["settings"]))
+
+# The tuned template is used like any other template
+reader = BarcodeReader()
+reader.init_license(license_key)
+error = reader.init_runtime_settings_with_string(json_string)
+if error[0] != EnumErrorCode.DBR_OK:
+    print(error[1])
+print("-------------------over------------------------")
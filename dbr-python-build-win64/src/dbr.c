@@ -1,7 +1,10 @@
 #include <Python.h>
+#include <pythread.h>
 #include "DynamsoftBarcodeReader.h"
 #include <ndarraytypes.h>
 #include <structmember.h>
+// Python 2 does not include the struct sequences of Point from Python.h
+#include <structseq.h>
 
 #ifndef DEBUG
 #define DEBUG 0
@@ -13,6 +16,30 @@
 #endif
 #endif
 
+#if !defined(IS_PY3K)
+#if defined(_WIN32)
+#include <windows.h>
+#define SleepMilliseconds(ms) Sleep(ms)
+#else
+#include <unistd.h>
+#define SleepMilliseconds(ms) usleep((ms) * 1000)
+#endif
+#endif
+
+// Monotonic milliseconds for the time-to-live of the video result filter
+#if defined(_WIN32)
+#include <windows.h>
+#define MonotonicMilliseconds() ((long long)GetTickCount64())
+#else
+#include <time.h>
+static long long MonotonicMilliseconds(void)
+{
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+    return (long long)now.tv_sec * 1000 + now.tv_nsec / 1000000;
+}
+#endif
+
 struct module_state
 {
     PyObject *error;
@@ -45,6 +72,47 @@ static PyObject * ErrorOut(PyObject *m)
 
 #define DEFAULT_MEMORY_SIZE 4096
 
+// Events of the video result filter, the values of EnumVideoResultEvent
+#define VIDEO_EVENT_APPEARED 0
+#define VIDEO_EVENT_PRESENT 1
+#define VIDEO_EVENT_DISAPPEARED 2
+
+// A barcode followed by the video result filter, matched by format, bytes and position
+typedef struct
+{
+    int format;
+    int format2;
+    unsigned char *bytes;
+    int bytesLength;
+    // Centre of the last localization
+    int x;
+    int y;
+    long long firstSeen;
+    long long lastSeen;
+    long long lastReported;
+    int seenCount;
+    int seenFrame;
+} TrackedBarcode;
+
+typedef struct
+{
+    int type;
+    // The result of the frame the event belongs to, -1 for a disappeared barcode
+    int resultIndex;
+    // A snapshot of the barcode. Only a disappeared barcode owns its bytes, the others read them from the result
+    TrackedBarcode barcode;
+} VideoEvent;
+
+// A decoded video frame waiting in the result queue
+typedef struct
+{
+    int frameId;
+    TextResultArray *pResults;
+    // The filter events of the frame, eventCount is -1 when the filter is off
+    VideoEvent *events;
+    int eventCount;
+} VideoResult;
+
 typedef struct
 {
     PyObject_HEAD
@@ -52,8 +120,270 @@ typedef struct
     void *hBarcode;
     // Callback function for video mode
     PyObject *py_callback;
+    // Frame layout given to StartVideoMode, checked by AppendVideoFrame
+    int frameWidth;
+    int frameHeight;
+    int frameStride;
+    // Whether the video mode callback gets lazy results
+    int lazyResults;
+    // Serializes native calls on hBarcode so a handle is never used by two threads at once
+    PyThread_type_lock lock;
+    // Set while StopVideoMode holds the lock and waits for the video mode thread, whose callback may then use the handle.
+    // The SDK decodes the frames of a video mode on a single thread, the one that last called the callback.
+    int lockLent;
+    long callbackThread;
+    int borrowDepth;
+    // Whether a video mode was started and not stopped yet
+    int videoRunning;
+    // Bounded queue filled by the video mode thread when there is no callback. The thread only moves
+    // native results in, so it never waits for the GIL. The oldest result is dropped when the queue is full.
+    PyThread_type_lock resultMutex;
+    // Available while the queue holds a result or video mode has stopped
+    PyThread_type_lock resultReady;
+    VideoResult *videoResults;
+    int resultCapacity;
+    int resultHead;
+    int resultCount;
+    int resultQueueClosed;
+    Py_ssize_t droppedResults;
+    // Available once the video mode thread has decoded a frame since WaitFrameQueue last looked at the frame queue.
+    // frameDecodedSignalled tells under resultMutex whether it is available.
+    PyThread_type_lock frameDecoded;
+    int frameDecodedSignalled;
+    // Ring of the buffers of the last appended frames. A frame stays pinned until as many frames were appended
+    // after it as the SDK can hold in the frame queue and the decoding thread, so its memory outlives every native read.
+    Py_buffer *pinnedFrames;
+    int pinnedCapacity;
+    int pinnedNext;
+    // Video result filter. The settings are written under resultMutex and copied by the next StartVideoMode into the
+    // ones in use. Those and the barcodes are only touched by the video mode thread while it runs and by StartVideoMode
+    // and StopVideoMode otherwise.
+    int filterEnabled;
+    int filterTimeToLive;
+    int filterRepeatInterval;
+    int filterTolerance;
+    int filterActive;
+    int activeTimeToLive;
+    int activeRepeatInterval;
+    int activeTolerance;
+    int filterFrame;
+    int filterLastFrameId;
+    TrackedBarcode *trackedBarcodes;
+    int trackedCount;
+    int trackedCapacity;
+    // Mirror of the runtime settings of hBarcode, valid while settingsCached is set. Updates are compared with it,
+    // so the SDK is only called when a value changes. Every other native call that changes the settings clears it.
+    PublicRuntimeSettings cachedSettings;
+    int settingsCached;
 } DynamsoftBarcodeReader;
 
+static int AcquireLockTimed(PyThread_type_lock lock, double timeout);
+
+/**
+ * Take the handle lock. If another thread owns it, wait with the GIL released
+ * so that the owner can finish its native call and reacquire the GIL.
+ */
+static void LockHandle(DynamsoftBarcodeReader *self)
+{
+    if (self->callbackThread == (long)PyThread_get_thread_ident())
+    {
+        // The decoding thread of video mode waits in steps, StopVideoMode may lend it the lock in the meantime
+        while (!self->lockLent)
+        {
+            if (AcquireLockTimed(self->lock, 0.001))
+                return;
+        }
+        self->borrowDepth++;
+        return;
+    }
+    if (!PyThread_acquire_lock(self->lock, NOWAIT_LOCK))
+    {
+        Py_BEGIN_ALLOW_THREADS
+        PyThread_acquire_lock(self->lock, WAIT_LOCK);
+        Py_END_ALLOW_THREADS
+    }
+}
+
+static void UnlockHandle(DynamsoftBarcodeReader *self)
+{
+    if (self->borrowDepth > 0 && self->callbackThread == (long)PyThread_get_thread_ident())
+    {
+        self->borrowDepth--;
+        return;
+    }
+    PyThread_release_lock(self->lock);
+}
+
+/**
+ * The runtime settings of the handle. They are read from the SDK only after the mirror was cleared.
+ * Call with the handle locked.
+ */
+static const PublicRuntimeSettings *GetCachedSettings(DynamsoftBarcodeReader *self)
+{
+    if (!self->settingsCached)
+    {
+        memset(&self->cachedSettings, 0, sizeof(PublicRuntimeSettings));
+        self->settingsCached = DBR_GetRuntimeSettings(self->hBarcode, &self->cachedSettings) == DBR_OK;
+    }
+    return &self->cachedSettings;
+}
+
+/**
+ * Update the runtime settings of the handle unless they are equal to the mirror. The settings must start
+ * as a copy of GetCachedSettings(), so that the bytes the caller did not set compare equal.
+ * Call with the handle locked.
+ */
+static int ApplySettings(DynamsoftBarcodeReader *self, PublicRuntimeSettings *settings, char *errorMsgBuffer, int errorMsgBufferLen)
+{
+    GetCachedSettings(self);
+    if (self->settingsCached && memcmp(settings, &self->cachedSettings, sizeof(PublicRuntimeSettings)) == 0)
+    {
+        snprintf(errorMsgBuffer, errorMsgBufferLen, "%s", DBR_GetErrorString(DBR_OK));
+        return DBR_OK;
+    }
+    int ret = DBR_UpdateRuntimeSettings(self->hBarcode, settings, errorMsgBuffer, errorMsgBufferLen);
+    // The SDK may adjust the values, the mirror is read again when it is needed
+    self->settingsCached = 0;
+    return ret;
+}
+
+#if defined(IS_PY3K)
+#define InternString PyUnicode_InternFromString
+#else
+#define InternString PyString_InternFromString
+#endif
+
+/**
+ * Dictionary keys used to marshal results and settings. They are interned once
+ * when the module is loaded, so building or reading a dict never allocates a key.
+ */
+#define DBR_KEYS(K) \
+    K(AccompanyingTextRecognitionModes) \
+    K(AutoFilter) \
+    K(BCMIndex) \
+    K(BMIndex) \
+    K(BarcodeColourModes) \
+    K(BarcodeComplementMode) \
+    K(BarcodeComplementModes) \
+    K(BarcodeFormatIds) \
+    K(BarcodeFormatIds_2) \
+    K(BinarizationMode) \
+    K(BinarizationModes) \
+    K(Bytes) \
+    K(CCMIndex) \
+    K(CICMIndex) \
+    K(ColourClusteringMode) \
+    K(ColourClusteringModes) \
+    K(ColourConversionMode) \
+    K(ColourConversionModes) \
+    K(DPMCRMIndex) \
+    K(DPMCodeReadingMode) \
+    K(DPMCodeReadingModes) \
+    K(DRMIndex) \
+    K(DataType) \
+    K(DeblurLevel) \
+    K(DeformationResistingMode) \
+    K(DeformationResistingModes) \
+    K(ExpectedBarcodesCount) \
+    K(FPS) \
+    K(FrameId) \
+    K(GTMIndex) \
+    K(GrayscaleTransformationMode) \
+    K(GrayscaleTransformationModes) \
+    K(Height) \
+    K(IMResults) \
+    K(IPMIndex) \
+    K(ImagePixelFormat) \
+    K(ImagePreprocessingMode) \
+    K(ImagePreprocessingModes) \
+    K(IntermediateResultSavingMode) \
+    K(IntermediateResultTypes) \
+    K(LMIndex) \
+    K(LocalizationMode) \
+    K(LocalizationModes) \
+    K(MaxAlgorithmThreadCount) \
+    K(MaxQueueLength) \
+    K(MaxResultQueueLength) \
+    K(MinBarcodeTextLength) \
+    K(MinResultConfidence) \
+    K(PDFRasterDPI) \
+    K(Point) \
+    K(ROIId) \
+    K(RPMIndex) \
+    K(RegionBottom) \
+    K(RegionLeft) \
+    K(RegionMeasuredByPercentage) \
+    K(RegionPredetectionMode) \
+    K(RegionPredetectionModes) \
+    K(RegionRight) \
+    K(RegionTop) \
+    K(ResultCoordinateType) \
+    K(ResultType) \
+    K(ReturnBarcodeZoneClarity) \
+    K(RotationMatrix) \
+    K(ScaleDownRatio) \
+    K(ScaleDownThreshold) \
+    K(ScaleUpModes) \
+    K(Stride) \
+    K(TFMIndex) \
+    K(TerminatePhase) \
+    K(TextAssistedCorrectionMode) \
+    K(TextFilterMode) \
+    K(TextFilterModes) \
+    K(TextResultOrderModes) \
+    K(TextureDetectionModes) \
+    K(Threshold) \
+    K(Timeout) \
+    K(Width)
+
+#define DECLARE_KEY(name) static PyObject *key_##name = NULL;
+DBR_KEYS(DECLARE_KEY)
+#undef DECLARE_KEY
+
+static int InitKeys(void)
+{
+#define INIT_KEY(name) if ((key_##name = InternString(#name)) == NULL) return -1;
+    DBR_KEYS(INIT_KEY)
+#undef INIT_KEY
+    return 0;
+}
+
+// Barcode format names repeat across results, so their string objects are shared
+#define MAX_FORMAT_STRINGS 64
+static char *formatNames[MAX_FORMAT_STRINGS];
+static PyObject *formatStrings[MAX_FORMAT_STRINGS];
+static int formatStringCount = 0;
+
+/**
+ * Return a new reference to the string object of a barcode format name.
+ */
+static PyObject * GetFormatString(const char *name)
+{
+    for (int i = 0; i < formatStringCount; ++i)
+    {
+        if (strcmp(formatNames[i], name) == 0)
+        {
+            Py_INCREF(formatStrings[i]);
+            return formatStrings[i];
+        }
+    }
+
+    PyObject *pyName = InternString(name);
+    if (pyName != NULL && formatStringCount < MAX_FORMAT_STRINGS)
+    {
+        char *copy = (char *)PyMem_Malloc(strlen(name) + 1);
+        if (copy != NULL)
+        {
+            strcpy(copy, name);
+            formatNames[formatStringCount] = copy;
+            formatStrings[formatStringCount] = pyName;
+            ++formatStringCount;
+            Py_INCREF(pyName);
+        }
+    }
+    return pyName;
+}
+
 void ToHexString(unsigned char* pSrc, int iLen, char* pDest)
 {
 	const char HEXCHARS[16] = { '0', '1', '2', '3', '4', '5', '6', '7', '8', '9', 'A', 'B', 'C', 'D', 'E', 'F' };
@@ -77,52 +407,36 @@ static PyObject * CreatePyRuntimeSettings(PublicRuntimeSettings pSettings)
     }
 
     PyObject * terminatePhase               = Py_BuildValue("i", pSettings.terminatePhase);
-    PyObject * terminatePhaseKey            = Py_BuildValue("s", "TerminatePhase");
-    PyDict_SetItem(pySettings, terminatePhaseKey,           terminatePhase);
+    PyDict_SetItem(pySettings, key_TerminatePhase,           terminatePhase);
     Py_DECREF(terminatePhase);
-    Py_DECREF(terminatePhaseKey);
 
     PyObject * timeout                      = Py_BuildValue("i", pSettings.timeout);
-    PyObject * timeoutKey                   = Py_BuildValue("s", "Timeout");
-    PyDict_SetItem(pySettings, timeoutKey, timeout);
+    PyDict_SetItem(pySettings, key_Timeout, timeout);
     Py_DECREF(timeout);
-    Py_DECREF(timeoutKey);
 
     PyObject * maxAlgorithmThreadCount      = Py_BuildValue("i", pSettings.maxAlgorithmThreadCount );
-    PyObject * maxAlgorithmThreadCountKey   = Py_BuildValue("s", "MaxAlgorithmThreadCount");
-    PyDict_SetItem(pySettings, maxAlgorithmThreadCountKey,  maxAlgorithmThreadCount);
+    PyDict_SetItem(pySettings, key_MaxAlgorithmThreadCount,  maxAlgorithmThreadCount);
     Py_DECREF(maxAlgorithmThreadCount);
-    Py_DECREF(maxAlgorithmThreadCountKey);
 
     PyObject * expectedBarcodesCount        = Py_BuildValue("i", pSettings.expectedBarcodesCount);
-    PyObject * expectedBarcodesCountKey     = Py_BuildValue("s", "ExpectedBarcodesCount");
-    PyDict_SetItem(pySettings, expectedBarcodesCountKey,    expectedBarcodesCount);
+    PyDict_SetItem(pySettings, key_ExpectedBarcodesCount,    expectedBarcodesCount);
     Py_DECREF(expectedBarcodesCount);
-    Py_DECREF(expectedBarcodesCountKey);
 
     PyObject * barcodeFormatIds             = Py_BuildValue("i", pSettings.barcodeFormatIds);
-    PyObject * BarcodeFormatIdsKey          = Py_BuildValue("s", "BarcodeFormatIds");
-    PyDict_SetItem(pySettings, BarcodeFormatIdsKey,         barcodeFormatIds);
+    PyDict_SetItem(pySettings, key_BarcodeFormatIds,         barcodeFormatIds);
     Py_DECREF(barcodeFormatIds);
-    Py_DECREF(BarcodeFormatIdsKey);
 
     PyObject * barcodeFormatIds_2           = Py_BuildValue("i", pSettings.barcodeFormatIds_2);
-    PyObject * barcodeFormatIds_2Key        = Py_BuildValue("s", "BarcodeFormatIds_2");
-    PyDict_SetItem(pySettings, barcodeFormatIds_2Key,       barcodeFormatIds_2);
+    PyDict_SetItem(pySettings, key_BarcodeFormatIds_2,       barcodeFormatIds_2);
     Py_DECREF(barcodeFormatIds_2);
-    Py_DECREF(barcodeFormatIds_2Key);
 
     PyObject * pdfRasterDPI                 = Py_BuildValue("i", pSettings.pdfRasterDPI);
-    PyObject * pdfRasterDPIKey              = Py_BuildValue("s", "PDFRasterDPI");
-    PyDict_SetItem(pySettings, pdfRasterDPIKey,             pdfRasterDPI);
+    PyDict_SetItem(pySettings, key_PDFRasterDPI,             pdfRasterDPI);
     Py_DECREF(pdfRasterDPI);
-    Py_DECREF(pdfRasterDPIKey);
 
     PyObject * scaleDownThreshold           = Py_BuildValue("i", pSettings.scaleDownThreshold);
-    PyObject * scaleDownThresholdKey        = Py_BuildValue("s", "ScaleDownThreshold");
-    PyDict_SetItem(pySettings, scaleDownThresholdKey,       scaleDownThreshold);
+    PyDict_SetItem(pySettings, key_ScaleDownThreshold,       scaleDownThreshold);
     Py_DECREF(scaleDownThreshold);
-    Py_DECREF(scaleDownThresholdKey);
 
     PyObject * binarizationModes            = PyList_New(8);
     PyObject * localizationModes            = PyList_New(8);
@@ -177,992 +491,1210 @@ static PyObject * CreatePyRuntimeSettings(PublicRuntimeSettings pSettings)
 		PyList_SetItem(scaleUpModes, i, tempSUM);
     }
 
-    PyObject * binarizationModesKey         = Py_BuildValue("s", "BinarizationModes");
-    PyDict_SetItem(pySettings, binarizationModesKey,        binarizationModes);
+    PyDict_SetItem(pySettings, key_BinarizationModes,        binarizationModes);
     Py_DECREF(binarizationModes);
-    Py_DECREF(binarizationModesKey);
 
-    PyObject * localizationModesKey         = Py_BuildValue("s", "LocalizationModes");
-    PyDict_SetItem(pySettings, localizationModesKey,        localizationModes);
+    PyDict_SetItem(pySettings, key_LocalizationModes,        localizationModes);
     Py_DECREF(localizationModes);
-    Py_DECREF(localizationModesKey);
 
-    PyObject * colourClusteringModesKey     = Py_BuildValue("s", "ColourClusteringModes");
-    PyDict_SetItem(pySettings, colourClusteringModesKey,    colourClusteringModes);
+    PyDict_SetItem(pySettings, key_ColourClusteringModes,    colourClusteringModes);
     Py_DECREF(colourClusteringModes);
-    Py_DECREF(colourClusteringModesKey);
 
-    PyObject * colourConversionModesKey     = Py_BuildValue("s", "ColourConversionModes");
-    PyDict_SetItem(pySettings, colourConversionModesKey,    colourConversionModes);
+    PyDict_SetItem(pySettings, key_ColourConversionModes,    colourConversionModes);
     Py_DECREF(colourConversionModes);
-    Py_DECREF(colourConversionModesKey);
 
-    PyObject * grayscaleTransformationModesKey = Py_BuildValue("s", "GrayscaleTransformationModes");
-    PyDict_SetItem(pySettings, grayscaleTransformationModesKey, grayscaleTransformationModes);
+    PyDict_SetItem(pySettings, key_GrayscaleTransformationModes, grayscaleTransformationModes);
     Py_DECREF(grayscaleTransformationModes);
-    Py_DECREF(grayscaleTransformationModesKey);
     
-    PyObject * regionPredetectionModesKey   = Py_BuildValue("s", "RegionPredetectionModes");
-    PyDict_SetItem(pySettings, regionPredetectionModesKey,  regionPredetectionModes);
+    PyDict_SetItem(pySettings, key_RegionPredetectionModes,  regionPredetectionModes);
     Py_DECREF(regionPredetectionModes);
-    Py_DECREF(regionPredetectionModesKey);
 
-    PyObject * imagePreprocessingModesKey   = Py_BuildValue("s", "ImagePreprocessingModes");
-    PyDict_SetItem(pySettings, imagePreprocessingModesKey,  imagePreprocessingModes);
+    PyDict_SetItem(pySettings, key_ImagePreprocessingModes,  imagePreprocessingModes);
     Py_DECREF(imagePreprocessingModes);
-    Py_DECREF(imagePreprocessingModesKey);
 
-    PyObject * textureDetectionModesKey     = Py_BuildValue("s", "TextureDetectionModes");
-    PyDict_SetItem(pySettings, textureDetectionModesKey,    textureDetectionModes);
+    PyDict_SetItem(pySettings, key_TextureDetectionModes,    textureDetectionModes);
     Py_DECREF(textureDetectionModes);
-    Py_DECREF(textureDetectionModesKey);
 
-    PyObject * textFilterModesKey           = Py_BuildValue("s", "TextFilterModes");
-    PyDict_SetItem(pySettings, textFilterModesKey,          textFilterModes);
+    PyDict_SetItem(pySettings, key_TextFilterModes,          textFilterModes);
     Py_DECREF(textFilterModes);
-    Py_DECREF(textFilterModesKey);
 
-    PyObject * dpmCodeReadingModesKey       = Py_BuildValue("s", "DPMCodeReadingModes");
-    PyDict_SetItem(pySettings, dpmCodeReadingModesKey,      dpmCodeReadingModes);
+    PyDict_SetItem(pySettings, key_DPMCodeReadingModes,      dpmCodeReadingModes);
     Py_DECREF(dpmCodeReadingModes);
-    Py_DECREF(dpmCodeReadingModesKey);
 
-    PyObject * deformationResistingModesKey = Py_BuildValue("s", "DeformationResistingModes");
-    PyDict_SetItem(pySettings, deformationResistingModesKey, deformationResistingModes);
+    PyDict_SetItem(pySettings, key_DeformationResistingModes, deformationResistingModes);
     Py_DECREF(deformationResistingModes);
-    Py_DECREF(deformationResistingModesKey);
 
-    PyObject * barcodeComplementModesKey    = Py_BuildValue("s", "BarcodeComplementModes");
-    PyDict_SetItem(pySettings, barcodeComplementModesKey,   barcodeComplementModes);
+    PyDict_SetItem(pySettings, key_BarcodeComplementModes,   barcodeComplementModes);
     Py_DECREF(barcodeComplementModes);
-    Py_DECREF(barcodeComplementModesKey);
 
-    PyObject * barcodeColourModesKey        = Py_BuildValue("s", "BarcodeColourModes");
-    PyDict_SetItem(pySettings, barcodeColourModesKey,       barcodeColourModes);
+    PyDict_SetItem(pySettings, key_BarcodeColourModes,       barcodeColourModes);
     Py_DECREF(barcodeColourModes);
-    Py_DECREF(barcodeColourModesKey);
 
-    PyObject * textResultOrderModesKey      = Py_BuildValue("s", "TextResultOrderModes");
-    PyDict_SetItem(pySettings, textResultOrderModesKey,     textResultOrderModes);
+    PyDict_SetItem(pySettings, key_TextResultOrderModes,     textResultOrderModes);
     Py_DECREF(textResultOrderModes);
-    Py_DECREF(textResultOrderModesKey);
 
-	PyObject * accompanyingTextRecognitionModesKey = Py_BuildValue("s", "AccompanyingTextRecognitionModes");
-	PyDict_SetItem(pySettings, accompanyingTextRecognitionModesKey, accompanyingTextRecognitionModes);
+	PyDict_SetItem(pySettings, key_AccompanyingTextRecognitionModes, accompanyingTextRecognitionModes);
 	Py_DECREF(accompanyingTextRecognitionModes);
-	Py_DECREF(accompanyingTextRecognitionModesKey);
 
-	PyObject * scaleUpModesKey = Py_BuildValue("s", "ScaleUpModes");
-	PyDict_SetItem(pySettings, scaleUpModesKey, scaleUpModes);
+	PyDict_SetItem(pySettings, key_ScaleUpModes, scaleUpModes);
 	Py_DECREF(scaleUpModes);
-	Py_DECREF(scaleUpModesKey);
 
     PyObject * textAssistedCorrectionMode   = Py_BuildValue("i", pSettings.furtherModes.textAssistedCorrectionMode);
-    PyObject * textAssistedCorrectionModeKey =Py_BuildValue("s", "TextAssistedCorrectionMode");
-    PyDict_SetItem(pySettings, textAssistedCorrectionModeKey, textAssistedCorrectionMode);
+    PyDict_SetItem(pySettings, key_TextAssistedCorrectionMode, textAssistedCorrectionMode);
     Py_DECREF(textAssistedCorrectionMode);
-    Py_DECREF(textAssistedCorrectionModeKey);
 
     PyObject * deblurLevel                  = Py_BuildValue("i", pSettings.deblurLevel);
-    PyObject * deblurLevelKey               = Py_BuildValue("s", "DeblurLevel");
-    PyDict_SetItem(pySettings, deblurLevelKey,              deblurLevel);
+    PyDict_SetItem(pySettings, key_DeblurLevel,              deblurLevel);
     Py_DECREF(deblurLevel);
-    Py_DECREF(deblurLevelKey);
 
     PyObject * intermediateResultTypes      = Py_BuildValue("i", pSettings.intermediateResultTypes);
-    PyObject * intermediateResultTypesKey   = Py_BuildValue("s", "IntermediateResultTypes");
-    PyDict_SetItem(pySettings, intermediateResultTypesKey,  intermediateResultTypes);
+    PyDict_SetItem(pySettings, key_IntermediateResultTypes,  intermediateResultTypes);
     Py_DECREF(intermediateResultTypes);
-    Py_DECREF(intermediateResultTypesKey);
 
     PyObject * intermediateResultSavingMode = Py_BuildValue("i", pSettings.intermediateResultSavingMode);
-    PyObject * intermediateResultSavingModeKey = Py_BuildValue("s", "IntermediateResultSavingMode");
-    PyDict_SetItem(pySettings, intermediateResultSavingModeKey, intermediateResultSavingMode);
+    PyDict_SetItem(pySettings, key_IntermediateResultSavingMode, intermediateResultSavingMode);
     Py_DECREF(intermediateResultSavingMode);
-    Py_DECREF(intermediateResultSavingModeKey);
 
     PyObject * resultCoordinateType         = Py_BuildValue("i", pSettings.resultCoordinateType);
-    PyObject * resultCoordinateTypeKey      = Py_BuildValue("s", "ResultCoordinateType");
-    PyDict_SetItem(pySettings, resultCoordinateTypeKey,     resultCoordinateType);
+    PyDict_SetItem(pySettings, key_ResultCoordinateType,     resultCoordinateType);
     Py_DECREF(resultCoordinateType);
-    Py_DECREF(resultCoordinateTypeKey);
 
     PyObject * returnBarcodeZoneClarity     = Py_BuildValue("i", pSettings.returnBarcodeZoneClarity);
-    PyObject * returnBarcodeZoneClarityKey  = Py_BuildValue("s", "ReturnBarcodeZoneClarity");
-    PyDict_SetItem(pySettings, returnBarcodeZoneClarityKey, returnBarcodeZoneClarity);
+    PyDict_SetItem(pySettings, key_ReturnBarcodeZoneClarity, returnBarcodeZoneClarity);
     Py_DECREF(returnBarcodeZoneClarity);
-    Py_DECREF(returnBarcodeZoneClarityKey);
 
     PyObject * regionTop                    = Py_BuildValue("i", pSettings.region.regionTop);
-    PyObject * regionTopKey                 = Py_BuildValue("s", "RegionTop");
-    PyDict_SetItem(pySettings, regionTopKey,                regionTop);
+    PyDict_SetItem(pySettings, key_RegionTop,                regionTop);
     Py_DECREF(regionTop);
-    Py_DECREF(regionTopKey);
 
     PyObject * regionBottom                 = Py_BuildValue("i", pSettings.region.regionBottom);
-    PyObject * regionBottomKey              = Py_BuildValue("s", "RegionBottom");
-    PyDict_SetItem(pySettings, regionBottomKey,             regionBottom);
+    PyDict_SetItem(pySettings, key_RegionBottom,             regionBottom);
     Py_DECREF(regionBottom);
-    Py_DECREF(regionBottomKey);
 
     PyObject * regionLeft                   = Py_BuildValue("i", pSettings.region.regionLeft);
-    PyObject * regionLeftKey                = Py_BuildValue("s", "RegionLeft");
-    PyDict_SetItem(pySettings, regionLeftKey,               regionLeft);
+    PyDict_SetItem(pySettings, key_RegionLeft,               regionLeft);
     Py_DECREF(regionLeft);
-    Py_DECREF(regionLeftKey);
 
     PyObject * regionRight                  = Py_BuildValue("i", pSettings.region.regionRight);
-    PyObject * regionRightKey               = Py_BuildValue("s", "RegionRight");
-    PyDict_SetItem(pySettings, regionRightKey,              regionRight);
+    PyDict_SetItem(pySettings, key_RegionRight,              regionRight);
     Py_DECREF(regionRight);
-    Py_DECREF(regionRightKey);
 
     PyObject * regionMeasuredByPercentage   = Py_BuildValue("i", pSettings.region.regionMeasuredByPercentage);
-    PyObject * regionMeasuredByPercentageKey =Py_BuildValue("s", "RegionMeasuredByPercentage");
-    PyDict_SetItem(pySettings, regionMeasuredByPercentageKey, regionMeasuredByPercentage);
+    PyDict_SetItem(pySettings, key_RegionMeasuredByPercentage, regionMeasuredByPercentage);
     Py_DECREF(regionMeasuredByPercentage);
-    Py_DECREF(regionMeasuredByPercentageKey);
 
     PyObject * minBarcodeTextLength         = Py_BuildValue("i", pSettings.minBarcodeTextLength);
-    PyObject * minBarcodeTextLengthKey      = Py_BuildValue("s", "MinBarcodeTextLength");
-    PyDict_SetItem(pySettings, minBarcodeTextLengthKey,     minBarcodeTextLength);
+    PyDict_SetItem(pySettings, key_MinBarcodeTextLength,     minBarcodeTextLength);
     Py_DECREF(minBarcodeTextLength);
-    Py_DECREF(minBarcodeTextLengthKey);
 
     PyObject * minResultConfidence          = Py_BuildValue("i", pSettings.minResultConfidence);
-    PyObject * minResultConfidenceKey       = Py_BuildValue("s", "MinResultConfidence");
-    PyDict_SetItem(pySettings, minResultConfidenceKey,      minResultConfidence);
+    PyDict_SetItem(pySettings, key_MinResultConfidence,      minResultConfidence);
     Py_DECREF(minResultConfidence);
-    Py_DECREF(minResultConfidenceKey);
 
     return pySettings;
 }
 
-PublicRuntimeSettings CreateCRuntimeSettings(PyObject *o)
+/**
+ * Replace the error of a setting that could not be converted with a TypeError naming it.
+ */
+static int OverlayTypeError(PyObject *key, const char *expected)
 {
-    PublicRuntimeSettings pSettings;
-    pSettings.terminatePhase            = (TerminatePhase)(PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "TerminatePhase"))));
-    pSettings.timeout                   = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "Timeout")));
-    pSettings.maxAlgorithmThreadCount   = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "MaxAlgorithmThreadCount")));
-    pSettings.expectedBarcodesCount     = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "ExpectedBarcodesCount")));
-    pSettings.barcodeFormatIds          = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "BarcodeFormatIds")));
-    pSettings.barcodeFormatIds_2        = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "BarcodeFormatIds_2")));
-    pSettings.pdfRasterDPI              = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "PDFRasterDPI")));
-    pSettings.scaleDownThreshold        = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "ScaleDownThreshold")));
-
-    PyObject * binarizationModes            = PyDict_GetItem(o, Py_BuildValue("s", "BinarizationModes"));
-    PyObject * localizationModes            = PyDict_GetItem(o, Py_BuildValue("s", "LocalizationModes"));
-    PyObject * colourClusteringModes        = PyDict_GetItem(o, Py_BuildValue("s", "ColourClusteringModes"));
-    PyObject * colourConversionModes        = PyDict_GetItem(o, Py_BuildValue("s", "ColourConversionModes"));
-    PyObject * grayscaleTransformationModes = PyDict_GetItem(o, Py_BuildValue("s", "GrayscaleTransformationModes"));
-    PyObject * regionPredetectionModes      = PyDict_GetItem(o, Py_BuildValue("s", "RegionPredetectionModes"));
-    PyObject * imagePreprocessingModes      = PyDict_GetItem(o, Py_BuildValue("s", "ImagePreprocessingModes"));
-    PyObject * textureDetectionModes        = PyDict_GetItem(o, Py_BuildValue("s", "TextureDetectionModes"));
-    PyObject * textFilterModes              = PyDict_GetItem(o, Py_BuildValue("s", "TextFilterModes"));
-    PyObject * dpmCodeReadingModes          = PyDict_GetItem(o, Py_BuildValue("s", "DPMCodeReadingModes"));
-    PyObject * deformationResistingModes    = PyDict_GetItem(o, Py_BuildValue("s", "DeformationResistingModes"));
-    PyObject * barcodeComplementModes       = PyDict_GetItem(o, Py_BuildValue("s", "BarcodeComplementModes"));
-    PyObject * barcodeColourModes           = PyDict_GetItem(o, Py_BuildValue("s", "BarcodeColourModes"));
-    PyObject * textResultOrderModes         = PyDict_GetItem(o, Py_BuildValue("s", "TextResultOrderModes"));
-	PyObject * accompanyingTextRecognitionModes = PyDict_GetItem(o, Py_BuildValue("s", "AccompanyingTextRecognitionModes"));
-	PyObject * scaleUpModes					= PyDict_GetItem(o, Py_BuildValue("s", "ScaleUpModes"));
-
-    for(int i = 0; i < 8; ++i)
-    {
-        pSettings.binarizationModes[i]                          = (BinarizationMode)(PyLong_AsLong(PyList_GetItem(binarizationModes, i)));
-        pSettings.localizationModes[i]                          = (LocalizationMode)(PyLong_AsLong(PyList_GetItem(localizationModes, i)));
-        pSettings.furtherModes.colourClusteringModes[i]         = (ColourClusteringMode)(PyLong_AsLong(PyList_GetItem(colourClusteringModes, i)));
-        pSettings.furtherModes.colourConversionModes[i]         = (ColourConversionMode)(PyLong_AsLong(PyList_GetItem(colourConversionModes, i)));
-        pSettings.furtherModes.grayscaleTransformationModes[i]  = (GrayscaleTransformationMode)(PyLong_AsLong(PyList_GetItem(grayscaleTransformationModes, i)));
-        pSettings.furtherModes.regionPredetectionModes[i]       = (RegionPredetectionMode)(PyLong_AsLong(PyList_GetItem(regionPredetectionModes, i)));
-        pSettings.furtherModes.imagePreprocessingModes[i]       = (ImagePreprocessingMode)(PyLong_AsLong(PyList_GetItem(imagePreprocessingModes, i)));
-        pSettings.furtherModes.textureDetectionModes[i]         = (TextureDetectionMode)(PyLong_AsLong(PyList_GetItem(textureDetectionModes, i)));
-        pSettings.furtherModes.textFilterModes[i]               = (TextFilterMode)(PyLong_AsLong(PyList_GetItem(textFilterModes, i)));
-        pSettings.furtherModes.dpmCodeReadingModes[i]           = (DPMCodeReadingMode)(PyLong_AsLong(PyList_GetItem(dpmCodeReadingModes, i)));
-        pSettings.furtherModes.deformationResistingModes[i]     = (DeformationResistingMode)(PyLong_AsLong(PyList_GetItem(deformationResistingModes, i)));
-        pSettings.furtherModes.barcodeComplementModes[i]        = (BarcodeComplementMode)(PyLong_AsLong(PyList_GetItem(barcodeComplementModes, i)));
-        pSettings.furtherModes.barcodeColourModes[i]            = (BarcodeColourMode)(PyLong_AsLong(PyList_GetItem(barcodeColourModes, i)));
-        pSettings.textResultOrderModes[i]                       = (TextResultOrderMode)(PyLong_AsLong(PyList_GetItem(textResultOrderModes, i)));
-		pSettings.furtherModes.accompanyingTextRecognitionModes[i] = (AccompanyingTextRecognitionMode)(PyLong_AsLong(PyList_GetItem(accompanyingTextRecognitionModes, i)));
-		pSettings.scaleUpModes[i]								= (ScaleUpMode)(PyLong_AsLong(PyList_GetItem(scaleUpModes, i)));
-	}
-
-    pSettings.furtherModes.textAssistedCorrectionMode               = (TextAssistedCorrectionMode)(PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "TextAssistedCorrectionMode"))));
-    pSettings.deblurLevel                                           = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "DeblurLevel")));
-    pSettings.intermediateResultTypes                               = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "IntermediateResultTypes")));
-    pSettings.intermediateResultSavingMode                          = (IntermediateResultSavingMode)(PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "IntermediateResultSavingMode"))));
-    pSettings.resultCoordinateType                                  = (ResultCoordinateType)(PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "ResultCoordinateType"))));
-    pSettings.returnBarcodeZoneClarity                              = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "ReturnBarcodeZoneClarity")));
-    pSettings.region.regionTop                                      = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "RegionTop")));
-    pSettings.region.regionBottom                                   = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "RegionBottom")));
-    pSettings.region.regionLeft                                     = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "RegionLeft")));
-    pSettings.region.regionRight                                    = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "RegionRight")));
-    pSettings.region.regionMeasuredByPercentage                     = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "RegionMeasuredByPercentage")));
-    pSettings.minBarcodeTextLength                                  = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "MinBarcodeTextLength")));
-    pSettings.minResultConfidence                                   = PyLong_AsLong(PyDict_GetItem(o, Py_BuildValue("s", "MinResultConfidence")));
-
-    return pSettings;
+    PyErr_Clear();
+#if defined(IS_PY3K)
+    PyErr_Format(PyExc_TypeError, "the runtime setting %U must be %s", key, expected);
+#else
+    PyErr_Format(PyExc_TypeError, "the runtime setting %s must be %s", PyString_AsString(key), expected);
+#endif
+    return -1;
 }
 
-static PyObject * CreatePySamplingImageData(SamplingImageData samplingImage)
-{
-    //create SamplingImage
-    PyObject * pySamplingImage = PyDict_New();
-    if(pySamplingImage == NULL)
-    { 
-        return NULL;     
-    }
-
-    if(samplingImage.bytes != NULL)
-    {
-        PyObject * pySamplingImageBytes     = PyByteArray_FromStringAndSize(samplingImage.bytes, samplingImage.width * samplingImage.height);
-        PyObject * pySamplingImageBytesKey  = Py_BuildValue("s", "Bytes");
-        PyDict_SetItem(pySamplingImage, pySamplingImageBytesKey, pySamplingImageBytes);
-        Py_DECREF(pySamplingImageBytes);
-        Py_DECREF(pySamplingImageBytesKey);
+/**
+ * Copy the values of the settings dict o into pSettings. A key missing from o keeps the value in pSettings,
+ * so a dict holding only the changed settings updates only those fields.
+ * Returns -1 with a TypeError set if a value is not an integer or a list of integers, pSettings must not be applied then.
+ */
+#define OVERLAY_SETTING(key, field) \
+    if ((item = PyDict_GetItem(o, key)) != NULL) \
+    { \
+        value = PyLong_AsLong(item); \
+        if (value == -1 && PyErr_Occurred()) \
+            return OverlayTypeError(key, "an integer"); \
+        field = value; \
     }
-    else
-    {
-        //PyObject * pySamplingImageBytes     = Py_BuildValue("s", "NULL");
-        PyObject * pySamplingImageBytesKey  = Py_BuildValue("s", "Bytes");
-        PyDict_SetItem(pySamplingImage, pySamplingImageBytesKey, Py_None);
-        //Py_DECREF(pySamplingImageBytes);
-        Py_DECREF(pySamplingImageBytesKey);
+#define OVERLAY_MODES(key, modes) \
+    if ((item = PyDict_GetItem(o, key)) != NULL) \
+    { \
+        if (!PyList_Check(item)) \
+            return OverlayTypeError(key, "a list of integers"); \
+        for (i = 0; i < 8 && i < PyList_GET_SIZE(item); ++i) \
+        { \
+            value = PyLong_AsLong(PyList_GET_ITEM(item, i)); \
+            if (value == -1 && PyErr_Occurred()) \
+                return OverlayTypeError(key, "a list of integers"); \
+            modes[i] = value; \
+        } \
     }
 
-    PyObject * pySamplingImageWidth     = Py_BuildValue("i", samplingImage.width);
-    PyObject * pySamplingImageWidthKey  = Py_BuildValue("s", "Width");
-    PyDict_SetItem(pySamplingImage, pySamplingImageWidthKey, pySamplingImageWidth);
-    Py_DECREF(pySamplingImageWidth);
-    Py_DECREF(pySamplingImageWidthKey);
-
-    PyObject * pySamplingImageHeight    = Py_BuildValue("i", samplingImage.height);
-    PyObject * pySamplingImageHeightKey = Py_BuildValue("s", "Height");
-    PyDict_SetItem(pySamplingImage, pySamplingImageHeightKey, pySamplingImageHeight);
-    Py_DECREF(pySamplingImageHeight);
-    Py_DECREF(pySamplingImageHeightKey);
-
-    return pySamplingImage;
+static int OverlayCRuntimeSettings(PyObject *o, PublicRuntimeSettings *pSettings)
+{
+    PyObject *item;
+    Py_ssize_t i;
+    long value;
+    OVERLAY_SETTING(key_TerminatePhase,             pSettings->terminatePhase);
+    OVERLAY_SETTING(key_Timeout,                    pSettings->timeout);
+    OVERLAY_SETTING(key_MaxAlgorithmThreadCount,    pSettings->maxAlgorithmThreadCount);
+    OVERLAY_SETTING(key_ExpectedBarcodesCount,      pSettings->expectedBarcodesCount);
+    OVERLAY_SETTING(key_BarcodeFormatIds,           pSettings->barcodeFormatIds);
+    OVERLAY_SETTING(key_BarcodeFormatIds_2,         pSettings->barcodeFormatIds_2);
+    OVERLAY_SETTING(key_PDFRasterDPI,               pSettings->pdfRasterDPI);
+    OVERLAY_SETTING(key_ScaleDownThreshold,         pSettings->scaleDownThreshold);
+
+    OVERLAY_MODES(key_BinarizationModes,                pSettings->binarizationModes);
+    OVERLAY_MODES(key_LocalizationModes,                pSettings->localizationModes);
+    OVERLAY_MODES(key_ColourClusteringModes,            pSettings->furtherModes.colourClusteringModes);
+    OVERLAY_MODES(key_ColourConversionModes,            pSettings->furtherModes.colourConversionModes);
+    OVERLAY_MODES(key_GrayscaleTransformationModes,     pSettings->furtherModes.grayscaleTransformationModes);
+    OVERLAY_MODES(key_RegionPredetectionModes,          pSettings->furtherModes.regionPredetectionModes);
+    OVERLAY_MODES(key_ImagePreprocessingModes,          pSettings->furtherModes.imagePreprocessingModes);
+    OVERLAY_MODES(key_TextureDetectionModes,            pSettings->furtherModes.textureDetectionModes);
+    OVERLAY_MODES(key_TextFilterModes,                  pSettings->furtherModes.textFilterModes);
+    OVERLAY_MODES(key_DPMCodeReadingModes,              pSettings->furtherModes.dpmCodeReadingModes);
+    OVERLAY_MODES(key_DeformationResistingModes,        pSettings->furtherModes.deformationResistingModes);
+    OVERLAY_MODES(key_BarcodeComplementModes,           pSettings->furtherModes.barcodeComplementModes);
+    OVERLAY_MODES(key_BarcodeColourModes,               pSettings->furtherModes.barcodeColourModes);
+    OVERLAY_MODES(key_TextResultOrderModes,             pSettings->textResultOrderModes);
+    OVERLAY_MODES(key_AccompanyingTextRecognitionModes, pSettings->furtherModes.accompanyingTextRecognitionModes);
+    OVERLAY_MODES(key_ScaleUpModes,                     pSettings->scaleUpModes);
+
+    OVERLAY_SETTING(key_TextAssistedCorrectionMode,     pSettings->furtherModes.textAssistedCorrectionMode);
+    OVERLAY_SETTING(key_DeblurLevel,                    pSettings->deblurLevel);
+    OVERLAY_SETTING(key_IntermediateResultTypes,        pSettings->intermediateResultTypes);
+    OVERLAY_SETTING(key_IntermediateResultSavingMode,   pSettings->intermediateResultSavingMode);
+    OVERLAY_SETTING(key_ResultCoordinateType,           pSettings->resultCoordinateType);
+    OVERLAY_SETTING(key_ReturnBarcodeZoneClarity,       pSettings->returnBarcodeZoneClarity);
+    OVERLAY_SETTING(key_RegionTop,                      pSettings->region.regionTop);
+    OVERLAY_SETTING(key_RegionBottom,                   pSettings->region.regionBottom);
+    OVERLAY_SETTING(key_RegionLeft,                     pSettings->region.regionLeft);
+    OVERLAY_SETTING(key_RegionRight,                    pSettings->region.regionRight);
+    OVERLAY_SETTING(key_RegionMeasuredByPercentage,     pSettings->region.regionMeasuredByPercentage);
+    OVERLAY_SETTING(key_MinBarcodeTextLength,           pSettings->minBarcodeTextLength);
+    OVERLAY_SETTING(key_MinResultConfidence,            pSettings->minResultConfidence);
+    return 0;
 }
 
-static PyObject * CreatePyDetailedResult(void * pResult, int format)
+/**
+ * Result types
+ *
+ * A result object is a fixed array of Python objects. The attributes of each type map to the slots,
+ * so the same functions create, pickle and free all of them.
+ *
+ * A result is either converted at once, or it is a lazy view of the native structure. A view keeps
+ * the capsule that owns the native TextResultArray and converts a slot the first time the attribute
+ * is read. The array is freed by DBR_FreeTextResults when the last view is gone.
+ */
+typedef struct
 {
-    PyObject * pyResult = PyDict_New();
-    if(pyResult == NULL)
-    {
-        return NULL;     
-    }
+    PyObject_HEAD
+    // The capsule owning the native TextResultArray, NULL once every slot is converted
+    PyObject *owner;
+    // The native structure the missing slots are converted from
+    const void *native;
+    Py_ssize_t missing;
+    PyObject *slots[1];
+} ResultObject;
 
-    if((format & BF_ONED) != 0)
-    {
-        PyObject * pyModuleSize         = Py_BuildValue("i", ((OneDCodeDetails *)pResult)->moduleSize);
-        PyObject * pyModuleSizeKey      = Py_BuildValue("s", "ModuleSize");
-        PyDict_SetItem(pyResult, pyModuleSizeKey, pyModuleSize);
-        Py_DECREF(pyModuleSize);
-        Py_DECREF(pyModuleSizeKey);
+typedef PyObject * (*CreateSlotFunc)(const void *native, int index, PyObject *owner);
 
-        if(((OneDCodeDetails *)pResult)->startCharsBytes != NULL)
-        {
-            PyObject * pyStartCharsBytes    = PyByteArray_FromStringAndSize(((OneDCodeDetails *)pResult)->startCharsBytes, ((OneDCodeDetails *)pResult)->startCharsBytesLength);
-            PyObject * pyStartCharsBytesKey = Py_BuildValue("s", "StartCharsBytes");
-            PyDict_SetItem(pyResult, pyStartCharsBytesKey, pyStartCharsBytes);
-            Py_DECREF(pyStartCharsBytes);
-            Py_DECREF(pyStartCharsBytesKey);
+typedef struct
+{
+    PyTypeObject type;
+    CreateSlotFunc createSlot;
+} ResultTypeObject;
 
-        }
-        else
-        {
-            //PyObject * pyStartCharsBytes    = Py_BuildValue("o", NULL);
-            PyObject * pyStartCharsBytesKey = Py_BuildValue("s", "StartCharsBytes");
-            PyDict_SetItem(pyResult, pyStartCharsBytesKey, Py_None);
-            //Py_DECREF(pyStartCharsBytes);
-            Py_DECREF(pyStartCharsBytesKey);
-        }
+#define RESULT_SLOT(index) (offsetof(ResultObject, slots) + (index) * sizeof(PyObject *))
+#define RESULT_GETSET(name, index, doc) {name, (getter)Result_get, NULL, doc, (void *)(Py_ssize_t)(index)}
+#define TEXT_RESULT_ARRAY_CAPSULE "dbr.TextResultArray"
 
-        if(((OneDCodeDetails *)pResult)->stopCharsBytes != NULL)
-        {
-            PyObject * pyStopCharsBytes     = PyByteArray_FromStringAndSize(((OneDCodeDetails *)pResult)->stopCharsBytes, ((OneDCodeDetails *)pResult)->stopCharsBytesLength);
-            PyObject * pyStopCharsBytesKey  = Py_BuildValue("s", "StopCharsBytes");
-            PyDict_SetItem(pyResult, pyStopCharsBytesKey, pyStopCharsBytes);
-            Py_DECREF(pyStopCharsBytes);
-            Py_DECREF(pyStopCharsBytesKey);
-        }
-        else
-        {
-            //PyObject * pyStopCharsBytes     = Py_BuildValue("o", NULL);
-            PyObject * pyStopCharsBytesKey  = Py_BuildValue("s", "StopCharsBytes");
-            PyDict_SetItem(pyResult, pyStopCharsBytesKey, Py_None);
-            //Py_DECREF(pyStopCharsBytes);
-            Py_DECREF(pyStopCharsBytesKey);
-        }
-        
+static Py_ssize_t ResultSlotCount(PyTypeObject *type)
+{
+    return (type->tp_basicsize - offsetof(ResultObject, slots)) / sizeof(PyObject *);
+}
 
-        if(((OneDCodeDetails *)pResult)->checkDigitBytes != NULL)
-        {
-            PyObject * pyCheckDigitBytes    = PyByteArray_FromStringAndSize(((OneDCodeDetails *)pResult)->checkDigitBytes, ((OneDCodeDetails *)pResult)->checkDigitBytesLength);
-            PyObject * pyCheckDigitBytesKey = Py_BuildValue("s", "CheckDigitBytes");
-            PyDict_SetItem(pyResult, pyCheckDigitBytesKey, pyCheckDigitBytes);
-            Py_DECREF(pyCheckDigitBytes);
-            Py_DECREF(pyCheckDigitBytesKey);
-        }
-        else
+/**
+ * Convert the missing slots of a result and release its native structure.
+ */
+static int FillResult(ResultObject *self)
+{
+    if (self->missing != 0)
+    {
+        CreateSlotFunc createSlot = ((ResultTypeObject *)Py_TYPE(self))->createSlot;
+        Py_ssize_t count = ResultSlotCount(Py_TYPE(self));
+        for (Py_ssize_t i = 0; i < count; ++i)
         {
-            //PyObject * pyCheckDigitBytes    = Py_BuildValue("o", NULL);
-            PyObject * pyCheckDigitBytesKey = Py_BuildValue("s", "CheckDigitBytes");
-            PyDict_SetItem(pyResult, pyCheckDigitBytesKey, Py_None);
-            //Py_DECREF(pyCheckDigitBytes);
-            Py_DECREF(pyCheckDigitBytesKey);
+            if (self->slots[i] == NULL && (self->slots[i] = createSlot(self->native, (int)i, self->owner)) == NULL)
+                return -1;
         }
+        self->missing = 0;
     }
-    else if(format == BF_QR_CODE)
-    {
-        PyObject * pyModuleSize         = Py_BuildValue("i", ((QRCodeDetails *)pResult)->moduleSize);
-        PyObject * pyModuleSizeKey      = Py_BuildValue("s", "ModuleSize");
-        PyDict_SetItem(pyResult, pyModuleSizeKey, pyModuleSize);
-        Py_DECREF(pyModuleSize);
-        Py_DECREF(pyModuleSizeKey);
-
-        PyObject * pyRows               = Py_BuildValue("i", ((QRCodeDetails *)pResult)->rows);
-        PyObject * pyRowsKey            = Py_BuildValue("s", "Rows");
-        PyDict_SetItem(pyResult, pyRowsKey, pyRows);
-        Py_DECREF(pyRows);
-        Py_DECREF(pyRowsKey);
-
-        PyObject * pyColumns            = Py_BuildValue("i", ((QRCodeDetails *)pResult)->columns);
-        PyObject * pyColumnsKey         = Py_BuildValue("s", "Columns");
-        PyDict_SetItem(pyResult, pyColumnsKey, pyColumns);
-        Py_DECREF(pyColumns);
-        Py_DECREF(pyColumnsKey);
-        
-        PyObject * pyErrorCorrectionLevel    = Py_BuildValue("i", ((QRCodeDetails *)pResult)->errorCorrectionLevel);
-        PyObject * pyErrorCorrectionLevelKey = Py_BuildValue("s", "ErrorCorrectionLevel");
-        PyDict_SetItem(pyResult, pyErrorCorrectionLevelKey, pyErrorCorrectionLevel);
-        Py_DECREF(pyErrorCorrectionLevel);
-        Py_DECREF(pyErrorCorrectionLevelKey);
-        
-        PyObject * pyVersion            = Py_BuildValue("i", ((QRCodeDetails *)pResult)->version);
-        PyObject * pyVersionKey         = Py_BuildValue("s", "Version");
-        PyDict_SetItem(pyResult, pyVersionKey, pyVersion);
-        Py_DECREF(pyVersion);
-        Py_DECREF(pyVersionKey);
-
-        PyObject * pyModel              = Py_BuildValue("i", ((QRCodeDetails *)pResult)->model);
-        PyObject * pyModelKey           = Py_BuildValue("s", "Model");
-        PyDict_SetItem(pyResult, pyModelKey, pyModel);
-        Py_DECREF(pyModel);
-        Py_DECREF(pyModelKey);
-    }
-    else if(format == BF_DATAMATRIX)
+    self->native = NULL;
+    Py_CLEAR(self->owner);
+    return 0;
+}
+
+/**
+ * Create a result from a native structure. With an owner the result is a lazy view, without one it is converted at once.
+ */
+static PyObject * CreateResult(ResultTypeObject *type, const void *native, PyObject *owner)
+{
+    ResultObject *self = (ResultObject *)type->type.tp_alloc(&type->type, 0);
+    if (self == NULL)
     {
-        PyObject * pyModuleSize         = Py_BuildValue("i", ((DataMatrixDetails *)pResult)->moduleSize);
-        PyObject * pyModuleSizeKey      = Py_BuildValue("s", "ModuleSize");
-        PyDict_SetItem(pyResult, pyModuleSizeKey, pyModuleSize);
-        Py_DECREF(pyModuleSize);
-        Py_DECREF(pyModuleSizeKey);
-
-        PyObject * pyRows               = Py_BuildValue("i", ((DataMatrixDetails *)pResult)->rows);
-        PyObject * pyRowsKey            = Py_BuildValue("s", "Rows");
-        PyDict_SetItem(pyResult, pyRowsKey, pyRows);
-        Py_DECREF(pyRows);
-        Py_DECREF(pyRowsKey);
-
-        PyObject * pyColumns            = Py_BuildValue("i", ((DataMatrixDetails *)pResult)->columns);
-        PyObject * pyColumnsKey         = Py_BuildValue("s", "Columns");
-        PyDict_SetItem(pyResult, pyColumnsKey, pyColumns); 
-        Py_DECREF(pyColumns);
-        Py_DECREF(pyColumnsKey);
-
-        PyObject * pyDataRegionRows     = Py_BuildValue("i", ((DataMatrixDetails *)pResult)->dataRegionRows);
-        PyObject * pyDataRegionRowsKey  = Py_BuildValue("s", "DataRegionRows");
-        PyDict_SetItem(pyResult, pyDataRegionRowsKey, pyDataRegionRows);
-        Py_DECREF(pyDataRegionRows);
-        Py_DECREF(pyDataRegionRowsKey);
-
-        PyObject * pyDataRegionColumns  = Py_BuildValue("i", ((DataMatrixDetails *)pResult)->dataRegionColumns);
-        PyObject * pyDataRegionColumnsKey = Py_BuildValue("s", "DataRegionColumns");
-        PyDict_SetItem(pyResult, pyDataRegionColumnsKey, pyDataRegionColumns);
-        Py_DECREF(pyDataRegionColumns);
-        Py_DECREF(pyDataRegionColumnsKey);
-
-        PyObject * pyDataRegionNumber   = Py_BuildValue("i", ((DataMatrixDetails *)pResult)->dataRegionNumber);
-        PyObject * pyDataRegionNumberKey= Py_BuildValue("s", "DataRegionNumber");
-        PyDict_SetItem(pyResult, pyDataRegionNumberKey, pyDataRegionNumber); 
-        Py_DECREF(pyDataRegionNumber);
-        Py_DECREF(pyDataRegionNumberKey);
+        return NULL;
     }
-    else if(format == BF_PDF417)
+    self->native = native;
+    self->missing = ResultSlotCount(&type->type);
+    if (owner != NULL)
     {
-        PyObject * pyModuleSize         = Py_BuildValue("i", ((PDF417Details *)pResult)->moduleSize);
-        PyObject * pyModuleSizeKey      = Py_BuildValue("s", "ModuleSize");
-        PyDict_SetItem(pyResult, pyModuleSizeKey, pyModuleSize);
-        Py_DECREF(pyModuleSize);
-        Py_DECREF(pyModuleSizeKey);
-
-        PyObject * pyRows               = Py_BuildValue("i", ((PDF417Details *)pResult)->rows);
-        PyObject * pyRowsKey            = Py_BuildValue("s", "Rows");
-        PyDict_SetItem(pyResult, pyRowsKey, pyRows);
-        Py_DECREF(pyRows);
-        Py_DECREF(pyRowsKey);
-
-        PyObject * pyColumns            = Py_BuildValue("i", ((PDF417Details *)pResult)->columns);
-        PyObject * pyColumnsKey         = Py_BuildValue("s", "Columns");
-        PyDict_SetItem(pyResult, pyColumnsKey, pyColumns);
-        Py_DECREF(pyColumns);
-        Py_DECREF(pyColumnsKey);
-        
-        PyObject * pyErrorCorrectionLevel    = Py_BuildValue("i", ((PDF417Details *)pResult)->errorCorrectionLevel);
-        PyObject * pyErrorCorrectionLevelKey = Py_BuildValue("s", "ErrorCorrectionLevel");
-        PyDict_SetItem(pyResult, pyErrorCorrectionLevelKey, pyErrorCorrectionLevel);
-        Py_DECREF(pyErrorCorrectionLevel);
-        Py_DECREF(pyErrorCorrectionLevelKey);
+        Py_INCREF(owner);
+        self->owner = owner;
     }
-    else if(format == BF_AZTEC)
+    else if (FillResult(self) < 0)
     {
-        PyObject * pyModuleSize         = Py_BuildValue("i", ((AztecDetails *)pResult)->moduleSize);
-        PyObject * pyModuleSizeKey      = Py_BuildValue("s", "ModuleSize");
-        PyDict_SetItem(pyResult, pyModuleSizeKey, pyModuleSize);
-        Py_DECREF(pyModuleSize);
-        Py_DECREF(pyModuleSizeKey);
-
-        PyObject * pyRows               = Py_BuildValue("i", ((AztecDetails *)pResult)->rows);
-        PyObject * pyRowsKey            = Py_BuildValue("s", "Rows");
-        PyDict_SetItem(pyResult, pyRowsKey, pyRows);
-        Py_DECREF(pyRows);
-        Py_DECREF(pyRowsKey);
-
-        PyObject * pyColumns            = Py_BuildValue("i", ((AztecDetails *)pResult)->columns);
-        PyObject * pyColumnsKey         = Py_BuildValue("s", "Columns");
-        PyDict_SetItem(pyResult, pyColumnsKey, pyColumns); 
-        Py_DECREF(pyColumns);
-        Py_DECREF(pyColumnsKey);
-
-        PyObject * pyLayerNumber        = Py_BuildValue("i", ((AztecDetails *)pResult)->layerNumber);
-        PyObject * pyLayerNumberKey     = Py_BuildValue("s", "LayerNumber");
-        PyDict_SetItem(pyResult, pyLayerNumberKey, pyLayerNumber);
-        Py_DECREF(pyLayerNumber);
-        Py_DECREF(pyLayerNumberKey);
+        Py_DECREF(self);
+        return NULL;
     }
-    return pyResult;
+    return (PyObject *)self;
 }
 
-static PyObject * CreatePyLocalizationResult(LocalizationResult * pResult)
+static PyObject * Result_get(ResultObject *self, void *closure)
 {
-    PyObject * pyResult = PyDict_New();
-    if(pyResult == NULL)
-    {  
-        return NULL;     
+    Py_ssize_t index = (Py_ssize_t)closure;
+    PyObject *value = self->slots[index];
+    if (value == NULL)
+    {
+        value = ((ResultTypeObject *)Py_TYPE(self))->createSlot(self->native, (int)index, self->owner);
+        if (value == NULL)
+        {
+            return NULL;
+        }
+        self->slots[index] = value;
+        if (--self->missing == 0)
+        {
+            self->native = NULL;
+            Py_CLEAR(self->owner);
+        }
     }
+    Py_INCREF(value);
+    return value;
+}
 
-    PyObject * pyTerminatePhase         = Py_BuildValue("i", pResult->terminatePhase);
-    PyObject * pyTerminatePhaseKey      = Py_BuildValue("s", "TerminatePhase");
-    PyDict_SetItem(pyResult, pyTerminatePhaseKey, pyTerminatePhase);
-    Py_DECREF(pyTerminatePhase);
-    Py_DECREF(pyTerminatePhaseKey);
-
-    PyObject * pyBarcodeFormat          = Py_BuildValue("i", pResult->barcodeFormat);
-    PyObject * pyBarcodeFormatKey       = Py_BuildValue("s", "BarcodeFormat");
-    PyDict_SetItem(pyResult, pyBarcodeFormatKey, pyBarcodeFormat);
-    Py_DECREF(pyBarcodeFormat);
-    Py_DECREF(pyBarcodeFormatKey);
-
-    if(pResult->barcodeFormatString != NULL)
+static void Result_dealloc(ResultObject *self)
+{
+    Py_ssize_t count = ResultSlotCount(Py_TYPE(self));
+    for (Py_ssize_t i = 0; i < count; ++i)
     {
-        PyObject *pyBarcodeFormatString     = Py_BuildValue("s", pResult->barcodeFormatString);
-        PyObject * pyBarcodeFormatStringKey = Py_BuildValue("s", "BarcodeFormatString");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey, pyBarcodeFormatString);
-        Py_DECREF(pyBarcodeFormatString);
-        Py_DECREF(pyBarcodeFormatStringKey);
+        Py_XDECREF(self->slots[i]);
     }
-    else
+    Py_XDECREF(self->owner);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+/**
+ * Results can be created from Python with one positional argument per attribute,
+ * in the order of the attribute table. This is what pickle uses.
+ */
+static PyObject * Result_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    Py_ssize_t count = ResultSlotCount(type);
+    if ((kwds != NULL && PyDict_Size(kwds) != 0) || PyTuple_GET_SIZE(args) != count)
     {
-        //PyObject *pyBarcodeFormatString     = Py_BuildValue("s", "NULL");
-        PyObject * pyBarcodeFormatStringKey = Py_BuildValue("s", "BarcodeFormatString");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey, Py_None);
-        //Py_DECREF(pyBarcodeFormatString);
-        Py_DECREF(pyBarcodeFormatStringKey);
+        PyErr_Format(PyExc_TypeError, "%s() takes exactly %zd positional arguments", type->tp_name, count);
+        return NULL;
     }
-    
 
-    PyObject * pyBarcodeFormat_2        = Py_BuildValue("i", pResult->barcodeFormat_2);
-    PyObject * pyBarcodeFormatKey_2     = Py_BuildValue("s", "BarcodeFormat_2");
-    PyDict_SetItem(pyResult, pyBarcodeFormatKey_2, pyBarcodeFormat_2);
-    Py_DECREF(pyBarcodeFormat_2);
-    Py_DECREF(pyBarcodeFormatKey_2);
-
-    if(pResult->barcodeFormatString_2 != NULL)
+    ResultObject *self = (ResultObject *)type->tp_alloc(type, 0);
+    if (self == NULL)
     {
-        PyObject * pyBarcodeFormatString_2    = Py_BuildValue("s", pResult->barcodeFormatString_2);
-        PyObject * pyBarcodeFormatStringKey_2 = Py_BuildValue("s", "BarcodeFormatString_2");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey_2, pyBarcodeFormatString_2);
-        Py_DECREF(pyBarcodeFormatString_2);
-        Py_DECREF(pyBarcodeFormatStringKey_2);
+        return NULL;
     }
-    else
+    for (Py_ssize_t i = 0; i < count; ++i)
     {
-        //PyObject * pyBarcodeFormatString_2    = Py_BuildValue("s", "NULL");
-        PyObject * pyBarcodeFormatStringKey_2 = Py_BuildValue("s", "BarcodeFormatString_2");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey_2, Py_None);
-        //Py_DECREF(pyBarcodeFormatString_2);
-        Py_DECREF(pyBarcodeFormatStringKey_2);
+        PyObject *value = PyTuple_GET_ITEM(args, i);
+        Py_INCREF(value);
+        self->slots[i] = value;
     }
-    
+    return (PyObject *)self;
+}
 
-    PyObject * pyX1                     = Py_BuildValue("i", pResult->x1);
-    PyObject * pyX1Key                  = Py_BuildValue("s", "X1");
-    PyDict_SetItem(pyResult, pyX1Key, pyX1);
-    Py_DECREF(pyX1);
-    Py_DECREF(pyX1Key);
-
-    PyObject * pyY1                     = Py_BuildValue("i", pResult->y1);
-    PyObject * pyY1Key                  = Py_BuildValue("s", "Y1");
-    PyDict_SetItem(pyResult, pyY1Key, pyY1);
-    Py_DECREF(pyY1);
-    Py_DECREF(pyY1Key);
-
-    PyObject * pyX2                     = Py_BuildValue("i", pResult->x2);
-    PyObject * pyX2Key                  = Py_BuildValue("s", "X2");
-    PyDict_SetItem(pyResult, pyX2Key, pyX2);
-    Py_DECREF(pyX2);
-    Py_DECREF(pyX2Key);
-
-    PyObject * pyY2                     = Py_BuildValue("i", pResult->y2);
-    PyObject * pyY2Key                  = Py_BuildValue("s", "Y2");
-    PyDict_SetItem(pyResult, pyY2Key, pyY2);
-    Py_DECREF(pyY2);
-    Py_DECREF(pyY2Key);
-
-    PyObject * pyX3                     = Py_BuildValue("i", pResult->x3);
-    PyObject * pyX3Key                  = Py_BuildValue("s", "X3");
-    PyDict_SetItem(pyResult, pyX3Key, pyX3);
-    Py_DECREF(pyX3);
-    Py_DECREF(pyX3Key);
-
-    PyObject * pyY3                     = Py_BuildValue("i", pResult->y3);
-    PyObject * pyY3Key                  = Py_BuildValue("s", "Y3");
-    PyDict_SetItem(pyResult, pyY3Key, pyY3);
-    Py_DECREF(pyY3);
-    Py_DECREF(pyY3Key);
-
-    PyObject * pyX4                     = Py_BuildValue("i", pResult->x4);
-    PyObject * pyX4Key                  = Py_BuildValue("s", "X4");
-    PyDict_SetItem(pyResult, pyX4Key, pyX4);
-    Py_DECREF(pyX4);
-    Py_DECREF(pyX4Key);
-
-    PyObject * pyY4                     = Py_BuildValue("i", pResult->y4);
-    PyObject * pyY4Key                  = Py_BuildValue("s", "Y4");
-    PyDict_SetItem(pyResult, pyY4Key, pyY4);
-    Py_DECREF(pyY4);
-    Py_DECREF(pyY4Key);
-
-    PyObject * pyAngle                  = Py_BuildValue("i", pResult->angle);
-    PyObject * pyAngleKey               = Py_BuildValue("s", "Angle");
-    PyDict_SetItem(pyResult, pyAngleKey, pyAngle);
-    Py_DECREF(pyAngle);
-    Py_DECREF(pyAngleKey);
-
-    PyObject * pyModuleSize             = Py_BuildValue("i", pResult->moduleSize);
-    PyObject * pyModuleSizeKey          = Py_BuildValue("s", "ModuleSize");
-    PyDict_SetItem(pyResult, pyModuleSizeKey, pyModuleSize);
-    Py_DECREF(pyModuleSize);
-    Py_DECREF(pyModuleSizeKey);
-
-    PyObject * pyPageNumber             = Py_BuildValue("i", pResult->pageNumber);
-    PyObject * pyPageNumberKey          = Py_BuildValue("s", "PageNumber");
-    PyDict_SetItem(pyResult, pyPageNumberKey, pyPageNumber);
-    Py_DECREF(pyPageNumber);
-    Py_DECREF(pyPageNumberKey);
-
-    if(pResult->regionName != NULL)
-    {
-        PyObject * pyRegionName             = Py_BuildValue("s", pResult->regionName);
-        PyObject * pyRegionNameKey          = Py_BuildValue("s", "RegionName");
-        PyDict_SetItem(pyResult, pyRegionNameKey, pyRegionName);
-        Py_DECREF(pyRegionName);
-        Py_DECREF(pyRegionNameKey);
-    }
-    else
+static PyObject * Result_reduce(ResultObject *self, PyObject *args)
+{
+    if (FillResult(self) < 0)
     {
-        PyObject * pyRegionName             = Py_BuildValue("s", "NULL");
-        PyObject * pyRegionNameKey          = Py_BuildValue("s", "RegionName");
-        PyDict_SetItem(pyResult, pyRegionNameKey, pyRegionName);
-        Py_DECREF(pyRegionName);
-        Py_DECREF(pyRegionNameKey);
+        return NULL;
     }
-    
 
-    if(pResult->documentName != NULL)
+    Py_ssize_t count = ResultSlotCount(Py_TYPE(self));
+    PyObject *values = PyTuple_New(count);
+    if (values == NULL)
     {
-        PyObject * pyDocumentName           = Py_BuildValue("s", pResult->documentName);
-        PyObject * pyDocumentNameKey        = Py_BuildValue("s", "DocumentName");
-        PyDict_SetItem(pyResult, pyDocumentNameKey, pyDocumentName);
-        Py_DECREF(pyDocumentName);
-        Py_DECREF(pyDocumentNameKey);
+        return NULL;
     }
-    else
+    for (Py_ssize_t i = 0; i < count; ++i)
     {
-        PyObject * pyDocumentName           = Py_BuildValue("s", "NULL");
-        PyObject * pyDocumentNameKey        = Py_BuildValue("s", "DocumentName");
-        PyDict_SetItem(pyResult, pyDocumentNameKey, pyDocumentName);
-        Py_DECREF(pyDocumentName);
-        Py_DECREF(pyDocumentNameKey);
+        Py_INCREF(self->slots[i]);
+        PyTuple_SET_ITEM(values, i, self->slots[i]);
     }
-    
+    return Py_BuildValue("(ON)", Py_TYPE(self), values);
+}
 
-    PyObject * pyResultCoordinateType   = Py_BuildValue("i", pResult->resultCoordinateType);
-    PyObject * pyResultCoordinateTypeKey= Py_BuildValue("s", "ResultCoordinateType");
-    PyDict_SetItem(pyResult, pyResultCoordinateTypeKey, pyResultCoordinateType);
-    Py_DECREF(pyResultCoordinateType);
-    Py_DECREF(pyResultCoordinateTypeKey);
+static PyMethodDef result_methods[] = {
+    {"__reduce__", (PyCFunction)Result_reduce, METH_NOARGS, NULL},
+    {NULL}
+};
 
-    if(!(pResult->accompanyingTextBytes == NULL || pResult->accompanyingTextBytesLength == 0))
-    {
-        PyObject * pyAccompanyingTextBytes    = PyByteArray_FromStringAndSize(pResult->accompanyingTextBytes, pResult->accompanyingTextBytesLength);
-        PyObject * pyAccompanyingTextBytesKey = Py_BuildValue("s", "AccompanyingTextBytes");
-        PyDict_SetItem(pyResult, pyAccompanyingTextBytesKey, pyAccompanyingTextBytes);
-        Py_DECREF(pyAccompanyingTextBytes);
-        Py_DECREF(pyAccompanyingTextBytesKey);
-    }
-    else
+static PyObject * NewNone(void)
+{
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject * ByteArrayOrNone(const unsigned char *bytes, int length)
+{
+    if (bytes == NULL)
     {
-        //PyObject * pyAccompanyingTextBytes    = Py_BuildValue("o", NULL);
-        PyObject * pyAccompanyingTextBytesKey = Py_BuildValue("s", "AccompanyingTextBytes");
-        PyDict_SetItem(pyResult, pyAccompanyingTextBytesKey, Py_None);
-        //Py_DECREF(pyAccompanyingTextBytes);
-        Py_DECREF(pyAccompanyingTextBytesKey);
+        return NewNone();
     }
-    
-
-    PyObject * pyConfidence             = Py_BuildValue("i", pResult->confidence);
-    PyObject * pyConfidenceKey          = Py_BuildValue("s", "Confidence");
-    PyDict_SetItem(pyResult, pyConfidenceKey, pyConfidence);
-    Py_DECREF(pyConfidence);
-    Py_DECREF(pyConfidenceKey);
-
-    return pyResult;
+    return PyByteArray_FromStringAndSize((const char *)bytes, length);
 }
 
-static PyObject * CreatePyExtendedResult(ExtendedResult * pResult)
+/**
+ * Image buffers
+ *
+ * An image buffer exports native image memory with its shape, strides and item format, so numpy.asarray
+ * wraps it without a copy. It keeps the owner of the memory alive: the capsule of the native result array,
+ * or a bytes object holding a copy when the result is converted at once.
+ */
+typedef struct
 {
-    PyObject * pyResult = PyDict_New();
-    if(pyResult == NULL)
-    { 
-        return NULL;     
+    PyObject_HEAD
+    PyObject *owner;
+    char *buf;
+    Py_ssize_t length;
+    int ndim;
+    Py_ssize_t itemsize;
+    const char *format;
+    Py_ssize_t shape[3];
+    Py_ssize_t strides[3];
+} ImageBufferObject;
+
+static int ImageBuffer_getbuffer(ImageBufferObject *self, Py_buffer *view, int flags)
+{
+    if ((flags & PyBUF_WRITABLE) == PyBUF_WRITABLE)
+    {
+        PyErr_SetString(PyExc_BufferError, "The image data is read-only");
+        view->obj = NULL;
+        return -1;
     }
 
-    PyObject * pyResultType             = Py_BuildValue("i", pResult->resultType);
-    PyObject * pyResultTypeKey          = Py_BuildValue("s", "ResultType");
-    PyDict_SetItem(pyResult, pyResultTypeKey, pyResultType);
-    Py_DECREF(pyResultType);
-    Py_DECREF(pyResultTypeKey);
-
-    PyObject * pyBarcodeFormat          = Py_BuildValue("i", pResult->barcodeFormat);
-    PyObject * pyBarcodeFormatKey       = Py_BuildValue("s", "BarcodeFormat");
-    PyDict_SetItem(pyResult, pyBarcodeFormatKey, pyBarcodeFormat);
-    Py_DECREF(pyBarcodeFormat);
-    Py_DECREF(pyBarcodeFormatKey);
-
-    if(pResult->barcodeFormatString != NULL)
+    view->buf = self->buf;
+    view->readonly = 1;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+    if ((flags & PyBUF_STRIDES) == PyBUF_STRIDES && ((flags & PyBUF_FORMAT) == PyBUF_FORMAT || self->itemsize == 1))
     {
-        PyObject * pyBarcodeFormatString    = Py_BuildValue("s", pResult->barcodeFormatString);
-        PyObject * pyBarcodeFormatStringKey = Py_BuildValue("s", "BarcodeFormatString");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey, pyBarcodeFormatString);
-        Py_DECREF(pyBarcodeFormatString);
-        Py_DECREF(pyBarcodeFormatStringKey);
+        view->ndim = self->ndim;
+        view->itemsize = self->itemsize;
+        view->format = (flags & PyBUF_FORMAT) == PyBUF_FORMAT ? (char *)self->format : NULL;
+        view->shape = self->shape;
+        view->strides = self->strides;
+        view->len = self->itemsize;
+        for (int i = 0; i < self->ndim; ++i)
+            view->len *= self->shape[i];
     }
     else
     {
-        PyObject * pyBarcodeFormatString    = Py_BuildValue("s", "NULL");
-        PyObject * pyBarcodeFormatStringKey = Py_BuildValue("s", "BarcodeFormatString");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey, pyBarcodeFormatString);
-        Py_DECREF(pyBarcodeFormatString);
-        Py_DECREF(pyBarcodeFormatStringKey);
+        // Consumers that can not follow strides get the raw bytes
+        view->ndim = 1;
+        view->itemsize = 1;
+        view->format = (flags & PyBUF_FORMAT) == PyBUF_FORMAT ? "B" : NULL;
+        view->shape = (flags & PyBUF_ND) == PyBUF_ND ? &self->length : NULL;
+        view->strides = NULL;
+        view->len = self->length;
     }
-    
+    Py_INCREF(self);
+    view->obj = (PyObject *)self;
+    return 0;
+}
+
+static void ImageBuffer_dealloc(ImageBufferObject *self)
+{
+    Py_XDECREF(self->owner);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyBufferProcs ImageBuffer_as_buffer;
 
-    PyObject * pyBarcodeFormat_2        = Py_BuildValue("i", pResult->barcodeFormat_2);
-    PyObject * pyBarcodeFormatKey_2     = Py_BuildValue("s", "BarcodeFormat_2");
-    PyDict_SetItem(pyResult, pyBarcodeFormatKey_2, pyBarcodeFormat_2);
-    Py_DECREF(pyBarcodeFormat_2);
-    Py_DECREF(pyBarcodeFormatKey_2);
+static PyTypeObject ImageBufferType = {PyVarObject_HEAD_INIT(NULL, 0)};
 
-    if(pResult->barcodeFormatString_2 != NULL)
+static int InitImageBufferType(void)
+{
+    ImageBuffer_as_buffer.bf_getbuffer = (getbufferproc)ImageBuffer_getbuffer;
+    ImageBufferType.tp_name = "dbr.ImageBuffer";
+    ImageBufferType.tp_basicsize = sizeof(ImageBufferObject);
+    ImageBufferType.tp_dealloc = (destructor)ImageBuffer_dealloc;
+    ImageBufferType.tp_as_buffer = &ImageBuffer_as_buffer;
+#if defined(IS_PY3K)
+    ImageBufferType.tp_flags = Py_TPFLAGS_DEFAULT;
+#else
+    ImageBufferType.tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_NEWBUFFER;
+#endif
+    ImageBufferType.tp_doc = "Exports native image memory to numpy.";
+    return PyType_Ready(&ImageBufferType);
+}
+
+/**
+ * Describe the pixels as (rows, width) or (rows, width, channels). Binary images stay packed
+ * with 8 pixels per byte, NV21 has the interleaved VU rows below the Y rows.
+ * An unknown format or a buffer too short for the layout is exported as raw bytes.
+ */
+static void SetImageLayout(ImageBufferObject *self, int width, int height, int stride, int format)
+{
+    int rows = height, channels = 1;
+    Py_ssize_t itemsize = 1;
+    const char *itemFormat = "B";
+    switch (format)
     {
-        PyObject * pyBarcodeFormatString_2    = Py_BuildValue("s", pResult->barcodeFormatString_2);
-        PyObject * pyBarcodeFormatStringKey_2 = Py_BuildValue("s", "BarcodeFormatString_2");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey_2, pyBarcodeFormatString_2);
-        Py_DECREF(pyBarcodeFormatString_2);
-        Py_DECREF(pyBarcodeFormatStringKey_2);
+    case IPF_BINARY:
+    case IPF_BINARYINVERTED:    width = (width + 7) / 8; break;
+    case IPF_GRAYSCALED:        break;
+    case IPF_NV21:              rows = height + height / 2; break;
+    case IPF_RGB_565:
+    case IPF_RGB_555:           itemsize = 2; itemFormat = "H"; break;
+    case IPF_RGB_888:           channels = 3; break;
+    case IPF_ARGB_8888:         channels = 4; break;
+    case IPF_RGB_161616:        channels = 3; itemsize = 2; itemFormat = "H"; break;
+    case IPF_ARGB_16161616:     channels = 4; itemsize = 2; itemFormat = "H"; break;
+    default:                    rows = 0; break;
     }
-    else
+
+    Py_ssize_t rowBytes = (Py_ssize_t)width * channels * itemsize;
+    if (rows <= 0 || width <= 0 || stride < rowBytes || (Py_ssize_t)(rows - 1) * stride + rowBytes > self->length)
     {
-        PyObject * pyBarcodeFormatString_2    = Py_BuildValue("s", "NULL");
-        PyObject * pyBarcodeFormatStringKey_2 = Py_BuildValue("s", "BarcodeFormatString_2");
-        PyDict_SetItem(pyResult, pyBarcodeFormatStringKey_2, pyBarcodeFormatString_2);
-        Py_DECREF(pyBarcodeFormatString_2);
-        Py_DECREF(pyBarcodeFormatStringKey_2);
+        self->ndim = 1;
+        self->itemsize = 1;
+        self->format = "B";
+        self->shape[0] = self->length;
+        self->strides[0] = 1;
+        return;
     }
 
-    PyObject * pyConfidence             = Py_BuildValue("i",pResult->confidence);
-    PyObject * pyConfidenceKey          = Py_BuildValue("s", "Confidence");
-    PyDict_SetItem(pyResult, pyConfidenceKey, pyConfidence);
-    Py_DECREF(pyConfidence);
-    Py_DECREF(pyConfidenceKey);
+    self->ndim = channels == 1 ? 2 : 3;
+    self->itemsize = itemsize;
+    self->format = itemFormat;
+    self->shape[0] = rows;
+    self->shape[1] = width;
+    self->shape[2] = channels;
+    self->strides[0] = stride;
+    self->strides[1] = channels * itemsize;
+    self->strides[2] = itemsize;
+}
+
+static PyObject *numpyAsArray = NULL;
 
-    if(pResult->bytes != NULL)
+/**
+ * Create a read-only numpy array over native image memory. Without an owner the memory is copied once,
+ * because the native result is freed as soon as the conversion is done.
+ */
+static PyObject * CreatePyImageArray(const unsigned char *bytes, Py_ssize_t length, int width, int height, int stride, int format, PyObject *owner)
+{
+    if (bytes == NULL)
     {
-        PyObject * pyBytes                  = PyByteArray_FromStringAndSize(pResult->bytes, pResult->bytesLength);
-        PyObject * pyBytesKey               = Py_BuildValue("s", "Bytes");
-        PyDict_SetItem(pyResult, pyBytesKey, pyBytes);
-        Py_DECREF(pyBytes);
-        Py_DECREF(pyBytesKey);
+        return NewNone();
     }
-    else
+    if (numpyAsArray == NULL)
     {
-        //PyObject * pyBytes                  = Py_BuildValue("o", NULL);
-        PyObject * pyBytesKey               = Py_BuildValue("s", "Bytes");
-        PyDict_SetItem(pyResult, pyBytesKey, Py_None);
-        //Py_DECREF(pyBytes);
-        Py_DECREF(pyBytesKey);
+        PyObject *numpy = PyImport_ImportModule("numpy");
+        if (numpy == NULL)
+            return NULL;
+        numpyAsArray = PyObject_GetAttrString(numpy, "asarray");
+        Py_DECREF(numpy);
+        if (numpyAsArray == NULL)
+            return NULL;
     }
 
-    if(pResult->accompanyingTextBytes != NULL)
+    ImageBufferObject *buffer = PyObject_New(ImageBufferObject, &ImageBufferType);
+    if (buffer == NULL)
     {
-        PyObject * pyAccompanyingTextBytes    = PyByteArray_FromStringAndSize(pResult->accompanyingTextBytes, pResult->accompanyingTextBytesLength);
-        PyObject * pyAccompanyingTextBytesKey = Py_BuildValue("s", "AccompanyingTextBytes");
-        PyDict_SetItem(pyResult, pyAccompanyingTextBytesKey, pyAccompanyingTextBytes);
-		Py_DECREF(pyAccompanyingTextBytes);
-		Py_DECREF(pyAccompanyingTextBytesKey);
-    }
-    else
-    {
-        //PyObject * pyAccompanyingTextBytes    = Py_BuildValue("o", NULL);
-        PyObject * pyAccompanyingTextBytesKey = Py_BuildValue("s", "AccompanyingTextBytes");
-        PyDict_SetItem(pyResult, pyAccompanyingTextBytesKey, Py_None);
-        //Py_DECREF(pyAccompanyingTextBytes);
-        Py_DECREF(pyAccompanyingTextBytesKey);
+        return NULL;
     }
-    
-    PyObject * pyDeformation            = Py_BuildValue("i", pResult->deformation);
-    PyObject * pyDeformationKey         = Py_BuildValue("s", "Deformation");
-    PyDict_SetItem(pyResult, pyDeformationKey, pyDeformation);
-    Py_DECREF(pyDeformation);
-    Py_DECREF(pyDeformationKey);
-
-    if(pResult->detailedResult != NULL)
+    if (owner != NULL)
     {
-        PyObject * pyDetailedResult         = CreatePyDetailedResult(pResult->detailedResult, pResult->barcodeFormat);
-        PyObject * pyDetailedResultKey      = Py_BuildValue("s", "DetailedResult");
-        PyDict_SetItem(pyResult, pyDetailedResultKey, pyDetailedResult);
-        Py_DECREF(pyDetailedResult);
-        Py_DECREF(pyDetailedResultKey);
+        Py_INCREF(owner);
+        buffer->owner = owner;
+        buffer->buf = (char *)bytes;
     }
     else
     {
-        //PyObject * pyDetailedResult         = Py_BuildValue("o", NULL);
-        PyObject * pyDetailedResultKey      = Py_BuildValue("s", "DetailedResult");
-        PyDict_SetItem(pyResult, pyDetailedResultKey, Py_None);
-        //Py_DECREF(pyDetailedResult);
-        Py_DECREF(pyDetailedResultKey);
+        buffer->owner = PyBytes_FromStringAndSize((const char *)bytes, length);
+        if (buffer->owner == NULL)
+        {
+            Py_DECREF(buffer);
+            return NULL;
+        }
+        buffer->buf = PyBytes_AS_STRING(buffer->owner);
     }
-    
-    
-    PyObject * pySamplingImage          = CreatePySamplingImageData(pResult->samplingImage);
-	if (pySamplingImage != NULL)
-	{
-		PyObject * pySamplingImageKey = Py_BuildValue("s", "SamplingImage");
-		PyDict_SetItem(pyResult, pySamplingImageKey, pySamplingImage);
-		Py_DECREF(pySamplingImage);
-		Py_DECREF(pySamplingImageKey);
-	}
-	else
-	{
-		PyObject * pySamplingImageKey = Py_BuildValue("s", "SamplingImage");
-		PyDict_SetItem(pyResult, pySamplingImageKey, Py_None);
-		Py_DECREF(pySamplingImage);
-		Py_DECREF(pySamplingImageKey);
-	}
+    buffer->length = length;
+    SetImageLayout(buffer, width, height, stride, format);
+
+    PyObject *array = PyObject_CallFunctionObjArgs(numpyAsArray, (PyObject *)buffer, NULL);
+    Py_DECREF(buffer);
+    return array;
+}
+
+enum { SI_BYTES, SI_WIDTH, SI_HEIGHT, SI_COUNT };
+
+static PyGetSetDef SamplingImageData_getset[] = {
+    RESULT_GETSET("bytes", SI_BYTES, "The sampling image data in a read-only numpy uint8 array of shape (height, width)"),
+    RESULT_GETSET("width", SI_WIDTH, "The width of the sampling image"),
+    RESULT_GETSET("height", SI_HEIGHT, "The height of the sampling image"),
+    {NULL}
+};
+
+enum { OD_MODULE_SIZE, OD_START_CHARS_BYTES, OD_STOP_CHARS_BYTES, OD_CHECK_DIGIT_BYTES, OD_COUNT };
+
+static PyGetSetDef OnedDetailedResult_getset[] = {
+    RESULT_GETSET("module_size", OD_MODULE_SIZE, "The barcode module size (the minimum bar width in pixel)"),
+    RESULT_GETSET("start_chars_bytes", OD_START_CHARS_BYTES, "The start chars in a byte array"),
+    RESULT_GETSET("stop_chars_bytes", OD_STOP_CHARS_BYTES, "The stop chars in a byte array"),
+    RESULT_GETSET("check_digit_bytes", OD_CHECK_DIGIT_BYTES, "The check digit chars in a byte array"),
+    {NULL}
+};
+
+enum { QR_MODULE_SIZE, QR_ROWS, QR_COLUMNS, QR_ERROR_CORRECTION_LEVEL, QR_VERSIONS, QR_MODEL, QR_COUNT };
+
+static PyGetSetDef QRCodeDetailedResult_getset[] = {
+    RESULT_GETSET("module_size", QR_MODULE_SIZE, "The barcode module size (the minimum bar width in pixel)"),
+    RESULT_GETSET("rows", QR_ROWS, "The row count of the barcode"),
+    RESULT_GETSET("columns", QR_COLUMNS, "The column count of the barcode"),
+    RESULT_GETSET("error_correction_level", QR_ERROR_CORRECTION_LEVEL, "The error correction level of the barcode"),
+    RESULT_GETSET("versions", QR_VERSIONS, "The version of the QR Code"),
+    RESULT_GETSET("model", QR_MODEL, "Number of the models"),
+    {NULL}
+};
+
+enum { DM_MODULE_SIZE, DM_ROWS, DM_COLUMNS, DM_DATA_REGION_ROWS, DM_DATA_REGION_COLUMNS, DM_DATA_REGION_NUMBER, DM_COUNT };
+
+static PyGetSetDef DataMatrixDetailedResult_getset[] = {
+    RESULT_GETSET("module_size", DM_MODULE_SIZE, "The barcode module size (the minimum bar width in pixel)"),
+    RESULT_GETSET("rows", DM_ROWS, "The row count of the barcode"),
+    RESULT_GETSET("columns", DM_COLUMNS, "The column count of the barcode"),
+    RESULT_GETSET("data_region_rows", DM_DATA_REGION_ROWS, "The data region row count of the barcode"),
+    RESULT_GETSET("data_region_columns", DM_DATA_REGION_COLUMNS, "The data region column count of the barcode"),
+    RESULT_GETSET("data_region_number", DM_DATA_REGION_NUMBER, "The data region count"),
+    {NULL}
+};
+
+enum { PDF_MODULE_SIZE, PDF_ROWS, PDF_COLUMNS, PDF_ERROR_CORRECTION_LEVEL, PDF_COUNT };
+
+static PyGetSetDef PDFDetailedResult_getset[] = {
+    RESULT_GETSET("module_size", PDF_MODULE_SIZE, "The barcode module size (the minimum bar width in pixel)"),
+    RESULT_GETSET("rows", PDF_ROWS, "The row count of the barcode"),
+    RESULT_GETSET("columns", PDF_COLUMNS, "The column count of the barcode"),
+    RESULT_GETSET("error_correction_level", PDF_ERROR_CORRECTION_LEVEL, "The error correction level of the barcode"),
+    {NULL}
+};
+
+enum { AZ_MODULE_SIZE, AZ_ROWS, AZ_COLUMNS, AZ_LAYER_NUMBER, AZ_COUNT };
+
+static PyGetSetDef AztecDetailedResult_getset[] = {
+    RESULT_GETSET("module_size", AZ_MODULE_SIZE, "The barcode module size (the minimum bar width in pixel)"),
+    RESULT_GETSET("rows", AZ_ROWS, "The row count of the barcode"),
+    RESULT_GETSET("columns", AZ_COLUMNS, "The column count of the barcode"),
+    RESULT_GETSET("layer_number", AZ_LAYER_NUMBER, "A negative number (-1, -2, -3, -4) specifies a compact Aztec code. A positive number (1, 2, .. 32) specifies a normal (full-rang) Aztec code."),
+    {NULL}
+};
+
+enum { ER_RESULT_TYPE, ER_BARCODE_FORMAT, ER_BARCODE_FORMAT_STRING, ER_BARCODE_FORMAT_2, ER_BARCODE_FORMAT_STRING_2, ER_CONFIDENCE,
+       ER_BYTES, ER_ACCOMPANYING_TEXT_BYTES, ER_DEFORMATION, ER_DETAILED_RESULT, ER_SAMPLING_IMAGE, ER_CLARITY, ER_COUNT };
+
+static PyGetSetDef ExtendedResult_getset[] = {
+    RESULT_GETSET("result_type", ER_RESULT_TYPE, "Extended result type"),
+    RESULT_GETSET("barcode_format", ER_BARCODE_FORMAT, "Barcode type in BarcodeFormat group 1"),
+    RESULT_GETSET("barcode_format_string", ER_BARCODE_FORMAT_STRING, "Barcode type in BarcodeFormat group 1 as string"),
+    RESULT_GETSET("barcode_format_2", ER_BARCODE_FORMAT_2, "Barcode type in BarcodeFormat group 2"),
+    RESULT_GETSET("barcode_format_string_2", ER_BARCODE_FORMAT_STRING_2, "Barcode type in BarcodeFormat group 2 as string"),
+    RESULT_GETSET("confidence", ER_CONFIDENCE, "The confidence of the result"),
+    RESULT_GETSET("bytes", ER_BYTES, "The content in a byte array"),
+    RESULT_GETSET("accompanying_text_bytes", ER_ACCOMPANYING_TEXT_BYTES, "The accompanying text content in a byte array"),
+    RESULT_GETSET("deformation", ER_DEFORMATION, "The deformation value"),
+    RESULT_GETSET("detailed_result", ER_DETAILED_RESULT, "One of the following: OnedDetailedResult, PDFDetailedResult, DataMatrixDetailedResult, AztecDetailedResult, QRCodeDetailedResult"),
+    RESULT_GETSET("sampling_image", ER_SAMPLING_IMAGE, "The sampling image info"),
+    RESULT_GETSET("clarity", ER_CLARITY, "The clarity of the barcode zone in percentage"),
+    {NULL}
+};
+
+enum { LR_TERMINATE_PHASE, LR_BARCODE_FORMAT, LR_BARCODE_FORMAT_STRING, LR_BARCODE_FORMAT_2, LR_BARCODE_FORMAT_STRING_2,
+       LR_LOCALIZATION_POINTS, LR_ANGLE, LR_MODULE_SIZE, LR_PAGE_NUMBER, LR_REGION_NAME, LR_DOCUMENT_NAME,
+       LR_RESULT_COORDINATE_TYPE, LR_ACCOMPANYING_TEXT_BYTES, LR_CONFIDENCE, LR_COUNT };
+
+static PyGetSetDef LocalizationResult_getset[] = {
+    RESULT_GETSET("terminate_phase", LR_TERMINATE_PHASE, "The terminate phase of localization result"),
+    RESULT_GETSET("barcode_format", LR_BARCODE_FORMAT, "Barcode type in BarcodeFormat group 1"),
+    RESULT_GETSET("barcode_format_string", LR_BARCODE_FORMAT_STRING, "Barcode type in BarcodeFormat group 1 as string"),
+    RESULT_GETSET("barcode_format_2", LR_BARCODE_FORMAT_2, "Barcode type in BarcodeFormat group 2"),
+    RESULT_GETSET("barcode_format_string_2", LR_BARCODE_FORMAT_STRING_2, "Barcode type in BarcodeFormat group 2 as string"),
+    RESULT_GETSET("localization_points", LR_LOCALIZATION_POINTS, "The 4 localization points, a list of Point"),
+    RESULT_GETSET("angle", LR_ANGLE, "The angle of a barcode. Values range is from 0 to 360"),
+    RESULT_GETSET("module_size", LR_MODULE_SIZE, "The barcode module size (the minimum bar width in pixel)"),
+    RESULT_GETSET("page_number", LR_PAGE_NUMBER, "The page number the barcode located in. The index is 0-based"),
+    RESULT_GETSET("region_name", LR_REGION_NAME, "The region name the barcode located in"),
+    RESULT_GETSET("document_name", LR_DOCUMENT_NAME, "The document name"),
+    RESULT_GETSET("result_coordinate_type", LR_RESULT_COORDINATE_TYPE, "The coordinate type"),
+    RESULT_GETSET("accompanying_text_bytes", LR_ACCOMPANYING_TEXT_BYTES, "The accompanying text content in a byte array"),
+    RESULT_GETSET("confidence", LR_CONFIDENCE, "The confidence of the localization result"),
+    {NULL}
+};
+
+enum { TR_BARCODE_FORMAT, TR_BARCODE_FORMAT_STRING, TR_BARCODE_FORMAT_2, TR_BARCODE_FORMAT_STRING_2, TR_BARCODE_TEXT,
+       TR_BARCODE_BYTES, TR_LOCALIZATION_RESULT, TR_DETAILED_RESULT, TR_EXTENDED_RESULTS, TR_COUNT };
+
+static PyGetSetDef TextResult_getset[] = {
+    RESULT_GETSET("barcode_format", TR_BARCODE_FORMAT, "Barcode type in BarcodeFormat group 1"),
+    RESULT_GETSET("barcode_format_string", TR_BARCODE_FORMAT_STRING, "Barcode type in BarcodeFormat group 1 as string"),
+    RESULT_GETSET("barcode_format_2", TR_BARCODE_FORMAT_2, "Barcode type in BarcodeFormat group 2"),
+    RESULT_GETSET("barcode_format_string_2", TR_BARCODE_FORMAT_STRING_2, "Barcode type in BarcodeFormat group 2 as string"),
+    RESULT_GETSET("barcode_text", TR_BARCODE_TEXT, "The barcode text"),
+    RESULT_GETSET("barcode_bytes", TR_BARCODE_BYTES, "The barcode content in a byte array"),
+    RESULT_GETSET("localization_result", TR_LOCALIZATION_RESULT, "The corresponding localization result"),
+    RESULT_GETSET("detailed_result", TR_DETAILED_RESULT, "One of the following: OnedDetailedResult, PDFDetailedResult, DataMatrixDetailedResult, AztecDetailedResult, QRCodeDetailedResult"),
+    RESULT_GETSET("extended_results", TR_EXTENDED_RESULTS, "The extended result list"),
+    {NULL}
+};
+
+static PyObject * CreateSamplingImageDataSlot(const void *native, int index, PyObject *owner);
+static PyObject * CreateOnedDetailedResultSlot(const void *native, int index, PyObject *owner);
+static PyObject * CreateQRCodeDetailedResultSlot(const void *native, int index, PyObject *owner);
+static PyObject * CreateDataMatrixDetailedResultSlot(const void *native, int index, PyObject *owner);
+static PyObject * CreatePDFDetailedResultSlot(const void *native, int index, PyObject *owner);
+static PyObject * CreateAztecDetailedResultSlot(const void *native, int index, PyObject *owner);
+static PyObject * CreateExtendedResultSlot(const void *native, int index, PyObject *owner);
+static PyObject * CreateLocalizationResultSlot(const void *native, int index, PyObject *owner);
+static PyObject * CreateTextResultSlot(const void *native, int index, PyObject *owner);
+
+static ResultTypeObject SamplingImageDataType = {{PyVarObject_HEAD_INIT(NULL, 0)}, CreateSamplingImageDataSlot};
+static ResultTypeObject OnedDetailedResultType = {{PyVarObject_HEAD_INIT(NULL, 0)}, CreateOnedDetailedResultSlot};
+static ResultTypeObject QRCodeDetailedResultType = {{PyVarObject_HEAD_INIT(NULL, 0)}, CreateQRCodeDetailedResultSlot};
+static ResultTypeObject DataMatrixDetailedResultType = {{PyVarObject_HEAD_INIT(NULL, 0)}, CreateDataMatrixDetailedResultSlot};
+static ResultTypeObject PDFDetailedResultType = {{PyVarObject_HEAD_INIT(NULL, 0)}, CreatePDFDetailedResultSlot};
+static ResultTypeObject AztecDetailedResultType = {{PyVarObject_HEAD_INIT(NULL, 0)}, CreateAztecDetailedResultSlot};
+static ResultTypeObject ExtendedResultType = {{PyVarObject_HEAD_INIT(NULL, 0)}, CreateExtendedResultSlot};
+static ResultTypeObject LocalizationResultType = {{PyVarObject_HEAD_INIT(NULL, 0)}, CreateLocalizationResultSlot};
+static ResultTypeObject TextResultType = {{PyVarObject_HEAD_INIT(NULL, 0)}, CreateTextResultSlot};
+
+static struct
+{
+    ResultTypeObject *type;
+    const char *name;
+    int slotCount;
+    PyGetSetDef *getset;
+    const char *doc;
+} resultTypes[] = {
+    {&SamplingImageDataType, "SamplingImageData", SI_COUNT, SamplingImageData_getset, "Stores the sampling image data."},
+    {&OnedDetailedResultType, "OnedDetailedResult", OD_COUNT, OnedDetailedResult_getset, "Stores the OneD code details."},
+    {&QRCodeDetailedResultType, "QRCodeDetailedResult", QR_COUNT, QRCodeDetailedResult_getset, "Stores the QRCode details."},
+    {&DataMatrixDetailedResultType, "DataMatrixDetailedResult", DM_COUNT, DataMatrixDetailedResult_getset, "Stores the DataMatrix details."},
+    {&PDFDetailedResultType, "PDFDetailedResult", PDF_COUNT, PDFDetailedResult_getset, "Stores the PDF details."},
+    {&AztecDetailedResultType, "AztecDetailedResult", AZ_COUNT, AztecDetailedResult_getset, "Stores the Aztec details."},
+    {&ExtendedResultType, "ExtendedResult", ER_COUNT, ExtendedResult_getset, "Stores the extended result."},
+    {&LocalizationResultType, "LocalizationResult", LR_COUNT, LocalizationResult_getset, "Stores the localization result."},
+    {&TextResultType, "TextResult", TR_COUNT, TextResult_getset, "Stores the text result."},
+};
+
+#define RESULT_TYPE_COUNT (sizeof(resultTypes) / sizeof(resultTypes[0]))
+
+// Point is a struct sequence, so it is also an (x, y) tuple that OpenCV accepts as it is
+static PyTypeObject PointType;
+
+static PyStructSequence_Field point_fields[] = {
+    {"x", "The X coordinate of the point"},
+    {"y", "The Y coordinate of the point"},
+    {NULL}
+};
+
+static PyStructSequence_Desc point_desc = {
+    "dbr.Point",
+    "Stores an x- and y-coordinate pair in two-dimensional space.",
+    point_fields,
+    2
+};
+
+static int InitResultTypes(void)
+{
+    if (InitImageBufferType() < 0)
+        return -1;
 
-    PyObject * pyClarity                = Py_BuildValue("i",pResult->clarity);
-    PyObject * pyClarityKey             = Py_BuildValue("s", "Clarity");
-    PyDict_SetItem(pyResult, pyClarityKey, pyClarity);
-    Py_DECREF(pyClarity);
-    Py_DECREF(pyClarityKey);
+    static char names[RESULT_TYPE_COUNT][64];
+    for (size_t i = 0; i < RESULT_TYPE_COUNT; ++i)
+    {
+        PyTypeObject *type = &resultTypes[i].type->type;
+        snprintf(names[i], sizeof(names[i]), "dbr.%s", resultTypes[i].name);
+        type->tp_name = names[i];
+        type->tp_basicsize = RESULT_SLOT(resultTypes[i].slotCount);
+        type->tp_dealloc = (destructor)Result_dealloc;
+        type->tp_flags = Py_TPFLAGS_DEFAULT;
+        type->tp_doc = resultTypes[i].doc;
+        type->tp_methods = result_methods;
+        type->tp_getset = resultTypes[i].getset;
+        type->tp_new = Result_new;
+        if (PyType_Ready(type) < 0)
+            return -1;
+    }
 
-    return pyResult;
+#if defined(IS_PY3K)
+    if (PyStructSequence_InitType2(&PointType, &point_desc) < 0)
+        return -1;
+#else
+    PyStructSequence_InitType(&PointType, &point_desc);
+#endif
+    return 0;
 }
 
-static PyObject * CreatePyTextResults(TextResultArray *pResults)
+static void AddResultTypes(PyObject *module)
 {
-    // Get barcode results
-    int count = pResults->resultsCount;
+    for (size_t i = 0; i < RESULT_TYPE_COUNT; ++i)
+    {
+        Py_INCREF(resultTypes[i].type);
+        PyModule_AddObject(module, resultTypes[i].name, (PyObject *)resultTypes[i].type);
+    }
+    Py_INCREF(&PointType);
+    PyModule_AddObject(module, "Point", (PyObject *)&PointType);
+}
 
-    // Create a Python object to store results
-    PyObject *pyTextResults = PyList_New(count);
-	if (pyTextResults == NULL)
-	{
-		return NULL;
-	}
+static PyObject * CreatePyPoint(int x, int y)
+{
+    PyObject * pyPoint = PyStructSequence_New(&PointType);
+    if(pyPoint == NULL)
+    {
+        return NULL;
+    }
 
-    for (int i = 0; i < count; i++)
+    PyObject * pyX = Py_BuildValue("i", x);
+    PyObject * pyY = Py_BuildValue("i", y);
+    PyStructSequence_SET_ITEM(pyPoint, 0, pyX);
+    PyStructSequence_SET_ITEM(pyPoint, 1, pyY);
+    if(pyX == NULL || pyY == NULL)
     {
-        PyObject * pyTextResult = PyDict_New();
-        if(pyTextResult == NULL)
-        {
-            return NULL;     
-        }
+        Py_DECREF(pyPoint);
+        return NULL;
+    }
+    return pyPoint;
+}
 
-        PyObject * pyBarcodeFormat      = Py_BuildValue("i", pResults->results[i]->barcodeFormat);
-        PyObject * pyBarcodeFormatKey   = Py_BuildValue("s", "BarcodeFormat");
-        PyDict_SetItem(pyTextResult, pyBarcodeFormatKey, pyBarcodeFormat);
-        Py_DECREF(pyBarcodeFormat);
-        Py_DECREF(pyBarcodeFormatKey);
+static PyObject * CreateSamplingImageDataSlot(const void *native, int index, PyObject *owner)
+{
+    const SamplingImageData * pResult = (const SamplingImageData *)native;
+    switch(index)
+    {
+    case SI_BYTES:  return CreatePyImageArray(pResult->bytes, (Py_ssize_t)pResult->width * pResult->height, pResult->width, pResult->height, pResult->width, IPF_GRAYSCALED, owner);
+    case SI_WIDTH:  return Py_BuildValue("i", pResult->width);
+    case SI_HEIGHT: return Py_BuildValue("i", pResult->height);
+    }
+    return NewNone();
+}
 
-        if(pResults->results[i]->barcodeFormatString != NULL)
-        {
-            PyObject * pyBarcodeFormatString    = Py_BuildValue("s", pResults->results[i]->barcodeFormatString);
-            PyObject * pyBarcodeFormatStringKey = Py_BuildValue("s", "BarcodeFormatString");
-            PyDict_SetItem(pyTextResult, pyBarcodeFormatStringKey, pyBarcodeFormatString);
-            Py_DECREF(pyBarcodeFormatString);
-            Py_DECREF(pyBarcodeFormatStringKey);
-        }
-        else
-        {
-            PyObject * pyBarcodeFormatString    = Py_BuildValue("s", "NULL");
-            PyObject * pyBarcodeFormatStringKey = Py_BuildValue("s", "BarcodeFormatString");
-            PyDict_SetItem(pyTextResult, pyBarcodeFormatStringKey, pyBarcodeFormatString);
-            Py_DECREF(pyBarcodeFormatString);
-            Py_DECREF(pyBarcodeFormatStringKey);
-        }    
-
-        PyObject * pyBarcodeFormat_2    = Py_BuildValue("i", pResults->results[i]->barcodeFormat_2);
-        PyObject * pyBarcodeFormatKey_2 = Py_BuildValue("s", "BarcodeFormat_2");
-        PyDict_SetItem(pyTextResult, pyBarcodeFormatKey_2, pyBarcodeFormat_2);
-        Py_DECREF(pyBarcodeFormat_2);
-        Py_DECREF(pyBarcodeFormatKey_2);
-
-        if(pResults->results[i]->barcodeFormatString_2 != NULL)
-        {
-            PyObject * pyBarcodeFormatString_2    = Py_BuildValue("s", pResults->results[i]->barcodeFormatString_2);
-            PyObject * pyBarcodeFormatStringKey_2 = Py_BuildValue("s", "BarcodeFormatString_2");
-            PyDict_SetItem(pyTextResult, pyBarcodeFormatStringKey_2, pyBarcodeFormatString_2);
-            Py_DECREF(pyBarcodeFormatString_2);
-            Py_DECREF(pyBarcodeFormatStringKey_2);
-        }
-        else
-        {
-            PyObject * pyBarcodeFormatString_2    = Py_BuildValue("s", "NULL");
-            PyObject * pyBarcodeFormatStringKey_2 = Py_BuildValue("s", "BarcodeFormatString_2");
-            PyDict_SetItem(pyTextResult, pyBarcodeFormatStringKey_2, pyBarcodeFormatString_2);
-            Py_DECREF(pyBarcodeFormatString_2);
-            Py_DECREF(pyBarcodeFormatStringKey_2);
-        }
+static PyObject * CreateOnedDetailedResultSlot(const void *native, int index, PyObject *owner)
+{
+    const OneDCodeDetails * pResult = (const OneDCodeDetails *)native;
+    switch(index)
+    {
+    case OD_MODULE_SIZE:        return Py_BuildValue("i", pResult->moduleSize);
+    case OD_START_CHARS_BYTES:  return ByteArrayOrNone(pResult->startCharsBytes, pResult->startCharsBytesLength);
+    case OD_STOP_CHARS_BYTES:   return ByteArrayOrNone(pResult->stopCharsBytes, pResult->stopCharsBytesLength);
+    case OD_CHECK_DIGIT_BYTES:  return ByteArrayOrNone(pResult->checkDigitBytes, pResult->checkDigitBytesLength);
+    }
+    return NewNone();
+}
 
-        if(pResults->results[i]->barcodeText != NULL)
-        {
-            PyObject * pyBarcodeText        = Py_BuildValue("s", pResults->results[i]->barcodeText);
-            if(pyBarcodeText == NULL)
-            {
-                PyErr_SetString(PyExc_TypeError, "Incorrect character set! Failed to decode barcode results!");
-                return NULL;
-            }
-            PyObject * pyBarcodeTextKey     = Py_BuildValue("s", "BarcodeText");
-            PyDict_SetItem(pyTextResult, pyBarcodeTextKey, pyBarcodeText);
-            Py_DECREF(pyBarcodeText);
-            Py_DECREF(pyBarcodeTextKey);
-        }
-        else
-        {
-            PyObject * pyBarcodeText        = Py_BuildValue("s", "NULL");
-            PyObject * pyBarcodeTextKey     = Py_BuildValue("s", "BarcodeText");
-            PyDict_SetItem(pyTextResult, pyBarcodeTextKey, pyBarcodeText);
-            Py_DECREF(pyBarcodeText);
-            Py_DECREF(pyBarcodeTextKey);
-        }
+static PyObject * CreateQRCodeDetailedResultSlot(const void *native, int index, PyObject *owner)
+{
+    const QRCodeDetails * pResult = (const QRCodeDetails *)native;
+    switch(index)
+    {
+    case QR_MODULE_SIZE:            return Py_BuildValue("i", pResult->moduleSize);
+    case QR_ROWS:                   return Py_BuildValue("i", pResult->rows);
+    case QR_COLUMNS:                return Py_BuildValue("i", pResult->columns);
+    case QR_ERROR_CORRECTION_LEVEL: return Py_BuildValue("i", pResult->errorCorrectionLevel);
+    case QR_VERSIONS:               return Py_BuildValue("i", pResult->version);
+    case QR_MODEL:                  return Py_BuildValue("i", pResult->model);
+    }
+    return NewNone();
+}
 
-        if(!(pResults->results[i]->barcodeBytes == NULL || pResults->results[i]->barcodeBytesLength == 0))
-        {
-            PyObject * pyBarcodeBytes       = PyByteArray_FromStringAndSize(pResults->results[i]->barcodeBytes, pResults->results[i]->barcodeBytesLength);
-            PyObject * pyBarcodeBytesKey    = Py_BuildValue("s", "BarcodeBytes");
-            PyDict_SetItem(pyTextResult, pyBarcodeBytesKey, pyBarcodeBytes);
-            Py_DECREF(pyBarcodeBytes);
-            Py_DECREF(pyBarcodeBytesKey);
-        }
-        else
-        {
-            //PyObject * pyBarcodeBytes       = Py_BuildValue("o", NULL);
-            PyObject * pyBarcodeBytesKey    = Py_BuildValue("s", "BarcodeBytes");
-            PyDict_SetItem(pyTextResult, pyBarcodeBytesKey, Py_None);
-            //Py_DECREF(pyBarcodeBytes);
-            Py_DECREF(pyBarcodeBytesKey);
-        }
-        
-        if(pResults->results[i]->localizationResult != NULL)
+static PyObject * CreateDataMatrixDetailedResultSlot(const void *native, int index, PyObject *owner)
+{
+    const DataMatrixDetails * pResult = (const DataMatrixDetails *)native;
+    switch(index)
+    {
+    case DM_MODULE_SIZE:            return Py_BuildValue("i", pResult->moduleSize);
+    case DM_ROWS:                   return Py_BuildValue("i", pResult->rows);
+    case DM_COLUMNS:                return Py_BuildValue("i", pResult->columns);
+    case DM_DATA_REGION_ROWS:       return Py_BuildValue("i", pResult->dataRegionRows);
+    case DM_DATA_REGION_COLUMNS:    return Py_BuildValue("i", pResult->dataRegionColumns);
+    case DM_DATA_REGION_NUMBER:     return Py_BuildValue("i", pResult->dataRegionNumber);
+    }
+    return NewNone();
+}
+
+static PyObject * CreatePDFDetailedResultSlot(const void *native, int index, PyObject *owner)
+{
+    const PDF417Details * pResult = (const PDF417Details *)native;
+    switch(index)
+    {
+    case PDF_MODULE_SIZE:               return Py_BuildValue("i", pResult->moduleSize);
+    case PDF_ROWS:                      return Py_BuildValue("i", pResult->rows);
+    case PDF_COLUMNS:                   return Py_BuildValue("i", pResult->columns);
+    case PDF_ERROR_CORRECTION_LEVEL:    return Py_BuildValue("i", pResult->errorCorrectionLevel);
+    }
+    return NewNone();
+}
+
+static PyObject * CreateAztecDetailedResultSlot(const void *native, int index, PyObject *owner)
+{
+    const AztecDetails * pResult = (const AztecDetails *)native;
+    switch(index)
+    {
+    case AZ_MODULE_SIZE:    return Py_BuildValue("i", pResult->moduleSize);
+    case AZ_ROWS:           return Py_BuildValue("i", pResult->rows);
+    case AZ_COLUMNS:        return Py_BuildValue("i", pResult->columns);
+    case AZ_LAYER_NUMBER:   return Py_BuildValue("i", pResult->layerNumber);
+    }
+    return NewNone();
+}
+
+static PyObject * CreatePyDetailedResult(void * pResult, int format, PyObject *owner)
+{
+    if((format & BF_ONED) != 0)
+        return CreateResult(&OnedDetailedResultType, pResult, owner);
+    else if(format == BF_QR_CODE)
+        return CreateResult(&QRCodeDetailedResultType, pResult, owner);
+    else if(format == BF_DATAMATRIX)
+        return CreateResult(&DataMatrixDetailedResultType, pResult, owner);
+    else if(format == BF_PDF417)
+        return CreateResult(&PDFDetailedResultType, pResult, owner);
+    else if(format == BF_AZTEC)
+        return CreateResult(&AztecDetailedResultType, pResult, owner);
+    return NewNone();
+}
+
+static PyObject * CreatePyLocalizationPoints(const LocalizationResult * pResult)
+{
+    PyObject * pyPoints = PyList_New(4);
+    if(pyPoints == NULL)
+    {
+        return NULL;
+    }
+
+    int coordinates[4][2] = {
+        {pResult->x1, pResult->y1}, {pResult->x2, pResult->y2}, {pResult->x3, pResult->y3}, {pResult->x4, pResult->y4}
+    };
+    for(int i = 0; i < 4; ++i)
+    {
+        PyObject * pyPoint = CreatePyPoint(coordinates[i][0], coordinates[i][1]);
+        if(pyPoint == NULL)
         {
-            PyObject * pyLocalizationResult     = CreatePyLocalizationResult(pResults->results[i]->localizationResult);
-            PyObject * pyLocalizationResultKey  = Py_BuildValue("s", "LocalizationResult");
-            PyDict_SetItem(pyTextResult, pyLocalizationResultKey, pyLocalizationResult);
-            Py_DECREF(pyLocalizationResult);
-            Py_DECREF(pyLocalizationResultKey);
+            Py_DECREF(pyPoints);
+            return NULL;
         }
-        else
+        PyList_SET_ITEM(pyPoints, i, pyPoint);
+    }
+    return pyPoints;
+}
+
+static PyObject * CreateLocalizationResultSlot(const void *native, int index, PyObject *owner)
+{
+    const LocalizationResult * pResult = (const LocalizationResult *)native;
+    switch(index)
+    {
+    case LR_TERMINATE_PHASE:            return Py_BuildValue("i", pResult->terminatePhase);
+    case LR_BARCODE_FORMAT:             return Py_BuildValue("i", pResult->barcodeFormat);
+    case LR_BARCODE_FORMAT_STRING:      return pResult->barcodeFormatString != NULL ? GetFormatString(pResult->barcodeFormatString) : NewNone();
+    case LR_BARCODE_FORMAT_2:           return Py_BuildValue("i", pResult->barcodeFormat_2);
+    case LR_BARCODE_FORMAT_STRING_2:    return pResult->barcodeFormatString_2 != NULL ? GetFormatString(pResult->barcodeFormatString_2) : NewNone();
+    case LR_LOCALIZATION_POINTS:        return CreatePyLocalizationPoints(pResult);
+    case LR_ANGLE:                      return Py_BuildValue("i", pResult->angle);
+    case LR_MODULE_SIZE:                return Py_BuildValue("i", pResult->moduleSize);
+    case LR_PAGE_NUMBER:                return Py_BuildValue("i", pResult->pageNumber);
+    case LR_REGION_NAME:                return Py_BuildValue("s", pResult->regionName != NULL ? pResult->regionName : "NULL");
+    case LR_DOCUMENT_NAME:              return Py_BuildValue("s", pResult->documentName != NULL ? pResult->documentName : "NULL");
+    case LR_RESULT_COORDINATE_TYPE:     return Py_BuildValue("i", pResult->resultCoordinateType);
+    case LR_ACCOMPANYING_TEXT_BYTES:    return ByteArrayOrNone(pResult->accompanyingTextBytesLength != 0 ? pResult->accompanyingTextBytes : NULL, pResult->accompanyingTextBytesLength);
+    case LR_CONFIDENCE:                 return Py_BuildValue("i", pResult->confidence);
+    }
+    return NewNone();
+}
+
+static PyObject * CreatePyLocalizationResult(LocalizationResult * pResult, PyObject *owner)
+{
+    return CreateResult(&LocalizationResultType, pResult, owner);
+}
+
+static PyObject * CreateExtendedResultSlot(const void *native, int index, PyObject *owner)
+{
+    const ExtendedResult * pResult = (const ExtendedResult *)native;
+    switch(index)
+    {
+    case ER_RESULT_TYPE:                return Py_BuildValue("i", pResult->resultType);
+    case ER_BARCODE_FORMAT:             return Py_BuildValue("i", pResult->barcodeFormat);
+    case ER_BARCODE_FORMAT_STRING:      return GetFormatString(pResult->barcodeFormatString != NULL ? pResult->barcodeFormatString : "NULL");
+    case ER_BARCODE_FORMAT_2:           return Py_BuildValue("i", pResult->barcodeFormat_2);
+    case ER_BARCODE_FORMAT_STRING_2:    return GetFormatString(pResult->barcodeFormatString_2 != NULL ? pResult->barcodeFormatString_2 : "NULL");
+    case ER_CONFIDENCE:                 return Py_BuildValue("i", pResult->confidence);
+    case ER_BYTES:                      return ByteArrayOrNone(pResult->bytes, pResult->bytesLength);
+    case ER_ACCOMPANYING_TEXT_BYTES:    return ByteArrayOrNone(pResult->accompanyingTextBytes, pResult->accompanyingTextBytesLength);
+    case ER_DEFORMATION:                return Py_BuildValue("i", pResult->deformation);
+    case ER_DETAILED_RESULT:            return pResult->detailedResult != NULL ? CreatePyDetailedResult(pResult->detailedResult, pResult->barcodeFormat, owner) : NewNone();
+    case ER_SAMPLING_IMAGE:             return CreateResult(&SamplingImageDataType, &pResult->samplingImage, owner);
+    case ER_CLARITY:                    return Py_BuildValue("i", pResult->clarity);
+    }
+    return NewNone();
+}
+
+static PyObject * CreatePyExtendedResults(const TextResult * pResult, PyObject *owner)
+{
+    if(pResult->resultsCount == 0 || pResult->results == NULL)
+    {
+        return NewNone();
+    }
+
+    PyObject * pyExtendedResults = PyList_New(pResult->resultsCount);
+    if(pyExtendedResults == NULL)
+    {
+        return NULL;
+    }
+    for(int j = 0; j < pResult->resultsCount; ++j)
+    {
+        PyObject * pyExtendedResult = CreateResult(&ExtendedResultType, pResult->results[j], owner);
+        if(pyExtendedResult == NULL)
         {
-            //PyObject * pyLocalizationResult     = Py_BuildValue("o", NULL);
-            PyObject * pyLocalizationResultKey  = Py_BuildValue("s", "LocalizationResult");
-            PyDict_SetItem(pyTextResult, pyLocalizationResultKey, Py_None);
-            //Py_DECREF(pyLocalizationResult);
-            Py_DECREF(pyLocalizationResultKey);
+            Py_DECREF(pyExtendedResults);
+            return NULL;
         }
+        PyList_SET_ITEM(pyExtendedResults, j, pyExtendedResult);
+    }
+    return pyExtendedResults;
+}
+
+static PyObject * CreatePyBarcodeText(const char * barcodeText)
+{
+    PyObject * pyBarcodeText = Py_BuildValue("s", barcodeText != NULL ? barcodeText : "NULL");
+    if(pyBarcodeText == NULL)
+    {
+        PyErr_SetString(PyExc_TypeError, "Incorrect character set! Failed to decode barcode results!");
+    }
+    return pyBarcodeText;
+}
+
+static PyObject * CreateTextResultSlot(const void *native, int index, PyObject *owner)
+{
+    const TextResult * pResult = (const TextResult *)native;
+    switch(index)
+    {
+    case TR_BARCODE_FORMAT:             return Py_BuildValue("i", pResult->barcodeFormat);
+    case TR_BARCODE_FORMAT_STRING:      return GetFormatString(pResult->barcodeFormatString != NULL ? pResult->barcodeFormatString : "NULL");
+    case TR_BARCODE_FORMAT_2:           return Py_BuildValue("i", pResult->barcodeFormat_2);
+    case TR_BARCODE_FORMAT_STRING_2:    return GetFormatString(pResult->barcodeFormatString_2 != NULL ? pResult->barcodeFormatString_2 : "NULL");
+    case TR_BARCODE_TEXT:               return CreatePyBarcodeText(pResult->barcodeText);
+    case TR_BARCODE_BYTES:              return ByteArrayOrNone(pResult->barcodeBytesLength != 0 ? pResult->barcodeBytes : NULL, pResult->barcodeBytesLength);
+    case TR_LOCALIZATION_RESULT:        return pResult->localizationResult != NULL ? CreatePyLocalizationResult(pResult->localizationResult, owner) : NewNone();
+    case TR_DETAILED_RESULT:            return pResult->detailedResult != NULL ? CreatePyDetailedResult(pResult->detailedResult, pResult->barcodeFormat, owner) : NewNone();
+    case TR_EXTENDED_RESULTS:           return CreatePyExtendedResults(pResult, owner);
+    }
+    return NewNone();
+}
+
+static void FreeTextResultArray(PyObject *capsule)
+{
+    TextResultArray *pResults = (TextResultArray *)PyCapsule_GetPointer(capsule, TEXT_RESULT_ARRAY_CAPSULE);
+    DBR_FreeTextResults(&pResults);
+}
 
-        if(pResults->results[i]->detailedResult != NULL)
+/**
+ * Create the list of text results and take over pResults. Converted results free the array at once,
+ * lazy results hand it to a capsule that frees it when the last result is gone.
+ */
+static PyObject * CreatePyTextResults(TextResultArray *pResults, int lazy)
+{
+    PyObject *owner = NULL;
+    if (lazy)
+    {
+        owner = PyCapsule_New(pResults, TEXT_RESULT_ARRAY_CAPSULE, FreeTextResultArray);
+        if (owner == NULL)
         {
-            PyObject * pyDetailedResult     = CreatePyDetailedResult(pResults->results[i]->detailedResult, pResults->results[i]->barcodeFormat);
-            PyObject * pyDetailedResultKey  = Py_BuildValue("s", "DetailedResult");
-            PyDict_SetItem(pyTextResult, pyDetailedResultKey, pyDetailedResult);
-            Py_DECREF(pyDetailedResult);
-            Py_DECREF(pyDetailedResultKey);
+            DBR_FreeTextResults(&pResults);
+            return NULL;
         }
-        else
+    }
+
+    // Get barcode results
+    int count = pResults->resultsCount;
+
+    // Create a Python object to store results
+    PyObject *pyTextResults = PyList_New(count);
+    for (int i = 0; pyTextResults != NULL && i < count; i++)
+    {
+        PyObject * pyTextResult = CreateResult(&TextResultType, pResults->results[i], owner);
+        if(pyTextResult == NULL)
         {
-            //PyObject * pyDetailedResult     = Py_BuildValue("o", NULL);
-            PyObject * pyDetailedResultKey  = Py_BuildValue("s", "DetailedResult");
-            PyDict_SetItem(pyTextResult, pyDetailedResultKey, Py_None);
-            //Py_DECREF(pyDetailedResult);
-            Py_DECREF(pyDetailedResultKey);
+            Py_CLEAR(pyTextResults);
+            break;
         }
+        PyList_SET_ITEM(pyTextResults, i, pyTextResult);
+    }
+
+    // Release memory
+    if (owner != NULL)
+    {
+        Py_DECREF(owner);
+    }
+    else
+    {
+        DBR_FreeTextResults(&pResults);
+    }
+    return pyTextResults;
+}
 
-        if(pResults->results[i]->resultsCount != 0 && pResults->results[i]->results != NULL)
+/**
+ * Pack the results into parallel columns: the list of texts, the quads as N*4*2 ints and the formats,
+ * confidences, angles and module sizes as N ints each. The columns are bytearrays, so numpy can wrap
+ * them without a copy. A result without localization gets zeros.
+ */
+static PyObject * CreatePyTextResultArrays(TextResultArray *pResults)
+{
+    Py_ssize_t count = pResults != NULL ? pResults->resultsCount : 0;
+    PyObject *pyTexts = PyList_New(count);
+    PyObject *pyQuads = PyByteArray_FromStringAndSize(NULL, count * 8 * sizeof(int));
+    PyObject *pyFormats = PyByteArray_FromStringAndSize(NULL, count * sizeof(int));
+    PyObject *pyConfidences = PyByteArray_FromStringAndSize(NULL, count * sizeof(int));
+    PyObject *pyAngles = PyByteArray_FromStringAndSize(NULL, count * sizeof(int));
+    PyObject *pyModuleSizes = PyByteArray_FromStringAndSize(NULL, count * sizeof(int));
+    if (pyTexts == NULL || pyQuads == NULL || pyFormats == NULL || pyConfidences == NULL || pyAngles == NULL || pyModuleSizes == NULL)
+        goto error;
+
+    int *quads = (int *)PyByteArray_AS_STRING(pyQuads);
+    int *formats = (int *)PyByteArray_AS_STRING(pyFormats);
+    int *confidences = (int *)PyByteArray_AS_STRING(pyConfidences);
+    int *angles = (int *)PyByteArray_AS_STRING(pyAngles);
+    int *moduleSizes = (int *)PyByteArray_AS_STRING(pyModuleSizes);
+    for (Py_ssize_t i = 0; i < count; i++)
+    {
+        const TextResult *pResult = pResults->results[i];
+        PyObject *pyText = CreatePyBarcodeText(pResult->barcodeText);
+        if (pyText == NULL)
+            goto error;
+        PyList_SET_ITEM(pyTexts, i, pyText);
+
+        formats[i] = pResult->barcodeFormat;
+        const LocalizationResult *pLocalization = pResult->localizationResult;
+        if (pLocalization == NULL)
         {
-            PyObject * pyExtendedResults    = PyList_New(pResults->results[i]->resultsCount);
-            for(int j = 0; j < pResults->results[i]->resultsCount; ++j)
-            {
-                PyObject * pyExtendedResult = CreatePyExtendedResult(pResults->results[i]->results[j]);
-                PyList_SetItem(pyExtendedResults, j, pyExtendedResult);
-            }
-            PyObject * pyExtendedResultsKey = Py_BuildValue("s", "ExtendedResults");
-            PyDict_SetItem(pyTextResult, pyExtendedResultsKey, pyExtendedResults);
-            Py_DECREF(pyExtendedResults);
-            Py_DECREF(pyExtendedResultsKey);
+            memset(quads + i * 8, 0, 8 * sizeof(int));
+            confidences[i] = angles[i] = moduleSizes[i] = 0;
+            continue;
         }
-        else
+        int *quad = quads + i * 8;
+        quad[0] = pLocalization->x1; quad[1] = pLocalization->y1;
+        quad[2] = pLocalization->x2; quad[3] = pLocalization->y2;
+        quad[4] = pLocalization->x3; quad[5] = pLocalization->y3;
+        quad[6] = pLocalization->x4; quad[7] = pLocalization->y4;
+        confidences[i] = pLocalization->confidence;
+        angles[i] = pLocalization->angle;
+        moduleSizes[i] = pLocalization->moduleSize;
+    }
+    return Py_BuildValue("(NNNNNN)", pyTexts, pyQuads, pyFormats, pyConfidences, pyAngles, pyModuleSizes);
+
+error:
+    Py_XDECREF(pyTexts);
+    Py_XDECREF(pyQuads);
+    Py_XDECREF(pyFormats);
+    Py_XDECREF(pyConfidences);
+    Py_XDECREF(pyAngles);
+    Py_XDECREF(pyModuleSizes);
+    return NULL;
+}
+
+/**
+ * Pack the contours of an intermediate result CSR style: the points of all contours one after another
+ * as x, y ints, and count + 1 offsets so that contour i is points[offsets[i]:offsets[i + 1]].
+ */
+static PyObject * CreatePyContours(const void** ppResults, int count)
+{
+    Py_ssize_t pointCount = 0;
+    for (int i = 0; i < count; ++i)
+    {
+        const Contour * pContour = (const Contour *)(ppResults[i]);
+        if (pContour->points != NULL)
+            pointCount += pContour->pointsCount;
+    }
+
+    PyObject * pyPoints = PyByteArray_FromStringAndSize(NULL, pointCount * 2 * sizeof(int));
+    PyObject * pyOffsets = PyByteArray_FromStringAndSize(NULL, ((Py_ssize_t)count + 1) * sizeof(int));
+    if (pyPoints == NULL || pyOffsets == NULL)
+    {
+        Py_XDECREF(pyPoints);
+        Py_XDECREF(pyOffsets);
+        return NULL;
+    }
+
+    int * points = (int *)PyByteArray_AS_STRING(pyPoints);
+    int * offsets = (int *)PyByteArray_AS_STRING(pyOffsets);
+    int offset = 0;
+    for (int i = 0; i < count; ++i)
+    {
+        const Contour * pContour = (const Contour *)(ppResults[i]);
+        offsets[i] = offset;
+        for (int j = 0; pContour->points != NULL && j < pContour->pointsCount; ++j, ++offset)
         {
-            //PyObject * pyExtendedResults = Py_BuildValue("o", NULL);
-            PyObject * pyExtendedResultsKey = Py_BuildValue("s", "ExtendedResults");
-            PyDict_SetItem(pyTextResult, pyExtendedResultsKey, Py_None);
-            //Py_DECREF(pyExtendedResults);
-            Py_DECREF(pyExtendedResultsKey);
+            points[2 * offset] = pContour->points[j].x;
+            points[2 * offset + 1] = pContour->points[j].y;
         }
-
-        PyList_SetItem(pyTextResults, i, pyTextResult);
     }
+    offsets[count] = offset;
+    return Py_BuildValue("(NN)", pyPoints, pyOffsets);
+}
 
-    // Release memory
-    // DBR_FreeTextResults(&pResults);
+/**
+ * Pack the line segments of an intermediate result: the start and end points as count * 2 * 2 ints
+ * and the confidence coefficients as count * 4 bytes, zeros where the SDK gives none.
+ */
+static PyObject * CreatePyLineSegments(const void** ppResults, int count)
+{
+    PyObject * pyLines = PyByteArray_FromStringAndSize(NULL, (Py_ssize_t)count * 4 * sizeof(int));
+    PyObject * pyCoefficients = PyByteArray_FromStringAndSize(NULL, (Py_ssize_t)count * 4);
+    if (pyLines == NULL || pyCoefficients == NULL)
+    {
+        Py_XDECREF(pyLines);
+        Py_XDECREF(pyCoefficients);
+        return NULL;
+    }
 
-    return pyTextResults;
+    int * lines = (int *)PyByteArray_AS_STRING(pyLines);
+    unsigned char * coefficients = (unsigned char *)PyByteArray_AS_STRING(pyCoefficients);
+    for (int i = 0; i < count; ++i)
+    {
+        const LineSegment * pLineSegment = (const LineSegment *)(ppResults[i]);
+        lines[4 * i] = pLineSegment->startPoint.x;
+        lines[4 * i + 1] = pLineSegment->startPoint.y;
+        lines[4 * i + 2] = pLineSegment->endPoint.x;
+        lines[4 * i + 3] = pLineSegment->endPoint.y;
+        for (int j = 0; j < 4; ++j)
+        {
+            coefficients[4 * i + j] = pLineSegment->linesConfidenceCoefficients != NULL ? pLineSegment->linesConfidenceCoefficients[j] : 0;
+        }
+    }
+    return Py_BuildValue("(NN)", pyLines, pyCoefficients);
 }
 
-static PyObject * CreateIntermediateResultDatas(const void** ppResults, int count, IMResultDataType dataType)
+static PyObject * CreateIntermediateResultDatas(const void** ppResults, int count, IMResultDataType dataType, PyObject *owner)
 {
     PyObject * pyResults = PyList_New(count);
 	if (pyResults == NULL)
@@ -1175,218 +1707,62 @@ static PyObject * CreateIntermediateResultDatas(const void** ppResults, int coun
         if(dataType == IMRDT_IMAGE)
         {
             PyObject * pyImageData = PyDict_New();
+            const ImageData * pImageData = (const ImageData *)(ppResults[i]);
 
-            if(((ImageData *)(ppResults[i]))->bytes == NULL)
+            // The array shares the memory of the native results, which stay alive as long as the array
+            PyObject * pyBytes       = CreatePyImageArray(pImageData->bytes, pImageData->bytesLength, pImageData->width, pImageData->height, pImageData->stride, pImageData->format, owner);
+            if(pyBytes == NULL)
             {
-                PyObject * pyBytes       = PyByteArray_FromStringAndSize(((ImageData *)(ppResults[i]))->bytes, ((ImageData *)(ppResults[i]))->bytesLength);
-                PyObject * pyBytesKey    = Py_BuildValue("s", "Bytes");
-                PyDict_SetItem(pyImageData, pyBytesKey, pyBytes);
-                Py_DECREF(pyBytes);
-                Py_DECREF(pyBytesKey);
-            }
-            else
-            {
-                //PyObject * pyBytes       = Py_BuildValue("o", NULL);
-                PyObject * pyBytesKey    = Py_BuildValue("s", "Bytes");
-                PyDict_SetItem(pyImageData, pyBytesKey, Py_None);
-                //Py_DECREF(pyBytes);
-                Py_DECREF(pyBytesKey);
+                Py_DECREF(pyImageData);
+                Py_DECREF(pyResults);
+                return NULL;
             }
-            
+            PyDict_SetItem(pyImageData, key_Bytes, pyBytes);
+            Py_DECREF(pyBytes);
+
 
             PyObject * pyWidth      = Py_BuildValue("i", ((ImageData *)(ppResults[i]))->width);
-            PyObject * pyWidthKey   = Py_BuildValue("s", "Width");
-            PyDict_SetItem(pyImageData, pyWidthKey, pyWidth);
+            PyDict_SetItem(pyImageData, key_Width, pyWidth);
             Py_DECREF(pyWidth);
-            Py_DECREF(pyWidthKey);
 
             PyObject * pyHeight      = Py_BuildValue("i", ((ImageData *)(ppResults[i]))->height);
-            PyObject * pyHeightKey   = Py_BuildValue("s", "Height");
-            PyDict_SetItem(pyImageData, pyHeightKey, pyHeight);
+            PyDict_SetItem(pyImageData, key_Height, pyHeight);
             Py_DECREF(pyHeight);
-            Py_DECREF(pyHeightKey);
 
             PyObject * pyStride      = Py_BuildValue("i", ((ImageData *)(ppResults[i]))->stride);
-            PyObject * pyStrideKey   = Py_BuildValue("s", "Stride");
-            PyDict_SetItem(pyImageData, pyStrideKey, pyStride);
+            PyDict_SetItem(pyImageData, key_Stride, pyStride);
             Py_DECREF(pyStride);
-            Py_DECREF(pyStrideKey);
 
             PyObject * pyImagePixelFormat      = Py_BuildValue("i", ((ImageData *)(ppResults[i]))->format);
-            PyObject * pyImagePixelFormatKey   = Py_BuildValue("s", "ImagePixelFormat");
-            PyDict_SetItem(pyImageData, pyImagePixelFormatKey, pyImagePixelFormat);
+            PyDict_SetItem(pyImageData, key_ImagePixelFormat, pyImagePixelFormat);
             Py_DECREF(pyImagePixelFormat);
-            Py_DECREF(pyImagePixelFormatKey);
 
             PyList_SetItem(pyResults, i, pyImageData);
         }
-        else if(dataType == IMRDT_CONTOUR)
+        else if(dataType == IMRDT_LOCALIZATIONRESULT)
         {
-            PyObject * pyContour = PyDict_New();
-            int pointCount = ((Contour *)(ppResults[i]))->pointsCount;
-            if(pointCount != 0)
-            {
-                PyObject * pyPoints = PyList_New(pointCount);
-                for(int j = 0; j < pointCount; ++j)
-                {
-                    PyObject * pyPoint = PyDict_New();
-
-                    PyObject * pyPointX = Py_BuildValue("i",((Contour *)(ppResults[i]))->points[j].x);
-                    PyObject * pyPointXKey   = Py_BuildValue("s", "X");
-                    PyDict_SetItem(pyPoint, pyPointXKey, pyPointX);
-                    Py_DECREF(pyPointX);
-                    Py_DECREF(pyPointXKey);
-
-                    PyObject * pyPointY = Py_BuildValue("i",((Contour *)(ppResults[i]))->points[j].y);
-                    PyObject * pyPointYKey   = Py_BuildValue("s", "Y");
-                    PyDict_SetItem(pyPoint, pyPointYKey, pyPointY);
-                    Py_DECREF(pyPointY);
-                    Py_DECREF(pyPointYKey);
-
-                    PyList_SetItem(pyPoints, j, pyPoint);
-                }
-                PyObject * pyPointsKey   = Py_BuildValue("s", "Points");
-                PyDict_SetItem(pyContour, pyPointsKey, pyPoints);
-                Py_DECREF(pyPoints);
-                Py_DECREF(pyPointsKey);
-                PyList_SetItem(pyResults, i, pyContour);
-            }
-            else
-            {
-                //PyObject * pyPoints   = Py_BuildValue("o", NULL);
-                PyObject * pyPointsKey   = Py_BuildValue("s", "Points");
-                PyDict_SetItem(pyContour, pyPointsKey, Py_None);
-                //Py_DECREF(pyPoints);
-                Py_DECREF(pyPointsKey);
-                PyList_SetItem(pyResults, i, pyContour);
-            }
-            
-        }
-        else if(dataType == IMRDT_LINESEGMENT)
-        {
-            PyObject * pyLineSegment = PyDict_New();
-
-            PyObject * pyStartPoint = PyDict_New();
-            PyObject * pyStartPointX = Py_BuildValue("i",((LineSegment *)(ppResults[i]))->startPoint.x);
-            PyObject * pyStartPointXKey   = Py_BuildValue("s", "X");
-            PyDict_SetItem(pyStartPoint, pyStartPointXKey, pyStartPointX);
-            Py_DECREF(pyStartPointX);
-            Py_DECREF(pyStartPointXKey);
-
-            PyObject * pyStartPointY = Py_BuildValue("i",((LineSegment *)(ppResults[i]))->startPoint.y);
-            PyObject * pyStartPointYKey   = Py_BuildValue("s", "Y");
-            PyDict_SetItem(pyStartPoint, pyStartPointYKey, pyStartPointY);
-            Py_DECREF(pyStartPointY);
-            Py_DECREF(pyStartPointYKey);
-            PyObject * pyStartPointKey   = Py_BuildValue("s", "StartPoint");
-            PyDict_SetItem(pyLineSegment, pyStartPointKey, pyStartPoint);
-            Py_DECREF(pyStartPoint);
-            Py_DECREF(pyStartPointKey);
-
-            PyObject * pyEndPoint = PyDict_New();
-            PyObject * pyEndPointX = Py_BuildValue("i",((LineSegment *)(ppResults[i]))->endPoint.x);
-            PyObject * pyEndPointXKey   = Py_BuildValue("s", "X");
-            PyDict_SetItem(pyEndPoint, pyEndPointXKey, pyEndPointX);
-            Py_DECREF(pyEndPointX);
-            Py_DECREF(pyEndPointXKey);
-
-            PyObject * pyEndPointY = Py_BuildValue("i",((LineSegment *)(ppResults[i]))->endPoint.y);
-            PyObject * pyEndPointYKey   = Py_BuildValue("s", "Y");
-            PyDict_SetItem(pyEndPoint, pyEndPointYKey, pyEndPointY);
-            Py_DECREF(pyEndPointY);
-            Py_DECREF(pyEndPointYKey);
-            PyObject * pyEndPointKey   = Py_BuildValue("s", "EndPoint");
-            PyDict_SetItem(pyLineSegment, pyEndPointKey, pyEndPoint);
-            Py_DECREF(pyEndPoint);
-            Py_DECREF(pyEndPointKey);
-
-            if(((LineSegment *)(ppResults[i]))->linesConfidenceCoefficients != NULL)
-            {
-                PyObject * pyLinesConfidenceCoefficients = PyList_New(4);
-                for(int j = 0; j < 4; ++j)
-                {
-                    PyObject * pyLinesConfidenceCoefficient = Py_BuildValue("i",((LineSegment *)(ppResults[i]))->linesConfidenceCoefficients[j]);
-                    PyList_SetItem(pyLinesConfidenceCoefficients, j, pyLinesConfidenceCoefficient);
-                }
-                PyObject * pyLinesConfidenceCoefficientsKey   = Py_BuildValue("s", "LinesConfidenceCoefficients");
-                PyDict_SetItem(pyLineSegment, pyLinesConfidenceCoefficientsKey, pyLinesConfidenceCoefficients);
-                Py_DECREF(pyLinesConfidenceCoefficients);
-                Py_DECREF(pyLinesConfidenceCoefficientsKey);
-            }
-            else
-            {
-                //PyObject * pyLinesConfidenceCoefficients   = Py_BuildValue("o", NULL);
-                PyObject * pyLinesConfidenceCoefficientsKey   = Py_BuildValue("s", "LinesConfidenceCoefficients");
-                PyDict_SetItem(pyLineSegment, pyLinesConfidenceCoefficientsKey, Py_None);
-                //Py_DECREF(pyLinesConfidenceCoefficients);
-                Py_DECREF(pyLinesConfidenceCoefficientsKey);
-            }
-            
-
-            PyList_SetItem(pyResults, i, pyLineSegment);
-        }
-        else if(dataType == IMRDT_LOCALIZATIONRESULT)
-        {
-            PyObject * pyLR = PyDict_New();
-            PyObject * pyLocalizationResult = CreatePyLocalizationResult((LocalizationResult *)(ppResults[i]));
-            if(pyLocalizationResult != NULL)
-            {
-                PyObject * pyLRKey   = Py_BuildValue("s", "LocalizationRsult");
-                PyDict_SetItem(pyLR, pyLRKey, pyLocalizationResult);
-                Py_DECREF(pyLocalizationResult);
-                Py_DECREF(pyLRKey);
-                PyList_SetItem(pyResults, i, pyLR);
-            }
-            else
-            {
-                //PyObject * pyLocalizationResult   = Py_BuildValue("o", NULL);
-                PyObject * pyLRKey   = Py_BuildValue("s", "LocalizationRsult");
-                PyDict_SetItem(pyLR, pyLRKey, Py_None);
-                //Py_DECREF(pyLocalizationResult);
-                Py_DECREF(pyLRKey);
-                PyList_SetItem(pyResults, i, pyLR);
-            }
-            
+            PyObject * pyLocalizationResult = CreatePyLocalizationResult((LocalizationResult *)(ppResults[i]), NULL);
+            PyList_SetItem(pyResults, i, pyLocalizationResult);
         }
         else if(dataType == IMRDT_REGIONOFINTEREST)
         {
             PyObject * pyRegionOfInterest = PyDict_New();
 
             PyObject * pyROIId      = Py_BuildValue("i", ((RegionOfInterest *)(ppResults[i]))->roiId);
-            PyObject * pyROIIdKey   = Py_BuildValue("s", "ROIId");
-            PyDict_SetItem(pyRegionOfInterest, pyROIIdKey, pyROIId);
+            PyDict_SetItem(pyRegionOfInterest, key_ROIId, pyROIId);
             Py_DECREF(pyROIId);
-            Py_DECREF(pyROIIdKey);
-
-            PyObject * pyPoint = PyDict_New();
-
-            PyObject * pyPointX = Py_BuildValue("i", ((RegionOfInterest *)(ppResults[i]))->point.x);
-            PyObject * pyPointXKey   = Py_BuildValue("s", "X");
-            PyDict_SetItem(pyPoint, pyPointXKey, pyPointX);
-            Py_DECREF(pyPointX);
-            Py_DECREF(pyPointXKey);
-
-            PyObject * pyPointY = Py_BuildValue("i", ((RegionOfInterest *)(ppResults[i]))->point.y);
-            PyObject * pyPointYKey   = Py_BuildValue("s", "Y");
-            PyDict_SetItem(pyPoint, pyPointYKey, pyPointY);
-            Py_DECREF(pyPointY);
-            Py_DECREF(pyPointYKey);
-            PyObject * pyPointKey   = Py_BuildValue("s", "Point");
-            PyDict_SetItem(pyRegionOfInterest, pyPointKey, pyPoint);
+
+            PyObject * pyPoint = CreatePyPoint(((RegionOfInterest *)(ppResults[i]))->point.x, ((RegionOfInterest *)(ppResults[i]))->point.y);
+            PyDict_SetItem(pyRegionOfInterest, key_Point, pyPoint);
             Py_DECREF(pyPoint);
-            Py_DECREF(pyPointKey);
 
             PyObject * pyWidth      = Py_BuildValue("i", ((RegionOfInterest *)(ppResults[i]))->width);
-            PyObject * pyWidthKey   = Py_BuildValue("s", "Width");
-            PyDict_SetItem(pyRegionOfInterest, pyWidthKey, pyWidth);
+            PyDict_SetItem(pyRegionOfInterest, key_Width, pyWidth);
             Py_DECREF(pyWidth);
-            Py_DECREF(pyWidthKey);
 
             PyObject * pyHeight      = Py_BuildValue("i", ((RegionOfInterest *)(ppResults[i]))->height);
-            PyObject * pyHeightKey   = Py_BuildValue("s", "Height");
-            PyDict_SetItem(pyRegionOfInterest, pyHeightKey, pyHeight);
+            PyDict_SetItem(pyRegionOfInterest, key_Height, pyHeight);
             Py_DECREF(pyHeight);
-            Py_DECREF(pyHeightKey);
 
             PyList_SetItem(pyResults, i, pyRegionOfInterest);
         }
@@ -1395,87 +1771,93 @@ static PyObject * CreateIntermediateResultDatas(const void** ppResults, int coun
     return pyResults;
 }
 
-static PyObject * CreatePyIntermediateResults(IntermediateResultArray * pResults)
+#define INTERMEDIATE_RESULT_ARRAY_CAPSULE "dbr.IntermediateResultArray"
+
+static void FreeIntermediateResultArray(PyObject *capsule)
+{
+    IntermediateResultArray *pResults = (IntermediateResultArray *)PyCapsule_GetPointer(capsule, INTERMEDIATE_RESULT_ARRAY_CAPSULE);
+    DBR_FreeIntermediateResults(&pResults);
+}
+
+static PyObject * CreatePyIntermediateResults(IntermediateResultArray * pResults, PyObject *owner)
 {
     // Get barcode results
     int count = pResults->resultsCount;
 
     // Create a Python object to store results
     PyObject * pyIntermediateResults = PyList_New(count);
+    if(pyIntermediateResults == NULL)
+    {
+        return NULL;
+    }
 
     for(int i = 0; i < count; ++i)
     {
         PyObject * pyIntermediateResult = PyDict_New();
         if(pyIntermediateResult == NULL)
         {
-            return NULL;     
+            Py_DECREF(pyIntermediateResults);
+            return NULL;
         }
 
         PyObject * pyDataType      = Py_BuildValue("i", pResults->results[i]->dataType);
-        PyObject * pyDataTypeKey   = Py_BuildValue("s", "DataType");
-        PyDict_SetItem(pyIntermediateResult, pyDataTypeKey, pyDataType);
+        PyDict_SetItem(pyIntermediateResult, key_DataType, pyDataType);
         Py_DECREF(pyDataType);
-        Py_DECREF(pyDataTypeKey);
 
         if(pResults->results[i]->results != NULL)
         {
-            PyObject * pyResults      = CreateIntermediateResultDatas(pResults->results[i]->results, pResults->results[i]->resultsCount, pResults->results[i]->dataType);
-            PyObject * pyResultsKey   = Py_BuildValue("s", "IMResults");
-            PyDict_SetItem(pyIntermediateResult, pyResultsKey, pyResults);
+            // Contours and line segments are packed into arrays, the other data types are lists
+            PyObject * pyResults;
+            if(pResults->results[i]->dataType == IMRDT_CONTOUR)
+                pyResults = CreatePyContours(pResults->results[i]->results, pResults->results[i]->resultsCount);
+            else if(pResults->results[i]->dataType == IMRDT_LINESEGMENT)
+                pyResults = CreatePyLineSegments(pResults->results[i]->results, pResults->results[i]->resultsCount);
+            else
+                pyResults = CreateIntermediateResultDatas(pResults->results[i]->results, pResults->results[i]->resultsCount, pResults->results[i]->dataType, owner);
+            if(pyResults == NULL)
+            {
+                Py_DECREF(pyIntermediateResult);
+                Py_DECREF(pyIntermediateResults);
+                return NULL;
+            }
+            PyDict_SetItem(pyIntermediateResult, key_IMResults, pyResults);
             Py_DECREF(pyResults);
-            Py_DECREF(pyResultsKey);
         }
         else
         {
             //PyObject * pyResults   = Py_BuildValue("o", NULL);
-            PyObject * pyResultsKey   = Py_BuildValue("s", "IMResults");
-            PyDict_SetItem(pyIntermediateResult, pyResultsKey, Py_None);
+            PyDict_SetItem(pyIntermediateResult, key_IMResults, Py_None);
             //Py_DECREF(pyResults);
-            Py_DECREF(pyResultsKey);
         }
         
 
         PyObject * pyResultType      = Py_BuildValue("i", pResults->results[i]->resultType);
-        PyObject * pyResultTypeKey   = Py_BuildValue("s", "ResultType");
-        PyDict_SetItem(pyIntermediateResult, pyResultTypeKey, pyResultType);
+        PyDict_SetItem(pyIntermediateResult, key_ResultType, pyResultType);
         Py_DECREF(pyResultType);
-        Py_DECREF(pyResultTypeKey);
 
         PyObject * pyBarcodeComplementMode      = Py_BuildValue("i", pResults->results[i]->barcodeComplementMode);
-        PyObject * pyBarcodeComplementModeKey   = Py_BuildValue("s", "BarcodeComplementMode");
-        PyDict_SetItem(pyIntermediateResult, pyBarcodeComplementModeKey, pyBarcodeComplementMode);
+        PyDict_SetItem(pyIntermediateResult, key_BarcodeComplementMode, pyBarcodeComplementMode);
         Py_DECREF(pyBarcodeComplementMode);
-        Py_DECREF(pyBarcodeComplementModeKey);
 
         PyObject * pyBCMIndex      = Py_BuildValue("i", pResults->results[i]->bcmIndex);
-        PyObject * pyBCMIndexKey   = Py_BuildValue("s", "BCMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyBCMIndexKey, pyBCMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_BCMIndex, pyBCMIndex);
         Py_DECREF(pyBCMIndex);
-        Py_DECREF(pyBCMIndexKey);
 
 		PyObject * pyDeformationResistingMode = Py_BuildValue("i", pResults->results[i]->deformationResistingMode);
-		PyObject * pyDeformationResistingModeKey = Py_BuildValue("s", "DeformationResistingMode");
-		PyDict_SetItem(pyIntermediateResult, pyDeformationResistingModeKey, pyDeformationResistingMode);
+		PyDict_SetItem(pyIntermediateResult, key_DeformationResistingMode, pyDeformationResistingMode);
 		Py_DECREF(pyDeformationResistingMode);
-		Py_DECREF(pyDeformationResistingModeKey);
 
-		PyObject * pyDRMIndex = Py_BuildValue("i", pResults->results[i]->bcmIndex);
-		PyObject * pyDRMIndexKey = Py_BuildValue("s", "DRMIndex");
-		PyDict_SetItem(pyIntermediateResult, pyDRMIndexKey, pyDRMIndex);
+		PyObject * pyDRMIndex = Py_BuildValue("i", pResults->results[i]->drmIndex);
+		PyDict_SetItem(pyIntermediateResult, key_DRMIndex, pyDRMIndex);
 		Py_DECREF(pyDRMIndex);
-		Py_DECREF(pyDRMIndexKey);
 
         PyObject * pyDPMCodeReadingMode      = Py_BuildValue("i", pResults->results[i]->dpmCodeReadingMode);
-        PyObject * pyDPMCodeReadingModeKey   = Py_BuildValue("s", "DPMCodeReadingMode");
-        PyDict_SetItem(pyIntermediateResult, pyDPMCodeReadingModeKey, pyDPMCodeReadingMode);
+        PyDict_SetItem(pyIntermediateResult, key_DPMCodeReadingMode, pyDPMCodeReadingMode);
         Py_DECREF(pyDPMCodeReadingMode);
-        Py_DECREF(pyDPMCodeReadingModeKey);
 
         PyObject * pyDPMCRMIndex      = Py_BuildValue("i", pResults->results[i]->dpmcrmIndex);
-        PyObject * pyDPMCRMIndexKey   = Py_BuildValue("s", "DPMCRMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyDPMCRMIndexKey, pyDPMCRMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_DPMCRMIndex, pyDPMCRMIndex);
         Py_DECREF(pyDPMCRMIndex);
-        Py_DECREF(pyDPMCRMIndexKey);
 
         PyObject * pyRotationMatrix = PyList_New(9);
         for(int j = 0; j < 9; ++j)
@@ -1483,130 +1865,88 @@ static PyObject * CreatePyIntermediateResults(IntermediateResultArray * pResults
             PyObject * temp = Py_BuildValue("d",pResults->results[i]->rotationMatrix[j]);
             PyList_SetItem(pyRotationMatrix, j, temp);
         }
-        PyObject * pyRotationMatrixKey   = Py_BuildValue("s", "RotationMatrix");
-        PyDict_SetItem(pyIntermediateResult, pyRotationMatrixKey, pyRotationMatrix);
+        PyDict_SetItem(pyIntermediateResult, key_RotationMatrix, pyRotationMatrix);
         Py_DECREF(pyRotationMatrix);
-        Py_DECREF(pyRotationMatrixKey);
 
         PyObject * pyTextFilterMode      = Py_BuildValue("i", pResults->results[i]->textFilterMode);
-        PyObject * pyTextFilterModeKey   = Py_BuildValue("s", "TextFilterMode");
-        PyDict_SetItem(pyIntermediateResult, pyTextFilterModeKey, pyTextFilterMode);
+        PyDict_SetItem(pyIntermediateResult, key_TextFilterMode, pyTextFilterMode);
         Py_DECREF(pyTextFilterMode);
-        Py_DECREF(pyTextFilterModeKey);
 
         PyObject * pyTFMIndex      = Py_BuildValue("i", pResults->results[i]->tfmIndex);
-        PyObject * pyTFMIndexKey   = Py_BuildValue("s", "TFMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyTFMIndexKey, pyTFMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_TFMIndex, pyTFMIndex);
         Py_DECREF(pyTFMIndex);
-        Py_DECREF(pyTFMIndexKey);
 
         PyObject * pyLocalizationMode      = Py_BuildValue("i", pResults->results[i]->localizationMode);
-        PyObject * pyLocalizationModeKey   = Py_BuildValue("s", "LocalizationMode");
-        PyDict_SetItem(pyIntermediateResult, pyLocalizationModeKey, pyLocalizationMode);
+        PyDict_SetItem(pyIntermediateResult, key_LocalizationMode, pyLocalizationMode);
         Py_DECREF(pyLocalizationMode);
-        Py_DECREF(pyLocalizationModeKey);
 
         PyObject * pyLMIndex      = Py_BuildValue("i", pResults->results[i]->lmIndex);
-        PyObject * pyLMIndexKey   = Py_BuildValue("s", "LMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyLMIndexKey, pyLMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_LMIndex, pyLMIndex);
         Py_DECREF(pyLMIndex);
-        Py_DECREF(pyLMIndexKey);
 
         PyObject * pyBinarizationMode      = Py_BuildValue("i", pResults->results[i]->binarizationMode);
-        PyObject * pyBinarizationModeKey   = Py_BuildValue("s", "BinarizationMode");
-        PyDict_SetItem(pyIntermediateResult, pyBinarizationModeKey, pyBinarizationMode);
+        PyDict_SetItem(pyIntermediateResult, key_BinarizationMode, pyBinarizationMode);
         Py_DECREF(pyBinarizationMode);
-        Py_DECREF(pyBinarizationModeKey);
 
         PyObject * pyBMIndex      = Py_BuildValue("i", pResults->results[i]->bmIndex);
-        PyObject * pyBMIndexKey   = Py_BuildValue("s", "BMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyBMIndexKey, pyBMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_BMIndex, pyBMIndex);
         Py_DECREF(pyBMIndex);
-        Py_DECREF(pyBMIndexKey);
 
         PyObject * pyImagePreprocessingMode      = Py_BuildValue("i", pResults->results[i]->imagePreprocessingMode);
-        PyObject * pyImagePreprocessingModeKey   = Py_BuildValue("s", "ImagePreprocessingMode");
-        PyDict_SetItem(pyIntermediateResult, pyImagePreprocessingModeKey, pyImagePreprocessingMode);
+        PyDict_SetItem(pyIntermediateResult, key_ImagePreprocessingMode, pyImagePreprocessingMode);
         Py_DECREF(pyImagePreprocessingMode);
-        Py_DECREF(pyImagePreprocessingModeKey);
 
         PyObject * pyIPMIndex      = Py_BuildValue("i", pResults->results[i]->ipmIndex);
-        PyObject * pyIPMIndexKey   = Py_BuildValue("s", "IPMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyIPMIndexKey, pyIPMIndex);
-        Py_DECREF(pyIPMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_IPMIndex, pyIPMIndex);
         Py_DECREF(pyIPMIndex);
 
         PyObject * pyROIId      = Py_BuildValue("i", pResults->results[i]->roiId);
-        PyObject * pyROIIdKey   = Py_BuildValue("s", "ROIId");
-        PyDict_SetItem(pyIntermediateResult, pyROIIdKey, pyROIId);
+        PyDict_SetItem(pyIntermediateResult, key_ROIId, pyROIId);
         Py_DECREF(pyROIId);
-        Py_DECREF(pyROIIdKey);
 
         PyObject * pyRegionPredetectionMode      = Py_BuildValue("i", pResults->results[i]->regionPredetectionMode);
-        PyObject * pyRegionPredetectionModeKey   = Py_BuildValue("s", "RegionPredetectionMode");
-        PyDict_SetItem(pyIntermediateResult, pyRegionPredetectionModeKey, pyRegionPredetectionMode);
+        PyDict_SetItem(pyIntermediateResult, key_RegionPredetectionMode, pyRegionPredetectionMode);
         Py_DECREF(pyRegionPredetectionMode);
-        Py_DECREF(pyRegionPredetectionModeKey);
 
         PyObject * pyRPMIndex      = Py_BuildValue("i", pResults->results[i]->rpmIndex);
-        PyObject * pyRPMIndexKey   = Py_BuildValue("s", "RPMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyRPMIndexKey, pyRPMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_RPMIndex, pyRPMIndex);
         Py_DECREF(pyRPMIndex);
-        Py_DECREF(pyRPMIndexKey);
 
         PyObject * pyGrayscaleTransformationMode      = Py_BuildValue("i", pResults->results[i]->grayscaleTransformationMode);
-        PyObject * pyGrayscaleTransformationModeKey   = Py_BuildValue("s", "GrayscaleTransformationMode");
-        PyDict_SetItem(pyIntermediateResult, pyRegionPredetectionModeKey, pyRegionPredetectionMode);
-        Py_DECREF(pyRegionPredetectionMode);
-        Py_DECREF(pyRegionPredetectionModeKey);
+        PyDict_SetItem(pyIntermediateResult, key_GrayscaleTransformationMode, pyGrayscaleTransformationMode);
+        Py_DECREF(pyGrayscaleTransformationMode);
 
         PyObject * pyGTMIndex      = Py_BuildValue("i", pResults->results[i]->gtmIndex);
-        PyObject * pyGTMIndexKey   = Py_BuildValue("s", "GTMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyGTMIndexKey, pyGTMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_GTMIndex, pyGTMIndex);
         Py_DECREF(pyGTMIndex);
-        Py_DECREF(pyGTMIndexKey);
 
         PyObject * pyColourConversionMode      = Py_BuildValue("i", pResults->results[i]->colourConversionMode);
-        PyObject * pyColourConversionModeKey   = Py_BuildValue("s", "ColourConversionMode");
-        PyDict_SetItem(pyIntermediateResult, pyColourConversionModeKey, pyColourConversionMode);
+        PyDict_SetItem(pyIntermediateResult, key_ColourConversionMode, pyColourConversionMode);
         Py_DECREF(pyColourConversionMode);
-        Py_DECREF(pyColourConversionModeKey);
 
         PyObject * pyCICMIndex      = Py_BuildValue("i", pResults->results[i]->cicmIndex);
-        PyObject * pyCICMIndexKey   = Py_BuildValue("s", "CICMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyCICMIndexKey, pyCICMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_CICMIndex, pyCICMIndex);
         Py_DECREF(pyCICMIndex);
-        Py_DECREF(pyCICMIndexKey);
 
         PyObject * pyColourClusteringMode      = Py_BuildValue("i", pResults->results[i]->colourClusteringMode);
-        PyObject * pyColourClusteringModeKey   = Py_BuildValue("s", "ColourClusteringMode");
-        PyDict_SetItem(pyIntermediateResult, pyColourClusteringModeKey, pyColourClusteringMode);
+        PyDict_SetItem(pyIntermediateResult, key_ColourClusteringMode, pyColourClusteringMode);
         Py_DECREF(pyColourClusteringMode);
-        Py_DECREF(pyColourClusteringModeKey);
 
         PyObject * pyCCMIndex      = Py_BuildValue("i", pResults->results[i]->ccmIndex);
-        PyObject * pyCCMIndexKey   = Py_BuildValue("s", "CCMIndex");
-        PyDict_SetItem(pyIntermediateResult, pyCCMIndexKey, pyCCMIndex);
+        PyDict_SetItem(pyIntermediateResult, key_CCMIndex, pyCCMIndex);
         Py_DECREF(pyCCMIndex);
-        Py_DECREF(pyCCMIndexKey);
 
         PyObject * pyScaleDownRatio      = Py_BuildValue("i", pResults->results[i]->scaleDownRatio);
-        PyObject * pyScaleDownRatioKey   = Py_BuildValue("s", "ScaleDownRatio");
-        PyDict_SetItem(pyIntermediateResult, pyScaleDownRatioKey, pyScaleDownRatio);
+        PyDict_SetItem(pyIntermediateResult, key_ScaleDownRatio, pyScaleDownRatio);
         Py_DECREF(pyScaleDownRatio);
-        Py_DECREF(pyScaleDownRatioKey);
 
         PyObject * pyFrameId      = Py_BuildValue("i", pResults->results[i]->frameId);
-        PyObject * pyFrameIdKey   = Py_BuildValue("s", "FrameId");
-        PyDict_SetItem(pyIntermediateResult, pyFrameIdKey, pyFrameId);
+        PyDict_SetItem(pyIntermediateResult, key_FrameId, pyFrameId);
         Py_DECREF(pyFrameId);
-        Py_DECREF(pyFrameIdKey);
 
         PyList_SetItem(pyIntermediateResults, i, pyIntermediateResult);
     }
 
-    // DBR_FreeIntermediateResults(&pResults);
-
     return pyIntermediateResults;
 }
 
@@ -1619,88 +1959,60 @@ static PyObject * CreatePyFrameDecodingParameters(FrameDecodingParameters * pPar
     }
 
     PyObject * pyMaxQueueLength             = Py_BuildValue("i", pParameters->maxQueueLength);
-    PyObject * pyMaxQueueLengthKey          = Py_BuildValue("s", "MaxQueueLength");
-    PyDict_SetItem(pyParameters, pyMaxQueueLengthKey, pyMaxQueueLength);
+    PyDict_SetItem(pyParameters, key_MaxQueueLength, pyMaxQueueLength);
     Py_DECREF(pyMaxQueueLength);
-    Py_DECREF(pyMaxQueueLengthKey);
 
     PyObject * pyMaxResultQueueLength             = Py_BuildValue("i", pParameters->maxResultQueueLength);
-    PyObject * pyMaxResultQueueLengthKey          = Py_BuildValue("s", "MaxResultQueueLength");
-    PyDict_SetItem(pyParameters, pyMaxResultQueueLengthKey, pyMaxResultQueueLength);
+    PyDict_SetItem(pyParameters, key_MaxResultQueueLength, pyMaxResultQueueLength);
     Py_DECREF(pyMaxResultQueueLength);
-    Py_DECREF(pyMaxResultQueueLengthKey);
 
     PyObject * pyWidth             = Py_BuildValue("i", pParameters->width);
-    PyObject * pyWidthKey          = Py_BuildValue("s", "Width");
-    PyDict_SetItem(pyParameters, pyWidthKey, pyWidth);
+    PyDict_SetItem(pyParameters, key_Width, pyWidth);
     Py_DECREF(pyWidth);
-    Py_DECREF(pyWidthKey);
 
     PyObject * pyHeight             = Py_BuildValue("i", pParameters->height);
-    PyObject * pyHeightKey          = Py_BuildValue("s", "Height");
-    PyDict_SetItem(pyParameters, pyHeightKey, pyHeight);
+    PyDict_SetItem(pyParameters, key_Height, pyHeight);
     Py_DECREF(pyHeight);
-    Py_DECREF(pyHeightKey);
 
     PyObject * pyStride             = Py_BuildValue("i", pParameters->stride);
-    PyObject * pyStrideKey          = Py_BuildValue("s", "Stride");
-    PyDict_SetItem(pyParameters, pyStrideKey, pyStride);
+    PyDict_SetItem(pyParameters, key_Stride, pyStride);
     Py_DECREF(pyStride);
-    Py_DECREF(pyStrideKey);
 
     PyObject * pyImagePixelFormat             = Py_BuildValue("i", pParameters->imagePixelFormat);
-    PyObject * pyImagePixelFormatKey          = Py_BuildValue("s", "ImagePixelFormat");
-    PyDict_SetItem(pyParameters, pyImagePixelFormatKey, pyImagePixelFormat);
+    PyDict_SetItem(pyParameters, key_ImagePixelFormat, pyImagePixelFormat);
     Py_DECREF(pyImagePixelFormat);
-    Py_DECREF(pyImagePixelFormatKey);
 
     PyObject * pyRegionTop             = Py_BuildValue("i", pParameters->region.regionTop);
-    PyObject * pyRegionTopKey          = Py_BuildValue("s", "RegionTop");
-    PyDict_SetItem(pyParameters, pyRegionTopKey, pyRegionTop);
+    PyDict_SetItem(pyParameters, key_RegionTop, pyRegionTop);
     Py_DECREF(pyRegionTop);
-    Py_DECREF(pyRegionTopKey);
 
     PyObject * pyRegionLeft             = Py_BuildValue("i", pParameters->region.regionLeft);
-    PyObject * pyRegionLeftKey          = Py_BuildValue("s", "RegionLeft");
-    PyDict_SetItem(pyParameters, pyRegionLeftKey, pyRegionLeft);
+    PyDict_SetItem(pyParameters, key_RegionLeft, pyRegionLeft);
     Py_DECREF(pyRegionLeft);
-    Py_DECREF(pyRegionLeftKey);
 
     PyObject * pyRegionRight             = Py_BuildValue("i", pParameters->region.regionRight);
-    PyObject * pyRegionRightKey          = Py_BuildValue("s", "RegionRight");
-    PyDict_SetItem(pyParameters, pyRegionRightKey, pyRegionRight);
+    PyDict_SetItem(pyParameters, key_RegionRight, pyRegionRight);
     Py_DECREF(pyRegionRight);
-    Py_DECREF(pyRegionRightKey);
 
     PyObject * pyRegionBottom             = Py_BuildValue("i", pParameters->region.regionBottom);
-    PyObject * pyRegionBottomKey          = Py_BuildValue("s", "RegionBottom");
-    PyDict_SetItem(pyParameters, pyRegionBottomKey, pyRegionBottom);
+    PyDict_SetItem(pyParameters, key_RegionBottom, pyRegionBottom);
     Py_DECREF(pyRegionBottom);
-    Py_DECREF(pyRegionBottomKey);
 
     PyObject * pyRegionMeasuredByPercentage             = Py_BuildValue("i", pParameters->region.regionMeasuredByPercentage);
-    PyObject * pyRegionMeasuredByPercentageKey          = Py_BuildValue("s", "RegionMeasuredByPercentage");
-    PyDict_SetItem(pyParameters, pyRegionMeasuredByPercentageKey, pyRegionMeasuredByPercentage);
+    PyDict_SetItem(pyParameters, key_RegionMeasuredByPercentage, pyRegionMeasuredByPercentage);
     Py_DECREF(pyRegionMeasuredByPercentage);
-    Py_DECREF(pyRegionMeasuredByPercentageKey);
 
     PyObject * pyThreshold             = Py_BuildValue("f", pParameters->threshold);
-    PyObject * pyThresholdKey          = Py_BuildValue("s", "Threshold");
-    PyDict_SetItem(pyParameters, pyThresholdKey, pyThreshold);
+    PyDict_SetItem(pyParameters, key_Threshold, pyThreshold);
     Py_DECREF(pyThreshold);
-    Py_DECREF(pyThresholdKey);
 
     PyObject * pyFPS             = Py_BuildValue("i", pParameters->fps);
-    PyObject * pyFPSKey          = Py_BuildValue("s", "FPS");
-    PyDict_SetItem(pyParameters, pyFPSKey, pyFPS);
+    PyDict_SetItem(pyParameters, key_FPS, pyFPS);
     Py_DECREF(pyFPS);
-    Py_DECREF(pyFPSKey);
 
 	PyObject * pyAutoFilter = Py_BuildValue("i", pParameters->autoFilter);
-	PyObject * pyAutoFilterKey = Py_BuildValue("s", "AutoFilter");
-	PyDict_SetItem(pyParameters, pyAutoFilterKey, pyAutoFilter);
+	PyDict_SetItem(pyParameters, key_AutoFilter, pyAutoFilter);
 	Py_DECREF(pyAutoFilter);
-	Py_DECREF(pyAutoFilterKey);
 
     return pyParameters;
 }
@@ -1708,20 +2020,20 @@ static PyObject * CreatePyFrameDecodingParameters(FrameDecodingParameters * pPar
 FrameDecodingParameters CreateCFrameDecodingParameters(PyObject * pyParameters)
 {
     FrameDecodingParameters parameters;
-    parameters.maxQueueLength                       = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "MaxQueueLength")));
-    parameters.maxResultQueueLength                 = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "MaxResultQueueLength")));
-    parameters.width                                = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "Width")));
-    parameters.height                               = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "Height")));
-    parameters.stride                               = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "Stride")));
-    parameters.imagePixelFormat                     = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "ImagePixelFormat")));
-    parameters.region.regionBottom                  = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "RegionBottom")));
-    parameters.region.regionLeft                    = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "RegionLeft")));
-    parameters.region.regionRight                   = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "RegionRight")));
-    parameters.region.regionTop                     = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "RegionTop")));
-    parameters.region.regionMeasuredByPercentage    = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "RegionMeasuredByPercentage")));
-    parameters.threshold                            = (float)PyFloat_AsDouble(PyDict_GetItem(pyParameters, Py_BuildValue("s", "Threshold")));
-    parameters.fps                                  = PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "FPS")));
-	parameters.autoFilter							= PyLong_AsLong(PyDict_GetItem(pyParameters, Py_BuildValue("s", "AutoFilter")));
+    parameters.maxQueueLength                       = PyLong_AsLong(PyDict_GetItem(pyParameters, key_MaxQueueLength));
+    parameters.maxResultQueueLength                 = PyLong_AsLong(PyDict_GetItem(pyParameters, key_MaxResultQueueLength));
+    parameters.width                                = PyLong_AsLong(PyDict_GetItem(pyParameters, key_Width));
+    parameters.height                               = PyLong_AsLong(PyDict_GetItem(pyParameters, key_Height));
+    parameters.stride                               = PyLong_AsLong(PyDict_GetItem(pyParameters, key_Stride));
+    parameters.imagePixelFormat                     = PyLong_AsLong(PyDict_GetItem(pyParameters, key_ImagePixelFormat));
+    parameters.region.regionBottom                  = PyLong_AsLong(PyDict_GetItem(pyParameters, key_RegionBottom));
+    parameters.region.regionLeft                    = PyLong_AsLong(PyDict_GetItem(pyParameters, key_RegionLeft));
+    parameters.region.regionRight                   = PyLong_AsLong(PyDict_GetItem(pyParameters, key_RegionRight));
+    parameters.region.regionTop                     = PyLong_AsLong(PyDict_GetItem(pyParameters, key_RegionTop));
+    parameters.region.regionMeasuredByPercentage    = PyLong_AsLong(PyDict_GetItem(pyParameters, key_RegionMeasuredByPercentage));
+    parameters.threshold                            = (float)PyFloat_AsDouble(PyDict_GetItem(pyParameters, key_Threshold));
+    parameters.fps                                  = PyLong_AsLong(PyDict_GetItem(pyParameters, key_FPS));
+	parameters.autoFilter							= PyLong_AsLong(PyDict_GetItem(pyParameters, key_AutoFilter));
 
     return parameters;
 }
@@ -1852,16 +2164,17 @@ static PyObject *createPyResults(TextResultArray *pResults, const char* encoding
 }
 
 /**
+ * Call with the handle locked, it reads and updates the settings mirror.
  * This function will deprecate in a future version.
 */
 void updateFormat(DynamsoftBarcodeReader *self, int format)
 {
-    // Update DBR params
-    PublicRuntimeSettings pSettings = {0};
-    DBR_GetRuntimeSettings(self->hBarcode, &pSettings);
+    // Update DBR params, nothing reaches the SDK while the format stays the same
+    PublicRuntimeSettings pSettings;
+    memcpy(&pSettings, GetCachedSettings(self), sizeof(PublicRuntimeSettings));
     pSettings.barcodeFormatIds = format;
     char szErrorMsgBuffer[256];
-    DBR_UpdateRuntimeSettings(self->hBarcode, &pSettings, szErrorMsgBuffer, 256);
+    ApplySettings(self, &pSettings, szErrorMsgBuffer, 256);
 }
 
 /**
@@ -1890,17 +2203,21 @@ decodeFile(PyObject *obj, PyObject *args)
         return NULL;
     }
 
-    updateFormat(self, iFormat);
-
     TextResultArray *pResults = NULL;
 
-    // Barcode detection
-    int ret = DBR_DecodeFile(self->hBarcode, pFileName, templateName ? templateName : "");
+    // Barcode detection. The format, the decoding and its results are one step on the handle.
+    int ret;
+    LockHandle(self);
+    updateFormat(self, iFormat);
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_DecodeFile(self->hBarcode, pFileName, templateName ? templateName : "");
+    Py_END_ALLOW_THREADS
+    DBR_GetAllTextResults(self->hBarcode, &pResults);
+    UnlockHandle(self);
     if (ret)
     {
         printf("Detection error: %s\n", DBR_GetErrorString(ret));
     }
-    DBR_GetAllTextResults(self->hBarcode, &pResults);
 
     // Wrap results
     PyObject *list = createPyResults(pResults, encoding);
@@ -1923,8 +2240,6 @@ decodeBuffer(PyObject *obj, PyObject *args)
     if (!PyArg_ParseTuple(args, "Oi|iss", &o, &iFormat, &imagePixelFormat, &templateName, &encoding))
         return NULL;
 
-    updateFormat(self, iFormat);
-
 #if defined(IS_PY3K)
     //Refer to numpy/core/src/multiarray/ctors.c
     Py_buffer *view;
@@ -1975,13 +2290,20 @@ decodeBuffer(PyObject *obj, PyObject *args)
     TextResultArray *pResults = NULL;
 
     PyObject *list = NULL;
-    int ret = DBR_DecodeBuffer(self->hBarcode, buffer, width, height, stride, imagePixelFormat, templateName ? templateName : "");
+    // The format, the decoding and its results are one step on the handle
+    int ret;
+    LockHandle(self);
+    updateFormat(self, iFormat);
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_DecodeBuffer(self->hBarcode, buffer, width, height, stride, imagePixelFormat, templateName ? templateName : "");
+    Py_END_ALLOW_THREADS
+    DBR_GetAllTextResults(self->hBarcode, &pResults);
+    UnlockHandle(self);
     if (ret)
     {
         printf("Detection error: %s\n", DBR_GetErrorString(ret));
     }
     // Wrap results
-    DBR_GetAllTextResults(self->hBarcode, &pResults);
     list = createPyResults(pResults, encoding);
 
 #if defined(IS_PY3K)
@@ -1993,6 +2315,32 @@ decodeBuffer(PyObject *obj, PyObject *args)
     return list;
 }
 
+/**
+ * Gets a read-only view of the bytes of a file stream: bytes, bytearray, memoryview, mmap or a uint8 array.
+ * On Python 2, mmap and the other objects that only have the old buffer interface are read through it.
+ * Their view keeps the object alive but does not lock its memory, so it must not be closed or resized during the decoding.
+ *
+ * On success the caller must release the view with PyBuffer_Release.
+ * On failure an exception is set and -1 is returned.
+ */
+static int GetFileStreamBuffer(PyObject *op, Py_buffer *view)
+{
+    if (PyObject_GetBuffer(op, view, PyBUF_SIMPLE) == 0)
+        return 0;
+#if !defined(IS_PY3K)
+    const void *buffer;
+    Py_ssize_t length;
+    if (PyObject_CheckReadBuffer(op))
+    {
+        PyErr_Clear();
+        if (PyObject_AsReadBuffer(op, &buffer, &length) < 0)
+            return -1;
+        return PyBuffer_FillInfo(view, op, (void *)buffer, length, 1, PyBUF_SIMPLE);
+    }
+#endif
+    return -1;
+}
+
 /**
  * Decode file stream. This API will be deprecated in a future version.
  */
@@ -2020,18 +2368,33 @@ decodeFileStream(PyObject *obj, PyObject *args)
         return NULL;
     }
 
-    updateFormat(self, iFormat);
-
     TextResultArray *pResults = NULL;
-    // https://docs.python.org/2/c-api/bytearray.html
-    char *filestream = PyByteArray_AsString(op);
-    // Barcode detection
-    int ret = DBR_DecodeFileInMemory(self->hBarcode, filestream, fileSize, templateName ? templateName : "");
+    // Any contiguous buffer is read in place: bytes, bytearray, memoryview, mmap or a uint8 array
+    Py_buffer view;
+    if (GetFileStreamBuffer(op, &view) < 0)
+    {
+        return NULL;
+    }
+    // A negative size decodes the whole buffer
+    if (fileSize < 0 || fileSize > view.len)
+    {
+        fileSize = (int)view.len;
+    }
+    char *filestream = (char *)view.buf;
+    // Barcode detection. The format, the decoding and its results are one step on the handle.
+    int ret;
+    LockHandle(self);
+    updateFormat(self, iFormat);
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_DecodeFileInMemory(self->hBarcode, filestream, fileSize, templateName ? templateName : "");
+    Py_END_ALLOW_THREADS
+    DBR_GetAllTextResults(self->hBarcode, &pResults);
+    UnlockHandle(self);
+    PyBuffer_Release(&view);
     if (ret)
     {
         printf("Detection error: %s\n", DBR_GetErrorString(ret));
     }
-    DBR_GetAllTextResults(self->hBarcode, &pResults);
 
     // Wrap results
     PyObject *list = createPyResults(pResults, encoding);
@@ -2059,7 +2422,9 @@ initLicenseFromLicenseContent(PyObject *obj, PyObject *args)
         return NULL;
     }
 
+    LockHandle(self);
     int ret = DBR_InitLicenseFromLicenseContent(self->hBarcode, pszLicenseKey, pszLicenseContent);
+    UnlockHandle(self);
     return Py_BuildValue("i", ret);
 }
 
@@ -2074,7 +2439,9 @@ outputLicenseToString(PyObject *obj, PyObject *args)
     DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
 
     char content[512];
+    LockHandle(self);
     int ret = DBR_OutputLicenseToString(self->hBarcode, content, 512);
+    UnlockHandle(self);
     if (ret)
     {
         printf("%s\n", DBR_GetErrorString(ret));
@@ -2104,7 +2471,9 @@ initLicenseFromServer(PyObject *obj, PyObject *args)
         return NULL;
     }
 
+    LockHandle(self);
     int ret = DBR_InitLicenseFromServer(self->hBarcode, pLicenseServer, pszLicenseKey);
+    UnlockHandle(self);
     return Py_BuildValue("i", ret);
 }
 
@@ -2113,21 +2482,29 @@ initLicenseFromServer(PyObject *obj, PyObject *args)
 */
 static void setModeValue(DynamsoftBarcodeReader *self, PyObject *iter, char *mode)
 {
-    PublicRuntimeSettings pSettings = {0};
-    DBR_GetRuntimeSettings(self->hBarcode, &pSettings);
-    int index = 0;
-    pSettings.furtherModes.grayscaleTransformationModes[0] = GTM_INVERTED;
-
-    while (1)
+    // The modes are read before the handle is locked, because iterating may run Python code that uses the reader
+    int attributes[8];
+    int count = 0;
+    while (count < 8)
     {
         PyObject *next = PyIter_Next(iter);
         if (!next)
         {
             break;
         }
+        attributes[count++] = PyLong_AsLong(next);
+        Py_DECREF(next);
+    }
 
+    LockHandle(self);
+    PublicRuntimeSettings pSettings;
+    memcpy(&pSettings, GetCachedSettings(self), sizeof(PublicRuntimeSettings));
+    pSettings.furtherModes.grayscaleTransformationModes[0] = GTM_INVERTED;
+
+    for (int index = 0; index < count; ++index)
+    {
         // Set attributes for different modes
-        int attribute = PyLong_AsLong(next);
+        int attribute = attributes[index];
         if (!strcmp("grayscaleTransformationModes", mode))
         {
             // printf("Set grayscaleTransformationModes %d\n", attribute);
@@ -2177,12 +2554,11 @@ static void setModeValue(DynamsoftBarcodeReader *self, PyObject *iter, char *mod
         {
             pSettings.furtherModes.textAssistedCorrectionMode = attribute;
         }
-
-        ++index;
     }
 
     char szErrorMsgBuffer[256];
-    DBR_UpdateRuntimeSettings(self->hBarcode, &pSettings, szErrorMsgBuffer, 256);
+    ApplySettings(self, &pSettings, szErrorMsgBuffer, 256);
+    UnlockHandle(self);
 }
 
 /**
@@ -2235,7 +2611,10 @@ setParameters(PyObject *obj, PyObject *args)
     }
 
     char errorMessage[DEFAULT_MEMORY_SIZE];
+    LockHandle(self);
     int ret = DBR_InitRuntimeSettingsWithString(self->hBarcode, json, CM_OVERWRITE, errorMessage, 256);
+    self->settingsCached = 0;
+    UnlockHandle(self);
     if (ret) 
     {
         printf("Returned value: %d, error message: %s\n", ret, errorMessage);
@@ -2258,7 +2637,9 @@ getParameters(PyObject *obj, PyObject *args)
     char errorMessage[DEFAULT_MEMORY_SIZE];
     char pContent[DEFAULT_MEMORY_SIZE];
 
+    LockHandle(self);
     int ret = DBR_OutputSettingsToString(self->hBarcode, pContent, DEFAULT_MEMORY_SIZE, "currentRuntimeSettings");
+    UnlockHandle(self);
     // printf("pContent: %s\n, string len: %d", pContent, strlen(pContent));
     if (ret) 
     {
@@ -2282,6 +2663,7 @@ void onResultCallback(int frameId, TextResultArray *pResults, void *pUser)
     // https://docs.python.org/2/c-api/init.html
     PyGILState_STATE gstate;
     gstate = PyGILState_Ensure();
+    self->callbackThread = (long)PyThread_get_thread_ident();
 
     PyObject *list = PyList_New(count);
     for (; i < count; i++)
@@ -2308,422 +2690,1156 @@ void onResultCallback(int frameId, TextResultArray *pResults, void *pUser)
     PyGILState_Release(gstate);
     /////////////////////////////////////////////
 
-    // Release memory
-    DBR_FreeTextResults(&pResults);
+    // Release memory
+    DBR_FreeTextResults(&pResults);
+}
+
+// The deprecated video mode shares the frame pinning of the current one
+static int ResetPinnedFrames(DynamsoftBarcodeReader *self, int capacity);
+static PyObject * StopVideoMode(PyObject *obj, PyObject *args);
+static PyObject * AppendVideoFrame(PyObject *obj, PyObject *args);
+
+/**
+ * Read barcodes from continuous video frames. This API will be deprecated in a future version.
+ */
+static PyObject *
+startVideoMode(PyObject *obj, PyObject *args)
+{
+    printf("Start the video mode\n");
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+
+    PyObject *callback = NULL;
+    int maxListLength, maxResultListLength, width, height, stride, iFormat;
+    int imagePixelFormat = IPF_RGB_888;
+    if (!PyArg_ParseTuple(args, "iiiiiiO|i", &maxListLength, &maxResultListLength, &width, &height, &stride, &iFormat, &callback, &imagePixelFormat))
+    {
+        return NULL;
+    }
+
+    if (!PyCallable_Check(callback))
+    {
+        PyErr_SetString(PyExc_TypeError, "parameter must be callable");
+        return NULL;
+    }
+    // A running video mode is left alone, its queues and pinned frames are still in use. The flag is taken with
+    // the GIL held, so a second start waiting for the handle lock below can not get past it.
+    if (self->videoRunning)
+    {
+        return Py_BuildValue("i", DBRERR_FRAME_DECODING_THREAD_EXISTS);
+    }
+    self->videoRunning = 1;
+
+    Py_XINCREF(callback);    /* Add a reference to new callback */
+    Py_XDECREF(self->py_callback); /* Dispose of previous callback */
+    self->py_callback = callback;
+
+    // appendVideoFrame checks and pins the frames like AppendVideoFrame
+    if (ResetPinnedFrames(self, (maxListLength > 0 ? maxListLength : 1) + 2) < 0)
+    {
+        self->videoRunning = 0;
+        return PyErr_NoMemory();
+    }
+    self->frameWidth = width;
+    self->frameHeight = height;
+    self->frameStride = stride;
+    self->filterActive = 0;
+
+    LockHandle(self);
+    updateFormat(self, iFormat);
+    DBR_SetTextResultCallback(self->hBarcode, onResultCallback, self);
+    int ret = DBR_StartFrameDecoding(self->hBarcode, maxListLength, maxResultListLength, width, height, stride, imagePixelFormat, "");
+    self->videoRunning = ret == DBR_OK;
+    UnlockHandle(self);
+    return Py_BuildValue("i", ret);
+}
+
+/**
+ * This API will be deprecated in a future version.
+*/
+static PyObject *
+stopVideoMode(PyObject *obj, PyObject *args)
+{
+    return StopVideoMode(obj, args);
+}
+
+/**
+ * The frame must have the layout given to startVideoMode. Its buffer stays pinned while the SDK may read it.
+ * This API will be deprecated in a future version.
+*/
+static PyObject *
+appendVideoFrame(PyObject *obj, PyObject *args)
+{
+    return AppendVideoFrame(obj, args);
+}
+
+#pragma endregion
+
+static PyObject * GetDBRVersion(PyObject *obj, PyObject *args)
+{
+	DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+	const char * version = DBR_GetVersion();
+	return Py_BuildValue("s", version);
+}
+
+static PyObject * GetErrorString(PyObject *obj, PyObject *args)
+{
+	DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+	int errorCode = 0;
+	if (!PyArg_ParseTuple(args, "i", &errorCode))
+	{
+		Py_RETURN_NONE;
+	}
+
+	const char* errorString = DBR_GetErrorString(errorCode);
+	return Py_BuildValue("s", errorString);
+}
+
+static PyObject * InitLicense(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+
+    char *pszLicense;
+    if (!PyArg_ParseTuple(args, "s", &pszLicense))
+    {
+		Py_RETURN_NONE;
+    }
+
+    LockHandle(self);
+    int ret = DBR_InitLicense(self->hBarcode, pszLicense);
+    UnlockHandle(self);
+    const char* errorString = DBR_GetErrorString(ret);
+    return Py_BuildValue("(i,s)", ret, errorString);
+}
+
+static PyObject * GetRuntimeSettings(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+
+    PublicRuntimeSettings settings;
+    LockHandle(self);
+    memcpy(&settings, GetCachedSettings(self), sizeof(PublicRuntimeSettings));
+    UnlockHandle(self);
+
+    PyObject * pySettings = CreatePyRuntimeSettings(settings);
+	
+    return pySettings;
+}
+
+static PyObject * UpdataRuntimeSettings(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+    PyObject *pyParameters;
+    if (!PyArg_ParseTuple(args, "O", &pyParameters))
+    {
+		Py_RETURN_NONE;
+    }
+    
+    // pyParameters may hold only the changed settings, the others keep their current values
+    PublicRuntimeSettings settings;
+    char szErrorMsgBuffer[256];
+    LockHandle(self);
+    memcpy(&settings, GetCachedSettings(self), sizeof(PublicRuntimeSettings));
+    if (OverlayCRuntimeSettings(pyParameters, &settings) < 0)
+    {
+        UnlockHandle(self);
+        return NULL;
+    }
+    int errorCode = ApplySettings(self, &settings, szErrorMsgBuffer, 256);
+    UnlockHandle(self);
+	return Py_BuildValue("(i,s)", errorCode, szErrorMsgBuffer);
+}
+
+static PyObject * ResetRuntimeSettings(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+
+    LockHandle(self);
+    DBR_ResetRuntimeSettings(self->hBarcode);
+    self->settingsCached = 0;
+    UnlockHandle(self);
+
+	Py_RETURN_NONE;
+}
+
+static PyObject * SetModeArgument(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+    char * pModesName;
+    int index;
+    char * pArgumentName;
+    char * pArgumentValue;
+    if (!PyArg_ParseTuple(args, "siss", &pModesName, &index, &pArgumentName, &pArgumentValue))
+    {
+		Py_RETURN_NONE;
+    }
+    char szErrorMsgBuffer[256];
+    LockHandle(self);
+    int errorCode = DBR_SetModeArgument(self->hBarcode, pModesName, index, pArgumentName, pArgumentValue, szErrorMsgBuffer, 256);
+    self->settingsCached = 0;
+    UnlockHandle(self);
+    return Py_BuildValue("(i,s)", errorCode, szErrorMsgBuffer);
+}
+
+static PyObject * GetModeArgument(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+    char * pModesName;
+    int index;
+    char * pArgumentName;
+    if (!PyArg_ParseTuple(args, "sis", &pModesName, &index, &pArgumentName))
+    {
+		Py_RETURN_NONE;
+    }
+    char szErrorMsgBuffer[256];
+    char pArgumentValue[512];
+    LockHandle(self);
+    int errorCode = DBR_GetModeArgument(self->hBarcode, pModesName, index, pArgumentName, pArgumentValue, 512, szErrorMsgBuffer, 256);
+    UnlockHandle(self);
+    if(errorCode != 0)
+    {
+		return Py_BuildValue("(i,s)", errorCode, szErrorMsgBuffer);
+    }
+    else
+    {
+		return Py_BuildValue("s", pArgumentValue);
+    }
+}
+
+/**
+ * Move the pixel coordinates of the results by (dx, dy), so that the results of a region are in the coordinates of the whole image.
+ */
+static void OffsetTextResults(TextResultArray *pResults, int dx, int dy)
+{
+	if (pResults == NULL || (dx == 0 && dy == 0))
+		return;
+
+	for (int i = 0; i < pResults->resultsCount; ++i)
+	{
+		LocalizationResult *pLocalization = pResults->results[i]->localizationResult;
+		if (pLocalization == NULL || pLocalization->resultCoordinateType != RCT_PIXEL)
+			continue;
+		pLocalization->x1 += dx;
+		pLocalization->y1 += dy;
+		pLocalization->x2 += dx;
+		pLocalization->y2 += dy;
+		pLocalization->x3 += dx;
+		pLocalization->y3 += dy;
+		pLocalization->x4 += dx;
+		pLocalization->y4 += dy;
+	}
+}
+
+/**
+ * Get the results of the last decoding.
+ *
+ * @param [in] lazy Int Whether to return lazy result views.
+ * @param [in] dx, dy Int The offset added to the pixel coordinates, the position of the decoded region in the image.
+ */
+static PyObject * GetAllTextResults(PyObject *obj, PyObject *args)
+{
+	DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+
+	int lazy = 0;
+	int dx = 0, dy = 0;
+	if (!PyArg_ParseTuple(args, "|iii", &lazy, &dx, &dy))
+		return NULL;
+
+	TextResultArray *pResults = NULL;
+	LockHandle(self);
+	Py_BEGIN_ALLOW_THREADS
+	DBR_GetAllTextResults(self->hBarcode, &pResults);
+	Py_END_ALLOW_THREADS
+	UnlockHandle(self);
+	OffsetTextResults(pResults, dx, dy);
+
+	if (pResults == NULL || pResults->resultsCount == 0)
+	{
+		if (pResults != NULL)
+			DBR_FreeTextResults(&pResults);
+		Py_RETURN_NONE;
+	}
+	else
+	{
+		return CreatePyTextResults(pResults, lazy);
+	}
+}
+
+static PyObject * GetAllTextResultArrays(PyObject *obj, PyObject *args)
+{
+	DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+
+	int dx = 0, dy = 0;
+	if (!PyArg_ParseTuple(args, "|ii", &dx, &dy))
+		return NULL;
+
+	TextResultArray *pResults = NULL;
+	LockHandle(self);
+	Py_BEGIN_ALLOW_THREADS
+	DBR_GetAllTextResults(self->hBarcode, &pResults);
+	Py_END_ALLOW_THREADS
+	UnlockHandle(self);
+	OffsetTextResults(pResults, dx, dy);
+
+	PyObject *pyArrays = CreatePyTextResultArrays(pResults);
+	if (pResults != NULL)
+		DBR_FreeTextResults(&pResults);
+	return pyArrays;
+}
+
+static PyObject * GetAllIntermediateResults(PyObject *obj, PyObject *args)
+{
+	DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+
+	IntermediateResultArray * pIResults = NULL;
+	LockHandle(self);
+	Py_BEGIN_ALLOW_THREADS
+	DBR_GetIntermediateResults(self->hBarcode, &pIResults);
+	Py_END_ALLOW_THREADS
+	UnlockHandle(self);
+
+	if (pIResults == NULL || pIResults->resultsCount == 0)
+	{
+		if (pIResults != NULL)
+			DBR_FreeIntermediateResults(&pIResults);
+		Py_RETURN_NONE;
+	}
+
+	// The images are numpy arrays over the native results, so the capsule frees them when the last array is gone
+	PyObject * owner = PyCapsule_New(pIResults, INTERMEDIATE_RESULT_ARRAY_CAPSULE, FreeIntermediateResultArray);
+	if (owner == NULL)
+	{
+		DBR_FreeIntermediateResults(&pIResults);
+		return NULL;
+	}
+	PyObject * pyIntermediateResults = CreatePyIntermediateResults(pIResults, owner);
+	Py_DECREF(owner);
+	return pyIntermediateResults;
+}
+
+static PyObject * DecodeFile(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+
+    char *pFileName; // File name
+    char *templateName = NULL;
+    if (!PyArg_ParseTuple(args, "ss", &pFileName, &templateName))
+    {
+		Py_RETURN_NONE;
+    }
+
+    if(templateName == NULL)
+    {
+        templateName = "";
+    }
+
+    // Barcode detection
+    int ret;
+    LockHandle(self);
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_DecodeFile(self->hBarcode, pFileName, templateName);
+    Py_END_ALLOW_THREADS
+    UnlockHandle(self);
+	return Py_BuildValue("i", ret);
+}
+
+/**
+ * Export the pixels of an image object without copying them.
+ *
+ * The image must be a 2-D (height, width) or 3-D (height, width, channels)
+ * uint8 buffer whose pixels are packed inside each row. Rows may be padded,
+ * so slices such as frame[y0:y1, x0:x1] are accepted: the view's first pixel
+ * and its row stride describe the region. If *format is negative, it is derived
+ * from the number of channels: 1 is gray, 3 is RGB_888 and 4 is ARGB_8888.
+ *
+ * On success the caller must release the view with PyBuffer_Release.
+ * On failure an exception is set and -1 is returned.
+ */
+static int GetImageBuffer(PyObject *o, Py_buffer *view, int *width, int *height, int *stride, int *format)
+{
+    if (PyObject_GetBuffer(o, view, PyBUF_STRIDED_RO | PyBUF_FORMAT) < 0)
+        return -1;
+
+    if (view->itemsize != 1 || (view->format != NULL && strcmp(view->format, "B") != 0 && strcmp(view->format, "=B") != 0))
+    {
+        PyErr_SetString(PyExc_TypeError, "the image must be a uint8 array");
+        PyBuffer_Release(view);
+        return -1;
+    }
+
+    Py_ssize_t channels = view->ndim == 3 ? view->shape[2] : 1;
+    if ((view->ndim != 2 && view->ndim != 3) || (channels != 1 && channels != 3 && channels != 4))
+    {
+        PyErr_SetString(PyExc_ValueError, "the image must have a shape of (height, width) or (height, width, 1|3|4)");
+        PyBuffer_Release(view);
+        return -1;
+    }
+
+    if (view->strides[1] != channels || (view->ndim == 3 && view->strides[2] != 1) ||
+        view->strides[0] < view->shape[1] * channels)
+    {
+        PyErr_SetString(PyExc_ValueError, "the pixels of every image row must be contiguous");
+        PyBuffer_Release(view);
+        return -1;
+    }
+
+    *height = (int)view->shape[0];
+    *width = (int)view->shape[1];
+    *stride = (int)view->strides[0];
+    if (*format < 0)
+    {
+        *format = channels == 1 ? IPF_GRAYSCALED : (channels == 3 ? IPF_RGB_888 : IPF_ARGB_8888);
+    }
+    return 0;
+}
+
+static PyObject * DecodeBuffer(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+
+    PyObject *o;
+    char *templateName = NULL;
+    int width, height, stride;
+    int imagePixelFormat = -1;
+    if (!PyArg_ParseTuple(args, "Ois", &o, &imagePixelFormat, &templateName))
+		Py_RETURN_NONE;
+
+    Py_buffer view;
+    if (GetImageBuffer(o, &view, &width, &height, &stride, &imagePixelFormat) < 0)
+        return NULL;
+
+    if(templateName == NULL)
+    {
+        templateName = "";
+    }
+    // The exported view keeps the buffer alive while the GIL is released
+    int ret;
+    LockHandle(self);
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_DecodeBuffer(self->hBarcode, (unsigned char *)view.buf, width, height, stride, imagePixelFormat, templateName);
+    Py_END_ALLOW_THREADS
+    UnlockHandle(self);
+    PyBuffer_Release(&view);
+	return Py_BuildValue("i", ret);
+}
+
+// One image of a DecodeBuffers batch
+typedef struct
+{
+    Py_buffer view;
+    int width;
+    int height;
+    int stride;
+    int format;
+    int ret;
+    TextResultArray *pResults;
+} BatchImage;
+
+/**
+ * Decode a batch of images with one call.
+ *
+ * The images are a list of arrays or an array stacked along the first axis,
+ * e.g. (T, H, W, C). The whole batch is decoded with the GIL released, and a
+ * list of (errorCode, textResults) tuples is returned in the same order.
+ */
+static PyObject * DecodeBuffers(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+
+    PyObject *images;
+    char *templateName = NULL;
+    int imagePixelFormat = -1;
+    int lazy = 0;
+    if (!PyArg_ParseTuple(args, "Ois|i", &images, &imagePixelFormat, &templateName, &lazy))
+        return NULL;
+
+    PyObject *sequence = PySequence_Fast(images, "images must be a list of arrays or a stacked array");
+    if (sequence == NULL)
+        return NULL;
+
+    Py_ssize_t count = PySequence_Fast_GET_SIZE(sequence);
+    BatchImage *batch = (BatchImage *)PyMem_Malloc(sizeof(BatchImage) * (count > 0 ? count : 1));
+    if (batch == NULL)
+    {
+        Py_DECREF(sequence);
+        return PyErr_NoMemory();
+    }
+
+    // Export every buffer up front so that the loop below never needs the GIL
+    Py_ssize_t exported = 0;
+    for (; exported < count; ++exported)
+    {
+        BatchImage *image = &batch[exported];
+        image->format = imagePixelFormat;
+        image->pResults = NULL;
+        if (GetImageBuffer(PySequence_Fast_GET_ITEM(sequence, exported), &image->view,
+                           &image->width, &image->height, &image->stride, &image->format) < 0)
+            break;
+    }
+
+    PyObject *list = NULL;
+    if (exported == count)
+    {
+        if(templateName == NULL)
+        {
+            templateName = "";
+        }
+
+        LockHandle(self);
+        Py_BEGIN_ALLOW_THREADS
+        for (Py_ssize_t i = 0; i < count; ++i)
+        {
+            BatchImage *image = &batch[i];
+            image->ret = DBR_DecodeBuffer(self->hBarcode, (unsigned char *)image->view.buf, image->width, image->height,
+                                          image->stride, image->format, templateName);
+            DBR_GetAllTextResults(self->hBarcode, &image->pResults);
+        }
+        Py_END_ALLOW_THREADS
+        UnlockHandle(self);
+
+        list = PyList_New(count);
+        for (Py_ssize_t i = 0; i < count; ++i)
+        {
+            BatchImage *image = &batch[i];
+            PyObject *pyTextResults = NULL;
+            if (list != NULL && image->pResults != NULL && image->pResults->resultsCount != 0)
+            {
+                pyTextResults = CreatePyTextResults(image->pResults, lazy);
+                image->pResults = NULL;
+                if (pyTextResults == NULL)
+                {
+                    Py_CLEAR(list);
+                }
+            }
+            if (image->pResults != NULL)
+            {
+                DBR_FreeTextResults(&image->pResults);
+            }
+            if (pyTextResults == NULL)
+            {
+                pyTextResults = Py_None;
+                Py_INCREF(Py_None);
+            }
+
+            if (list != NULL)
+            {
+                PyList_SetItem(list, i, Py_BuildValue("(iN)", image->ret, pyTextResults));
+            }
+            else
+            {
+                Py_DECREF(pyTextResults);
+            }
+        }
+    }
+
+    for (Py_ssize_t i = 0; i < exported; ++i)
+    {
+        PyBuffer_Release(&batch[i].view);
+    }
+    PyMem_Free(batch);
+    Py_DECREF(sequence);
+    return list;
 }
 
-/**
- * Read barcodes from continuous video frames. This API will be deprecated in a future version.
- */
-static PyObject *
-startVideoMode(PyObject *obj, PyObject *args)
+static PyObject * DecodeFileStream(PyObject *obj, PyObject *args)
 {
-    printf("Start the video mode\n");
     DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
 
-    PyObject *callback = NULL;
-    int maxListLength, maxResultListLength, width, height, stride, iFormat;
-    int imagePixelFormat = IPF_RGB_888;
-    if (!PyArg_ParseTuple(args, "iiiiiiO|i", &maxListLength, &maxResultListLength, &width, &height, &stride, &iFormat, &callback, &imagePixelFormat))
+    PyObject *op; 
+    int fileSize;
+    char *templateName = NULL;
+    if (!PyArg_ParseTuple(args, "Ois", &op, &fileSize, &templateName))
     {
-        return NULL;
+		Py_RETURN_NONE;
     }
 
-    updateFormat(self, iFormat);
-
-    if (!PyCallable_Check(callback))
+    // Any contiguous buffer is read in place: bytes, bytearray, memoryview, mmap or a uint8 array
+    Py_buffer view;
+    if (GetFileStreamBuffer(op, &view) < 0)
     {
-        PyErr_SetString(PyExc_TypeError, "parameter must be callable");
         return NULL;
     }
-    else
+    if (view.len > INT_MAX)
     {
-        Py_XINCREF(callback);    /* Add a reference to new callback */
-        Py_XDECREF(self->py_callback); /* Dispose of previous callback */
-        self->py_callback = callback;
+        PyErr_SetString(PyExc_ValueError, "the file stream must be smaller than 2 GB");
+        PyBuffer_Release(&view);
+        return NULL;
+    }
+    // A negative size decodes the whole buffer
+    if (fileSize < 0 || fileSize > (int)view.len)
+    {
+        fileSize = (int)view.len;
+    }
+    if(templateName == NULL)
+    {
+        templateName = "";
     }
+    // Barcode detection. The view keeps the buffer alive and unresized until it is released.
+    int ret;
+    LockHandle(self);
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_DecodeFileInMemory(self->hBarcode, (unsigned char *)view.buf, fileSize, templateName);
+    Py_END_ALLOW_THREADS
+    UnlockHandle(self);
+    PyBuffer_Release(&view);
+	return Py_BuildValue("i", ret);
+}
 
+static PyObject * GetLengthOfFrameQueue(PyObject *obj, PyObject *args)
+{
+	DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
 
-    DBR_SetTextResultCallback(self->hBarcode, onResultCallback, self);
+	int length;
 
-    int ret = DBR_StartFrameDecoding(self->hBarcode, maxListLength, maxResultListLength, width, height, stride, imagePixelFormat, "");
-    return Py_BuildValue("i", ret);
-}
+	LockHandle(self);
 
-/**
- * This API will be deprecated in a future version.
-*/
-static PyObject *
-stopVideoMode(PyObject *obj, PyObject *args)
-{
-    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-    printf("Stop the video mode\n");
-    if (self->hBarcode)
-    {
-        int ret = DBR_StopFrameDecoding(self->hBarcode);
-        return Py_BuildValue("i", ret);
-    }
+	length = DBR_GetLengthOfFrameQueue(self->hBarcode);
 
-    return 0;
+	UnlockHandle(self);
+	return Py_BuildValue("i", length);
 }
 
 /**
- * This API will be deprecated in a future version.
-*/
-static PyObject *
-appendVideoFrame(PyObject *obj, PyObject *args)
+ * Video result queue
+ *
+ * Without a callback the video mode thread pushes the native results into a bounded ring and returns
+ * at once. Python pops them with GetVideoResults and converts them on its own thread.
+ */
+static void FreeVideoEvents(VideoEvent *events, int eventCount)
 {
-    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+    for (int i = 0; i < eventCount; ++i)
+        free(events[i].barcode.bytes);
+    free(events);
+}
 
-    PyObject *o;
-    if (!PyArg_ParseTuple(args, "O", &o))
-        return NULL;
+static void FreeVideoResult(VideoResult *pResult)
+{
+    if (pResult->pResults != NULL)
+        DBR_FreeTextResults(&pResult->pResults);
+    if (pResult->events != NULL)
+        FreeVideoEvents(pResult->events, pResult->eventCount);
+    pResult->events = NULL;
+}
 
-#if defined(IS_PY3K)
-    //Refer to numpy/core/src/multiarray/ctors.c
-    Py_buffer *view;
-    PyObject *memoryview = PyMemoryView_FromObject(o);
-    if (memoryview == NULL)
+static void PushVideoResult(DynamsoftBarcodeReader *self, const VideoResult *pResult)
+{
+    VideoResult dropped;
+    int hasDropped = 0;
+    PyThread_acquire_lock(self->resultMutex, WAIT_LOCK);
+    if (self->resultCount == self->resultCapacity)
     {
-        PyErr_Clear();
-        return NULL;
+        dropped = self->videoResults[self->resultHead];
+        hasDropped = 1;
+        self->resultHead = (self->resultHead + 1) % self->resultCapacity;
+        self->resultCount--;
+        self->droppedResults++;
     }
+    self->videoResults[(self->resultHead + self->resultCount) % self->resultCapacity] = *pResult;
+    if (self->resultCount++ == 0 && !self->resultQueueClosed)
+        PyThread_release_lock(self->resultReady);
+    PyThread_release_lock(self->resultMutex);
 
-    view = PyMemoryView_GET_BUFFER(memoryview);
-    unsigned char *buffer = (unsigned char *)(view->buf);
-    Py_DECREF(memoryview);
-#else
-
-    PyObject *ao = PyObject_GetAttrString(o, "__array_struct__");
+    if (hasDropped)
+        FreeVideoResult(&dropped);
+}
 
-    if ((ao == NULL) || !PyCObject_Check(ao))
+/**
+ * Pop the oldest result. Returns 0 if the queue is empty.
+ * The caller must own resultReady, which is handed on while results are left or the queue is closed.
+ */
+static int PopVideoResult(DynamsoftBarcodeReader *self, VideoResult *pResult)
+{
+    int popped = 0;
+    PyThread_acquire_lock(self->resultMutex, WAIT_LOCK);
+    if (self->resultCount > 0)
     {
-        PyErr_SetString(PyExc_TypeError, "object does not have array interface");
-        return NULL;
+        *pResult = self->videoResults[self->resultHead];
+        self->resultHead = (self->resultHead + 1) % self->resultCapacity;
+        self->resultCount--;
+        popped = 1;
     }
+    if (self->resultCount > 0 || self->resultQueueClosed)
+        PyThread_release_lock(self->resultReady);
+    PyThread_release_lock(self->resultMutex);
+    return popped;
+}
 
-    PyArrayInterface *pai = (PyArrayInterface *)PyCObject_AsVoidPtr(ao);
-
-    if (pai->two != 2)
+static void ClearVideoResults(DynamsoftBarcodeReader *self)
+{
+    while (self->resultCount > 0)
     {
-        PyErr_SetString(PyExc_TypeError, "object does not have array interface");
-        Py_DECREF(ao);
-        return NULL;
+        FreeVideoResult(&self->videoResults[self->resultHead]);
+        self->resultHead = (self->resultHead + 1) % self->resultCapacity;
+        self->resultCount--;
     }
-
-    // Get image information
-    unsigned char *buffer = (unsigned char *)pai->data; // The address of image data
-    Py_DECREF(ao);
-#endif
-
-    int frameId = DBR_AppendFrame(self->hBarcode, buffer);
-    return 0;
+    self->resultHead = 0;
 }
 
-#pragma endregion
-
-static PyObject * GetDBRVersion(PyObject *obj, PyObject *args)
+/**
+ * Empty the queue and size it for a new video mode. The video mode thread must not be running.
+ */
+static int ResetVideoResults(DynamsoftBarcodeReader *self, int capacity)
 {
-	DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-	const char * version = DBR_GetVersion();
-	return Py_BuildValue("s", version);
+    if (capacity < 1)
+        capacity = 1;
+
+    PyThread_acquire_lock(self->resultMutex, WAIT_LOCK);
+    ClearVideoResults(self);
+    // Take resultReady back if the last video mode left it available
+    PyThread_acquire_lock(self->resultReady, NOWAIT_LOCK);
+    self->resultQueueClosed = 0;
+    self->droppedResults = 0;
+    int ret = 0;
+    if (capacity != self->resultCapacity)
+    {
+        VideoResult *videoResults = (VideoResult *)realloc(self->videoResults, capacity * sizeof(VideoResult));
+        if (videoResults != NULL)
+        {
+            self->videoResults = videoResults;
+            self->resultCapacity = capacity;
+        }
+        else
+        {
+            ret = -1;
+        }
+    }
+    PyThread_release_lock(self->resultMutex);
+    return ret;
 }
 
-static PyObject * GetErrorString(PyObject *obj, PyObject *args)
+/**
+ * Wake the consumers once video mode has stopped. They get the results left in the queue and then learn that it is closed.
+ */
+static void CloseVideoResults(DynamsoftBarcodeReader *self)
 {
-	DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-	int errorCode = 0;
-	if (!PyArg_ParseTuple(args, "i", &errorCode))
-	{
-		Py_RETURN_NONE;
-	}
-
-	const char* errorString = DBR_GetErrorString(errorCode);
-	return Py_BuildValue("s", errorString);
+    PyThread_acquire_lock(self->resultMutex, WAIT_LOCK);
+    if (!self->resultQueueClosed)
+    {
+        self->resultQueueClosed = 1;
+        if (self->resultCount == 0)
+            PyThread_release_lock(self->resultReady);
+    }
+    PyThread_release_lock(self->resultMutex);
 }
 
-static PyObject * InitLicense(PyObject *obj, PyObject *args)
+/**
+ * Acquire a lock with the GIL released. A negative timeout waits until the lock is available.
+ */
+static int AcquireLockTimed(PyThread_type_lock lock, double timeout)
 {
-    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-
-    char *pszLicense;
-    if (!PyArg_ParseTuple(args, "s", &pszLicense))
+    int acquired;
+#if defined(IS_PY3K)
+    PY_TIMEOUT_T microseconds = -1;
+    if (timeout >= 0)
+        microseconds = timeout * 1e6 < (double)PY_TIMEOUT_MAX ? (PY_TIMEOUT_T)(timeout * 1e6) : PY_TIMEOUT_MAX;
+    Py_BEGIN_ALLOW_THREADS
+    acquired = PyThread_acquire_lock_timed(lock, microseconds, 0) == PY_LOCK_ACQUIRED;
+    Py_END_ALLOW_THREADS
+#else
+    // Python 2 locks can not wait with a timeout, so poll every millisecond
+    acquired = PyThread_acquire_lock(lock, NOWAIT_LOCK);
+    for (double waited = 0; !acquired && (timeout < 0 || waited < timeout); waited += 0.001)
     {
-		Py_RETURN_NONE;
+        Py_BEGIN_ALLOW_THREADS
+        SleepMilliseconds(1);
+        Py_END_ALLOW_THREADS
+        acquired = PyThread_acquire_lock(lock, NOWAIT_LOCK);
     }
-
-    int ret = DBR_InitLicense(self->hBarcode, pszLicense);
-    const char* errorString = DBR_GetErrorString(ret);
-    return Py_BuildValue("(i,s)", ret, errorString);
+#endif
+    return acquired;
 }
 
-static PyObject * GetRuntimeSettings(PyObject *obj, PyObject *args)
+/**
+ * Wait for resultReady with the GIL released. A negative timeout waits until a result arrives or video mode stops.
+ */
+static int WaitVideoResult(DynamsoftBarcodeReader *self, double timeout)
 {
-    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-
-    PublicRuntimeSettings settings;
-    int errorCode = DBR_GetRuntimeSettings(self->hBarcode, &settings);
-
-    PyObject * pySettings = CreatePyRuntimeSettings(settings);
-	
-    return pySettings;
+    return AcquireLockTimed(self->resultReady, timeout);
 }
 
-static PyObject * UpdataRuntimeSettings(PyObject *obj, PyObject *args)
+/**
+ * Make frameDecoded available or take it back. Called with resultMutex held.
+ */
+static void SetFrameDecoded(DynamsoftBarcodeReader *self, int signalled)
 {
-    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-    PyObject *pyParameters;
-    if (!PyArg_ParseTuple(args, "O", &pyParameters))
-    {
-		Py_RETURN_NONE;
-    }
-    
-    PublicRuntimeSettings settings = CreateCRuntimeSettings(pyParameters);
-    char szErrorMsgBuffer[256];
-    int errorCode = DBR_UpdateRuntimeSettings(self->hBarcode, &settings, szErrorMsgBuffer, 256);
-	return Py_BuildValue("(i,s)", errorCode, szErrorMsgBuffer);
+    if (signalled && !self->frameDecodedSignalled)
+        PyThread_release_lock(self->frameDecoded);
+    else if (!signalled && self->frameDecodedSignalled)
+        PyThread_acquire_lock(self->frameDecoded, NOWAIT_LOCK);
+    self->frameDecodedSignalled = signalled;
 }
 
-static PyObject * ResetRuntimeSettings(PyObject *obj, PyObject *args)
+/**
+ * Wake WaitFrameQueue. The SDK calls the result or the error callback once for every decoded frame.
+ */
+static void SignalFrameDecoded(DynamsoftBarcodeReader *self)
 {
-    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-
-    DBR_ResetRuntimeSettings(self->hBarcode);
+    PyThread_acquire_lock(self->resultMutex, WAIT_LOCK);
+    SetFrameDecoded(self, 1);
+    PyThread_release_lock(self->resultMutex);
+}
 
-	Py_RETURN_NONE;
+/**
+ * Video result filter
+ *
+ * The filter runs on the video mode thread before the GIL is taken. It follows the barcodes across frames and turns
+ * the results into events: a barcode appeared, is still present (at most once per repeat interval) or disappeared
+ * (not seen for the time-to-live). A frame without event is freed at once and never reaches Python.
+ */
+static void ClearTrackedBarcodes(DynamsoftBarcodeReader *self)
+{
+    for (int i = 0; i < self->trackedCount; ++i)
+        free(self->trackedBarcodes[i].bytes);
+    self->trackedCount = 0;
 }
 
-static PyObject * SetModeArgument(PyObject *obj, PyObject *args)
+static void GetResultCentre(const TextResult *pResult, int *x, int *y)
 {
-    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-    char * pModesName;
-    int index;
-    char * pArgumentName;
-    char * pArgumentValue;
-    if (!PyArg_ParseTuple(args, "siss", &pModesName, &index, &pArgumentName, &pArgumentValue))
+    const LocalizationResult *pLocalization = pResult->localizationResult;
+    *x = *y = 0;
+    if (pLocalization != NULL)
     {
-		Py_RETURN_NONE;
+        *x = (pLocalization->x1 + pLocalization->x2 + pLocalization->x3 + pLocalization->x4) / 4;
+        *y = (pLocalization->y1 + pLocalization->y2 + pLocalization->y3 + pLocalization->y4) / 4;
     }
-    char szErrorMsgBuffer[256];
-    int errorCode = DBR_SetModeArgument(self->hBarcode, pModesName, index, pArgumentName, pArgumentValue, szErrorMsgBuffer, 256);
-    return Py_BuildValue("(i,s)", errorCode, szErrorMsgBuffer);
 }
 
-static PyObject * GetModeArgument(PyObject *obj, PyObject *args)
+static TrackedBarcode * FindTrackedBarcode(DynamsoftBarcodeReader *self, const TextResult *pResult, int x, int y)
 {
-    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-    char * pModesName;
-    int index;
-    char * pArgumentName;
-    if (!PyArg_ParseTuple(args, "sis", &pModesName, &index, &pArgumentName))
+    for (int i = 0; i < self->trackedCount; ++i)
     {
-		Py_RETURN_NONE;
+        TrackedBarcode *pBarcode = &self->trackedBarcodes[i];
+        // A barcode matches one result per frame, so two equal codes side by side stay apart
+        if (pBarcode->seenFrame == self->filterFrame || pBarcode->format != pResult->barcodeFormat || pBarcode->format2 != pResult->barcodeFormat_2 ||
+            pBarcode->bytesLength != pResult->barcodeBytesLength ||
+            (pBarcode->bytesLength != 0 && memcmp(pBarcode->bytes, pResult->barcodeBytes, pBarcode->bytesLength) != 0))
+            continue;
+        if (self->activeTolerance < 0 || (abs(pBarcode->x - x) <= self->activeTolerance && abs(pBarcode->y - y) <= self->activeTolerance))
+            return pBarcode;
     }
-    char szErrorMsgBuffer[256];
-    char pArgumentValue[512];
-    int errorCode = DBR_GetModeArgument(self->hBarcode, pModesName, index, pArgumentName, pArgumentValue, 512, szErrorMsgBuffer, 256);
-    if(errorCode != 0)
+    return NULL;
+}
+
+static TrackedBarcode * AddTrackedBarcode(DynamsoftBarcodeReader *self, const TextResult *pResult)
+{
+    if (self->trackedCount == self->trackedCapacity)
     {
-		return Py_BuildValue("(i,s)", errorCode, szErrorMsgBuffer);
+        int capacity = self->trackedCapacity > 0 ? self->trackedCapacity * 2 : 16;
+        TrackedBarcode *trackedBarcodes = (TrackedBarcode *)realloc(self->trackedBarcodes, capacity * sizeof(TrackedBarcode));
+        if (trackedBarcodes == NULL)
+            return NULL;
+        self->trackedBarcodes = trackedBarcodes;
+        self->trackedCapacity = capacity;
     }
-    else
+    TrackedBarcode *pBarcode = &self->trackedBarcodes[self->trackedCount];
+    memset(pBarcode, 0, sizeof(TrackedBarcode));
+    if (pResult->barcodeBytesLength > 0)
     {
-		return Py_BuildValue("s", pArgumentValue);
+        pBarcode->bytes = (unsigned char *)malloc(pResult->barcodeBytesLength);
+        if (pBarcode->bytes == NULL)
+            return NULL;
+        memcpy(pBarcode->bytes, pResult->barcodeBytes, pResult->barcodeBytesLength);
     }
+    pBarcode->format = pResult->barcodeFormat;
+    pBarcode->format2 = pResult->barcodeFormat_2;
+    pBarcode->bytesLength = pResult->barcodeBytesLength;
+    self->trackedCount++;
+    return pBarcode;
 }
 
-static PyObject * GetAllTextResults(PyObject *obj, PyObject *args)
-{
-	DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-
-	TextResultArray *pResults = NULL;
-	DBR_GetAllTextResults(self->hBarcode, &pResults);
-
-	if (pResults == NULL || pResults->resultsCount == 0)
-	{
-		Py_RETURN_NONE;
-	}
-	else
-	{
-		PyObject * pyTextResults = CreatePyTextResults(pResults);
-		DBR_FreeTextResults(&pResults);
-		if(pyTextResults == NULL)
-		{
-			Py_RETURN_NONE;
-		}
-		else
-		{
-			return pyTextResults;
-		}
-	}
-}
-
-static PyObject * GetAllIntermediateResults(PyObject *obj, PyObject *args)
-{
-	DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-
-	IntermediateResultArray * pIResults = NULL;
-	DBR_GetIntermediateResults(self->hBarcode, &pIResults);
-
-	if (pIResults == NULL || pIResults->resultsCount == 0)
-		Py_RETURN_NONE;
-	else
-	{
-		PyObject * pyIntermediateResults = CreatePyIntermediateResults(pIResults);
-		DBR_FreeIntermediateResults(&pIResults);
-		if (pyIntermediateResults == NULL)
-		{
-			Py_RETURN_NONE;
-		}
-		else
-		{
-			return pyIntermediateResults;
-		}
-	}
-}
-
-static PyObject * DecodeFile(PyObject *obj, PyObject *args)
+/**
+ * Match the results of a frame against the followed barcodes. pResults may be NULL to only look for disappeared
+ * barcodes, and flush reports every followed barcode as disappeared.
+ *
+ * @return Returns the number of events stored in *pEvents, or -1 if memory runs out.
+ */
+static int FilterVideoResults(DynamsoftBarcodeReader *self, int frameId, const TextResultArray *pResults, int flush, VideoEvent **pEvents)
 {
-    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+    int resultCount = pResults != NULL ? pResults->resultsCount : 0;
+    int eventCount = 0;
+    long long now = MonotonicMilliseconds();
+    *pEvents = NULL;
+    if (resultCount + self->trackedCount == 0)
+        return 0;
+
+    VideoEvent *events = (VideoEvent *)malloc((resultCount + self->trackedCount) * sizeof(VideoEvent));
+    if (events == NULL)
+        return -1;
+
+    self->filterFrame++;
+    self->filterLastFrameId = frameId;
+    for (int i = 0; i < resultCount; ++i)
+    {
+        const TextResult *pResult = pResults->results[i];
+        int x, y;
+        GetResultCentre(pResult, &x, &y);
+        int type = VIDEO_EVENT_PRESENT;
+        TrackedBarcode *pBarcode = FindTrackedBarcode(self, pResult, x, y);
+        if (pBarcode == NULL)
+        {
+            pBarcode = AddTrackedBarcode(self, pResult);
+            if (pBarcode == NULL)
+            {
+                FreeVideoEvents(events, eventCount);
+                return -1;
+            }
+            type = VIDEO_EVENT_APPEARED;
+            pBarcode->firstSeen = now;
+        }
+        pBarcode->x = x;
+        pBarcode->y = y;
+        pBarcode->lastSeen = now;
+        pBarcode->seenCount++;
+        pBarcode->seenFrame = self->filterFrame;
+        if (type == VIDEO_EVENT_APPEARED || (self->activeRepeatInterval >= 0 && now - pBarcode->lastReported >= self->activeRepeatInterval))
+        {
+            pBarcode->lastReported = now;
+            events[eventCount].type = type;
+            events[eventCount].resultIndex = i;
+            events[eventCount].barcode = *pBarcode;
+            events[eventCount].barcode.bytes = NULL;
+            eventCount++;
+        }
+    }
 
-    char *pFileName; // File name
-    char *templateName = NULL;
-    if (!PyArg_ParseTuple(args, "ss", &pFileName, &templateName))
+    for (int i = self->trackedCount - 1; i >= 0; --i)
     {
-		Py_RETURN_NONE;
+        TrackedBarcode *pBarcode = &self->trackedBarcodes[i];
+        if (!flush && (pBarcode->seenFrame == self->filterFrame || now - pBarcode->lastSeen <= self->activeTimeToLive))
+            continue;
+        // The event takes over the bytes
+        events[eventCount].type = VIDEO_EVENT_DISAPPEARED;
+        events[eventCount].resultIndex = -1;
+        events[eventCount].barcode = *pBarcode;
+        eventCount++;
+        self->trackedBarcodes[i] = self->trackedBarcodes[--self->trackedCount];
     }
 
-    if(templateName == NULL)
+    if (eventCount == 0)
     {
-        templateName = "";
+        free(events);
+        return 0;
     }
-
-    // Barcode detection
-
-    int ret = DBR_DecodeFile(self->hBarcode, pFileName, templateName);
-	return Py_BuildValue("i", ret);
+    *pEvents = events;
+    return eventCount;
 }
 
-static PyObject * DecodeBuffer(PyObject *obj, PyObject *args)
+/**
+ * Create the list of (event, text result, barcode format, barcode bytes, x, y, seen count, seconds seen) of the events
+ * and take over pResults and events. A disappeared barcode has no text result.
+ */
+static PyObject * CreatePyVideoEvents(TextResultArray *pResults, VideoEvent *events, int eventCount, int lazy)
 {
-    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-
-    PyObject *o;
-    char *templateName = NULL;
-    int width, height, stride;
-    int imagePixelFormat = IPF_RGB_888;
-    if (!PyArg_ParseTuple(args, "Oiiiis", &o, &height, &width, &stride, &imagePixelFormat, &templateName))
-		Py_RETURN_NONE;
-
-#if defined(IS_PY3K)
-    //Refer to numpy/core/src/multiarray/ctors.c
-    Py_buffer *view;
-    // int nd;
-    PyObject *memoryview = PyMemoryView_FromObject(o);
-    if (memoryview == NULL)
+    PyObject *owner = NULL;
+    if (lazy && pResults != NULL)
     {
-        PyErr_Clear();
-		Py_RETURN_NONE;
+        owner = PyCapsule_New(pResults, TEXT_RESULT_ARRAY_CAPSULE, FreeTextResultArray);
+        if (owner == NULL)
+        {
+            DBR_FreeTextResults(&pResults);
+            FreeVideoEvents(events, eventCount);
+            return NULL;
+        }
     }
 
-    view = PyMemoryView_GET_BUFFER(memoryview);
-    char *buffer = (char *)(view->buf);
-
-#else
+    PyObject *pyEvents = PyList_New(eventCount);
+    for (int i = 0; pyEvents != NULL && i < eventCount; i++)
+    {
+        const VideoEvent *pEvent = &events[i];
+        const unsigned char *bytes = pEvent->barcode.bytes;
+        PyObject *pyTextResult;
+        if (pEvent->resultIndex >= 0)
+        {
+            const TextResult *pResult = pResults->results[pEvent->resultIndex];
+            bytes = pResult->barcodeBytes;
+            pyTextResult = CreateResult(&TextResultType, pResult, owner);
+        }
+        else
+        {
+            pyTextResult = NewNone();
+        }
+        PyObject *pyEvent = pyTextResult != NULL ? Py_BuildValue("(iNiNiiid)", pEvent->type, pyTextResult, pEvent->barcode.format,
+            ByteArrayOrNone(pEvent->barcode.bytesLength != 0 ? bytes : NULL, pEvent->barcode.bytesLength),
+            pEvent->barcode.x, pEvent->barcode.y, pEvent->barcode.seenCount, (pEvent->barcode.lastSeen - pEvent->barcode.firstSeen) / 1000.0) : NULL;
+        if (pyEvent == NULL)
+        {
+            Py_CLEAR(pyEvents);
+            break;
+        }
+        PyList_SET_ITEM(pyEvents, i, pyEvent);
+    }
 
-    PyObject *ao = PyObject_GetAttrString(o, "__array_struct__");
+    // Release memory
+    if (owner != NULL)
+    {
+        Py_DECREF(owner);
+    }
+    else if (pResults != NULL)
+    {
+        DBR_FreeTextResults(&pResults);
+    }
+    FreeVideoEvents(events, eventCount);
+    return pyEvents;
+}
 
-    if ((ao == NULL) || !PyCObject_Check(ao))
+/**
+ * Call the video mode callback with the GIL held. It gets the filter events instead of the text results when the filter is on.
+ */
+static void CallVideoCallback(DynamsoftBarcodeReader *self, VideoResult *pResult)
+{
+    // The results take over pResults
+    PyObject * pyResults = pResult->eventCount >= 0 ? CreatePyVideoEvents(pResult->pResults, pResult->events, pResult->eventCount, self->lazyResults)
+                                                    : CreatePyTextResults(pResult->pResults, self->lazyResults);
+    if(pyResults != NULL)
     {
-        PyErr_SetString(PyExc_TypeError, "object does not have array interface");
-		Py_RETURN_NONE;
+        PyObject * result = PyObject_CallFunction(self->py_callback, "O", pyResults);
+        Py_DECREF(pyResults);
+        if (result != NULL)
+            Py_DECREF(result);
+        else
+            PyErr_Print();
+    }
+    else
+    {
+        PyErr_Print();
     }
+}
 
-    PyArrayInterface *pai = (PyArrayInterface *)PyCObject_AsVoidPtr(ao);
+void OnResultCallback(int frameId, TextResultArray *pResults, void *pUser)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)pUser;
+    VideoResult result = {frameId, pResults, NULL, -1};
+    SignalFrameDecoded(self);
+    if (self->filterActive)
+    {
+        result.eventCount = FilterVideoResults(self, frameId, pResults, 0, &result.events);
+        // Nothing new in this frame, or no memory to follow the barcodes
+        if (result.eventCount <= 0)
+        {
+            if (pResults != NULL)
+                DBR_FreeTextResults(&pResults);
+            return;
+        }
+    }
 
-    if (pai->two != 2)
+    if (self->py_callback == NULL)
     {
-        PyErr_SetString(PyExc_TypeError, "object does not have array interface");
-        Py_DECREF(ao);
-		Py_RETURN_NONE;
+        PushVideoResult(self, &result);
+        return;
     }
 
-    // Get image information
-    char *buffer = (char *)pai->data;  // The address of image data
+    // https://docs.python.org/2/c-api/init.html
+    PyGILState_STATE gstate;
+    gstate = PyGILState_Ensure();
+    self->callbackThread = (long)PyThread_get_thread_ident();
+    CallVideoCallback(self, &result);
+    PyGILState_Release(gstate);
+}
 
-#endif
+/**
+ * The SDK reports the frames without results here, which is where most barcodes disappear.
+ */
+void OnErrorCallback(int frameId, int errorCode, void *pUser)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)pUser;
+    if (self->filterActive)
+        OnResultCallback(frameId, NULL, pUser);
+    else
+        SignalFrameDecoded(self);
+}
 
-    // Initialize Dynamsoft Barcode Reader
+/**
+ * Report every followed barcode as disappeared once the video mode thread has stopped. The GIL must be held.
+ */
+static void FlushVideoResultFilter(DynamsoftBarcodeReader *self)
+{
+    if (!self->filterActive)
+        return;
+    self->filterActive = 0;
 
-    if(templateName == NULL)
+    VideoResult result = {self->filterLastFrameId, NULL, NULL, -1};
+    result.eventCount = FilterVideoResults(self, self->filterLastFrameId, NULL, 1, &result.events);
+    if (result.eventCount <= 0)
     {
-        templateName = "";
+        ClearTrackedBarcodes(self);
+        return;
     }
-    int ret = DBR_DecodeBuffer(self->hBarcode, buffer, width, height, stride, imagePixelFormat, templateName);
-#if defined(IS_PY3K)
-	Py_DECREF(memoryview);
-#else
-	Py_DECREF(ao);
-#endif
-	return Py_BuildValue("i", ret);
+    if (self->py_callback == NULL)
+        PushVideoResult(self, &result);
+    else
+        CallVideoCallback(self, &result);
 }
 
-static PyObject * DecodeFileStream(PyObject *obj, PyObject *args)
+/**
+ * Set the video result filter used from the next StartVideoMode.
+ *
+ * @param [in] enabled Int Whether to report filter events instead of the results of every frame.
+ * @param [in] timeToLive Int The milliseconds a barcode is not seen before it is reported as disappeared.
+ * @param [in] repeatInterval Int The milliseconds between two reports of a present barcode, negative to report it only when it appears.
+ * @param [in] tolerance Int The pixels the centre of a barcode may move between two sightings, negative to ignore the position.
+ */
+static PyObject * SetVideoResultFilter(PyObject *obj, PyObject *args)
 {
     DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
 
-    PyObject *op; 
-    int fileSize;
-    char *templateName = NULL;
-    if (!PyArg_ParseTuple(args, "Ois", &op, &fileSize, &templateName))
-    {
-		Py_RETURN_NONE;
-    }
+    int enabled, timeToLive, repeatInterval, tolerance;
+    if (!PyArg_ParseTuple(args, "iiii", &enabled, &timeToLive, &repeatInterval, &tolerance))
+        return NULL;
 
-    // https://docs.python.org/2/c-api/bytearray.html
-    char *filestream = PyByteArray_AsString(op);
-    if(templateName == NULL)
+    PyThread_acquire_lock(self->resultMutex, WAIT_LOCK);
+    self->filterEnabled = enabled;
+    self->filterTimeToLive = timeToLive;
+    self->filterRepeatInterval = repeatInterval;
+    self->filterTolerance = tolerance;
+    PyThread_release_lock(self->resultMutex);
+    Py_RETURN_NONE;
+}
+
+/**
+ * Release every pinned frame. Video mode must be stopped.
+ */
+static void ReleasePinnedFrames(DynamsoftBarcodeReader *self)
+{
+    for (int i = 0; i < self->pinnedCapacity; ++i)
     {
-        templateName = "";
+        if (self->pinnedFrames[i].obj != NULL)
+            PyBuffer_Release(&self->pinnedFrames[i]);
     }
-    // Barcode detection
-    int ret = DBR_DecodeFileInMemory(self->hBarcode, filestream, fileSize, templateName);
-	return Py_BuildValue("i", ret);
+    self->pinnedNext = 0;
 }
 
-static PyObject * GetLengthOfFrameQueue(PyObject *obj, PyObject *args)
+/**
+ * Release the pinned frames and size the ring for a new video mode.
+ */
+static int ResetPinnedFrames(DynamsoftBarcodeReader *self, int capacity)
 {
-	DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-
-	int length = DBR_GetLengthOfFrameQueue(self->hBarcode);
-	return Py_BuildValue("i", length);
+    ReleasePinnedFrames(self);
+    if (capacity != self->pinnedCapacity)
+    {
+        Py_buffer *pinnedFrames = (Py_buffer *)calloc(capacity, sizeof(Py_buffer));
+        if (pinnedFrames == NULL)
+            return -1;
+        free(self->pinnedFrames);
+        self->pinnedFrames = pinnedFrames;
+        self->pinnedCapacity = capacity;
+    }
+    return 0;
 }
 
-void OnResultCallback(int frameId, TextResultArray *pResults, void *pUser)
+/**
+ * Keep the buffer of an appended frame and release the frame appended capacity frames before it.
+ */
+static void PinFrame(DynamsoftBarcodeReader *self, Py_buffer *view)
 {
-    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)pUser;
-    // Get barcode results
-    int count = pResults->resultsCount;
-    int i = 0;
-
-    // https://docs.python.org/2/c-api/init.html
-    PyGILState_STATE gstate;
-    gstate = PyGILState_Ensure();
-
-    PyObject * pyTextResults = CreatePyTextResults(pResults);
-    if(pyTextResults != NULL)
+    if (self->pinnedCapacity == 0)
     {
-        PyObject * result = PyObject_CallFunction(self->py_callback, "O", pyTextResults);
-        Py_DECREF(pyTextResults);
-        if (result != NULL)
-            Py_DECREF(result);
+        PyBuffer_Release(view);
+        return;
     }
-
-    PyGILState_Release(gstate);
-    /////////////////////////////////////////////
-
-    // Release memory
-    DBR_FreeTextResults(&pResults);
+    Py_buffer *slot = &self->pinnedFrames[self->pinnedNext];
+    if (slot->obj != NULL)
+        PyBuffer_Release(slot);
+    *slot = *view;
+    self->pinnedNext = (self->pinnedNext + 1) % self->pinnedCapacity;
 }
 
 static PyObject * InitFrameDecodingParameters(PyObject *obj, PyObject *args)
@@ -2742,50 +3858,104 @@ static PyObject * StartVideoMode(PyObject *obj, PyObject *args)
     PyObject *pyParameters = NULL;
     PyObject *callback = NULL;
     char * templateName = NULL;
-    if (!PyArg_ParseTuple(args, "OOs",&pyParameters, &callback, &templateName))
+    int lazy = 0;
+    if (!PyArg_ParseTuple(args, "OOs|i",&pyParameters, &callback, &templateName, &lazy))
     {
-		Py_RETURN_NONE;
+        return NULL;
     }
 
     if(!PyDict_Check(pyParameters))
     {
-        printf("the first parameter should be a dictionary.");
-		Py_RETURN_NONE;
+        PyErr_SetString(PyExc_TypeError, "the first parameter should be a dictionary");
+        return NULL;
     }
-    if (!PyCallable_Check(callback))
+    if (callback != Py_None && !PyCallable_Check(callback))
     {
         PyErr_SetString(PyExc_TypeError, "parameter must be callable");
-		Py_RETURN_NONE;
+        return NULL;
+    }
+    // A running video mode is left alone, its queues and pinned frames are still in use. The flag is taken with
+    // the GIL held, so a second start waiting for the handle lock below can not get past it.
+    if (self->videoRunning)
+    {
+        return Py_BuildValue("i", DBRERR_FRAME_DECODING_THREAD_EXISTS);
+    }
+    self->videoRunning = 1;
+
+    FrameDecodingParameters parameters = CreateCFrameDecodingParameters(pyParameters);
+    // Without a callback the results go to the queue, which holds as many results as the SDK would.
+    // Results left by the last video mode are dropped either way.
+    // The SDK reads at most the queued frames and the one being decoded, plus one is being appended.
+    if (ResetVideoResults(self, parameters.maxResultQueueLength) < 0 ||
+        ResetPinnedFrames(self, (parameters.maxQueueLength > 0 ? parameters.maxQueueLength : 1) + 2) < 0)
+    {
+        self->videoRunning = 0;
+        return PyErr_NoMemory();
+    }
+    if (callback == Py_None)
+    {
+        Py_CLEAR(self->py_callback);
     }
     else
     {
+        CloseVideoResults(self);
         Py_XINCREF(callback);    /* Add a reference to new callback */
         Py_XDECREF(self->py_callback); /* Dispose of previous callback */
         self->py_callback = callback;
     }
 
     DBR_SetTextResultCallback(self->hBarcode, OnResultCallback, self);
-    FrameDecodingParameters parameters = CreateCFrameDecodingParameters(pyParameters);
+    DBR_SetErrorCallback(self->hBarcode, OnErrorCallback, self);
     // Py_DECREF(pyParameters);
+    self->frameWidth = parameters.width;
+    self->frameHeight = parameters.height;
+    self->frameStride = parameters.stride;
+    self->lazyResults = lazy;
+    // The barcodes of the last video mode are forgotten without events
+    ClearTrackedBarcodes(self);
+    PyThread_acquire_lock(self->resultMutex, WAIT_LOCK);
+    self->filterActive = self->filterEnabled;
+    self->activeTimeToLive = self->filterTimeToLive;
+    self->activeRepeatInterval = self->filterRepeatInterval;
+    self->activeTolerance = self->filterTolerance;
+    PyThread_release_lock(self->resultMutex);
     if(templateName == NULL)
     {
         templateName = "";
     }
+    LockHandle(self);
     int ret = DBR_StartFrameDecodingEx(self->hBarcode, parameters, templateName);
+    self->videoRunning = ret == DBR_OK;
+    UnlockHandle(self);
     return Py_BuildValue("i", ret);
 }
 
 static PyObject * StopVideoMode(PyObject *obj, PyObject *args)
 {
     DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
-    printf("Stop the video mode\n");
-    if (self->hBarcode)
+    if (!self->hBarcode)
     {
-        int ret = DBR_StopFrameDecoding(self->hBarcode);
-        return Py_BuildValue("i", ret);
+        PyErr_SetString(PyExc_RuntimeError, "the barcode reader has no native instance");
+        return NULL;
     }
 
-    return 0;
+    // Stopping joins the decoding thread, whose result callback needs the GIL and may call into the reader.
+    // The GIL is released while waiting, and the handle lock is lent to the decoding thread.
+    int ret;
+    LockHandle(self);
+    self->lockLent = 1;
+    Py_BEGIN_ALLOW_THREADS
+    ret = DBR_StopFrameDecoding(self->hBarcode);
+    Py_END_ALLOW_THREADS
+    self->lockLent = 0;
+    // The decoding thread has ended, its id may be reused
+    self->callbackThread = 0;
+    self->videoRunning = 0;
+    UnlockHandle(self);
+    FlushVideoResultFilter(self);
+    CloseVideoResults(self);
+    ReleasePinnedFrames(self);
+    return Py_BuildValue("i", ret);
 }
 
 static PyObject * AppendVideoFrame(PyObject *obj, PyObject *args)
@@ -2796,47 +3966,120 @@ static PyObject * AppendVideoFrame(PyObject *obj, PyObject *args)
     if (!PyArg_ParseTuple(args, "O", &o))
 		Py_RETURN_NONE;
 
-#if defined(IS_PY3K)
-    //Refer to numpy/core/src/multiarray/ctors.c
-    Py_buffer *view;
-    PyObject *memoryview = PyMemoryView_FromObject(o);
-    if (memoryview == NULL)
+    Py_buffer view;
+    int width, height, stride;
+    int imagePixelFormat = -1;
+    if (GetImageBuffer(o, &view, &width, &height, &stride, &imagePixelFormat) < 0)
+        return NULL;
+
+    // The frame queue reads frames with the layout given to StartVideoMode
+    if (width != self->frameWidth || height != self->frameHeight || stride != self->frameStride)
     {
-        PyErr_Clear();
-		Py_RETURN_NONE;
+        PyErr_Format(PyExc_ValueError, "the frame is %dx%d with stride %d, but video mode was started with %dx%d and stride %d",
+                     width, height, stride, self->frameWidth, self->frameHeight, self->frameStride);
+        PyBuffer_Release(&view);
+        return NULL;
     }
 
-    view = PyMemoryView_GET_BUFFER(memoryview);
-    unsigned char *buffer = (unsigned char *)view->buf;
-    Py_DECREF(memoryview);
+    // The SDK may still read the frame after this call returns, so its buffer stays pinned
+    int frameId;
+    LockHandle(self);
+    frameId = DBR_AppendFrame(self->hBarcode, (unsigned char *)view.buf);
+    UnlockHandle(self);
+    PinFrame(self, &view);
+    return Py_BuildValue("i",frameId);
+}
 
-#else
+/**
+ * Get the results of the oldest queued frame of video mode without a callback.
+ *
+ * @param [in] timeout Float The seconds to wait for a result. Negative waits until a result arrives or video mode stops.
+ * @return Returns (frame id, list of text results), None if no result arrived in time, or (-1, None) once video mode has stopped and the queue is empty.
+ *         With the video result filter on, the list holds the events of the frame, see CreatePyVideoEvents.
+ *         (-1, None) is also returned if video mode without a callback has never been started.
+ */
+static PyObject * GetVideoResults(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
 
-    PyObject *ao = PyObject_GetAttrString(o, "__array_struct__");
+    double timeout = 0;
+    if (!PyArg_ParseTuple(args, "|d", &timeout))
+        return NULL;
 
-    if ((ao == NULL) || !PyCObject_Check(ao))
-    {
-        PyErr_SetString(PyExc_TypeError, "object does not have array interface");
-		Py_RETURN_NONE;
-    }
+    // Video mode without a callback has never been started, so no result will come
+    if (self->resultCapacity == 0)
+        return Py_BuildValue("(iO)", -1, Py_None);
+    if (!WaitVideoResult(self, timeout))
+        Py_RETURN_NONE;
 
-    PyArrayInterface *pai = (PyArrayInterface *)PyCObject_AsVoidPtr(ao);
+    VideoResult result;
+    if (!PopVideoResult(self, &result))
+        return Py_BuildValue("(iO)", -1, Py_None);
 
-    if (pai->two != 2)
-    {
-        PyErr_SetString(PyExc_TypeError, "object does not have array interface");
-        Py_DECREF(ao);
-		Py_RETURN_NONE;
-    }
+    PyObject *pyTextResults = result.eventCount >= 0 ? CreatePyVideoEvents(result.pResults, result.events, result.eventCount, self->lazyResults)
+                                                     : CreatePyTextResults(result.pResults, self->lazyResults);
+    if (pyTextResults == NULL)
+        return NULL;
+    return Py_BuildValue("(iN)", result.frameId, pyTextResults);
+}
 
-    // Get image information
-    unsigned char *buffer = (unsigned char *)pai->data; // The address of image data
-    Py_DECREF(ao);
+/**
+ * Wait until the frame queue of video mode is shorter than a length. The queue is checked again whenever the video mode
+ * thread has decoded a frame, so a full queue is waited for without polling.
+ *
+ * @param [in] length Int The queue length to get below.
+ * @param [in] timeout Float The seconds to wait for a decoded frame. Negative waits until a frame is decoded.
+ * @return Returns True if the frame queue is shorter than length, False if it is still not after the timeout.
+ */
+static PyObject * WaitFrameQueue(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
 
-#endif
+    int length;
+    double timeout = -1;
+    if (!PyArg_ParseTuple(args, "i|d", &length, &timeout))
+        return NULL;
 
-    int frameId = DBR_AppendFrame(self->hBarcode, buffer);
-    return Py_BuildValue("i",frameId);
+    // Forget the frames decoded so far before reading the queue, so a frame decoded after the read still wakes the wait
+    PyThread_acquire_lock(self->resultMutex, WAIT_LOCK);
+    SetFrameDecoded(self, 0);
+    PyThread_release_lock(self->resultMutex);
+
+    LockHandle(self);
+    int queueLength = DBR_GetLengthOfFrameQueue(self->hBarcode);
+    UnlockHandle(self);
+    if (queueLength < length)
+        Py_RETURN_TRUE;
+
+    if (!AcquireLockTimed(self->frameDecoded, timeout))
+        Py_RETURN_FALSE;
+    PyThread_acquire_lock(self->resultMutex, WAIT_LOCK);
+    self->frameDecodedSignalled = 0;
+    PyThread_release_lock(self->resultMutex);
+
+    LockHandle(self);
+    queueLength = DBR_GetLengthOfFrameQueue(self->hBarcode);
+    UnlockHandle(self);
+    return PyBool_FromLong(queueLength < length);
+}
+
+/**
+ * @return Returns (number of queued results, number of results dropped because the queue was full) for the current video mode.
+ */
+static PyObject * GetVideoResultQueueState(PyObject *obj, PyObject *args)
+{
+    DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
+
+    int count = 0;
+    Py_ssize_t dropped = 0;
+    if (self->resultCapacity != 0)
+    {
+        PyThread_acquire_lock(self->resultMutex, WAIT_LOCK);
+        count = self->resultCount;
+        dropped = self->droppedResults;
+        PyThread_release_lock(self->resultMutex);
+    }
+    return Py_BuildValue("(in)", count, dropped);
 }
 
 static PyObject * InitLicenseFromLicenseContent(PyObject *obj, PyObject *args)
@@ -2850,7 +4093,9 @@ static PyObject * InitLicenseFromLicenseContent(PyObject *obj, PyObject *args)
 		Py_RETURN_NONE;
     }
 
+    LockHandle(self);
     int ret = DBR_InitLicenseFromLicenseContent(self->hBarcode, pszLicenseKey, pszLicenseContent);
+    UnlockHandle(self);
 	const char* errorString = DBR_GetErrorString(ret);
 	return Py_BuildValue("(i,s)", ret, errorString);
 }
@@ -2860,7 +4105,9 @@ static PyObject * OutputLicenseToString(PyObject *obj, PyObject *args)
     DynamsoftBarcodeReader *self = (DynamsoftBarcodeReader *)obj;
 
     char* content = NULL;
+    LockHandle(self);
     int ret = DBR_OutputLicenseToStringPtr(self->hBarcode, &content);
+    UnlockHandle(self);
     if (ret)
     {
         return Py_BuildValue("i", ret);
@@ -2883,7 +4130,9 @@ static PyObject * InitLicenseFromServer(PyObject *obj, PyObject *args)
 		Py_RETURN_NONE;
     }
 
+    LockHandle(self);
     int ret = DBR_InitLicenseFromServer(self->hBarcode, pLicenseServer, pszLicenseKey);
+    UnlockHandle(self);
 	const char* errorString = DBR_GetErrorString(ret);
 	return Py_BuildValue("(i,s)", ret, errorString);
 }
@@ -2900,7 +4149,10 @@ static PyObject * InitRuntimeSettingsByJsonString(PyObject *obj, PyObject *args)
     }
 
     char errorMessage[512];
+    LockHandle(self);
     int ret = DBR_InitRuntimeSettingsWithString(self->hBarcode, json, conflictMode, errorMessage, 512);
+    self->settingsCached = 0;
+    UnlockHandle(self);
     return Py_BuildValue("(i,s)", ret, errorMessage);
 }
 
@@ -2916,7 +4168,10 @@ static PyObject * InitRuntimeSettingsByJsonFile(PyObject *obj, PyObject *args)
     }
 
     char errorMessage[512];
+    LockHandle(self);
     int ret = DBR_InitRuntimeSettingsWithFile(self->hBarcode, jsonPath, conflictMode, errorMessage, 512);
+    self->settingsCached = 0;
+    UnlockHandle(self);
 	return Py_BuildValue("(i,s)", ret, errorMessage);
 }
 
@@ -2926,7 +4181,9 @@ static PyObject * OutputSettingsToJsonString(PyObject *obj, PyObject *args)
 
     char * pContent = NULL;
 
+    LockHandle(self);
     int ret = DBR_OutputSettingsToStringPtr(self->hBarcode, &pContent, "CurrentRuntimeSettings");
+    UnlockHandle(self);
     PyObject * content = Py_BuildValue("s", pContent);
     DBR_FreeSettingsString(&pContent);
     return content;
@@ -2942,7 +4199,9 @@ static PyObject * OutputSettingsToJsonFile(PyObject *obj, PyObject *args)
 		Py_RETURN_NONE;
     }
 
+    LockHandle(self);
     int ret = DBR_OutputSettingsToFile(self->hBarcode, jsonPath, "CurrentRuntimeSettings");
+    UnlockHandle(self);
 
 	const char* errorString = DBR_GetErrorString(ret);
 	return Py_BuildValue("(i,s)", ret, errorString);
@@ -2960,7 +4219,10 @@ static PyObject * AppendTplFileToRuntimeSettings(PyObject *obj, PyObject *args)
     }
 
     char errorMessage[512];
+    LockHandle(self);
     int ret = DBR_AppendTplFileToRuntimeSettings(self->hBarcode, jsonPath, conflictMode, errorMessage, 512);
+    self->settingsCached = 0;
+    UnlockHandle(self);
 
     return Py_BuildValue("(i,s)", ret, errorMessage);
 }
@@ -2977,7 +4239,10 @@ static PyObject * AppendTplStringToRuntimeSettings(PyObject *obj, PyObject *args
     }
 
     char errorMessage[512];
+    LockHandle(self);
     int ret = DBR_AppendTplStringToRuntimeSettings(self->hBarcode, json, conflictMode, errorMessage, 512);
+    self->settingsCached = 0;
+    UnlockHandle(self);
 
 	return Py_BuildValue("(i,s)", ret, errorMessage);
 }
@@ -3024,14 +4289,20 @@ static PyMethodDef dbr_methods[] = {
 	{"GetDBRVersion",					GetDBRVersion,						METH_VARARGS, NULL},
 	{"GetErrorString",                  GetErrorString,                     METH_VARARGS, NULL},
 	{"GetAllTextResults",               GetAllTextResults,                  METH_VARARGS, NULL},
+	{"GetAllTextResultArrays",          GetAllTextResultArrays,             METH_VARARGS, NULL},
 	{"GetAllIntermediateResults",       GetAllIntermediateResults,          METH_VARARGS, NULL},
 	{"GetLengthOfFrameQueue",			GetLengthOfFrameQueue,				METH_VARARGS, NULL},
     {"InitLicense",                     InitLicense,                        METH_VARARGS, NULL},
     {"DecodeFile",                      DecodeFile,                         METH_VARARGS, NULL},
     {"DecodeBuffer",                    DecodeBuffer,                       METH_VARARGS, NULL},
+    {"DecodeBuffers",                   DecodeBuffers,                      METH_VARARGS, NULL},
     {"StartVideoMode",                  StartVideoMode,                     METH_VARARGS, NULL},
     {"StopVideoMode",                   StopVideoMode,                      METH_VARARGS, NULL},
+    {"SetVideoResultFilter",            SetVideoResultFilter,               METH_VARARGS, NULL},
     {"AppendVideoFrame",                AppendVideoFrame,                   METH_VARARGS, NULL},
+    {"GetVideoResults",                 GetVideoResults,                    METH_VARARGS, NULL},
+    {"GetVideoResultQueueState",        GetVideoResultQueueState,           METH_VARARGS, NULL},
+    {"WaitFrameQueue",                  WaitFrameQueue,                     METH_VARARGS, NULL},
     {"InitLicenseFromLicenseContent",   InitLicenseFromLicenseContent,      METH_VARARGS, NULL},
     {"OutputLicenseToString",           OutputLicenseToString,              METH_VARARGS, NULL},
     {"InitLicenseFromServer",           InitLicenseFromServer,              METH_VARARGS, NULL},
@@ -3060,6 +4331,48 @@ static PyMethodDef module_methods[] =
 static int DynamsoftBarcodeReader_clear(DynamsoftBarcodeReader *self)
 {
     DBR_DestroyInstance(self->hBarcode);
+    if (self->lock)
+    {
+        PyThread_free_lock(self->lock);
+        self->lock = NULL;
+    }
+    if (self->videoResults)
+    {
+        ClearVideoResults(self);
+        free(self->videoResults);
+        self->videoResults = NULL;
+        self->resultCapacity = 0;
+    }
+    if (self->pinnedFrames)
+    {
+        // The native instance is destroyed, nothing reads the frames any more
+        ReleasePinnedFrames(self);
+        free(self->pinnedFrames);
+        self->pinnedFrames = NULL;
+        self->pinnedCapacity = 0;
+    }
+    if (self->trackedBarcodes)
+    {
+        ClearTrackedBarcodes(self);
+        free(self->trackedBarcodes);
+        self->trackedBarcodes = NULL;
+        self->trackedCapacity = 0;
+    }
+    if (self->resultMutex)
+    {
+        PyThread_free_lock(self->resultMutex);
+        self->resultMutex = NULL;
+    }
+    if (self->resultReady)
+    {
+        PyThread_free_lock(self->resultReady);
+        self->resultReady = NULL;
+    }
+    if (self->frameDecoded)
+    {
+        PyThread_free_lock(self->frameDecoded);
+        self->frameDecoded = NULL;
+    }
     return 0;
 }
 
@@ -3089,6 +4402,20 @@ static PyObject * DynamsoftBarcodeReader_new(PyTypeObject *type, PyObject *args,
             printf("Cannot allocate memory!\n");
             return NULL;
         }
+
+        self->lock = PyThread_allocate_lock();
+        self->resultMutex = PyThread_allocate_lock();
+        self->resultReady = PyThread_allocate_lock();
+        self->frameDecoded = PyThread_allocate_lock();
+        if (!self->lock || !self->resultMutex || !self->resultReady || !self->frameDecoded)
+        {
+            // dealloc destroys the native instance
+            Py_DECREF(self);
+            return PyErr_NoMemory();
+        }
+        // resultReady starts taken, the queue is empty, and so does frameDecoded
+        PyThread_acquire_lock(self->resultReady, WAIT_LOCK);
+        PyThread_acquire_lock(self->frameDecoded, WAIT_LOCK);
     }
 
     return (PyObject *)self;
@@ -3172,6 +4499,12 @@ void initdbr(void)
     if (PyType_Ready(&DynamsoftBarcodeReaderType) < 0)
         INITERROR;
 
+    if (InitResultTypes() < 0)
+        INITERROR;
+
+    if (InitKeys() < 0)
+        INITERROR;
+
 #if defined(IS_PY3K)
     PyObject *module = PyModule_Create(&moduledef);
 #else
@@ -3182,6 +4515,7 @@ void initdbr(void)
 
     Py_INCREF(&DynamsoftBarcodeReaderType);
     PyModule_AddObject(module, "DynamsoftBarcodeReader", (PyObject *)&DynamsoftBarcodeReaderType);
+    AddResultTypes(module);
 #if defined(IS_PY3K)
     return module;
 #endif
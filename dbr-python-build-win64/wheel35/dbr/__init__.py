@@ -1,2 +1,3 @@
 from .dbr import *
 from dbr.dbr_python import *
+from dbr.dbr_async import *
@@ -0,0 +1,368 @@
+# @Version : 7.3
+# @Author : Dynamsoft
+
+''' Offline runtime settings tuner.
+
+    Usage: python -m dbr tune <directory> [--labels FILE] [--license KEY] [--template FILE] [--target-recall R]
+                              [--trials N] [--eta N] [--min-images N] [--space FILE] [--output FILE] [--report FILE]
+
+    The images of a directory are decoded with many configurations of the cost-relevant runtime settings, and the
+    fastest configuration whose recall reaches the target is written as a template JSON string, together with a
+    latency/recall Pareto report.
+
+    The expected barcode texts of an image are read from a labels JSON file {"relative/path.png": ["text", ...]}
+    or from a text file next to the image with the same name and the extension .txt, one text per line.
+    Images without labels are skipped, an empty label file means the image has no barcode.
+
+    The search is successive halving: every configuration is decoded on a small share of the images, the better
+    1/eta of them and the ones on the latency/recall Pareto front are decoded on eta times more images, and so on
+    until the survivors are decoded on all images. All decoding runs on one reader in this process, so that
+    max_algorithm_thread_count is measured without other decodings competing for the CPU.
+'''
+
+import os
+import sys
+import json
+import copy
+import time
+import random
+import argparse
+import collections
+from dbr.dbr_python import BarcodeReader, BarcodeReaderError, EnumErrorCode, EnumLocalizationMode, EnumBinarizationMode, \
+    EnumGrayscaleTransformationMode, EnumImagePreprocessingMode, EnumRegionPredetectionMode, EnumTextFilterMode, \
+    EnumScaleUpMode, EnumDeformationResistingMode, EnumTextureDetectionMode
+from dbr.scan import DEFAULT_EXTENSIONS, iter_image_files, redirect_native_stdout
+
+_timer = getattr(time, "perf_counter", time.time)
+
+# The enumeration of every mode list setting that can be searched
+MODE_ENUMS = {
+    "localization_modes": EnumLocalizationMode,
+    "binarization_modes": EnumBinarizationMode,
+    "grayscale_transformation_modes": EnumGrayscaleTransformationMode,
+    "image_preprocessing_modes": EnumImagePreprocessingMode,
+    "region_predetection_modes": EnumRegionPredetectionMode,
+    "text_filter_modes": EnumTextFilterMode,
+    "scale_up_modes": EnumScaleUpMode,
+    "deformation_resisting_modes": EnumDeformationResistingMode,
+    "texture_detection_modes": EnumTextureDetectionMode,
+}
+
+# The candidate values of every setting. A mode list is given by the modes before the first skip.
+DEFAULT_SEARCH_SPACE = {
+    "localization_modes": [
+        ["LM_CONNECTED_BLOCKS", "LM_SCAN_DIRECTLY", "LM_STATISTICS", "LM_LINES"],
+        ["LM_CONNECTED_BLOCKS", "LM_SCAN_DIRECTLY"],
+        ["LM_CONNECTED_BLOCKS"],
+        ["LM_SCAN_DIRECTLY"],
+        ["LM_CONNECTED_BLOCKS", "LM_STATISTICS"],
+        ["LM_LINES"],
+    ],
+    "binarization_modes": [
+        ["BM_LOCAL_BLOCK"],
+        ["BM_AUTO"],
+    ],
+    "grayscale_transformation_modes": [
+        ["GTM_ORIGINAL"],
+        ["GTM_ORIGINAL", "GTM_INVERTED"],
+    ],
+    "image_preprocessing_modes": [
+        ["IPM_GENERAL"],
+        ["IPM_GENERAL", "IPM_GRAY_SMOOTH"],
+        ["IPM_GENERAL", "IPM_SHARPEN_SMOOTH"],
+    ],
+    "region_predetection_modes": [
+        ["RPM_GENERAL"],
+        [],
+    ],
+    "text_filter_modes": [
+        ["TFM_GENERAL_CONTOUR"],
+        [],
+    ],
+    "scale_up_modes": [
+        ["SUM_AUTO"],
+        [],
+    ],
+    "deblur_level": [9, 7, 5, 3, 1, 0],
+    "expected_barcodes_count": [0, 1],
+    "scale_down_threshold": [2300, 1600, 1024, 512],
+    "max_algorithm_thread_count": [4, 2, 1],
+    "timeout": [10000, 1000, 300, 100],
+}
+
+def load_corpus(directory, labels_file=None, extensions=None, recursive=True):
+    ''' Loads the labeled images of a directory.
+        :param directory <str> : The directory to walk.
+        :param labels_file(optional) <str> : A JSON file mapping the image paths relative to directory to the expected texts.
+            By default the texts are read from the .txt file next to every image.
+        :param extensions(optional) <set[str]> : The file extensions to load.
+        :param recursive(optional) <bool> : Whether to walk sub directories.
+        :return corpus <list[tuple]> : (file_name, file_bytes, expected_texts) of every labeled image.
+    '''
+    if extensions is None:
+        extensions = set(DEFAULT_EXTENSIONS.split(","))
+    labels = None
+    if labels_file is not None:
+        with open(labels_file) as f:
+            labels = dict((os.path.normpath(name), texts) for name, texts in json.load(f).items())
+    corpus = []
+    for file_name in iter_image_files(directory, extensions, recursive):
+        if labels is not None:
+            expected_texts = labels.get(os.path.normpath(os.path.relpath(file_name, directory)))
+            if expected_texts is not None and not isinstance(expected_texts, list):
+                expected_texts = [expected_texts]
+        else:
+            label_file = os.path.splitext(file_name)[0] + ".txt"
+            if not os.path.isfile(label_file):
+                continue
+            with open(label_file) as f:
+                expected_texts = [line.rstrip("\r\n") for line in f if line.strip()]
+        if expected_texts is None:
+            continue
+        # The bytes are decoded from memory, so reading the files is not part of the latency
+        with open(file_name, "rb") as f:
+            corpus.append((file_name, f.read(), expected_texts))
+    return corpus
+
+def parse_search_space(search_space):
+    ''' Converts the mode names of a search space into the values of their enumeration.
+        :param search_space <dict> : The candidate values of every setting, e.g. {"deblur_level": [0, 5], "localization_modes": [["LM_SCAN_DIRECTLY"]]}.
+        :return search_space <dict> : The search space with the modes as enumeration items.
+        :exception BarcodeReaderError : If a setting or a mode name is unknown.
+    '''
+    parsed = {}
+    for name, candidates in search_space.items():
+        if not candidates:
+            raise BarcodeReaderError("The setting " + name + " has no candidate value.")
+        if name in MODE_ENUMS:
+            enum = MODE_ENUMS[name]
+            try:
+                parsed[name] = [tuple(enum[mode] if not isinstance(mode, int) else enum(mode) for mode in modes) for modes in candidates]
+            except (KeyError, ValueError) as e:
+                raise BarcodeReaderError("The setting " + name + " has an unknown mode " + str(e) + ".")
+        else:
+            parsed[name] = list(candidates)
+    return parsed
+
+def _describe(config):
+    # The JSON form of a configuration, with the names of the modes
+    return dict((name, [mode.name for mode in value] if name in MODE_ENUMS else value) for name, value in sorted(config.items()))
+
+def _apply(reader, base_settings, config):
+    settings = copy.deepcopy(base_settings)
+    for name, value in config.items():
+        if not hasattr(settings, name):
+            raise BarcodeReaderError("The setting " + name + " is not a runtime setting.")
+        if name in MODE_ENUMS:
+            length = len(getattr(settings, name))
+            if len(value) > length:
+                raise BarcodeReaderError("The setting " + name + " has at most " + str(length) + " modes.")
+            value = [int(mode) for mode in value] + [0] * (length - len(value))
+        setattr(settings, name, value)
+    # Only the settings that differ from the previous configuration are sent
+    reader.update_runtime_settings(settings)
+
+def _decode(reader, file_bytes, expected_texts):
+    start = _timer()
+    try:
+        text_results = reader.decode_file_stream(file_bytes)
+    except BarcodeReaderError:
+        text_results = None
+    elapsed_ms = (_timer() - start) * 1000
+    found = collections.Counter(text_result.barcode_text for text_result in text_results or [])
+    expected = collections.Counter(expected_texts)
+    matched = sum((found & expected).values())
+    return matched, sum(found.values()) - matched, elapsed_ms
+
+class _Trial():
+    # The measurements of one configuration on the first images of the corpus
+
+    def __init__(self, config):
+        self.config = config
+        self.samples = []
+
+    def measure(self, reader, base_settings, corpus, images):
+        if len(self.samples) >= images:
+            return
+        _apply(reader, base_settings, self.config)
+        for file_name, file_bytes, expected_texts in corpus[len(self.samples):images]:
+            self.samples.append(_decode(reader, file_bytes, expected_texts) + (len(expected_texts),))
+
+    @property
+    def recall(self):
+        expected = sum(sample[3] for sample in self.samples)
+        return float(sum(sample[0] for sample in self.samples)) / expected if expected else 1.0
+
+    @property
+    def mean_ms(self):
+        return sum(sample[2] for sample in self.samples) / len(self.samples)
+
+    def percentile_ms(self, percentile):
+        elapsed = sorted(sample[2] for sample in self.samples)
+        return elapsed[max(0, int(len(elapsed) * percentile + 0.5) - 1)]
+
+    def sort_key(self, target_recall):
+        # The configurations reaching the target come first by latency, the others by recall
+        if self.recall >= target_recall:
+            return (0, self.mean_ms)
+        return (1, -self.recall, self.mean_ms)
+
+    def to_json(self):
+        return {
+            "settings": _describe(self.config),
+            "images": len(self.samples),
+            "recall": round(self.recall, 4),
+            "mean_ms": round(self.mean_ms, 3),
+            "p95_ms": round(self.percentile_ms(0.95), 3),
+            "false_positives": sum(sample[1] for sample in self.samples),
+        }
+
+def pareto_front(trials):
+    ''' Returns the trials that no other trial beats in both latency and recall, by increasing latency. '''
+    front = []
+    for trial in sorted(trials, key=lambda trial: (trial.mean_ms, -trial.recall)):
+        if not front or trial.recall > front[-1].recall:
+            front.append(trial)
+    return front
+
+def _sample_configs(search_space, trials, rng):
+    # The first configuration changes nothing, so the report always shows the settings it started from
+    configs = [{}]
+    seen = set([()])
+    names = sorted(search_space)
+    attempts = 0
+    while len(configs) < trials and attempts < trials * 100:
+        attempts += 1
+        config = dict((name, rng.choice(search_space[name])) for name in names)
+        key = tuple((name, config[name]) for name in names)
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+    return configs
+
+def tune(corpus, dbr_license="", json_string=None, target_recall=0.95, search_space=None, trials=27, eta=3, min_images=5, seed=0, progress=None):
+    ''' Searches the runtime settings for the fastest configuration that reaches a target recall.
+        :param corpus <list[tuple]> : The labeled images returned by load_corpus().
+        :param dbr_license(optional) <str> : The product keys.
+        :param json_string(optional) <str> : The JSON template string the search starts from. Settings not in the search space keep its values.
+        :param target_recall(optional) <float> : The share of the expected barcode texts that must be found.
+        :param search_space(optional) <dict> : The candidate values of every setting, see DEFAULT_SEARCH_SPACE.
+        :param trials(optional) <int> : The number of configurations to try, including the unchanged settings.
+        :param eta(optional) <int> : The factor by which the configurations are cut and the images are multiplied at every round.
+        :param min_images(optional) <int> : The number of images of the first round.
+        :param seed(optional) <int> : The seed of the configuration sampling and of the image order.
+        :param progress(optional) : A function called with a message after every round.
+        :return report <dict> : {"target_recall", "target_met", "images", "best", "pareto", "trials", "template"}, where best and the items
+            of pareto and trials hold the settings, images, recall, mean_ms, p95_ms and false_positives of a configuration, and template
+            is the JSON template string of the best configuration from output_settings_to_json_string().
+        :exception BarcodeReaderError : If the search space or the template can not be applied.
+    '''
+    if not corpus:
+        raise BarcodeReaderError("The corpus has no labeled image.")
+    if eta < 2:
+        raise BarcodeReaderError("eta must be at least 2.")
+    search_space = parse_search_space(search_space if search_space is not None else DEFAULT_SEARCH_SPACE)
+    rng = random.Random(seed)
+    corpus = list(corpus)
+    rng.shuffle(corpus)
+
+    reader = BarcodeReader()
+    if dbr_license:
+        reader.init_license(dbr_license)
+    if json_string:
+        error = reader.init_runtime_settings_with_string(json_string)
+        if error[0] != EnumErrorCode.DBR_OK:
+            raise BarcodeReaderError(error[1])
+    base_settings = reader.get_runtime_settings()
+
+    candidates = [_Trial(config) for config in _sample_configs(search_space, trials, rng)]
+    all_trials = list(candidates)
+    images = min(len(corpus), max(1, min_images))
+    while True:
+        for trial in candidates:
+            trial.measure(reader, base_settings, corpus, images)
+        if progress is not None:
+            progress("%d configurations on %d images" % (len(candidates), images))
+        if images >= len(corpus) or len(candidates) == 1:
+            break
+        # The front is kept too, so the final report compares its configurations on all images
+        ranked = sorted(candidates, key=lambda trial: trial.sort_key(target_recall))
+        survivors = ranked[:max(1, len(ranked) // eta)]
+        survivors += [trial for trial in pareto_front(candidates) if trial not in survivors]
+        candidates = survivors
+        images = min(len(corpus), images * eta)
+    for trial in candidates:
+        trial.measure(reader, base_settings, corpus, len(corpus))
+
+    best = min(candidates, key=lambda trial: trial.sort_key(target_recall))
+    _apply(reader, base_settings, best.config)
+    return {
+        "target_recall": target_recall,
+        "target_met": best.recall >= target_recall,
+        "images": len(corpus),
+        "best": best.to_json(),
+        "pareto": [trial.to_json() for trial in pareto_front(candidates)],
+        "trials": [trial.to_json() for trial in sorted(all_trials, key=lambda trial: (-len(trial.samples), trial.sort_key(target_recall)))],
+        "template": reader.output_settings_to_json_string(),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dbr tune", description="Search the fastest runtime settings that reach a target recall on labeled images.")
+    parser.add_argument("directory", help="The directory of the labeled images")
+    parser.add_argument("--labels", help="A JSON file mapping the relative image paths to the expected texts, default to a .txt file next to every image")
+    parser.add_argument("--license", default="", help="The product keys")
+    parser.add_argument("--template", help="The JSON template file the search starts from")
+    parser.add_argument("--target-recall", type=float, default=0.95, help="The share of the expected texts that must be found, default to %(default)s")
+    parser.add_argument("--trials", type=int, default=27, help="The number of configurations to try, default to %(default)s")
+    parser.add_argument("--eta", type=int, default=3, help="The halving factor, default to %(default)s")
+    parser.add_argument("--min-images", type=int, default=5, help="The number of images of the first round, default to %(default)s")
+    parser.add_argument("--space", help="A JSON file with the candidate values of every setting, default to the built-in search space")
+    parser.add_argument("--seed", type=int, default=0, help="The random seed, default to %(default)s")
+    parser.add_argument("--extensions", default=DEFAULT_EXTENSIONS, help="Comma separated file extensions, default to %(default)s")
+    parser.add_argument("--no-recursive", action="store_true", help="Do not walk sub directories")
+    parser.add_argument("--output", help="The template JSON file to write, default to stdout")
+    parser.add_argument("--report", help="The JSON report file to write")
+    args = parser.parse_args(argv)
+
+    json_string = None
+    if args.template:
+        with open(args.template) as f:
+            json_string = f.read()
+    search_space = None
+    if args.space:
+        with open(args.space) as f:
+            search_space = json.load(f)
+    extensions = set(extension.strip().lower() for extension in args.extensions.split(",") if extension.strip())
+
+    def progress(message):
+        sys.stderr.write(message + "\n")
+
+    # The template goes to stdout by default, the messages of the library must not
+    output = redirect_native_stdout() if not args.output else None
+    try:
+        corpus = load_corpus(args.directory, args.labels, extensions, not args.no_recursive)
+        report = tune(corpus, args.license, json_string, args.target_recall, search_space, args.trials, args.eta, args.min_images, args.seed, progress)
+    except BarcodeReaderError as bre:
+        sys.stderr.write(str(bre) + "\n")
+        return 2
+
+    sys.stderr.write("Pareto front on %d images:\n" % report["images"])
+    sys.stderr.write("%10s %10s %8s  %s\n" % ("mean_ms", "p95_ms", "recall", "settings"))
+    for trial in report["pareto"]:
+        sys.stderr.write("%10.3f %10.3f %8.4f  %s\n" % (trial["mean_ms"], trial["p95_ms"], trial["recall"], json.dumps(trial["settings"], sort_keys=True)))
+    if not report["target_met"]:
+        sys.stderr.write("No configuration reaches the target recall %s, the template has the highest recall.\n" % args.target_recall)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report["template"])
+    else:
+        output.write(report["template"] + "\n")
+        output.flush()
+    return 0 if report["target_met"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+# @Version : 7.3
+# @Author : Dynamsoft
+
+''' Command line entry: python -m dbr <command> [arguments] '''
+
+import sys
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    # Commands are imported on demand, so one command does not pay for the imports of another
+    commands = {
+        "scan": "dbr.scan",
+        "tune": "dbr.tune",
+    }
+    if len(argv) == 0 or argv[0] not in commands:
+        sys.stderr.write("usage: python -m dbr {%s} ...\n" % ",".join(sorted(commands)))
+        return 2
+    module = __import__(commands[argv[0]], fromlist=["main"])
+    return module.main(argv[1:])
+
+if __name__ == "__main__":
+    sys.exit(main())
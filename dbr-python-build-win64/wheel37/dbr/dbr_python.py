@@ -3,10 +3,34 @@
 
 import sys
 import os
+import threading
+import collections
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+import contextlib
+import logging
+import mmap
+import hashlib
+import json
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+try:
+    from pathlib import PurePath
+except ImportError:
+    PurePath = None
 import cv2
 import numpy
 from enum import IntEnum
 from dbr import DynamsoftBarcodeReader
+# The result types are implemented in C and returned by the decoding functions as they are
+from dbr import TextResult, LocalizationResult, ExtendedResult, SamplingImageData, Point, \
+    OnedDetailedResult, QRCodeDetailedResult, DataMatrixDetailedResult, PDFDetailedResult, AztecDetailedResult
+
+_logger = logging.getLogger(__name__)
 
 #region Enum
 
@@ -338,28 +362,30 @@ class EnumAccompanyingTextRecognitionMode(IntEnum):
     ATRM_GENERAL = 0x01
     ATRM_SKIP = 0x00
 
-#endregion
+class EnumVideoResultEvent(IntEnum):
+    """ Describes the events of the video result filter. """
 
-#region struct
+    VRE_APPEARED = 0
+    VRE_PRESENT = 1
+    VRE_DISAPPEARED = 2
 
-class SamplingImageData:
-    """ 
-    Stores the sampling image data. 
-
-    Attributes:
-    -----------
-    - bytes <bytearray> : The sampling image data in a byte array
+#endregion
 
-    - width <int> : The width of the sampling image
+#region struct
 
-    - height <int> : The height of the sampling image
-    """
+def _int32_array(data, shape):
+    # The native columns are bytearrays, so the arrays share their memory and stay writable
+    if len(data) == 0:
+        return numpy.zeros(shape, dtype=numpy.int32)
+    return numpy.frombuffer(data, dtype=numpy.int32).reshape(shape)
 
-    def __init__(self, sampling_image_data):
-        '''Init Function'''
-        self.bytes = sampling_image_data["Bytes"]
-        self.width = sampling_image_data["Width"]
-        self.height = sampling_image_data["Height"]
+# The pixel format of an opencv frame by its number of channels, like the one decode_buffer() derives
+_CHANNELS_TO_IMAGE_PIXEL_FORMAT = {
+    1: EnumImagePixelFormat.IPF_GRAYSCALED,
+    3: EnumImagePixelFormat.IPF_RGB_888,
+    4: EnumImagePixelFormat.IPF_ARGB_8888,
+}
+_IMAGE_PIXEL_FORMAT_TO_CHANNELS = dict((image_pixel_format, channels) for channels, image_pixel_format in _CHANNELS_TO_IMAGE_PIXEL_FORMAT.items())
 
 class FrameDecodingParameters:
     """ 
@@ -472,6 +498,70 @@ class FrameDecodingParameters:
         parameters["FPS"] = self.fps
         parameters["AutoFilter"] = self.auto_filter
 
+class FrameRing:
+    """
+    Defines a ring of reusable frame buffers for video mode, so that frames are read into preallocated memory
+    instead of a new array per frame.
+
+    Attributes:
+    -----------
+    - slots <list[numpy.ndarray]> : The frame buffers, uint8 of shape (height, width) for IPF_GRAYSCALED, (height, width, 3) for IPF_RGB_888
+        and (height, width, 4) for IPF_ARGB_8888, with the stride of the frame decoding parameters. Other formats get (height, stride).
+
+    Methods:
+    -----------
+    - current_slot()
+    - read(capture)
+    - advance()
+
+    It holds max_queue_length + 2 slots, for the queued frames, the frame being decoded and the frame being read.
+    append_video_frame() keeps as many frames alive. A slot comes back after the SDK is done with it as long as frames
+    are only appended while get_length_of_frame_queue() < max_queue_length, which is what iter_video() does.
+    Call advance() once the frame of the current slot is appended, a frame that is skipped leaves its slot to the next one.
+    """
+
+    def __init__(self, frame_decoding_parameters):
+        ''' Init Function
+            :param frame_decoding_parameters <class FrameDecodingParameters> : The parameters video mode is started with.
+        '''
+        height = int(frame_decoding_parameters.height)
+        width = int(frame_decoding_parameters.width)
+        stride = int(frame_decoding_parameters.stride)
+        channels = _IMAGE_PIXEL_FORMAT_TO_CHANNELS.get(frame_decoding_parameters.image_pixel_format)
+        size = max(frame_decoding_parameters.max_queue_length, 1) + 2
+        self.slots = []
+        for i in range(size):
+            buffer = numpy.zeros((height, stride), dtype=numpy.uint8)
+            if channels is None:
+                self.slots.append(buffer)
+            elif channels == 1:
+                self.slots.append(buffer[:, :width])
+            else:
+                # Splitting the pixels of a row keeps the view on the padded buffer
+                self.slots.append(buffer[:, :width * channels].reshape(height, width, channels))
+        self.__current = 0
+
+    def __len__(self):
+        return len(self.slots)
+
+    def current_slot(self):
+        ''' Returns the buffer to fill next. It was appended len(slots) frames ago.
+            :return slot <numpy.ndarray> : The buffer.
+        '''
+        return self.slots[self.__current]
+
+    def read(self, capture):
+        ''' Reads the next frame of a capture into the current buffer.
+            :param capture <class cv2.VideoCapture> : The capture.
+            :return frame <numpy.ndarray> : The frame, None at the end of the capture. It is the buffer unless the capture delivers another layout.
+        '''
+        rval, frame = capture.read(image=self.current_slot())
+        return frame if rval else None
+
+    def advance(self):
+        ''' Moves on to the next buffer after the current one was appended. '''
+        self.__current = (self.__current + 1) % len(self.slots)
+
 class PublicRuntimeSetting:
     """"
     Defines a struct to configure the barcode reading runtime settings. These settings control the barcode recognition process such as which barcode types to decode. 
@@ -751,398 +841,128 @@ class PublicRuntimeSetting:
         settings["ScaleUpModes"] = self.scale_up_modes
         settings["AccompanyingTextRecognitionModes"] = self.accompanying_text_recognition_modes
 
-class OnedDetailedResult:
-    """
-    Stores the OneD code details.
-    
-    Attributes:
-    -----------
-    - module_size <int> : The barcode module size (the minimum bar width in pixel) 
-
-    - start_chars_bytes <bytearray> : The start chars in a byte array
-
-    - stop_chars_bytes <bytearray> : The stop chars in a byte array
-
-    - check_digit_bytes <bytearray> : The check digit chars in a byte array
-    """
-
-    def __init__(self, detailed_result):
-        ''' Init Function '''
-        self.module_size = detailed_result["ModuleSize"]
-        self.start_chars_bytes = detailed_result["StartCharsBytes"]
-        self.stop_chars_bytes = detailed_result["StopCharsBytes"]
-        self.check_digit_bytes = detailed_result["CheckDigitBytes"]
-
-class QRCodeDetailedResult:
+class ImageData:
     """
-    Stores the QRCode details.
+    Stores the image data.
     
     Attributes:
     -----------
-    - module_size <int> : The barcode module size (the minimum bar width in pixel) 
+    - bytes <numpy.ndarray> : The image data content in a read-only array sharing the memory of the native results.
+        The shape is (height, width) or (height, width, channels) with the stride of the image, and the dtype is uint16
+        for the 16 bit formats, otherwise uint8. Binary images stay packed with 8 pixels per byte, NV21 images have the
+        VU rows below the Y rows. An unknown format gives the raw bytes.
 
-    - rows <int> : The row count of the barcode
+    - width <int> : The width of the image in pixels
 
-    - columns <int> : The column count of the barcode
+    - height <int> : The height of the image in pixels
 
-    - error_correction_level <EnumQRCodeErrorCorrectionLevel> : The error correction level of the barcode
-    
-    - versions <int> : The version of the QR Code
-    
-    - model <int> : Number of the models
+    - stride <int> : The stride (or scan width) of the image
 
+    - image_pixel_format <EnumImagePixelFormat> : The image pixel format used in the image byte array
     """
 
-    def __init__(self, detailed_result):
+    def __init__(self, image_data):
         ''' Init Function '''
-        self.module_size = detailed_result["ModuleSize"]
-        self.rows = detailed_result["Rows"]
-        self.columns = detailed_result["Columns"]
-        self.error_correction_level = detailed_result["ErrorCorrectionLevel"]
-        self.versions = detailed_result["Version"]
-        self.model = detailed_result["Model"]
-
-class DataMatrixDetailedResult:
-    """
-    Stores the DataMatrix details.
-    
-    Attributes:
-    -----------
-    - module_size <int> : The barcode module size (the minimum bar width in pixel) 
-
-    - rows <int> : The row count of the barcode
-
-    - columns <int> : The column count of the barcode
-
-    - data_region_rows <int> : The data region row count of the barcode
-    
-    - data_region_columns <int> : The data region column count of the barcode
-    
-    - data_region_number <int> : The data region count
+        self.bytes = image_data["Bytes"]
+        self.width = image_data["Width"]
+        self.height = image_data["Height"]
+        self.stride = image_data["Stride"]
+        self.image_pixel_format = image_data["ImagePixelFormat"]
 
+class Contour:
     """
+    Stores the contour
 
-    def __init__(self, detailed_result):
-        ''' Init Function '''
-        self.module_size = detailed_result["ModuleSize"]
-        self.rows = detailed_result["Rows"]
-        self.columns = detailed_result["Columns"]
-        self.data_region_rows = detailed_result["DataRegionRows"]
-        self.data_region_columns = detailed_result["DataRegionColumns"]
-        self.data_region_number = detailed_result["DataRegionNumber"]
-
-class PDFDetailedResult:
-    """ 
-    Stores the PDF details.
-    
     Attributes:
     -----------
-    - module_size <int> : The barcode module size (the minimum bar width in pixel) 
+    - points <numpy.ndarray> : The points, int32 of shape (K, 2) holding (x, y). A view of Contours.points
 
-    - rows <int> : The row count of the barcode
-
-    - columns <int> : The column count of the barcode
-
-    - error_correction_level <EnumQRCodeErrorCorrectionLevel> : The error correction level of the barcode
-    
     """
 
-    def __init__(self, detailed_result):
+    def __init__(self, points):
         ''' Init Function '''
-        self.module_size = detailed_result["ModuleSize"]
-        self.rows = detailed_result["Rows"]
-        self.columns = detailed_result["Columns"]
-        self.error_correction_level = detailed_result["ErrorCorrectionLevel"]
+        self.points = points
 
-class AztecDetailedResult:
+class Contours:
     """
-    Stores the Aztec details.
+    Stores the contours of an intermediate result packed CSR style, so that hundreds of thousands of points
+    cost a few arrays instead of one object per point.
 
     Attributes:
     -----------
-    - module_size <int> : The barcode module size (the minimum bar width in pixel) 
+    - points <numpy.ndarray> : The points of all contours one after another, int32 of shape (P, 2) holding (x, y)
 
-    - rows <int> : The row count of the barcode
-
-    - columns <int> : The column count of the barcode
-
-    - layer_number <int> : A negative number (-1, -2, -3, -4) specifies a compact Aztec code. A positive number (1, 2, .. 32) specifies a normal (full-rang) Aztec code.
+    - offsets <numpy.ndarray> : The start of every contour in points, int32 of shape (N + 1,).
+        Contour i is points[offsets[i]:offsets[i + 1]].
 
+    len(contours) is the number of contours and contours[i] is a Contour viewing its points.
     """
 
-    def __init__(self, detailed_result):
+    def __init__(self, contours):
         ''' Init Function '''
-        self.module_size = detailed_result["ModuleSize"]
-        self.rows = detailed_result["Rows"]
-        self.columns = detailed_result["Columns"]
-        self.layer_number = detailed_result["LayerNumber"]
-
-class ExtendedResult:
-    """
-    Stores the extended result.
-    
-    Attributes:
-    -----------
-    - result_type <EnumResultType> : Extended result type
-
-    - barcode_format <EnumBarcodeFormat> : Barcode type in BarcodeFormat group 1
-
-    - barcode_format_string <str> : Barcode type in BarcodeFormat group 1 as string
-
-    - barcode_format_2 <EnumBarcodeFormat_2> : Barcode type in BarcodeFormat group 2
-
-    - barcode_format_string_2 <str> : Barcode type in BarcodeFormat group 2 as string
-
-    - confidence <EnumResultType> : The confidence of the result
-
-    - bytes <bytearray> : The content in a byte array
-
-    - accompanying_text_bytes <bytearray> : The accompanying text content in a byte array
-
-    - deformation <int> : The deformation value
-
-    - detailed_result <class> : One of the following: OnedDetailedResult, PDFDetailedResult, DataMatrixDetailedResult, AztecDetailedResult, QRCodeDetailedResult
-
-    - sampling_image <class SamplingImageData> : The sampling image info
-
-    - clarity <int> : The clarity of the barcode zone in percentage.
-
-    """
-
-    def __init__(self, extended_result):
-        ''' Init Function '''
-        self.result_type = extended_result["ResultType"]
-        self.barcode_format = extended_result["BarcodeFormat"]
-        self.barcode_format_string = extended_result["BarcodeFormatString"]
-        self.barcode_format_2 = extended_result["BarcodeFormat_2"]
-        self.barcode_format_string_2 = extended_result["BarcodeFormatString_2"]
-        self.confidence = extended_result["Confidence"]
-        self.bytes = extended_result["Bytes"]
-        self.accompanying_text_bytes = extended_result["AccompanyingTextBytes"]
-        self.deformation = extended_result["Deformation"]
-
-        detailed_result = extended_result["DetailedResult"]
-        is_oned = self.barcode_format & EnumBarcodeFormat.BF_ONED
-        if is_oned != 0:
-            self.detailed_result = OnedDetailedResult(detailed_result)
-        elif self.barcode_format == EnumBarcodeFormat.BF_QR_CODE:
-            self.detailed_result = QRCodeDetailedResult(detailed_result)
-        elif self.barcode_format == EnumBarcodeFormat.BF_DATAMATRIX:
-            self.detailed_result = DataMatrixDetailedResult(detailed_result)
-        elif self.barcode_format == EnumBarcodeFormat.BF_PDF417:
-            self.detailed_result = PDFDetailedResult(detailed_result)
-        elif self.barcode_format == EnumBarcodeFormat.BF_AZTEC:
-            self.detailed_result = AztecDetailedResult(detailed_result)
-        else:
-            self.detailed_result = None
-
-        sampling_image = extended_result["SamplingImage"]
-        self.sampling_image = SamplingImageData(sampling_image)
-        self.clarity = extended_result["Clarity"]
-
-class LocalizationResult:
-    """
-    Stores the localization result.
-
-    Attributes:
-    -----------
-    - terminate_phase <EnumTerminatePhase> : The terminate phase of localization result
-
-    - barcode_format <EnumBarcodeFormat> : Barcode type in BarcodeFormat group 1
+        points, offsets = contours
+        self.offsets = _int32_array(offsets, (len(offsets) // 4,))
+        self.points = _int32_array(points, (len(points) // 8, 2))
 
-    - barcode_format_string <str> : Barcode type in BarcodeFormat group 1 as string
+    def __len__(self):
+        return len(self.offsets) - 1
 
-    - barcode_format_2 <EnumBarcodeFormat_2> : Barcode type in BarcodeFormat group 2
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("contour index out of range")
+        return Contour(self.points[self.offsets[index]:self.offsets[index + 1]])
 
-    - barcode_format_string_2 <str> : Barcode type in BarcodeFormat group 2 as string
-
-    - localization_points <tuple> : The 4 localization points
-
-    - angle <int> : The angle of a barcode. Values range is from 0 to 360
-
-    - module_size <int> : The barcode module size (the minimum bar width in pixel)
-
-    - page_number <int> : The page number the barcode located in. The index is 0-based
-
-    - region_name <int> : The region name the barcode located in
-
-    - document_name <int> : The document name
-
-    - result_coordinate_type <EnumResultCoordinateType> : The coordinate type
-
-    - accompanying_text_bytes <bytearray> : The accompanying text content in a byte array
-
-    - confidence <int> : The confidence of the localization result
-
-    """
-
-    def __init__(self, localization_result):
-        ''' Init Function '''
-        self.terminate_phase = localization_result["TerminatePhase"]
-        self.barcode_format = localization_result["BarcodeFormat"]
-        self.barcode_format_string = localization_result["BarcodeFormatString"]
-        self.barcode_format_2 = localization_result["BarcodeFormat_2"]
-        self.barcode_format_string_2 = localization_result["BarcodeFormatString_2"]
-        x1 = localization_result["X1"]
-        y1 = localization_result["Y1"]
-        x2 = localization_result["X2"]
-        y2 = localization_result["Y2"]
-        x3 = localization_result["X3"]
-        y3 = localization_result["Y3"]
-        x4 = localization_result["X4"]
-        y4 = localization_result["Y4"]
-        self.localization_points = [(x1,y1),(x2,y2),(x3,y3),(x4,y4)]
-        self.angle = localization_result["Angle"]
-        self.module_size = localization_result["ModuleSize"]
-        self.page_number = localization_result["PageNumber"]
-        self.region_name = localization_result["RegionName"]
-        self.document_name = localization_result["DocumentName"]
-        self.result_coordinate_type = localization_result["ResultCoordinateType"]
-        self.accompanying_text_bytes = localization_result["AccompanyingTextBytes"]
-        self.confidence = localization_result["Confidence"]
-
-class TextResult:
-    """
-    Stores the text result.
+class LineSegment:
+    """ 
+    Stores line segment data. 
     
     Attributes:
     -----------
-    - barcode_format <EnumBarcodeFormat> : Barcode type in BarcodeFormat group 1
-
-    - barcode_format_string <str> : Barcode type in BarcodeFormat group 1 as string
-
-    - barcode_format_2 <EnumBarcodeFormat_2> : Barcode type in BarcodeFormat group 2
-
-    - barcode_format_string_2 <str> : Barcode type in BarcodeFormat group 2 as string
-
-    - barcode_text <str> : The barcode text
-
-    - barcode_bytes <bytearray> : The barcode content in a byte array
-
-    - localization_result <class LocalizationResult> : The corresponding localization result
+    - start_point <class Point> : The start point of the line segment
 
-    - detailed_result <class> : One of the following: OnedDetailedResult, PDFDetailedResult, DataMatrixDetailedResult, AztecDetailedResult, QRCodeDetailedResult
+    - end_point <class Point> : The end point of the line segment
 
-    - extended_results <class ExtendedResult> : The extended result list
+    - lines_confidence_coefficients <numpy.ndarray> : The average and max positive and the average and max negative amplitudes, uint8 of shape (4,)
 
     """
 
-    def __init__(self, text_result):
+    def __init__(self, start_point, end_point, lines_confidence_coefficients):
         ''' Init Function '''
-        self.barcode_format = text_result["BarcodeFormat"]
-        self.barcode_format_string = text_result["BarcodeFormatString"]
-        self.barcode_format_2 = text_result["BarcodeFormat_2"]
-        self.barcode_format_string_2 = text_result["BarcodeFormatString_2"]
-        self.barcode_text = text_result["BarcodeText"]
-        self.barcode_bytes = text_result["BarcodeBytes"]
-
-        localization_result = text_result["LocalizationResult"]
-        self.localization_result = LocalizationResult(localization_result)
-
-        detailed_result = text_result["DetailedResult"]
-        is_oned = self.barcode_format & EnumBarcodeFormat.BF_ONED
-        if is_oned != 0:
-            self.detailed_result = OnedDetailedResult(detailed_result)
-        elif self.barcode_format == EnumBarcodeFormat.BF_QR_CODE:
-            self.detailed_result = QRCodeDetailedResult(detailed_result)
-        elif self.barcode_format == EnumBarcodeFormat.BF_DATAMATRIX:
-            self.detailed_result = DataMatrixDetailedResult(detailed_result)
-        elif self.barcode_format == EnumBarcodeFormat.BF_PDF417:
-            self.detailed_result = PDFDetailedResult(detailed_result)
-        elif self.barcode_format == EnumBarcodeFormat.BF_AZTEC:
-            self.detailed_result = AztecDetailedResult(detailed_result)
-        else:
-            self.detailed_result = None
-
-        extended_results = text_result["ExtendedResults"]
-        if type(extended_results) is list:
-            self.extended_results = []
-            length = len(extended_results)
-            for extended_result in extended_results:
-                self.extended_results.append(ExtendedResult(extended_result))
-        else:
-            self.extended_results = None
-
-class Point:
-    """
-    Stores an x- and y-coordinate pair in two-dimensional space.
-    
-    Attributes:
-    -----------
-    - x <int> : The X coordinate of the point
-
-    - y <int> : The Y coordinate of the point
+        self.start_point = start_point
+        self.end_point = end_point
+        self.lines_confidence_coefficients = lines_confidence_coefficients
 
+class LineSegments:
     """
+    Stores the line segments of an intermediate result in packed arrays.
 
-    def __init__(self, point):
-        ''' Init Function '''
-        self.x = point["X"]
-        self.y = point["Y"]
-
-class ImageData:
-    """
-    Stores the image data.
-    
     Attributes:
     -----------
-    - bytes <bytearray> : The image data content in a byte array
+    - lines <numpy.ndarray> : The line segments, int32 of shape (N, 2, 2). lines[i, 0] is the start point (x, y)
+        and lines[i, 1] the end point of segment i.
 
-    - width <bytearray> : The width of the image in pixels
+    - lines_confidence_coefficients <numpy.ndarray> : The coefficients of every segment, uint8 of shape (N, 4).
+        A segment without coefficients has zeros.
 
-    - height <bytearray> : The height of the image in pixels
-
-    - stride <bytearray> : The image data content in a byte array
-
-    - image_pixel_format <bytearray> : The image data content in a byte array
+    len(line_segments) is the number of segments and line_segments[i] is a LineSegment.
     """
 
-    def __init__(self, image_data):
+    def __init__(self, line_segments):
         ''' Init Function '''
-        self.bytes = image_data["Bytes"]
-        self.width = image_data["Width"]
-        self.height = image_data["Height"]
-        self.stride = image_data["Stride"]
-        self.image_pixel_format = image_data["ImagePixelFormat"]
+        lines, coefficients = line_segments
+        count = len(coefficients) // 4
+        self.lines = _int32_array(lines, (count, 2, 2))
+        self.lines_confidence_coefficients = numpy.frombuffer(coefficients, dtype=numpy.uint8).reshape(count, 4) if count != 0 \
+            else numpy.zeros((0, 4), dtype=numpy.uint8)
 
-class Contour:
-    """
-    Stores the contour
-
-    Attributes:
-    -----------
-    - points <list[class Point]> : The points list
-
-    """
-
-    def __init__(self, contour):
-        ''' Init Function '''
-        points = contour["Points"]
-        self.points = []
-        for point in points:
-            self.points.append(Point(point))
-
-class LineSegment:
-    """ 
-    Stores line segment data. 
-    
-    Attributes:
-    -----------
-    - start_point <class Point> : The start point of the line segment
-
-    - end_point <class Point> : The end point of the line segment
-
-    - lines_confidence_coefficients <list[int]> : The end point of the line segment
-
-    """
+    def __len__(self):
+        return len(self.lines)
 
-    def __init__(self, line_segment):
-        ''' Init Function '''
-        start_point = line_segment["StartPoint"]
-        self.start_point = Point(start_point)
-        end_point = line_segment["EndPoint"]
-        self.end_point = Point(end_point)
-        self.lines_confidence_coefficients = line_segment["LinesConfidenceCoefficients"]
+    def __getitem__(self, index):
+        start, end = self.lines[index].tolist()
+        return LineSegment(Point(start), Point(end), self.lines_confidence_coefficients[index])
 
 class RegionOfInterest:
     """ 
@@ -1163,8 +983,7 @@ class RegionOfInterest:
     def __init__(self, result):
         ''' Init Function '''
         self.roi_id = result["ROIId"]
-        point = result["Point"]
-        self.point = Point(point)
+        self.point = result["Point"]
         self.width = result["Width"]
         self.height = result["Height"]
 
@@ -1176,7 +995,7 @@ class IntermediateResult:
     -----------
     - data_type <EnumIMResultDataType> : The data type of the intermediate result
 
-    - results <list[class]> : One of the following types: List of class Contour, List of class ImageData, List of class LineSegment, List of class LocalizationResult, List of class RegionOfInterest
+    - results : One of the following types: class Contours, List of class ImageData, class LineSegments, List of class LocalizationResult, List of class RegionOfInterest
 
     - result_type <EnumIntermediateResultType> : Intermediate result type
 
@@ -1239,20 +1058,17 @@ class IntermediateResult:
         self.data_type = intermediate_result["DataType"]
 
         im_results = intermediate_result["IMResults"]
-        if type(im_results) is list:
+        if self.data_type == EnumIMResultDataType.IMRDT_CONTOUR and im_results is not None:
+            self.results = Contours(im_results)
+        elif self.data_type == EnumIMResultDataType.IMRDT_LINESEGMENT and im_results is not None:
+            self.results = LineSegments(im_results)
+        elif type(im_results) is list:
             self.results = []
             if self.data_type == EnumIMResultDataType.IMRDT_IMAGE:
                 for im_result in im_results:
                     self.results.append(ImageData(im_result))
-            elif self.data_type == EnumIMResultDataType.IMRDT_CONTOUR:
-                for im_result in im_results:
-                    self.results.append(Contour(im_result))
-            elif self.data_type == EnumIMResultDataType.IMRDT_LINESEGMENT:
-                for im_result in im_results:
-                    self.results.append(LineSegment(im_result))
             elif self.data_type == EnumIMResultDataType.IMRDT_LOCALIZATIONRESULT:
-                for im_result in im_results:
-                    self.results.append(LocalizationResult(im_result))
+                self.results = im_results
             elif self.data_type == EnumIMResultDataType.IMRDT_REGIONOFINTEREST:
                 for im_result in im_results:
                     self.results.append(RegionOfInterest(im_result))
@@ -1289,6 +1105,70 @@ class IntermediateResult:
         self.scale_down_ratio = intermediate_result["ScaleDownRatio"]
         self.frame_id = intermediate_result["FrameId"]
 
+class VideoResultEvent:
+    """
+    Stores an event of the video result filter, see BarcodeReader.enable_video_result_filter().
+
+    Attributes:
+    -----------
+    - event <EnumVideoResultEvent> : Whether the barcode appeared, is still present or disappeared
+
+    - text_result <class TextResult> : The result of the barcode in this frame. None if it disappeared
+
+    - barcode_format <int> : The barcode format
+
+    - barcode_bytes <bytearray> : The barcode content in a byte array
+
+    - x <int> : The x-coordinate of the centre of the barcode when it was last seen
+
+    - y <int> : The y-coordinate of the centre of the barcode when it was last seen
+
+    - seen_count <int> : The number of frames the barcode was seen in
+
+    - duration <float> : The seconds between the first and the last sighting of the barcode
+    """
+
+    def __init__(self, event):
+        ''' Init Function '''
+        event_type, self.text_result, self.barcode_format, self.barcode_bytes, self.x, self.y, self.seen_count, self.duration = event
+        self.event = EnumVideoResultEvent(event_type)
+
+class TextResultArrays:
+    """
+    Stores the text results of one decoding as parallel arrays, so geometry can be computed with numpy instead of
+    looping over TextResult objects. Row i of every array belongs to the same barcode.
+
+    Attributes:
+    -----------
+    - barcode_texts <list[str]> : The barcode texts
+
+    - localization_points <numpy.ndarray> : The quadrilaterals of the barcodes, int32 of shape (N, 4, 2) holding (x, y) of the four vertices
+
+    - barcode_formats <numpy.ndarray> : The barcode formats, int32 of shape (N,)
+
+    - confidences <numpy.ndarray> : The confidences of the localization results, int32 of shape (N,)
+
+    - angles <numpy.ndarray> : The angles of the barcodes, int32 of shape (N,)
+
+    - module_sizes <numpy.ndarray> : The module sizes of the barcodes, int32 of shape (N,)
+
+    A barcode without localization result has zeros in the numeric arrays.
+    """
+
+    def __init__(self, arrays):
+        ''' Init Function '''
+        texts, quads, formats, confidences, angles, module_sizes = arrays
+        count = len(texts)
+        self.barcode_texts = texts
+        self.localization_points = _int32_array(quads, (count, 4, 2))
+        self.barcode_formats = _int32_array(formats, (count,))
+        self.confidences = _int32_array(confidences, (count,))
+        self.angles = _int32_array(angles, (count,))
+        self.module_sizes = _int32_array(module_sizes, (count,))
+
+    def __len__(self):
+        return len(self.barcode_texts)
+
 #endregion
 
 #region Exception Class
@@ -1306,6 +1186,63 @@ class BarcodeReaderError(Exception):
 
 #region Main Region 
 
+# Error codes after which the decoding results are still valid, e.g. a trial license only masks part of the text.
+_DECODE_ACCEPTED_ERROR_CODES = frozenset([EnumErrorCode.DBR_OK, EnumErrorCode.DBRERR_LICENSE_EXPIRED, EnumErrorCode.DBRERR_LICENSE_INVALID, EnumErrorCode.DBRERR_RECOGNITION_TIMEOUT,
+    EnumErrorCode.DBRERR_1D_LICENSE_INVALID, EnumErrorCode.DBRERR_QR_LICENSE_INVALID, EnumErrorCode.DBRERR_PDF417_LICENSE_INVALID,
+    EnumErrorCode.DBRERR_AZTEC_LICENSE_INVALID, EnumErrorCode.DBRERR_DATAMATRIX_LICENSE_INVALID, EnumErrorCode.DBRERR_GS1_DATABAR_LICENSE_INVALID,
+    EnumErrorCode.DBRERR_GS1_COMPOSITE_LICENSE_INVALID, EnumErrorCode.DBRERR_MAXICODE_LICENSE_INVALID, EnumErrorCode.DBRERR_PATCHCODE_LICENSE_INVALID,
+    EnumErrorCode.DBRERR_POSTALCODE_LICENSE_INVALID])
+
+# blake2b is the fastest hash of hashlib, Python 2 falls back to sha1
+_content_hash = getattr(hashlib, "blake2b", hashlib.sha1)
+# os.replace only exists on Python 3, rename replaces a file on POSIX as well
+_replace_file = getattr(os, "replace", os.rename)
+
+def _content_digest(*chunks):
+    content_hash = _content_hash()
+    for chunk in chunks:
+        content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+def _file_name(source):
+    # The file name of a str, a unicode string on Python 2 or a path object such as pathlib.Path, otherwise None
+    if isinstance(source, (str, type(u""))):
+        return source
+    if hasattr(source, "__fspath__"):
+        return source.__fspath__()
+    if PurePath is not None and isinstance(source, PurePath):
+        return str(source)
+    return None
+
+def _copy_settings(settings):
+    # The mode lists of a PublicRuntimeSetting can be changed in place, so the copy must not share them
+    return dict((key, list(value) if isinstance(value, list) else value) for key, value in settings.items())
+
+def _profile_template(name, settings):
+    # A profile is a template whose only ImageParameter is named after the profile
+    if isinstance(settings, dict):
+        template = {"ImageParameter": dict(settings), "Version": "3.0"}
+    else:
+        template = json.loads(settings)
+    image_parameters = template.get("ImageParameterContentArray")
+    if image_parameters is not None and len(image_parameters) == 1:
+        template["ImageParameter"] = image_parameters[0]
+        del template["ImageParameterContentArray"]
+    if not isinstance(template.get("ImageParameter"), dict):
+        raise BarcodeReaderError("A profile must define exactly one ImageParameter.")
+    template["ImageParameter"]["Name"] = name
+    return json.dumps(template)
+
+_PAGE_TEMPLATE_NAME = "__page_decoding"
+_PAGE_PLACEHOLDER = "__page_decoding_page"
+
+def _page_template(settings_string):
+    # The settings from output_settings_to_json_string() as a private template limited to one page by "Pages",
+    # the page number replaces _PAGE_PLACEHOLDER
+    template = json.loads(_profile_template(_PAGE_TEMPLATE_NAME, settings_string))
+    template["ImageParameter"]["Pages"] = _PAGE_PLACEHOLDER
+    return json.dumps(template)
+
 class BarcodeReader():
     """ 
     Defines a class that provides functions for decoding barcodes in images. This is the main interface for recognizing barcodes.
@@ -1314,6 +1251,10 @@ class BarcodeReader():
     -----------
     - version <str> : The Dynamsoft Barcode Reader - Python Edition version
     - dbr_version <str> : The Dynamsoft Barcode Reader version
+    - lazy_results <bool> : Whether the decoding functions return lazy results. A lazy TextResult keeps the native result
+        memory and converts an attribute the first time it is read, so reading only barcode_text skips the localization,
+        detailed and extended results. The native memory is freed when the last result of the decoding is gone.
+    - result_cache <class ResultCache> : The cache decode_file(), decode_file_stream() and decode_buffer() look up before decoding. None decodes every time.
 
     Methods:
     -----------
@@ -1338,25 +1279,59 @@ class BarcodeReader():
         - output_settings_to_json_string()
         - output_settings_to_json_file(save_file_path)
         - get_all_template_names()
+    - Profile Functions
+        - register_profile(name, settings)
+        - profile(name)
     - Image Decoding Functions
-        - decode_file(image_file_name, template_name="")
-        - decode_buffer(image, image_pixel_format=EnumImagePixelFormat.IPF_RGB_888, template_name="")
-        - decode_file_stream(file_stream, template_name="")
+        - decode_file(image_file_name, template_name="", as_arrays=False, profile=None)
+        - decode_buffer(image, image_pixel_format=None, template_name="", as_arrays=False, region=None, profile=None)
+        - decode_buffers(images, image_pixel_format=None, template_name="", profile=None)
+        - decode_file_stream(file_stream, template_name="", as_arrays=False, profile=None)
+        - decode_file_mmap(image_file_name, template_name="", as_arrays=False, profile=None)
+        - iter_pages(image_file_name, pages=None, max_barcodes=None, pool=None)
         - get_all_intermediate_results()
     - Frame Decoding Functions
         - init_frame_decoding_parameters()
-        - start_video_mode(frame_decoding_parameters, call_back_func, template_name="")
+        - start_video_mode(frame_decoding_parameters, call_back_func=None, template_name="")
         - append_video_frame(video_frame)
         - stop_video_mode()
         - get_length_of_frame_queue()
+        - get_video_results(timeout=0)
+        - get_length_of_result_queue()
+        - get_dropped_result_count()
+        - enable_video_result_filter(time_to_live=1.0, repeat_interval=None, position_tolerance=100)
+        - disable_video_result_filter()
+        - iter_video(source, frame_decoding_parameters=None, template_name="", drop_frames=True)
 
     """
 
-    def __init__(self):
-        ''' Init Function '''
+    def __init__(self, lazy_results=False, result_cache=None):
+        ''' Init Function
+            :param lazy_results(optional) <bool> : Whether the decoding functions return lazy results.
+            :param result_cache(optional) <class ResultCache> : The cache of decoding results.
+        '''
         self.__dbr = DynamsoftBarcodeReader()
+        # Native decoding runs without the GIL. This lock keeps a decode call and the
+        # fetch of its results together when the same reader is shared by several threads.
+        self.__decode_lock = threading.Lock()
         self.version = "dbr-python 7.3"
         self.dbr_version = self.__dbr.GetDBRVersion()
+        self.lazy_results = lazy_results
+        self.result_cache = result_cache
+        # The hash of the runtime settings in the cache keys, computed again after a settings change
+        self.__settings_fingerprint = None
+        # The settings last read or applied, update_runtime_settings() only sends the values that differ from them
+        self.__applied_settings = None
+        # The JSON templates of the registered profiles by name, and the profile selected by profile() on each thread
+        self.__profiles = {}
+        self.__local = threading.local()
+        # The templates initialized and appended since the last reset, applied again to drop the private templates
+        self.__templates = []
+        # The runtime settings from before the first private template, None while the reader has none
+        self.__private_settings = None
+        self.__video_result_filter = False
+        # Whether the running video mode reports filter events
+        self.__video_events = False
 
 
     def get_error_string(self, error_code):
@@ -1423,27 +1398,39 @@ class BarcodeReader():
         '''
         cp_settings = self.__dbr.GetRuntimeSettings()
         settings = PublicRuntimeSetting(cp_settings)
+        self.__applied_settings = _copy_settings(cp_settings)
         return settings
 
 
     def update_runtime_settings(self, settings):
-        ''' Update runtime settings with a PublicRuntimeSetting object
+        ''' Update runtime settings with a PublicRuntimeSetting object. Only the values that changed are sent to the library,
+            and nothing is sent if no value changed.
             :param settings <class PublicRuntimeSetting> : a PublicRuntimeSetting object.
             :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
         '''
-        cp_settings = self.__dbr.GetRuntimeSettings()
-
-        settings.update_settings(cp_settings)
+        new_settings = {}
+        settings.update_settings(new_settings)
+        cp_settings = new_settings
+        if self.__applied_settings is not None:
+            cp_settings = dict((key, value) for key, value in new_settings.items() if self.__applied_settings.get(key) != value)
+            if not cp_settings:
+                return
+        # The native side keeps the current value of every setting missing from cp_settings
         error = self.__dbr.UpdataRuntimeSettings(cp_settings)
         error_code = error[0]
         error_message = error[1]
+        self.__settings_changed()
         if error_code != EnumErrorCode.DBR_OK:
             raise BarcodeReaderError(error_message)
+        self.__applied_settings = _copy_settings(new_settings)
 
 
     def reset_runtime_settings(self):
-        ''' Resets all parameters to default values. '''
+        ''' Resets all parameters to default values. The registered profiles are kept. '''
+        self.__settings_changed()
         self.__dbr.ResetRuntimeSettings()
+        self.__templates = []
+        self.__reload_profiles()
 
 
     def set_mode_argument(self, modes_name, index, argument_name, argument_value):
@@ -1455,6 +1442,7 @@ class BarcodeReader():
             :return error         <tuple> : error_code = error[0], error_message = error[1], if error_code != EnumErrorCode.DBR_OK, 
                 you can get the detailed error message by error_message.
         '''
+        self.__settings_changed()
         error = self.__dbr.SetModeArgument(modes_name, index, argument_name, argument_value)
         return error
 
@@ -1487,7 +1475,11 @@ class BarcodeReader():
             :return error <tuple> : error_code = error[0], error_message = error[1], if error_code != EnumErrorCode.DBR_OK, 
                 you can get the detailed error message by error_message.
         '''
+        self.__settings_changed()
         error = self.__dbr.InitRuntimeSettingsByJsonString(json_string, conflict_mode)
+        if error[0] == EnumErrorCode.DBR_OK:
+            self.__templates = [("InitRuntimeSettingsByJsonString", json_string, conflict_mode)]
+            self.__reload_profiles()
         return error
 
 
@@ -1499,7 +1491,11 @@ class BarcodeReader():
             :return error <tuple> : error_code = error[0], error_message = error[1], if error_code != EnumErrorCode.DBR_OK, 
                 you can get the detailed error message by error_message.
         '''
+        self.__settings_changed()
         error = self.__dbr.InitRuntimeSettingsByJsonFile(json_file, conflict_mode)
+        if error[0] == EnumErrorCode.DBR_OK:
+            self.__templates = [("InitRuntimeSettingsByJsonFile", json_file, conflict_mode)]
+            self.__reload_profiles()
         return error
 
 
@@ -1511,7 +1507,10 @@ class BarcodeReader():
             :return error <tuple> : error_code = error[0], error_message = error[1], if error_code != EnumErrorCode.DBR_OK, 
                 you can get the detailed error message by error_message.
         '''
+        self.__settings_changed()
         error = self.__dbr.AppendTplStringToRuntimeSettings(json_string, conflict_mode)
+        if error[0] == EnumErrorCode.DBR_OK:
+            self.__templates.append(("AppendTplStringToRuntimeSettings", json_string, conflict_mode))
         return error
 
 
@@ -1523,7 +1522,10 @@ class BarcodeReader():
             :return error <tuple> : error_code = error[0], error_message = error[1], if error_code != EnumErrorCode.DBR_OK, 
                 you can get the detailed error message by error_message.
         '''
+        self.__settings_changed()
         error = self.__dbr.AppendTplFileToRuntimeSettings(json_file, conflict_mode)
+        if error[0] == EnumErrorCode.DBR_OK:
+            self.__templates.append(("AppendTplFileToRuntimeSettings", json_file, conflict_mode))
         return error
 
 
@@ -1554,92 +1556,304 @@ class BarcodeReader():
 
 #endregion
 
+#region Profile Functions
+
+    def register_profile(self, name, settings):
+        ''' Registers named runtime settings, e.g. a fast 1D profile and a thorough DPM profile. The profile is compiled into a template
+            of the reader once, so selecting it with profile() or the profile parameter of the decoding functions neither parses JSON
+            nor updates the runtime settings. The current runtime settings are not changed, and the profiles are kept by
+            init_runtime_settings_with_string(), init_runtime_settings_with_file() and reset_runtime_settings().
+            :param name <str> : The profile name, which is also the name of its template.
+            :param settings <str/dict> : A JSON template string with one ImageParameter, which is renamed to name, or a dict of
+                ImageParameter values, e.g. {"BarcodeFormatIds": ["BF_ONED"], "DeblurLevel": 0}. A profile with the same name is replaced.
+            :exception BarcodeReaderError : If the template can not be applied, this function will throw a BarcodeReaderError exception.
+        '''
+        json_string = _profile_template(name, settings)
+        self.__append_profile(json_string)
+        self.__profiles[name] = json_string
+        self.__settings_fingerprint = None
+
+
+    @contextlib.contextmanager
+    def profile(self, name):
+        ''' Selects a registered profile for the decoding functions called in the with block on this thread.
+            A template_name or profile passed to a decoding function takes precedence.
+            :param name <str> : The profile name.
+            :exception BarcodeReaderError : If the profile is not registered, this function will throw a BarcodeReaderError exception.
+        '''
+        self.__check_profile(name)
+        previous = getattr(self.__local, "profile", None)
+        self.__local.profile = name
+        try:
+            yield self
+        finally:
+            self.__local.profile = previous
+
+
+    def __check_profile(self, name):
+        if name not in self.__profiles:
+            raise BarcodeReaderError("The profile " + str(name) + " is not registered.")
+
+
+    def __get_template_name(self, template_name, profile):
+        if profile is None and not template_name:
+            profile = getattr(self.__local, "profile", None)
+        if profile is None:
+            return template_name
+        self.__check_profile(profile)
+        return profile
+
+
+    def __append_profile(self, json_string):
+        # Appending a template can replace the current runtime settings, they are put back through the settings mirror
+        cp_settings = self.__dbr.GetRuntimeSettings()
+        error = self.__dbr.AppendTplStringToRuntimeSettings(json_string, EnumConflictMode.CM_OVERWRITE)
+        if error[0] != EnumErrorCode.DBR_OK:
+            raise BarcodeReaderError(error[1])
+        error = self.__dbr.UpdataRuntimeSettings(cp_settings)
+        if error[0] != EnumErrorCode.DBR_OK:
+            # The template replaced the runtime settings, the mirrors no longer match them
+            self.__settings_changed()
+            raise BarcodeReaderError(error[1])
+
+
+    def __reload_profiles(self):
+        # The templates of the profiles are dropped with the others when the settings are initialized or reset
+        for json_string in self.__profiles.values():
+            self.__append_profile(json_string)
+
+
+    def _append_private_template(self, json_string):
+        # Used by PageDecoding. A private template is not one of the templates of the reader and is dropped again by
+        # _drop_private_templates(), the runtime settings are then put back as they were before the first one.
+        if self.__private_settings is None:
+            self.__private_settings = self.__dbr.GetRuntimeSettings()
+        self.__settings_changed()
+        error = self.__dbr.AppendTplStringToRuntimeSettings(json_string, EnumConflictMode.CM_OVERWRITE)
+        if error[0] != EnumErrorCode.DBR_OK:
+            raise BarcodeReaderError(error[1])
+
+
+    def _drop_private_templates(self):
+        # The library can not remove a template, so the runtime settings are reset and the templates of the reader applied again
+        cp_settings, self.__private_settings = self.__private_settings, None
+        if cp_settings is None:
+            return
+        self.__settings_changed()
+        self.__dbr.ResetRuntimeSettings()
+        for function_name, template, conflict_mode in self.__templates:
+            error = getattr(self.__dbr, function_name)(template, conflict_mode)
+            if error[0] != EnumErrorCode.DBR_OK:
+                raise BarcodeReaderError(error[1])
+        self.__reload_profiles()
+        error = self.__dbr.UpdataRuntimeSettings(cp_settings)
+        if error[0] != EnumErrorCode.DBR_OK:
+            raise BarcodeReaderError(error[1])
+
+#endregion
+
 #region Image Decoding Functions
 
-    def decode_file(self, image_file_name, template_name=""):
+    def decode_file(self, image_file_name, template_name="", as_arrays=False, profile=None):
         ''' Decodes barcodes in the specified image file.
             :param image_file_name           <str> : A string defining the file name.
             :param template_name(optional)   <str> : The template name.
-            :return text_results <list[class TextResult]> : All text results.
+            :param as_arrays(optional)       <bool> : Whether to return the results as a TextResultArrays object.
+            :param profile(optional) <str> : The registered profile to decode with, see register_profile().
+            :return text_results <list[class TextResult]> : All text results. With as_arrays, a <class TextResultArrays>, which is empty if no barcode is found.
             :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
         '''
-        error_code = self.__dbr.DecodeFile(image_file_name, template_name)
-        if error_code == EnumErrorCode.DBR_OK or error_code == EnumErrorCode.DBRERR_LICENSE_EXPIRED or error_code == EnumErrorCode.DBRERR_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_RECOGNITION_TIMEOUT or \
-            error_code == EnumErrorCode.DBRERR_1D_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_QR_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_PDF417_LICENSE_INVALID or \
-            error_code == EnumErrorCode.DBRERR_AZTEC_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_DATAMATRIX_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_GS1_DATABAR_LICENSE_INVALID or \
-            error_code == EnumErrorCode.DBRERR_GS1_COMPOSITE_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_MAXICODE_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_PATCHCODE_LICENSE_INVALID or \
-            error_code == EnumErrorCode.DBRERR_POSTALCODE_LICENSE_INVALID :
-            cp_text_results = self.__dbr.GetAllTextResults()
-            
-            text_results = []
-            if type(cp_text_results) is list:
-                for cp_text_result in cp_text_results:
-                    text_results.append(TextResult(cp_text_result))
-                return text_results
-            else:
-                return None
+        template_name = self.__get_template_name(template_name, profile)
+        cache_key = None
+        if self.result_cache is not None:
+            try:
+                # A file is known by its path, size and modification time, so it is not read twice to look it up
+                file_stat = os.stat(image_file_name)
+                file_id = repr((os.path.abspath(image_file_name), file_stat.st_size, getattr(file_stat, "st_mtime_ns", file_stat.st_mtime)))
+                cache_key = self.__get_cache_key(file_id.encode("utf-8"), "file", template_name, as_arrays)
+            except (IOError, OSError):
+                # Decoding reports the file error
+                pass
+            if cache_key is not None:
+                found, text_results = self.result_cache.get(cache_key)
+                if found:
+                    return text_results
+        with self.__decode_lock:
+            error_code = self.__dbr.DecodeFile(image_file_name, template_name)
+            text_results = self.__get_text_results(as_arrays)
+        if error_code in _DECODE_ACCEPTED_ERROR_CODES:
+            if cache_key is not None and error_code == EnumErrorCode.DBR_OK:
+                self.__cache_results(cache_key, text_results)
+            return text_results
         else:
             error_message = self.__dbr.GetErrorString(error_code)
             raise BarcodeReaderError(error_message)
     
     
-    def decode_buffer(self, image, image_pixel_format=EnumImagePixelFormat.IPF_RGB_888, template_name=""):
+    def decode_buffer(self, image, image_pixel_format=None, template_name="", as_arrays=False, region=None, profile=None):
         ''' Decodes barcodes from the memory buffer containing image pixels in defined format. 
-            :param image <class numpy.ndarray> : The image which is processed by opencv.( image = cv2.imread('image_name') )
-            :param image_pixel_format(optional) <EnumImagePixelFormat> : The image pixel format used in the image byte array. Default value = EnumImagePixelFormat.IPF_RGB_888.
+            :param image <class numpy.ndarray> : The image which is processed by opencv.( image = cv2.imread('image_name') ).
+                A uint8 array whose pixels are contiguous inside each row. Slices of a larger image are accepted.
+            :param image_pixel_format(optional) <EnumImagePixelFormat> : The image pixel format used in the image byte array.
+                By default it is derived from the image: IPF_GRAYSCALED for (H, W), IPF_RGB_888 for (H, W, 3), IPF_ARGB_8888 for (H, W, 4).
             :param template_name(optional) <str> : The template name.
-            :return text_results <list[class TextResult]> : All text results.
+            :param as_arrays(optional) <bool> : Whether to return the results as a TextResultArrays object.
+            :param region(optional) <tuple> : (left, top, right, bottom) in pixels. Only this region of the image is decoded, and the
+                localization points are still given in the coordinates of the whole image.
+            :param profile(optional) <str> : The registered profile to decode with, see register_profile().
+            :return text_results <list[class TextResult]> : All text results. With as_arrays, a <class TextResultArrays>, which is empty if no barcode is found.
             :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
         '''
-        height = image.shape[0]
-        width = image.shape[1]
-        stride = image.strides[0]
-        error_code = self.__dbr.DecodeBuffer(image, height, width, stride, image_pixel_format, template_name)
-        if error_code == EnumErrorCode.DBR_OK or error_code == EnumErrorCode.DBRERR_LICENSE_EXPIRED or error_code == EnumErrorCode.DBRERR_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_RECOGNITION_TIMEOUT or \
-            error_code == EnumErrorCode.DBRERR_1D_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_QR_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_PDF417_LICENSE_INVALID or \
-            error_code == EnumErrorCode.DBRERR_AZTEC_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_DATAMATRIX_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_GS1_DATABAR_LICENSE_INVALID or \
-            error_code == EnumErrorCode.DBRERR_GS1_COMPOSITE_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_MAXICODE_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_PATCHCODE_LICENSE_INVALID or \
-            error_code == EnumErrorCode.DBRERR_POSTALCODE_LICENSE_INVALID :
-            cp_text_results = self.__dbr.GetAllTextResults()
-            text_results = []
-            if type(cp_text_results) is list:
-                for cp_text_result in cp_text_results:
-                    text_results.append(TextResult(cp_text_result))
+        template_name = self.__get_template_name(template_name, profile)
+        # Width, height and stride come from the buffer, so a slice like image[y0:y1, x0:x1] is decoded without a copy
+        left = top = 0
+        if region is not None:
+            left, top = max(int(region[0]), 0), max(int(region[1]), 0)
+            image = image[top:int(region[3]), left:int(region[2])]
+        if image_pixel_format is None:
+            image_pixel_format = -1
+        cache_key = None
+        if self.result_cache is not None:
+            pixels = numpy.ascontiguousarray(image)
+            cache_key = self.__get_cache_key(pixels.data, "buffer", template_name, as_arrays, image.shape, image.dtype.str, image_pixel_format, left, top)
+            found, text_results = self.result_cache.get(cache_key)
+            if found:
                 return text_results
-            else:
-                return None
+        with self.__decode_lock:
+            error_code = self.__dbr.DecodeBuffer(image, image_pixel_format, template_name)
+            text_results = self.__get_text_results(as_arrays, left, top)
+        if error_code in _DECODE_ACCEPTED_ERROR_CODES:
+            if cache_key is not None and error_code == EnumErrorCode.DBR_OK:
+                self.__cache_results(cache_key, text_results)
+            return text_results
         else:
             error_message = self.__dbr.GetErrorString(error_code)
             raise BarcodeReaderError(error_message)
 
 
-    def decode_file_stream(self, file_stream, template_name=""):
+    def decode_buffers(self, images, image_pixel_format=None, template_name="", profile=None):
+        ''' Decodes barcodes from a batch of images in one native call, without returning to Python between images.
+            :param images : A list of images <class numpy.ndarray>, or the images stacked in one array of shape (T, H, W, C) or (T, H, W).
+            :param image_pixel_format(optional) <EnumImagePixelFormat> : The image pixel format shared by all images. By default it is derived from each image like decode_buffer().
+            :param template_name(optional) <str> : The template name.
+            :param profile(optional) <str> : The registered profile to decode with, see register_profile().
+            :return text_results_list <list[list[class TextResult]]> : The text results of every image, in the order of images. An image without barcode gets None.
+            :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
+        '''
+        template_name = self.__get_template_name(template_name, profile)
+        if image_pixel_format is None:
+            image_pixel_format = -1
+        cp_batch_results = self.__dbr.DecodeBuffers(images, image_pixel_format, template_name, self.lazy_results)
+        text_results_list = []
+        for error_code, text_results in cp_batch_results:
+            if error_code not in _DECODE_ACCEPTED_ERROR_CODES:
+                error_message = self.__dbr.GetErrorString(error_code)
+                raise BarcodeReaderError(error_message)
+            text_results_list.append(text_results)
+        return text_results_list
+
+
+    def decode_file_stream(self, file_stream, template_name="", as_arrays=False, profile=None):
         ''' Decodes barcodes from an image file in memory.
-            :param file_stream <bytearray> : The image file bytes in memory.
+            :param file_stream <bytes/bytearray/memoryview/mmap/numpy.ndarray> : The image file bytes in memory. Any contiguous buffer is
+                decoded in place without a copy.
             :param template_name(optional) <str> : The template name. 
-            :return text_results <list[class TextResult]> : All text results.
+            :param as_arrays(optional) <bool> : Whether to return the results as a TextResultArrays object.
+            :param profile(optional) <str> : The registered profile to decode with, see register_profile().
+            :return text_results <list[class TextResult]> : All text results. With as_arrays, a <class TextResultArrays>, which is empty if no barcode is found.
             :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
         '''
-        file_size = len(file_stream)
-        error_code = self.__dbr.DecodeFileStream(file_stream, file_size, template_name)
-        if error_code == EnumErrorCode.DBR_OK or error_code == EnumErrorCode.DBRERR_LICENSE_EXPIRED or error_code == EnumErrorCode.DBRERR_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_RECOGNITION_TIMEOUT or \
-            error_code == EnumErrorCode.DBRERR_1D_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_QR_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_PDF417_LICENSE_INVALID or \
-            error_code == EnumErrorCode.DBRERR_AZTEC_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_DATAMATRIX_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_GS1_DATABAR_LICENSE_INVALID or \
-            error_code == EnumErrorCode.DBRERR_GS1_COMPOSITE_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_MAXICODE_LICENSE_INVALID or error_code == EnumErrorCode.DBRERR_PATCHCODE_LICENSE_INVALID or \
-            error_code == EnumErrorCode.DBRERR_POSTALCODE_LICENSE_INVALID :
-            cp_text_results = self.__dbr.GetAllTextResults()
-            text_results = []
-            if type(cp_text_results) is list:
-                for cp_text_result in cp_text_results:
-                    text_results.append(TextResult(cp_text_result))
+        template_name = self.__get_template_name(template_name, profile)
+        # The native side takes the size from the buffer
+        file_size = -1
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self.__get_cache_key(file_stream, "stream", template_name, as_arrays)
+            found, text_results = self.result_cache.get(cache_key)
+            if found:
                 return text_results
-            else:
-                return None
+        with self.__decode_lock:
+            error_code = self.__dbr.DecodeFileStream(file_stream, file_size, template_name)
+            text_results = self.__get_text_results(as_arrays)
+        if error_code in _DECODE_ACCEPTED_ERROR_CODES:
+            if cache_key is not None and error_code == EnumErrorCode.DBR_OK:
+                self.__cache_results(cache_key, text_results)
+            return text_results
         else:
             error_message = self.__dbr.GetErrorString(error_code)
             raise BarcodeReaderError(error_message)
 
 
+    def decode_file_mmap(self, image_file_name, template_name="", as_arrays=False, profile=None):
+        ''' Decodes barcodes in the specified image file by mapping it into memory instead of reading it.
+            A large TIFF or PDF file is decoded without a copy of its bytes in the Python heap.
+            :param image_file_name           <str> : A string defining the file name.
+            :param template_name(optional)   <str> : The template name.
+            :param as_arrays(optional) <bool> : Whether to return the results as a TextResultArrays object.
+            :param profile(optional) <str> : The registered profile to decode with, see register_profile().
+            :return text_results <list[class TextResult]> : All text results. With as_arrays, a <class TextResultArrays>, which is empty if no barcode is found.
+            :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
+        '''
+        template_name = self.__get_template_name(template_name, profile)
+        try:
+            image_file = open(image_file_name, "rb")
+        except (IOError, OSError):
+            # Decoding reports the file error
+            return self.decode_file(image_file_name, template_name, as_arrays)
+        with image_file:
+            if os.fstat(image_file.fileno()).st_size == 0:
+                # An empty file can not be mapped
+                return self.decode_file(image_file_name, template_name, as_arrays)
+            file_map = mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return self.decode_file_stream(file_map, template_name, as_arrays)
+        finally:
+            file_map.close()
+
+
+    def iter_pages(self, image_file_name, pages=None, max_barcodes=None, pool=None):
+        ''' Decodes a multi-page TIFF or PDF file page by page and iterates the results of every page as soon as it is done.
+            :param image_file_name           <str> : A string defining the file name.
+            :param pages(optional) : The page numbers to decode in this order, 0-based, e.g. range(0, 10). By default all pages.
+            :param max_barcodes(optional) <int> : Stops after the page on which the number of barcodes found reaches max_barcodes.
+            :param pool(optional) <class BarcodeReaderPool> : The pool whose idle readers decode the pages at the same time.
+                They decode with a private template made of the runtime settings of this reader, their own settings are not changed.
+                The private template is dropped again when the iteration is closed.
+            :return page_decoding <class PageDecoding> : Yields page_number, text_results in page order. text_results is None for a page without barcode.
+            :exception BarcodeReaderError : If error happens, the iteration will throw a BarcodeReaderError exception that can report the detailed error message.
+        '''
+        return PageDecoding(self, image_file_name, pages, max_barcodes, pool)
+
+
+    def __settings_changed(self):
+        self.__settings_fingerprint = None
+        self.__applied_settings = None
+
+
+    def __get_cache_key(self, content, *options):
+        # The same content decodes to the same results as long as the settings and the options are the same
+        if self.__settings_fingerprint is None:
+            settings_string = self.__dbr.OutputSettingsToJsonString() or ""
+            profiles_string = repr(sorted(self.__profiles.items()))
+            self.__settings_fingerprint = _content_digest(settings_string.encode("utf-8"), profiles_string.encode("utf-8"))
+        return _content_digest(content, repr((self.__settings_fingerprint,) + options).encode("utf-8"))
+
+
+    def __cache_results(self, cache_key, text_results):
+        # The results are decoded already, so a cache that can not store them does not fail the decoding
+        try:
+            self.result_cache.put(cache_key, text_results)
+        except Exception:
+            _logger.warning("The decoding results could not be cached.", exc_info=True)
+
+
+    def __get_text_results(self, as_arrays, dx=0, dy=0):
+        # dx, dy move the results of a region into the coordinates of the whole image
+        if as_arrays:
+            return TextResultArrays(self.__dbr.GetAllTextResultArrays(dx, dy))
+        return self.__dbr.GetAllTextResults(self.lazy_results, dx, dy)
+
+
     def get_all_intermediate_results(self):
         ''' Returns intermediate results containing the original image, the colour clustered image, the binarized image, contours, lines, text blocks, etc. 
             :return intermediate_results <liset[class IntermediateResult]> : All intermediate results.
@@ -1670,10 +1884,13 @@ class BarcodeReader():
             print(ke)
 
 
-    def start_video_mode(self, frame_decoding_parameters, call_back_func, template_name=""):
+    def start_video_mode(self, frame_decoding_parameters, call_back_func=None, template_name=""):
         ''' Starts a new thread to decode barcodes from the inner frame queue.
             :param frame_decoding_parameters <class FrameDecodingParameters> : The frame decoding parameters. You can get it by init_frame_decoding_parameters(), then modify its parameters' value.
-            :param call_back_func <function pointer> : Sets callback function to process text results generated during frame decoding.
+            :param call_back_func(optional) <function pointer> : Sets callback function to process text results generated during frame decoding. It is called with a list of TextResult
+                on the decoding thread. If it is None, the results are queued instead and fetched by get_video_results(). The queue holds
+                frame_decoding_parameters.max_result_queue_length results and drops the oldest one when it is full, so a slow consumer never holds up decoding.
+                With enable_video_result_filter() it is called with a list of VideoResultEvent instead.
             :param template_name(optional) <str> : The template name.
             :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
         '''
@@ -1682,15 +1899,21 @@ class BarcodeReader():
             frame_decoding_parameters.update_parameters(cp_frame_decoding_parameters)
         except KeyError as ke:
             print(ke)
-        error_code = self.__dbr.StartVideoMode(cp_frame_decoding_parameters, call_back_func, template_name)
+        video_events = self.__video_result_filter
+        if video_events and call_back_func is not None:
+            user_call_back_func = call_back_func
+            call_back_func = lambda events: user_call_back_func([VideoResultEvent(event) for event in events])
+        error_code = self.__dbr.StartVideoMode(cp_frame_decoding_parameters, call_back_func, template_name, self.lazy_results)
         if error_code != EnumErrorCode.DBR_OK:
             error_message = self.__dbr.GetErrorString(error_code)
             raise BarcodeReaderError(error_message)
+        self.__video_events = video_events
 
 
     def append_video_frame(self, video_frame):
         ''' Appends a video frame to the inner frame queue. 
-            :param video_frame : Gets by opencv.
+            :param video_frame : Gets by opencv. Its width, height and stride must match the frame decoding parameters.
+                It is kept alive until max_queue_length + 2 more frames are appended or video mode stops. See FrameRing to reuse the frames.
             :return frame_id <int> : Current frame id.
         '''
         frame_id = self.__dbr.AppendVideoFrame(video_frame)
@@ -1714,6 +1937,926 @@ class BarcodeReader():
         frame_queue_length = self.__dbr.GetLengthOfFrameQueue()
         return frame_queue_length
 
+
+    def _wait_frame_queue(self, length, timeout):
+        # Used by VideoDecoding. Waits until the frame queue is shorter than length, at most timeout seconds for the next
+        # decoded frame, and returns whether it is.
+        return self.__dbr.WaitFrameQueue(length, timeout)
+
+
+    def get_video_results(self, timeout=0):
+        ''' Gets the results of the oldest decoded frame when video mode was started without a callback.
+            :param timeout(optional) <float> : The seconds to wait for a result. 0 returns at once, None waits until a result arrives or video mode stops.
+            :return video_result <tuple> : frame_id = video_result[0], text_results = video_result[1]. None if no result arrived in time,
+                or once video mode has stopped and every queued result has been fetched. With enable_video_result_filter(), video_result[1]
+                is a list of VideoResultEvent, and the barcodes left when video mode stops come with the id of the last frame.
+        '''
+        if timeout is not None:
+            video_result = self.__dbr.GetVideoResults(timeout)
+        else:
+            # Wait in short slices so that the waiting thread still handles signals like KeyboardInterrupt
+            video_result = None
+            while video_result is None:
+                video_result = self.__dbr.GetVideoResults(0.1)
+        if video_result is None or video_result[0] < 0:
+            return None
+        if self.__video_events:
+            return video_result[0], [VideoResultEvent(event) for event in video_result[1]]
+        return video_result
+
+
+    def get_length_of_result_queue(self):
+        ''' Gets current length of the video result queue used by start_video_mode() without a callback.
+            :return result_queue_length <int> : The number of decoded frames waiting for get_video_results().
+        '''
+        return self.__dbr.GetVideoResultQueueState()[0]
+
+
+    def get_dropped_result_count(self):
+        ''' Gets how many results the video result queue dropped since start_video_mode() because it was full.
+            :return dropped_result_count <int> : The number of dropped results.
+        '''
+        return self.__dbr.GetVideoResultQueueState()[1]
+
+
+    def enable_video_result_filter(self, time_to_live=1.0, repeat_interval=None, position_tolerance=100):
+        ''' Reports the barcodes of video mode as events instead of every result of every frame, from the next start_video_mode() on.
+            The filter runs natively on the decoding thread and follows the barcodes by format, bytes and position, so frames without
+            an event never reach Python. The callback and get_video_results() then get a list of VideoResultEvent.
+            :param time_to_live(optional) <float> : The seconds a barcode is not seen before it is reported as disappeared.
+            :param repeat_interval(optional) <float> : The seconds between two reports of a barcode that is still present. None reports it only when it appears.
+            :param position_tolerance(optional) <int> : The pixels the centre of a barcode may move between two frames. None ignores the position.
+        '''
+        repeat_interval_ms = int(repeat_interval * 1000) if repeat_interval is not None else -1
+        position_tolerance = int(position_tolerance) if position_tolerance is not None else -1
+        self.__dbr.SetVideoResultFilter(1, int(time_to_live * 1000), repeat_interval_ms, position_tolerance)
+        self.__video_result_filter = True
+
+
+    def disable_video_result_filter(self):
+        ''' Reports every result of every frame again from the next start_video_mode() on. '''
+        self.__dbr.SetVideoResultFilter(0, 0, -1, -1)
+        self.__video_result_filter = False
+
+
+    def iter_video(self, source, frame_decoding_parameters=None, template_name="", drop_frames=True):
+        ''' Decodes the frames of a source in video mode and iterates the results as they are decoded.
+            :param source : A video file path <str/os.PathLike> or a camera index <int> opened with cv2.VideoCapture, an object with a read() method
+                like cv2.VideoCapture, or any iterable of frames <class numpy.ndarray>. A capture opened here is released at the end.
+            :param frame_decoding_parameters(optional) <class FrameDecodingParameters> : The frame decoding parameters. By default init_frame_decoding_parameters().
+                Width, height, stride and image_pixel_format are always taken from the first frame.
+            :param template_name(optional) <str> : The template name.
+            :param drop_frames(optional) <bool> : Whether to skip a frame when the frame queue is full, which suits a camera.
+                If False the source is read only as fast as the frames are decoded, so no frame of a file is lost.
+            :return video_decoding <class VideoDecoding> : Yields frame_id, text_results. Video mode starts with the iteration and stops when the source is exhausted or close() is called.
+            :exception BarcodeReaderError : If video mode can not be started, the iteration will throw a BarcodeReaderError exception.
+        '''
+        return VideoDecoding(self, source, frame_decoding_parameters, template_name, drop_frames)
+
 #endregion
 
+
+class BarcodeReaderPool():
+    """ 
+    Defines a bounded pool of BarcodeReader instances that share the same license and template settings.
+    Every reader is created and configured once, then checked out and returned by the threads that decode with it.
+    
+    Attributes:
+    -----------
+    - size <int> : The number of readers owned by the pool
+
+    Methods:
+    -----------
+    - Checkout Functions
+        - acquire(timeout=None)
+        - release(reader)
+        - reader(timeout=None)
+    - register_profile(name, settings)
+    - Decoding Functions
+        - decode(image, template_name="", profile=None)
+        - submit(image, template_name="", profile=None)
+        - map(images, template_name="", profile=None)
+    - close()
+
+    """
+
+    def __init__(self, size, dbr_license="", json_string=None, conflict_mode=EnumConflictMode.CM_OVERWRITE, lazy_results=False, result_cache=None):
+        ''' Init Function
+            :param size <int> : The number of readers to create.
+            :param dbr_license(optional) <str> : The product keys applied to every reader.
+            :param json_string(optional) <str> : A JSON template string applied to every reader with init_runtime_settings_with_string().
+            :param conflict_mode(optional) <EnumConflictMode> : The parameter setting mode used with json_string.
+            :param lazy_results(optional) <bool> : Whether the readers return lazy results, see BarcodeReader.lazy_results.
+            :param result_cache(optional) <class ResultCache> : The cache shared by the readers, see BarcodeReader.result_cache.
+            :exception BarcodeReaderError : If the template can not be applied, this function will throw a BarcodeReaderError exception.
+        '''
+        if size < 1:
+            raise BarcodeReaderError("The pool size must be at least 1.")
+        self.size = size
+        self.__readers = []
+        self.__idle = queue.Queue()
+        self.__executor = None
+        self.__executor_lock = threading.Lock()
+        for i in range(size):
+            reader = BarcodeReader(lazy_results, result_cache)
+            if dbr_license:
+                reader.init_license(dbr_license)
+            if json_string is not None:
+                error = reader.init_runtime_settings_with_string(json_string, conflict_mode)
+                if error[0] != EnumErrorCode.DBR_OK:
+                    raise BarcodeReaderError(error[1])
+            self.__readers.append(reader)
+            self.__idle.put(reader)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+#region Checkout Functions
+
+    def acquire(self, timeout=None):
+        ''' Checks out an idle reader. It must be given back with release().
+            :param timeout(optional) <float> : The maximum seconds to wait for an idle reader. None means wait forever.
+            :return reader <class BarcodeReader> : A reader owned by the pool.
+            :exception BarcodeReaderError : If no reader becomes idle before the timeout.
+        '''
+        try:
+            return self.__idle.get(timeout=timeout)
+        except queue.Empty:
+            raise BarcodeReaderError("No idle reader in the pool.")
+
+    def release(self, reader):
+        ''' Returns a reader checked out by acquire().
+            :param reader <class BarcodeReader> : The reader to give back.
+        '''
+        self.__idle.put(reader)
+
+    @contextlib.contextmanager
+    def reader(self, timeout=None):
+        ''' Checks out a reader for the duration of a with block.
+            :param timeout(optional) <float> : The maximum seconds to wait for an idle reader.
+        '''
+        reader = self.acquire(timeout)
+        try:
+            yield reader
+        finally:
+            self.release(reader)
+
+#endregion
+
+    def register_profile(self, name, settings):
+        ''' Registers a profile on every reader, see BarcodeReader.register_profile(). It waits until all readers are idle.
+            :param name <str> : The profile name.
+            :param settings <str/dict> : A JSON template string with one ImageParameter or a dict of ImageParameter values.
+            :exception BarcodeReaderError : If the template can not be applied, this function will throw a BarcodeReaderError exception.
+        '''
+        readers = [self.acquire() for i in range(self.size)]
+        try:
+            for reader in readers:
+                reader.register_profile(name, settings)
+        finally:
+            for reader in readers:
+                self.release(reader)
+
+#region Decoding Functions
+
+    def decode(self, image, template_name="", profile=None):
+        ''' Decodes an image with an idle reader, waiting for one if needed.
+            :param image : A file name <str/os.PathLike>, an image file in memory <bytes/bytearray/memoryview/mmap> or an image <class numpy.ndarray>.
+            :param template_name(optional) <str> : The template name.
+            :param profile(optional) <str> : The registered profile to decode with, see register_profile().
+            :return text_results <list[class TextResult]> : All text results.
+            :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
+        '''
+        image_file_name = _file_name(image)
+        with self.reader() as reader:
+            if image_file_name is not None:
+                return reader.decode_file(image_file_name, template_name, profile=profile)
+            elif isinstance(image, (bytes, bytearray, memoryview, mmap.mmap)):
+                return reader.decode_file_stream(image, template_name, profile=profile)
+            else:
+                return reader.decode_buffer(image, template_name=template_name, profile=profile)
+
+    def submit(self, image, template_name="", profile=None):
+        ''' Schedules decode() on the worker threads of the pool.
+            :param image : A file name <str/os.PathLike>, an image file in memory <bytes/bytearray/memoryview/mmap> or an image <class numpy.ndarray>.
+            :param template_name(optional) <str> : The template name.
+            :param profile(optional) <str> : The registered profile to decode with, see register_profile().
+            :return future <class concurrent.futures.Future> : The future of the text results.
+        '''
+        return self.__get_executor().submit(self.decode, image, template_name, profile)
+
+    def map(self, images, template_name="", profile=None):
+        ''' Decodes many images concurrently, with at most size images in flight.
+            :param images : An iterable of images accepted by decode().
+            :param template_name(optional) <str> : The template name.
+            :param profile(optional) <str> : The registered profile to decode with, see register_profile().
+            :return text_results_iterator : The text results of every image, in the order of images.
+        '''
+        return self.__get_executor().map(lambda image: self.decode(image, template_name, profile), images)
+
+#endregion
+
+    def close(self):
+        ''' Waits for the scheduled decoding to finish and stops the worker threads. '''
+        with self.__executor_lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=True)
+                self.__executor = None
+
+    def __get_executor(self):
+        with self.__executor_lock:
+            if self.__executor is None:
+                # Only submit() and map() need concurrent.futures, which Python 2 gets from the futures package
+                from concurrent.futures import ThreadPoolExecutor
+                self.__executor = ThreadPoolExecutor(max_workers=self.size)
+            return self.__executor
+
+
+# The seconds the capture thread of a VideoDecoding waits for a decoded frame before it checks whether it was closed
+_STOP_CHECK_INTERVAL = 0.1
+
+class VideoDecoding():
+    """
+    Drives video mode from a frame source and iterates the results as decoding completes. Created by BarcodeReader.iter_video().
+    A capture thread reads and appends the frames, so reading the source and decoding overlap.
+
+    Attributes:
+    -----------
+    - frames_read <int> : The number of frames read from the source
+    - frames_appended <int> : The number of frames appended to the frame queue
+    - dropped_frames <int> : The number of frames skipped because the frame queue was full
+    - dropped_results <int> : The number of results dropped because the result queue was full
+    - frame_queue_length <int> : The current length of the frame queue
+    - result_queue_length <int> : The current length of the result queue
+
+    Methods:
+    -----------
+    - for frame_id, text_results in video_decoding
+    - close()
+
+    The iteration ends when the source is exhausted and the last frames are decoded, or after close().
+    An error of the source or of append_video_frame() is raised by the iteration instead of being swallowed.
+    """
+
+    def __init__(self, reader, source, frame_decoding_parameters=None, template_name="", drop_frames=True):
+        ''' Init Function
+            :param reader <class BarcodeReader> : The reader running video mode.
+            :param source : See BarcodeReader.iter_video().
+            :param frame_decoding_parameters(optional) <class FrameDecodingParameters> : See BarcodeReader.iter_video().
+            :param template_name(optional) <str> : The template name.
+            :param drop_frames(optional) <bool> : See BarcodeReader.iter_video().
+        '''
+        self.frames_read = 0
+        self.frames_appended = 0
+        self.dropped_frames = 0
+        self.__reader = reader
+        self.__source = source
+        self.__parameters = frame_decoding_parameters
+        self.__template_name = template_name
+        self.__drop_frames = drop_frames
+        self.__capture = None
+        self.__own_capture = False
+        self.__frames = None
+        self.__ring = None
+        self.__thread = None
+        self.__started = False
+        self.__stopping = threading.Event()
+        self.__error = None
+
+    @property
+    def dropped_results(self):
+        return self.__reader.get_dropped_result_count()
+
+    @property
+    def frame_queue_length(self):
+        return self.__reader.get_length_of_frame_queue()
+
+    @property
+    def result_queue_length(self):
+        return self.__reader.get_length_of_result_queue()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.__started:
+            self.__started = True
+            if not self.__start():
+                raise StopIteration
+        video_result = self.__reader.get_video_results(None)
+        if video_result is None:
+            self.__join()
+            raise StopIteration
+        return video_result
+
+    next = __next__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        ''' Stops reading the source, stops video mode and waits for the capture thread. '''
+        self.__stopping.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        self.__release_source()
+
+    def __open_source(self):
+        source = self.__source
+        file_name = _file_name(source)
+        if file_name is not None or isinstance(source, int):
+            self.__capture = cv2.VideoCapture(file_name if file_name is not None else source)
+            self.__own_capture = True
+        elif hasattr(source, "read"):
+            self.__capture = source
+        else:
+            self.__frames = iter(source)
+
+    def __read_frame(self):
+        if self.__ring is not None:
+            return self.__ring.read(self.__capture)
+        if self.__capture is not None:
+            rval, frame = self.__capture.read()
+            return frame if rval else None
+        return next(self.__frames, None)
+
+    def __release_source(self):
+        if self.__own_capture and self.__capture is not None:
+            self.__capture.release()
+            self.__capture = None
+
+    def __start(self):
+        self.__open_source()
+        frame = self.__read_frame()
+        if frame is None:
+            self.__release_source()
+            return False
+        self.frames_read += 1
+
+        # The frame layout comes from the first frame, every later frame must have the same one
+        parameters = self.__parameters if self.__parameters is not None else self.__reader.init_frame_decoding_parameters()
+        parameters.height = frame.shape[0]
+        parameters.width = frame.shape[1]
+        parameters.stride = frame.strides[0]
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        parameters.image_pixel_format = _CHANNELS_TO_IMAGE_PIXEL_FORMAT.get(channels, EnumImagePixelFormat.IPF_RGB_888)
+        self.__max_queue_length = parameters.max_queue_length
+        try:
+            self.__reader.start_video_mode(parameters, None, self.__template_name)
+        except BarcodeReaderError:
+            self.__release_source()
+            raise
+        # An opencv capture reads the next frames into preallocated buffers
+        if isinstance(self.__capture, cv2.VideoCapture):
+            self.__ring = FrameRing(parameters)
+
+        self.__thread = threading.Thread(target=self.__capture_frames, args=(frame,))
+        self.__thread.daemon = True
+        self.__thread.start()
+        return True
+
+    def __capture_frames(self, frame):
+        try:
+            while frame is not None and not self.__stopping.is_set():
+                if self.__wait_for_room():
+                    self.__reader.append_video_frame(frame)
+                    self.frames_appended += 1
+                    if self.__ring is not None:
+                        self.__ring.advance()
+                else:
+                    self.dropped_frames += 1
+                frame = self.__read_frame()
+                if frame is not None:
+                    self.frames_read += 1
+            # Let the queued frames be decoded before video mode stops
+            while not self.__stopping.is_set() and not self.__reader._wait_frame_queue(1, _STOP_CHECK_INTERVAL):
+                pass
+        except Exception as e:
+            self.__error = e
+        finally:
+            try:
+                self.__reader.stop_video_mode()
+            except BarcodeReaderError as bre:
+                if self.__error is None:
+                    self.__error = bre
+
+    def __wait_for_room(self):
+        # A live source skips the frame when the queue is full, a file waits for a decoded frame so that no frame is lost
+        if self.__drop_frames:
+            return self.__reader.get_length_of_frame_queue() < self.__max_queue_length
+        while not self.__reader._wait_frame_queue(self.__max_queue_length, _STOP_CHECK_INTERVAL):
+            if self.__stopping.is_set():
+                return False
+        return True
+
+    def __join(self):
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        self.__release_source()
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise error
+
+
+class PageDecoding():
+    """
+    Decodes the pages of a multi-page TIFF or PDF file one at a time and iterates the results in page order as soon as a page
+    and the pages before it are done. Created by BarcodeReader.iter_pages().
+
+    Attributes:
+    -----------
+    - pages_decoded <int> : The number of pages decoded so far
+    - barcodes_found <int> : The number of barcodes on the pages iterated so far
+    - page_count <int> : The number of pages of the file once all pages were iterated up to its end, otherwise None
+
+    Methods:
+    -----------
+    - for page_number, text_results in page_decoding
+    - close()
+
+    Every page is decoded on its own with a private template of the reader named "__page_decoding", a copy of the runtime settings
+    of the reader with the template parameter "Pages" set to the page, so the library only rasterizes that page. The file is mapped
+    into memory once and shared by the readers. Each reader decodes on one worker thread, which takes the next page as long as the
+    iteration is less pages behind than there are readers. With a pool, the idle readers are checked out and decode the next pages
+    at the same time. A page past the end of the file ends the iteration.
+    Leaving the for loop, close() and the garbage collection of an iteration that was given up wait for the pages being decoded,
+    drop the private template, so the runtime settings and the templates of the readers are as before, and give the readers their
+    result cache and the pool its readers back.
+    """
+
+    def __init__(self, reader, image_file_name, pages=None, max_barcodes=None, pool=None):
+        ''' Init Function
+            :param reader <class BarcodeReader> : The reader whose runtime settings are used.
+            :param image_file_name <str> : See BarcodeReader.iter_pages().
+            :param pages(optional) : See BarcodeReader.iter_pages().
+            :param max_barcodes(optional) <int> : See BarcodeReader.iter_pages().
+            :param pool(optional) <class BarcodeReaderPool> : See BarcodeReader.iter_pages().
+        '''
+        self.__decoder = None
+        self.barcodes_found = 0
+        self.__decoder = _PageDecoder(reader, image_file_name, pages, max_barcodes, pool)
+
+    @property
+    def pages_decoded(self):
+        return self.__decoder.pages_decoded
+
+    @property
+    def page_count(self):
+        return self.__decoder.page_count
+
+    def __del__(self):
+        # The worker threads only reference the decoder, so an iteration that was given up is still collected
+        if self.__decoder is not None:
+            self.__decoder.close()
+
+    def __iter__(self):
+        # Leaving the for loop closes the generator and with it the iteration
+        try:
+            while True:
+                try:
+                    page = self.__next__()
+                except StopIteration:
+                    return
+                yield page
+        finally:
+            self.close()
+
+    def __next__(self):
+        page_number, text_results = self.__decoder.next_page()
+        self.barcodes_found += len(text_results) if text_results is not None else 0
+        return page_number, text_results
+
+    next = __next__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        ''' Stops taking pages, waits for the pages being decoded, drops the private template and gives the readers their result cache
+            and the pool its readers back.
+            :exception BarcodeReaderError : If the templates of a reader can not be applied again, this function will throw a BarcodeReaderError exception.
+        '''
+        self.__decoder.close()
+
+
+class _PageDecoder():
+    # The state of a PageDecoding shared with its worker threads
+
+    def __init__(self, reader, image_file_name, pages, max_barcodes, pool):
+        self.__condition = threading.Condition()
+        self.__started = False
+        self.__closed = False
+        self.__readers = []
+        self.__workers = []
+        self.__running = 0
+        self.__file_map = None
+        self.pages_decoded = 0
+        self.page_count = None
+        self.__reader = reader
+        self.__image_file_name = image_file_name
+        self.__pages = list(pages) if pages is not None else None
+        self.__max_barcodes = max_barcodes
+        self.__pool = pool
+        self.__template = None
+        self.__results = {}
+        # Positions in the page order: the next page to decode, to iterate and to count barcodes of
+        self.__next_decode = 0
+        self.__next_yield = 0
+        self.__next_counted = 0
+        self.__counted_barcodes = 0
+        self.__end = len(self.__pages) if self.__pages is not None else None
+        self.__error = None
+        self.__page_end_error = None
+
+    def next_page(self):
+        if not self.__started:
+            self.__started = True
+            self.__start()
+        with self.__condition:
+            while True:
+                if self.__error is not None:
+                    error, self.__error = self.__error, None
+                    break
+                if self.__end is not None and self.__next_yield >= self.__end:
+                    error = None
+                    break
+                if self.__next_yield in self.__results:
+                    page_number = self.__page_at(self.__next_yield)
+                    text_results = self.__results.pop(self.__next_yield)
+                    self.__next_yield += 1
+                    # The workers waiting for the iteration to catch up take the next pages
+                    self.__condition.notify_all()
+                    return page_number, text_results
+                if self.__running == 0:
+                    error = None
+                    break
+                self.__condition.wait()
+        self.close()
+        if error is not None:
+            raise error
+        raise StopIteration
+
+    def close(self):
+        with self.__condition:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__condition.notify_all()
+        for worker in self.__workers:
+            # The garbage collection can run on a worker thread
+            if worker is not threading.current_thread():
+                worker.join()
+        self.__workers = []
+        error = None
+        for reader, result_cache in self.__readers:
+            try:
+                reader._drop_private_templates()
+            except BarcodeReaderError as bre:
+                if error is None:
+                    error = bre
+            reader.result_cache = result_cache
+            if reader is not self.__reader:
+                self.__pool.release(reader)
+        self.__readers = []
+        if self.__file_map is not None:
+            self.__file_map.close()
+            self.__file_map = None
+        if error is not None:
+            raise error
+
+    def __page_at(self, position):
+        return self.__pages[position] if self.__pages is not None else position
+
+    def __start(self):
+        if self.__end == 0:
+            return
+        try:
+            image_file = open(self.__image_file_name, "rb")
+        except (IOError, OSError):
+            raise BarcodeReaderError(self.__reader.get_error_string(EnumErrorCode.DBRERR_FILE_NOT_FOUND))
+        with image_file:
+            if os.fstat(image_file.fileno()).st_size == 0:
+                raise BarcodeReaderError(self.__reader.get_error_string(EnumErrorCode.DBRERR_IMAGE_READ_FAILED))
+            self.__file_map = mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__template = _page_template(self.__reader.output_settings_to_json_string())
+        self.__page_end_error = self.__reader.get_error_string(EnumErrorCode.DBRERR_PAGE_NUMBER_INVALID)
+
+        readers = [self.__reader]
+        if self.__pool is not None:
+            # Wait for one reader of the pool and take the others that are idle
+            readers = [self.__pool.acquire()]
+            while len(readers) < self.__pool.size:
+                try:
+                    readers.append(self.__pool.acquire(0))
+                except BarcodeReaderError:
+                    break
+        for reader in readers:
+            self.__readers.append((reader, reader.result_cache))
+            # Hashing the whole file for every page would cost more than the cache saves
+            reader.result_cache = None
+        self.__running = len(readers)
+        for reader in readers:
+            worker = threading.Thread(target=self.__decode_pages, args=(reader,))
+            worker.daemon = True
+            worker.start()
+            self.__workers.append(worker)
+
+    def __take_page(self):
+        # The next page to decode, or None once the iteration stops taking pages. A page is only taken while the iteration is less
+        # pages behind than there are readers, so the pages stop being taken when the iteration stops.
+        with self.__condition:
+            while not self.__closed and self.__error is None and (self.__end is None or self.__next_decode < self.__end):
+                if self.__next_decode - self.__next_yield < len(self.__readers):
+                    position = self.__next_decode
+                    self.__next_decode += 1
+                    return position
+                self.__condition.wait()
+            return None
+
+    def __decode_pages(self, reader):
+        position = self.__take_page()
+        while position is not None:
+            page_number = self.__page_at(position)
+            text_results = None
+            page_error = None
+            try:
+                reader._append_private_template(self.__template.replace(_PAGE_PLACEHOLDER, str(page_number)))
+                text_results = reader.decode_file_stream(self.__file_map, template_name=_PAGE_TEMPLATE_NAME)
+            except Exception as e:
+                page_error = e
+            with self.__condition:
+                if page_error is None:
+                    self.__store(position, text_results)
+                elif isinstance(page_error, BarcodeReaderError) and page_error.error_info == self.__page_end_error:
+                    self.__finish_at(position, page_number)
+                elif self.__error is None:
+                    self.__error = page_error
+                self.__condition.notify_all()
+            position = self.__take_page()
+        with self.__condition:
+            self.__running -= 1
+            self.__condition.notify_all()
+
+    def __finish_at(self, position, page_number):
+        # Called with the condition held
+        if self.__end is None or position < self.__end:
+            self.__end = position
+        if self.__pages is None:
+            self.page_count = page_number if self.page_count is None else min(self.page_count, page_number)
+
+    def __store(self, position, text_results):
+        # Called with the condition held
+        self.pages_decoded += 1
+        self.__results[position] = text_results
+        # Count the barcodes of the pages in order, so the limit is reached on the same pages as without a pool
+        while self.__next_counted in self.__results:
+            counted_results = self.__results[self.__next_counted]
+            self.__counted_barcodes += len(counted_results) if counted_results is not None else 0
+            self.__next_counted += 1
+            if self.__max_barcodes is not None and self.__counted_barcodes >= self.__max_barcodes:
+                if self.__end is None or self.__next_counted < self.__end:
+                    self.__end = self.__next_counted
+                break
+
+
+class RegionTracker():
+    """
+    Decodes the frames of a video around the barcodes found in the recent frames instead of searching every frame in full.
+    Codes on a conveyor or in a handheld video move little between frames, so most frames only decode a few regions.
+
+    Attributes:
+    -----------
+    - padding <float> : The margin added around a recent barcode, as a share of its larger side
+    - history <int> : The number of recent frames whose barcodes are searched around
+    - full_frame_interval <int> : The number of frames after which the whole frame is searched again
+    - template_name <str> : The template name
+    - full_frame_decodes <int> : The number of frames searched in full
+    - region_decodes <int> : The number of regions decoded
+    - decoded_pixel_ratio <float> : The decoded pixels divided by the pixels of all frames so far, overlapping decodes counted twice
+
+    Methods:
+    -----------
+    - decode(frame)
+    - reset()
+
+    A frame is searched in full when there is no recent barcode, every full_frame_interval frames and when no region
+    gives a barcode, so a new barcode is found at the latest full_frame_interval frames after it appears.
+    """
+
+    def __init__(self, reader, padding=0.5, history=2, full_frame_interval=15, template_name=""):
+        ''' Init Function
+            :param reader <class BarcodeReader> : The reader decoding the frames.
+            :param padding(optional) <float> : The margin added around a recent barcode, as a share of its larger side.
+            :param history(optional) <int> : The number of recent frames whose barcodes are searched around.
+            :param full_frame_interval(optional) <int> : The number of frames after which the whole frame is searched again.
+            :param template_name(optional) <str> : The template name.
+        '''
+        self.padding = padding
+        self.history = history
+        self.full_frame_interval = full_frame_interval
+        self.template_name = template_name
+        self.__reader = reader
+        self.reset()
+
+    @property
+    def decoded_pixel_ratio(self):
+        if self.__frame_pixels == 0:
+            return 0.0
+        return float(self.__decoded_pixels) / self.__frame_pixels
+
+    def reset(self):
+        ''' Forgets the recent barcodes and the counters, the next frame is searched in full. '''
+        self.full_frame_decodes = 0
+        self.region_decodes = 0
+        self.__decoded_pixels = 0
+        self.__frame_pixels = 0
+        self.__recent_boxes = collections.deque(maxlen=max(self.history, 1))
+        self.__frames_since_full = 0
+
+    def decode(self, frame):
+        ''' Decodes barcodes in the next frame of the video.
+            :param frame <class numpy.ndarray> : The frame, see BarcodeReader.decode_buffer().
+            :return text_results <list[class TextResult]> : All text results in the coordinates of the frame, None if no barcode is found.
+            :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
+        '''
+        height, width = frame.shape[0], frame.shape[1]
+        text_results = []
+        if self.__frames_since_full < self.full_frame_interval:
+            for region in self.__get_regions(width, height):
+                region_results = self.__reader.decode_buffer(frame, None, self.template_name, region=region)
+                self.region_decodes += 1
+                self.__decoded_pixels += (region[2] - region[0]) * (region[3] - region[1])
+                if region_results:
+                    text_results.extend(region_results)
+        if text_results:
+            self.__frames_since_full += 1
+        else:
+            text_results = self.__reader.decode_buffer(frame, None, self.template_name) or []
+            self.full_frame_decodes += 1
+            self.__decoded_pixels += width * height
+            self.__frames_since_full = 0
+        self.__frame_pixels += width * height
+
+        boxes = []
+        for text_result in text_results:
+            if text_result.localization_result is not None:
+                points = text_result.localization_result.localization_points
+                xs = [point[0] for point in points]
+                ys = [point[1] for point in points]
+                boxes.append((min(xs), min(ys), max(xs), max(ys)))
+        self.__recent_boxes.append(boxes)
+        return text_results if text_results else None
+
+    def __get_regions(self, width, height):
+        # Pad every recent barcode and merge the regions that overlap, so that no barcode is decoded twice
+        regions = []
+        for boxes in self.__recent_boxes:
+            for left, top, right, bottom in boxes:
+                margin = int(self.padding * max(right - left, bottom - top))
+                region = [max(left - margin, 0), max(top - margin, 0), min(right + margin, width), min(bottom + margin, height)]
+                if region[0] >= region[2] or region[1] >= region[3]:
+                    continue
+                i = 0
+                while i < len(regions):
+                    other = regions[i]
+                    if other[0] < region[2] and region[0] < other[2] and other[1] < region[3] and region[1] < other[3]:
+                        region = [min(region[0], other[0]), min(region[1], other[1]), max(region[2], other[2]), max(region[3], other[3])]
+                        del regions[i]
+                        i = 0
+                    else:
+                        i += 1
+                regions.append(region)
+        return [tuple(region) for region in regions]
+
+
+class ResultCache():
+    """
+    Defines a cache of decoding results keyed by a hash of the image content, the runtime settings and the template name,
+    so that a file decoded again is answered without decoding. decode_file() hashes the path, size and modification time
+    of the file instead of its content. Pass it to BarcodeReader(result_cache=...), several readers may share it.
+
+    Attributes:
+    -----------
+    - max_bytes <int> : The memory the cached results may take. The least recently used results are evicted beyond it
+    - directory <str> : The directory of the on-disk store, None to keep the results in memory only
+    - hits <int> : The number of lookups answered from the cache
+    - misses <int> : The number of lookups that had to decode
+    - size <int> : The memory the cached results take now
+
+    Methods:
+    -----------
+    - get(key)
+    - put(key, text_results)
+    - clear()
+
+    The results are stored pickled, so a hit returns new objects. The on-disk store keeps every result and survives restarts,
+    it must only hold files written by this class because loading a pickle can run code.
+    A result that can not be stored is logged and the decoding returns it anyway.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, directory=None):
+        ''' Init Function
+            :param max_bytes(optional) <int> : The memory the cached results may take.
+            :param directory(optional) <str> : The directory of the on-disk store. It is created if it does not exist.
+        '''
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self.__entries = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        if directory is not None and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key):
+        ''' Looks up the results of a key and counts the hit or miss.
+            :param key <str> : The key.
+            :return found, text_results <tuple> : Whether the key was found and its results, which may be None for an image without barcode.
+        '''
+        with self.__lock:
+            data = self.__entries.get(key)
+            if data is not None:
+                # Move the entry to the most recently used end
+                del self.__entries[key]
+                self.__entries[key] = data
+        if data is None and self.directory is not None:
+            data = self.__load(key)
+            if data is not None:
+                self.__remember(key, data)
+        with self.__lock:
+            if data is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+        return True, pickle.loads(data)
+
+    def put(self, key, text_results):
+        ''' Stores the results of a key.
+            :param key <str> : The key.
+            :param text_results : The results to store.
+        '''
+        data = pickle.dumps(text_results, pickle.HIGHEST_PROTOCOL)
+        self.__remember(key, data)
+        if self.directory is not None:
+            self.__store(key, data)
+
+    def clear(self):
+        ''' Removes every result from memory and from the on-disk store, and resets the counters. '''
+        with self.__lock:
+            self.__entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+        if self.directory is not None:
+            for file_name in os.listdir(self.directory):
+                if file_name.endswith(".pickle"):
+                    os.remove(os.path.join(self.directory, file_name))
+
+    def __remember(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self.__entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self.__entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def __load(self, key):
+        try:
+            with open(os.path.join(self.directory, key + ".pickle"), "rb") as cache_file:
+                return cache_file.read()
+        except (IOError, OSError):
+            return None
+
+    def __store(self, key, data):
+        # Write to a temporary file first, so a reader never sees half a result
+        path = os.path.join(self.directory, key + ".pickle")
+        temporary_path = "%s.%d.%d.tmp" % (path, os.getpid(), threading.current_thread().ident)
+        with open(temporary_path, "wb") as cache_file:
+            cache_file.write(data)
+        try:
+            _replace_file(temporary_path, path)
+        except OSError:
+            # Python 2 on Windows can not rename over a file another process has just stored
+            os.remove(temporary_path)
+
 #endregion
\ No newline at end of file
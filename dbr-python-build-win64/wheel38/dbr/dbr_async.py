@@ -0,0 +1,244 @@
+# @Version : 7.3
+# @Author : Dynamsoft
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dbr.dbr_python import BarcodeReaderPool, EnumConflictMode
+
+try:
+    _get_running_loop = asyncio.get_running_loop
+except AttributeError:
+    # Python 3.5 and 3.6, where get_event_loop() returns the running loop in a coroutine
+    _get_running_loop = asyncio.get_event_loop
+
+#region Main Region
+
+class AsyncBarcodeReader():
+    """
+    Defines an asyncio interface for decoding barcodes. Decoding runs on a pool of readers in an executor,
+    so awaiting a result never blocks the event loop.
+
+    Attributes:
+    -----------
+    - size <int> : The number of readers, which is also the number of decodings running at the same time
+    - max_pending <int> : The maximum number of decodings that are running or waiting for a reader.
+        Further calls wait in the event loop before anything is queued to the executor.
+
+    Methods:
+    -----------
+    - register_profile(name, settings)
+    - Image Decoding Functions
+        - await decode_file(image_file_name, template_name="", profile=None)
+        - await decode_buffer(image, image_pixel_format=None, template_name="", profile=None)
+        - await decode_file_stream(file_stream, template_name="", profile=None)
+        - await decode_file_mmap(image_file_name, template_name="", profile=None)
+    - await aclose()
+    - close()
+
+    A cancelled call that is still waiting never reaches a reader. A call that is already decoding finishes in
+    the background and its result is dropped, because the native decoding can not be interrupted. It counts
+    against max_pending until it is done.
+    The reader must be used from one event loop.
+    """
+
+    def __init__(self, size=4, dbr_license="", json_string=None, conflict_mode=EnumConflictMode.CM_OVERWRITE, max_pending=None, executor=None, lazy_results=False, result_cache=None):
+        ''' Init Function
+            :param size(optional) <int> : The number of readers to create.
+            :param dbr_license(optional) <str> : The product keys applied to every reader.
+            :param json_string(optional) <str> : A JSON template string applied to every reader.
+            :param conflict_mode(optional) <EnumConflictMode> : The parameter setting mode used with json_string.
+            :param max_pending(optional) <int> : The maximum number of decodings in flight. Default value = size.
+            :param executor(optional) <class concurrent.futures.Executor> : The executor running the decoding.
+                By default a thread pool with size workers is created and shut down by close().
+            :param lazy_results(optional) <bool> : Whether the readers return lazy results, see BarcodeReader.lazy_results.
+            :param result_cache(optional) <class ResultCache> : The cache shared by the readers, see BarcodeReader.result_cache.
+            :exception BarcodeReaderError : If the template can not be applied, this function will throw a BarcodeReaderError exception.
+        '''
+        self.size = size
+        self.max_pending = max_pending if max_pending is not None else size
+        self.__pool = BarcodeReaderPool(size, dbr_license, json_string, conflict_mode, lazy_results, result_cache)
+        self.__own_executor = executor is None
+        self.__executor = executor if executor is not None else ThreadPoolExecutor(max_workers=size)
+        self.__semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    def register_profile(self, name, settings):
+        ''' Registers a profile on every reader, see BarcodeReader.register_profile(). It blocks until all readers are idle.
+            :param name <str> : The profile name.
+            :param settings <str/dict> : A JSON template string with one ImageParameter or a dict of ImageParameter values.
+            :exception BarcodeReaderError : If the template can not be applied, this function will throw a BarcodeReaderError exception.
+        '''
+        self.__pool.register_profile(name, settings)
+
+#region Image Decoding Functions
+
+    async def decode_file(self, image_file_name, template_name="", profile=None):
+        ''' Decodes barcodes in the specified image file.
+            :param image_file_name           <str> : A string defining the file name.
+            :param template_name(optional)   <str> : The template name.
+            :param profile(optional) <str> : The registered profile to decode with, see BarcodeReader.register_profile().
+            :return text_results <list[class TextResult]> : All text results.
+            :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
+        '''
+        return await self.__run(lambda reader: reader.decode_file(image_file_name, template_name, profile=profile))
+
+    async def decode_buffer(self, image, image_pixel_format=None, template_name="", profile=None):
+        ''' Decodes barcodes from the memory buffer containing image pixels in defined format.
+            :param image <class numpy.ndarray> : The image which is processed by opencv.( image = cv2.imread('image_name') )
+            :param image_pixel_format(optional) <EnumImagePixelFormat> : The image pixel format used in the image byte array.
+                By default it is derived from the image: IPF_GRAYSCALED for (H, W), IPF_RGB_888 for (H, W, 3), IPF_ARGB_8888 for (H, W, 4).
+            :param template_name(optional) <str> : The template name.
+            :param profile(optional) <str> : The registered profile to decode with, see BarcodeReader.register_profile().
+            :return text_results <list[class TextResult]> : All text results.
+            :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
+        '''
+        return await self.__run(lambda reader: reader.decode_buffer(image, image_pixel_format, template_name, profile=profile))
+
+    async def decode_file_stream(self, file_stream, template_name="", profile=None):
+        ''' Decodes barcodes from an image file in memory.
+            :param file_stream <bytes/bytearray/memoryview/mmap/numpy.ndarray> : The image file bytes in memory.
+            :param template_name(optional) <str> : The template name.
+            :param profile(optional) <str> : The registered profile to decode with, see BarcodeReader.register_profile().
+            :return text_results <list[class TextResult]> : All text results.
+            :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
+        '''
+        return await self.__run(lambda reader: reader.decode_file_stream(file_stream, template_name, profile=profile))
+
+    async def decode_file_mmap(self, image_file_name, template_name="", profile=None):
+        ''' Decodes barcodes in the specified image file mapped into memory, see BarcodeReader.decode_file_mmap().
+            :param image_file_name           <str> : A string defining the file name.
+            :param template_name(optional)   <str> : The template name.
+            :param profile(optional) <str> : The registered profile to decode with, see BarcodeReader.register_profile().
+            :return text_results <list[class TextResult]> : All text results.
+            :exception BarcodeReaderError : If error happens, this function will throw a BarcodeReaderError exception that can report the detailed error message.
+        '''
+        return await self.__run(lambda reader: reader.decode_file_mmap(image_file_name, template_name, profile=profile))
+
+#endregion
+
+    async def aclose(self):
+        ''' Like close(), but waits in a worker thread, so the event loop keeps running until the decoding in flight is done. '''
+        loop = _get_running_loop()
+        await loop.run_in_executor(None, self.close)
+
+    def close(self):
+        ''' Waits for the running decoding to finish, stops the executor if it was created by this reader and closes the pool.
+            It blocks the calling thread, use aclose() on the event loop.
+        '''
+        if self.__own_executor:
+            self.__executor.shutdown(wait=True)
+        self.__pool.close()
+
+    async def __run(self, decode):
+        # The semaphore belongs to the running loop, so it is created on first use
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.max_pending)
+        await self.__semaphore.acquire()
+        loop = _get_running_loop()
+        try:
+            future = self.__executor.submit(self.__decode_with_reader, decode)
+        except BaseException:
+            self.__semaphore.release()
+            raise
+        # Cancelling the call does not stop a decoding that has started, so the slot is given back when the executor is done
+        future.add_done_callback(lambda done: self.__release_slot(loop))
+        return await asyncio.wrap_future(future)
+
+    def __release_slot(self, loop):
+        try:
+            loop.call_soon_threadsafe(self.__semaphore.release)
+        except RuntimeError:
+            # The event loop is closed, nobody waits for a slot any more
+            pass
+
+    def __decode_with_reader(self, decode):
+        with self.__pool.reader() as reader:
+            return decode(reader)
+
+class AsyncVideoResults():
+    """
+    Iterates the results of a reader in video mode without a callback with async for.
+
+    Attributes:
+    -----------
+    - reader <class BarcodeReader> : The reader whose video result queue is read
+
+    Methods:
+    -----------
+    - async for frame_id, text_results in AsyncVideoResults(reader)
+    - close()
+
+    A helper thread waits for the native queue and wakes the event loop with call_soon_threadsafe. It only takes a
+    result from the queue when the loop asks for the next one, so the queue stays bounded and drops the oldest results
+    while the loop is busy. The iteration ends when reader.stop_video_mode() is called and the queue is empty.
+    """
+
+    def __init__(self, reader):
+        ''' Init Function
+            :param reader <class BarcodeReader> : The reader. Its video mode must be started with call_back_func=None.
+        '''
+        self.reader = reader
+        self.__requests = queue.Queue()
+        self.__thread = None
+        self.__loop = None
+        self.__pending = None
+        self.__closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.__pending is not None:
+            video_result, self.__pending = self.__pending, None
+            return video_result
+        if self.__closed:
+            raise StopAsyncIteration
+        if self.__thread is None:
+            self.__loop = _get_running_loop()
+            self.__thread = threading.Thread(target=self.__wait_results, daemon=True)
+            self.__thread.start()
+
+        future = self.__loop.create_future()
+        self.__requests.put(future)
+        video_result = await future
+        if video_result is None:
+            self.__closed = True
+            raise StopAsyncIteration
+        return video_result
+
+    def close(self):
+        ''' Ends the iteration. A wait that is already running ends with the next result or when video mode stops. '''
+        if not self.__closed:
+            self.__closed = True
+            self.__requests.put(None)
+
+    def __wait_results(self):
+        while True:
+            future = self.__requests.get()
+            if future is None:
+                return
+            video_result = self.reader.get_video_results(None)
+            try:
+                self.__loop.call_soon_threadsafe(self.__deliver, future, video_result)
+            except RuntimeError:
+                # The event loop is closed, nobody is waiting any more
+                return
+            if video_result is None:
+                return
+
+    def __deliver(self, future, video_result):
+        # A result for a cancelled call is kept for the next one instead of being lost
+        if future.cancelled():
+            if video_result is not None:
+                self.__pending = video_result
+        else:
+            future.set_result(video_result)
+
+#endregion
@@ -0,0 +1,150 @@
+# @Version : 7.3
+# @Author : Dynamsoft
+
+''' Parallel directory scanner.
+
+    Usage: python -m dbr scan <directory> [--license KEY] [--template FILE] [--workers N] [--output FILE]
+
+    Every worker process creates one BarcodeReader, applies the license and the template once,
+    and then decodes the files it is given. One JSON object is written per file:
+    {"file": ..., "elapsed_ms": ..., "results": [{"format": ..., "text": ..., "points": [[x, y], ...]}], "error": ...}
+'''
+
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from dbr.dbr_python import BarcodeReader, BarcodeReaderError, EnumErrorCode
+
+DEFAULT_EXTENSIONS = ".bmp,.jpg,.jpeg,.png,.gif,.tif,.tiff,.pdf"
+
+# The reader of the current worker process
+_reader = None
+
+def iter_image_files(directory, extensions, recursive=True):
+    ''' Yields the files under a directory whose extension is in extensions.
+        :param directory <str> : The directory to walk.
+        :param extensions <set[str]> : Lower case extensions including the dot, e.g. ".png".
+        :param recursive(optional) <bool> : Whether to walk sub directories.
+    '''
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in extensions:
+                yield os.path.join(root, name)
+        if not recursive:
+            break
+
+def redirect_native_stdout():
+    ''' Points the standard output descriptor at the standard error, so that the messages printed by the native library,
+        e.g. its version when a reader is created, do not mix with the output of a command. Worker processes inherit it.
+        :return output <file> : A file writing to the original standard output.
+    '''
+    try:
+        stdout_fd = sys.stdout.fileno()
+        stderr_fd = sys.stderr.fileno()
+    except (AttributeError, ValueError, IOError, OSError):
+        # Not a real stream, e.g. captured output, the native library does not write to it anyway
+        return sys.stdout
+    sys.stdout.flush()
+    output = os.fdopen(os.dup(stdout_fd), "w")
+    os.dup2(stderr_fd, stdout_fd)
+    return output
+
+def init_worker(dbr_license, json_string):
+    ''' Creates the reader of a worker process. Runs once per process. '''
+    global _reader
+    # Only the text, the format and the points are written, so the rest of a result is never converted
+    _reader = BarcodeReader(lazy_results=True)
+    if dbr_license:
+        _reader.init_license(dbr_license)
+    if json_string:
+        error = _reader.init_runtime_settings_with_string(json_string)
+        if error[0] != EnumErrorCode.DBR_OK:
+            raise BarcodeReaderError(error[1])
+
+def scan_file(file_name):
+    ''' Decodes one file with the reader of the current worker process.
+        :param file_name <str> : The image file.
+        :return record <dict> : The JSON record of the file.
+    '''
+    record = {"file": file_name, "results": [], "error": None}
+    start = time.time()
+    try:
+        text_results = _reader.decode_file(file_name)
+        if text_results != None:
+            for text_result in text_results:
+                record["results"].append({
+                    "format": text_result.barcode_format_string,
+                    "text": text_result.barcode_text,
+                    "points": [list(point) for point in text_result.localization_result.localization_points]
+                })
+    except BarcodeReaderError as bre:
+        record["error"] = str(bre)
+    except Exception as e:
+        # Any other failure is recorded for this file too, so that it does not end the whole scan
+        record["error"] = "%s: %s" % (type(e).__name__, e)
+    record["elapsed_ms"] = round((time.time() - start) * 1000, 3)
+    return record
+
+def scan(directory, dbr_license="", json_string=None, workers=None, extensions=None, recursive=True, chunk_size=8):
+    ''' Scans a directory tree in parallel.
+        :param directory <str> : The directory to walk.
+        :param dbr_license(optional) <str> : The product keys.
+        :param json_string(optional) <str> : A JSON template string applied to every reader.
+        :param workers(optional) <int> : The number of worker processes. Default value = the number of CPUs.
+        :param extensions(optional) <set[str]> : The file extensions to decode.
+        :param recursive(optional) <bool> : Whether to walk sub directories.
+        :param chunk_size(optional) <int> : The number of files sent to a worker at a time.
+        :return records : An iterator of the JSON records, in the order the files finish.
+    '''
+    if extensions is None:
+        extensions = set(DEFAULT_EXTENSIONS.split(","))
+    # Check the template here, a failing pool initializer would be restarted forever
+    if json_string:
+        error = BarcodeReader().init_runtime_settings_with_string(json_string)
+        if error[0] != EnumErrorCode.DBR_OK:
+            raise BarcodeReaderError(error[1])
+    pool = multiprocessing.Pool(workers, init_worker, (dbr_license, json_string))
+    try:
+        for record in pool.imap_unordered(scan_file, iter_image_files(directory, extensions, recursive), chunk_size):
+            yield record
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dbr scan", description="Decode all images in a directory tree and write JSON Lines.")
+    parser.add_argument("directory", help="The directory to scan")
+    parser.add_argument("--license", default="", help="The product keys")
+    parser.add_argument("--template", help="A JSON template file loaded once by every worker")
+    parser.add_argument("--workers", type=int, default=None, help="The number of worker processes, default to the number of CPUs")
+    parser.add_argument("--extensions", default=DEFAULT_EXTENSIONS, help="Comma separated file extensions, default to %(default)s")
+    parser.add_argument("--no-recursive", action="store_true", help="Do not walk sub directories")
+    parser.add_argument("--chunk-size", type=int, default=8, help="The number of files sent to a worker at a time")
+    parser.add_argument("--output", help="The JSON Lines file to write, default to stdout")
+    args = parser.parse_args(argv)
+
+    json_string = None
+    if args.template:
+        with open(args.template) as f:
+            json_string = f.read()
+    extensions = set(extension.strip().lower() for extension in args.extensions.split(",") if extension.strip())
+
+    output = open(args.output, "w") if args.output else redirect_native_stdout()
+    try:
+        for record in scan(args.directory, args.license, json_string, args.workers, extensions, not args.no_recursive, args.chunk_size):
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
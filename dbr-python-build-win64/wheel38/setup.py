@@ -24,7 +24,7 @@ class BinaryDistribution(Distribution):
         return True
 
 
-data_info = {'dbr':['*.pyd', 'dbr_python.py','vcomp110.dll', 'DynamicPdfx64.dll', 'DynamsoftBarcodeReaderx64.dll', 'DynamsoftLicClientx64.dll', 'Classification.dll', 'gflags.dll', 'glog.dll', 'libopenblas.dll', 'legal.txt', \
+data_info = {'dbr':['*.pyd', 'dbr_python.py', 'scan.py', 'tune.py', '__main__.py', 'dbr_async.py','vcomp110.dll', 'DynamicPdfx64.dll', 'DynamsoftBarcodeReaderx64.dll', 'DynamsoftLicClientx64.dll', 'Classification.dll', 'gflags.dll', 'glog.dll', 'libopenblas.dll', 'legal.txt', \
 'CaffeModel/Add_all_iter_70000.caffemodel', 'CaffeModel/labels.txt', 'CaffeModel/labels_alpha.txt', 'CaffeModel/lenet.prototxt', 'CaffeModel/lenet_alpha.prototxt', 'CaffeModel/number_iter_20000.caffemodel']}
 
 setup(